@@ -1,10 +1,9 @@
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 import urllib
 import uuid
-import base64
-from io import BufferedReader, BytesIO
+from io import BufferedReader
 from botocore.exceptions import BotoCoreError, ClientError
 from edenai_apis.apis.amazon.helpers import (
     amazon_speaking_rate_converter,
@@ -36,13 +35,13 @@ from edenai_apis.utils.types import (
     AsyncResponseType,
     ResponseType,
 )
-from edenai_apis.utils.upload_s3 import upload_file_bytes_to_s3, USER_PROCESS
+from edenai_apis.utils.tts_streaming import AUDIO_CHUNK_SIZE, text_to_speech_response
 
 from .config import audio_voices_ids
 
 
 class AmazonAudioApi(AudioInterface):
-    def audio__text_to_speech(
+    def _text_to_speech_chunks(
         self,
         language: str,
         text: str,
@@ -53,7 +52,7 @@ class AmazonAudioApi(AudioInterface):
         speaking_pitch: int,
         speaking_volume: int,
         sampling_rate: int,
-    ) -> ResponseType[TextToSpeechDataClass]:
+    ) -> Tuple[str, Iterator[bytes]]:
         _, voice_id_name, engine = voice_id.split("_")
         engine = engine.lower()
 
@@ -77,22 +76,34 @@ class AmazonAudioApi(AudioInterface):
             params["TextType"] = "ssml"
 
         response = handle_amazon_call(self.clients["texttospeech"].synthesize_speech, **params)
-        
-        audio_content = BytesIO(response["AudioStream"].read())
 
-        # convert 'StreamBody' to b64
-        audio_file = base64.b64encode(audio_content.read()).decode("utf-8")
-        voice_type = 1
+        # Polly sends the audio as it's synthesized
+        return ext, response["AudioStream"].iter_chunks(AUDIO_CHUNK_SIZE)
 
-        audio_content.seek(0)
-        resource_url = upload_file_bytes_to_s3(audio_content, f".{ext}", USER_PROCESS)
-
-        standardized_response = TextToSpeechDataClass(
-            audio=audio_file, voice_type=voice_type, audio_resource_url=resource_url
-        )
-        return ResponseType[TextToSpeechDataClass](
-            original_response={}, standardized_response=standardized_response
+    def audio__text_to_speech(
+        self,
+        language: str,
+        text: str,
+        option: str,
+        voice_id: str,
+        audio_format: str,
+        speaking_rate: int,
+        speaking_pitch: int,
+        speaking_volume: int,
+        sampling_rate: int,
+    ) -> ResponseType[TextToSpeechDataClass]:
+        ext, chunks = self._text_to_speech_chunks(
+            language,
+            text,
+            option,
+            voice_id,
+            audio_format,
+            speaking_rate,
+            speaking_pitch,
+            speaking_volume,
+            sampling_rate,
         )
+        return text_to_speech_response(chunks, ext)
 
     # Speech to text async
     def _upload_audio_file_to_amazon_server(
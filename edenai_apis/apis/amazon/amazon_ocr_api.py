@@ -196,13 +196,11 @@ class AmazonOcrApi(OcrInterface):
     def ocr__ocr_tables_async__launch_job(
         self, file: str, file_type: str, language: str, file_url: str = ""
     ) -> AsyncLaunchJobResponseType:
+        # upload file first, streamed from disk
         with open(file, "rb") as file_:
-            file_content = file_.read()
-
-        # upload file first
-        self.storage_clients["textract"].Bucket(self.api_settings["bucket"]).put_object(
-            Key=file, Body=file_content
-        )
+            self.storage_clients["textract"].Bucket(
+                self.api_settings["bucket"]
+            ).upload_fileobj(file_, file)
 
         response = self.clients["textract"].start_document_analysis(
             DocumentLocation={
@@ -268,11 +266,9 @@ class AmazonOcrApi(OcrInterface):
         self, file: str, queries: List[Dict[str, Union[str, str]]], file_url: str = ""
     ) -> AsyncLaunchJobResponseType:
         with open(file, "rb") as file_:
-            file_content = file_.read()
-
-        self.storage_clients["textract"].Bucket(self.api_settings["bucket"]).put_object(
-            Key=file, Body=file_content
-        )
+            self.storage_clients["textract"].Bucket(
+                self.api_settings["bucket"]
+            ).upload_fileobj(file_, file)
         formatted_queries = [
             {"Text": query.get("query"), "Pages": query.get("pages").split(",")}
             for query in queries
@@ -352,11 +348,9 @@ class AmazonOcrApi(OcrInterface):
         self, file: str, language: str, file_url: str = ""
     ) -> ResponseType[InvoiceParserDataClass]:
         with open(file, "rb") as file_:
-            file_content = file_.read()
-
-        self.storage_clients["textract"].Bucket(self.api_settings["bucket"]).put_object(
-            Key=file, Body=file_content
-        )
+            self.storage_clients["textract"].Bucket(
+                self.api_settings["bucket"]
+            ).upload_fileobj(file_, file)
 
         # Launch invoice job
         payload = {
@@ -414,11 +408,9 @@ class AmazonOcrApi(OcrInterface):
         self, file: str, language: str, file_url: str = ""
     ) -> ResponseType[ReceiptParserDataClass]:
         with open(file, "rb") as file_:
-            file_content = file_.read()
-
-        self.storage_clients["textract"].Bucket(self.api_settings["bucket"]).put_object(
-            Key=file, Body=file_content
-        )
+            self.storage_clients["textract"].Bucket(
+                self.api_settings["bucket"]
+            ).upload_fileobj(file_, file)
 
         # Launch invoice job
         payload = {
@@ -476,11 +468,9 @@ class AmazonOcrApi(OcrInterface):
         self, file: str, file_url: str = ""
     ) -> AsyncLaunchJobResponseType:
         with open(file, "rb") as file_:
-            file_content = file_.read()
-
-        self.storage_clients["textract"].Bucket(self.api_settings["bucket"]).put_object(
-            Key=file, Body=file_content
-        )
+            self.storage_clients["textract"].Bucket(
+                self.api_settings["bucket"]
+            ).upload_fileobj(file_, file)
 
         payload = {
             "DocumentLocation": {
@@ -537,11 +527,9 @@ class AmazonOcrApi(OcrInterface):
         self, file: str, file_url: str = ""
     ) -> ResponseType[DataExtractionDataClass]:
         with open(file, "rb") as fstream:
-            file_content = fstream.read()
-
             self.storage_clients["textract"].Bucket(
                 self.api_settings["bucket"]
-            ).put_object(Key=file, Body=file_content)
+            ).upload_fileobj(fstream, file)
 
             payload = {
                 "DocumentLocation": {
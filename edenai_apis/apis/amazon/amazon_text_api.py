@@ -170,12 +170,12 @@ class AmazonTextApi(TextInterface):
         res = handle_amazon_call(self.clients["text"].detect_pii_entities, **payload)
 
         last_end = 0
-        new_text = ""
+        # parts of the anonymized text, joined once
+        new_text_parts: List[str] = []
         entities: Sequence[AnonymizationEntity] = []
         for entity in res["Entities"]:
-            new_text += text[last_end : entity["BeginOffset"]] + "*" * (
-                entity["EndOffset"] - entity["BeginOffset"]
-            )
+            new_text_parts.append(text[last_end : entity["BeginOffset"]])
+            new_text_parts.append("*" * (entity["EndOffset"] - entity["BeginOffset"]))
             last_end = entity["EndOffset"]
             classification = CategoryType.choose_category_subcategory(entity["Type"])
             entities.append(
@@ -189,9 +189,9 @@ class AmazonTextApi(TextInterface):
                     subcategory=classification["subcategory"],
                 )
             )
-        new_text += text[last_end:]
+        new_text_parts.append(text[last_end:])
         standardized_response = AnonymizationDataClass(
-            result=new_text, entities=entities
+            result="".join(new_text_parts), entities=entities
         )
         return ResponseType(
             original_response=res, standardized_response=standardized_response
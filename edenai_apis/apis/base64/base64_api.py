@@ -2,8 +2,6 @@ from itertools import zip_longest
 import json
 from typing import Any, Dict, Sequence, Type, TypeVar, Union
 from collections import defaultdict
-import mimetypes
-import base64
 from enum import Enum
 from proto import message
 import requests
@@ -64,6 +62,7 @@ from edenai_apis.utils.conversion import (
     retreive_first_number_from_string,
 )
 from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.file_streams import JsonFileStream
 from edenai_apis.utils.types import ResponseType
 
 
@@ -301,18 +300,14 @@ class Base64Api(ProviderInterface, OcrInterface):
         return standardized_response
 
     def _send_ocr_document(self, file: str, model_type: str) -> Dict:
-        file_ = open(file, "rb")
-        image_as_base64 = (
-            f"data:{mimetypes.guess_type(file)[0]};base64,"
-            + base64.b64encode(file_.read()).decode()
+        # the file is streamed as a base64 data uri inside the json body
+        data = JsonFileStream(
+            {"modelTypes": [model_type]}, {"image": file}, data_uri=True
         )
-        file_.close()
-
-        data = {"modelTypes": [model_type], "image": image_as_base64}
 
         headers = {"Content-type": "application/json", "Authorization": self.api_key}
 
-        response = requests.post(url=self.url, headers=headers, json=data)
+        response = requests.post(url=self.url, headers=headers, data=data)
 
         if response.status_code != 200:
             raise ProviderException(
@@ -367,21 +362,12 @@ class Base64Api(ProviderInterface, OcrInterface):
     def ocr__identity_parser(
         self, file: str, file_url: str = ""
     ) -> ResponseType[IdentityParserDataClass]:
-        file_ = open(file, "rb")
-
-        image_as_base64 = (
-            f"data:{mimetypes.guess_type(file)[0]};base64,"
-            + base64.b64encode(file_.read()).decode()
-        )
-
-        payload = json.dumps({"image": image_as_base64})
+        payload = JsonFileStream({}, {"image": file}, data_uri=True)
 
         headers = {"Content-Type": "application/json", "Authorization": self.api_key}
 
         response = requests.post(url=self.url, headers=headers, data=payload)
 
-        file_.close()
-
         original_response = response.json()
         if response.status_code != 200:
             raise ProviderException(
@@ -531,21 +517,8 @@ class Base64Api(ProviderInterface, OcrInterface):
         if file1_url and file2_url:
             payload = json.dumps({"referenceUrl": file1_url, "queryUrl": file2_url})
         else:
-            file_reference_ = open(file1, "rb")
-            file_query_ = open(file2, "rb")
-            image_reference_as_base64 = (
-                f"data:{mimetypes.guess_type(file1)[0]};base64,"
-                + base64.b64encode(file_reference_.read()).decode()
-            )
-            image_query_as_base64 = (
-                f"data:{mimetypes.guess_type(file2)[0]};base64,"
-                + base64.b64encode(file_query_.read()).decode()
-            )
-            payload = json.dumps(
-                {
-                    "referenceImage": image_reference_as_base64,
-                    "queryImage": image_query_as_base64,
-                }
+            payload = JsonFileStream(
+                {}, {"referenceImage": file1, "queryImage": file2}, data_uri=True
             )
 
         response = requests.request("POST", url, headers=headers, data=payload)
@@ -580,19 +553,13 @@ class Base64Api(ProviderInterface, OcrInterface):
     def ocr__data_extraction(
         self, file: str, file_url: str = ""
     ) -> ResponseType[DataExtractionDataClass]:
-        with open(file, "rb") as f_stream:
-            image_as_base64 = (
-                f"data:{mimetypes.guess_type(file)[0]};base64,"
-                + base64.b64encode(f_stream.read()).decode()
-            )
-
-            payload = json.dumps({"image": image_as_base64})
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": self.api_key,
-            }
+        payload = JsonFileStream({}, {"image": file}, data_uri=True)
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": self.api_key,
+        }
 
-            response = requests.post(url=self.url, headers=headers, data=payload)
+        response = requests.post(url=self.url, headers=headers, data=payload)
 
         original_response = response.json()
         if response.status_code != 200:
@@ -631,13 +598,9 @@ class Base64Api(ProviderInterface, OcrInterface):
     def ocr__bank_check_parsing(
         self, file: str, file_url: str = ""
     ) -> ResponseType[BankCheckParsingDataClass]:
-        with open(file, "rb") as fstream:
-            image_as_base64 = (
-                f"data:{mimetypes.guess_type(file)[0]};base64,"
-                + base64.b64encode(fstream.read()).decode()
-            )
-
-            payload = json.dumps({"modelTypes": ["finance/"], "image": image_as_base64})
+        with JsonFileStream(
+            {"modelTypes": ["finance/"]}, {"image": file}, data_uri=True
+        ) as payload:
             headers = {
                 "Content-Type": "application/json",
                 "Authorization": self.api_key,
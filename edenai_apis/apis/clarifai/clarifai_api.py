@@ -5,7 +5,6 @@ from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
 from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
 from clarifai_grpc.grpc.api.status import status_code_pb2
 from collections import defaultdict
-from PIL import Image as Img
 from edenai_apis.features.image.face_detection.face_detection_dataclass import (
     FaceAccessories,
     FaceEmotions,
@@ -39,6 +38,7 @@ from edenai_apis.features.text.moderation.moderation_dataclass import Moderation
 from edenai_apis.loaders.data_loader import ProviderDataEnum
 from edenai_apis.loaders.loaders import load_provider
 from edenai_apis.utils.conversion import standardized_confidence_score
+from edenai_apis.utils.file_probe import get_image_dimensions
 from edenai_apis.utils.exception import ProviderException, LanguageException
 from edenai_apis.utils.types import ResponseType
 
@@ -406,7 +406,7 @@ class ClarifaiApi(
 
         with open(file, "rb") as file_:
             file_content = file_.read()
-        width, height = Img.open(file).size
+        width, height = get_image_dimensions(file)
         user_id = "clarifai"
         app_id = "main"
         metadata = (("authorization", self.key),)
@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Sequence
+from typing import Optional, List, Dict, Sequence, Union
 import requests
 from edenai_apis.features import ProviderInterface, TextInterface
 from edenai_apis.features.text import (
@@ -8,7 +8,9 @@ from edenai_apis.features.text import (
     SummarizeDataClass,
     CustomNamedEntityRecognitionDataClass,
     EmbeddingsDataClass,
-    EmbeddingDataClass
+    EmbeddingDataClass,
+    CompactEmbeddingsDataClass,
+    EmbeddingsOutputOptions,
 )
 from edenai_apis.features.text.spell_check.spell_check_dataclass import (
     SpellCheckDataClass,
@@ -324,7 +326,10 @@ Answer:"""
     def text__embeddings(
         self, 
         texts: List[str],
-        model: str) -> ResponseType[EmbeddingsDataClass]:
+        model: str,
+        output_options: Optional[Dict] = None,
+    ) -> ResponseType[Union[EmbeddingsDataClass, CompactEmbeddingsDataClass]]:
+        options = EmbeddingsOutputOptions.from_output_options(output_options)
         url = f"{self.base_url}embed"
         model = model.split("__")
         payload = {
@@ -338,7 +343,18 @@ Answer:"""
                 original_response["message"],
                 code = response.status_code
             )
-        
+
+        if options is not None:
+            vectors = original_response["embeddings"]
+            if not options.include_original_vectors:
+                original_response.pop("embeddings")
+            return ResponseType[CompactEmbeddingsDataClass].model_construct(
+                original_response=original_response,
+                standardized_response=CompactEmbeddingsDataClass.from_vectors(
+                    vectors, options
+                ),
+            )
+
         items: Sequence[EmbeddingsDataClass] = []
         for prediction in original_response["embeddings"]:
             items.append(EmbeddingDataClass(embedding=prediction))
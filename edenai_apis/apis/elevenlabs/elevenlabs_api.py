@@ -1,6 +1,4 @@
-from typing import Dict
-from io import BytesIO
-import base64
+from typing import Dict, Iterator, Tuple
 import requests
 from edenai_apis.features import AudioInterface
 from edenai_apis.features.audio.text_to_speech.text_to_speech_dataclass import TextToSpeechDataClass
@@ -10,7 +8,7 @@ from edenai_apis.loaders.loaders import load_provider
 from edenai_apis.utils.exception import ProviderException
 from edenai_apis.utils.types import ResponseType
 from .config import voice_ids
-from edenai_apis.utils.upload_s3 import USER_PROCESS, upload_file_bytes_to_s3
+from edenai_apis.utils.tts_streaming import AUDIO_CHUNK_SIZE, text_to_speech_response
 
 
 class ElevenlabsApi(ProviderInterface, AudioInterface):
@@ -42,7 +40,7 @@ class ElevenlabsApi(ProviderInterface, AudioInterface):
         return voice_id_from_dict
     
 
-    def audio__text_to_speech(
+    def _text_to_speech_chunks(
         self,
         language: str,
         text: str,
@@ -52,7 +50,7 @@ class ElevenlabsApi(ProviderInterface, AudioInterface):
         speaking_rate: int,
         speaking_pitch: int,
         speaking_volume: int,
-        sampling_rate: int) -> ResponseType[TextToSpeechDataClass]:
+        sampling_rate: int) -> Tuple[str, Iterator[bytes]]:
 
         ids = ElevenlabsApi.__get_voice_id(voice_id=voice_id)
         url = f"{self.base_url}text-to-speech/{ids}"
@@ -65,23 +63,38 @@ class ElevenlabsApi(ProviderInterface, AudioInterface):
                 "similarity_boost": 0.5
             }
         }
-        response = requests.post(url, json=data, headers=self.headers)
+        # the audio is read as it's received
+        response = requests.post(url, json=data, headers=self.headers, stream=True)
         
         if response.status_code != 200:
             raise ProviderException(
                 response.text,
                 code = response.status_code
                 )
-        
-        audio_content = BytesIO(response.content)
-        audio = base64.b64encode(audio_content.read()).decode("utf-8")
 
-        audio_content.seek(0)
-        resource_url = upload_file_bytes_to_s3(audio_content, ".wav", USER_PROCESS)
+        return "wav", response.iter_content(AUDIO_CHUNK_SIZE)
 
-        return ResponseType[TextToSpeechDataClass](
-            original_response=response.content,
-            standardized_response=TextToSpeechDataClass(
-                audio=audio, voice_type=1, audio_resource_url=resource_url
-            ),
-        )
\ No newline at end of file
+    def audio__text_to_speech(
+        self,
+        language: str,
+        text: str,
+        option: str,
+        voice_id: str,
+        audio_format: str,
+        speaking_rate: int,
+        speaking_pitch: int,
+        speaking_volume: int,
+        sampling_rate: int) -> ResponseType[TextToSpeechDataClass]:
+        ext, chunks = self._text_to_speech_chunks(
+            language,
+            text,
+            option,
+            voice_id,
+            audio_format,
+            speaking_rate,
+            speaking_pitch,
+            speaking_volume,
+            sampling_rate,
+        )
+        audio = b"".join(chunks)
+        return text_to_speech_response(audio, ext, original_response=audio)
\ No newline at end of file
@@ -1,9 +1,7 @@
-import base64
 import uuid
-from io import BytesIO
 from pathlib import Path
 from time import time
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import googleapiclient.discovery
 from edenai_apis.apis.google.google_helpers import (
@@ -38,14 +36,13 @@ from edenai_apis.utils.types import (
 
 from google.cloud import speech, storage, texttospeech
 
-from edenai_apis.utils.upload_s3 import USER_PROCESS, upload_file_bytes_to_s3
+from edenai_apis.utils.tts_streaming import text_to_speech_response
 
 
 class GoogleAudioApi(AudioInterface):
-    def audio__text_to_speech(
+    def _text_to_speech_chunks(
         self,
-        language: str
-        ,
+        language: str,
         text: str,
         option: str,
         voice_id: str,
@@ -54,9 +51,7 @@ class GoogleAudioApi(AudioInterface):
         speaking_pitch: int,
         speaking_volume: int,
         sampling_rate: int,
-    ) -> ResponseType[TextToSpeechDataClass]:
-        voice_type = 1
-
+    ) -> Tuple[str, bytes]:
         client = texttospeech.TextToSpeechClient()
 
         if is_ssml(text):
@@ -92,21 +87,33 @@ class GoogleAudioApi(AudioInterface):
             }
         }
         response = handle_google_call(client.synthesize_speech, **payload)
+        # the whole audio is received at once
+        return ext, response.audio_content
 
-        audio_content = BytesIO(response.audio_content)
-
-        audio = base64.b64encode(audio_content.read()).decode("utf-8")
-
-        audio_content.seek(0)
-        resource_url = upload_file_bytes_to_s3(audio_content, f".{ext}", USER_PROCESS)
-
-        standardized_response = TextToSpeechDataClass(
-            audio=audio, voice_type=voice_type, audio_resource_url=resource_url
-        )
-        return ResponseType[TextToSpeechDataClass](
-            original_response={},
-            standardized_response=standardized_response,
+    def audio__text_to_speech(
+        self,
+        language: str,
+        text: str,
+        option: str,
+        voice_id: str,
+        audio_format: str,
+        speaking_rate: int,
+        speaking_pitch: int,
+        speaking_volume: int,
+        sampling_rate: int,
+    ) -> ResponseType[TextToSpeechDataClass]:
+        ext, audio = self._text_to_speech_chunks(
+            language,
+            text,
+            option,
+            voice_id,
+            audio_format,
+            speaking_rate,
+            speaking_pitch,
+            speaking_volume,
+            sampling_rate,
         )
+        return text_to_speech_response(audio, ext)
 
     def _create_vocabulary(self, list_vocabs: list):
         adaptation_client = speech.AdaptationClient()
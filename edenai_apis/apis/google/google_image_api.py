@@ -40,9 +40,9 @@ from edenai_apis.features.image.object_detection.object_detection_dataclass impo
     ObjectDetectionDataClass,
     ObjectItem,
 )
+from edenai_apis.utils.file_probe import get_image_dimensions
 from edenai_apis.utils.exception import ProviderException
 from edenai_apis.utils.types import ResponseType
-from PIL import Image as Img
 
 from google.cloud import vision
 from google.cloud.vision_v1.types.image_annotator import AnnotateImageResponse
@@ -131,7 +131,7 @@ class GoogleImageApi(ImageInterface):
     ) -> ResponseType[FaceDetectionDataClass]:
         with open(file, "rb") as file_:
             file_content = file_.read()
-        img_size = Img.open(file).size
+        img_size = get_image_dimensions(file)
         image = vision.Image(content=file_content)
         
         payload = {
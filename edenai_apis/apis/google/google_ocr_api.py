@@ -41,6 +41,7 @@ from edenai_apis.features.ocr.receipt_parser.receipt_parser_dataclass import (
     Taxes,
 )
 from edenai_apis.utils.conversion import convert_string_to_number
+from edenai_apis.utils.file_probe import get_image_dimensions
 from edenai_apis.utils.exception import (
     AsyncJobException,
     AsyncJobExceptionReason,
@@ -53,7 +54,6 @@ from edenai_apis.utils.types import (
     AsyncResponseType,
     ResponseType,
 )
-from PIL import Image as Img
 
 import google.auth
 
@@ -83,7 +83,7 @@ class GoogleOcrApi(OcrInterface):
 
         mimetype = mimetypes.guess_type(file)[0] or "unrecognized"
         if mimetype.startswith("image"):
-            width, height = Img.open(file).size
+            width, height = get_image_dimensions(file)
         elif mimetype == "application/pdf":
             width, height = get_pdf_width_height(file)
         else:
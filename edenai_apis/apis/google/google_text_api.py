@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Union
 
 import requests
 from edenai_apis.apis.google.google_helpers import (
@@ -14,8 +14,10 @@ from edenai_apis.features.text import (
     GenerationDataClass,
 )
 from edenai_apis.features.text.embeddings.embeddings_dataclass import (
+    CompactEmbeddingsDataClass,
     EmbeddingDataClass,
     EmbeddingsDataClass,
+    EmbeddingsOutputOptions,
 )
 from edenai_apis.features.text.entity_sentiment.entities import Entities
 from edenai_apis.features.text.entity_sentiment.entity_sentiment_dataclass import (
@@ -53,7 +55,227 @@ from google.protobuf.json_format import MessageToDict
 from edenai_apis.utils.conversion import standardized_confidence_score
 
 
+def _named_entity_recognition_response(
+    response: Dict,
+) -> ResponseType[NamedEntityRecognitionDataClass]:
+    items: Sequence[InfosNamedEntityRecognitionDataClass] = []
+
+    # Analyse response
+    # Getting name of entity, its category and its score of confidence
+    if response.get("entities") and isinstance(response["entities"], list):
+        for ent in response["entities"]:
+            if ent.get("salience"):
+                items.append(
+                    InfosNamedEntityRecognitionDataClass(
+                        entity=ent["name"],
+                        importance=ent.get("salience"),
+                        category=ent["type"],
+                        #    url=ent.get("metadata", {}).get("wikipedia_url", None),
+                    )
+                )
+
+    standardized_response = NamedEntityRecognitionDataClass(items=items)
+
+    return ResponseType[NamedEntityRecognitionDataClass](
+        original_response=response, standardized_response=standardized_response
+    )
+
+
+def _sentiment_analysis_response(
+    response: Dict,
+) -> ResponseType[SentimentAnalysisDataClass]:
+    # Create output response
+    items: Sequence[SegmentSentimentAnalysisDataClass] = []
+    for segment in response["sentences"]:
+        items.append(
+            SegmentSentimentAnalysisDataClass(
+                segment=segment["text"].get("content"),
+                sentiment=score_to_sentiment(segment["sentiment"].get("score", 0)),
+                sentiment_rate=abs(segment["sentiment"].get("score", 0)),
+            )
+        )
+    standarize = SentimentAnalysisDataClass(
+        general_sentiment=score_to_sentiment(
+            response["documentSentiment"].get("score", 0)
+        ),
+        general_sentiment_rate=abs(response["documentSentiment"].get("score", 0)),
+        items=items,
+    )
+
+    return ResponseType[SentimentAnalysisDataClass](
+        original_response=response, standardized_response=standarize
+    )
+
+
+def _syntax_analysis_response(response: Dict) -> ResponseType[SyntaxAnalysisDataClass]:
+    items: Sequence[InfosSyntaxAnalysisDataClass] = []
+
+    # Analysing response
+    # Getting syntax detected of word and its score of confidence
+    for token in response["tokens"]:
+        part_of_speech_tag = {}
+        part_of_speech_filter = {}
+        part_of_speech = token["partOfSpeech"]
+        part_of_speech_keys = list(part_of_speech.keys())
+        part_of_speech_values = list(part_of_speech.values())
+        for key, prop in enumerate(part_of_speech_keys):
+            tag_ = ""
+            if "proper" in part_of_speech_keys[key]:
+                prop = "proper_name"
+            if "UNKNOWN" not in part_of_speech_values[key]:
+                if "tag" in prop:
+                    tag_ = get_tag_name(part_of_speech_values[key])
+                    part_of_speech_tag[prop] = tag_
+                else:
+                    part_of_speech_filter[prop] = part_of_speech_values[key]
+
+        items.append(
+            InfosSyntaxAnalysisDataClass(
+                word=token["text"]["content"],
+                tag=part_of_speech_tag["tag"],
+                lemma=token["lemma"],
+                others=part_of_speech_filter,
+                importance=None,
+            )
+        )
+
+    standardized_response = SyntaxAnalysisDataClass(items=items)
+
+    return ResponseType[SyntaxAnalysisDataClass](
+        original_response=response,
+        standardized_response=standardized_response,
+    )
+
+
+def _topic_extraction_response(
+    original_response: Dict,
+) -> ResponseType[TopicExtractionDataClass]:
+    # Standardize the response
+    categories: Sequence[ExtractedTopic] = []
+    for category in original_response.get("categories", []):
+        categories.append(
+            ExtractedTopic(
+                category=category.get("name"), importance=category.get("confidence")
+            )
+        )
+    standardized_response = TopicExtractionDataClass(items=categories)
+
+    return ResponseType[TopicExtractionDataClass](
+        original_response=original_response,
+        standardized_response=standardized_response,
+    )
+
+
+def _entity_sentiment_response(
+    original_response: Dict,
+) -> ResponseType[EntitySentimentDataClass]:
+    entity_items: List[Entity] = []
+    for entity in original_response["entities"]:
+        for mention in entity["mentions"]:
+            sentiment = mention["sentiment"].get("score")
+            if sentiment is None:
+                sentiment_score = "Neutral"
+            elif sentiment > 0:
+                sentiment_score = "Positive"
+            elif sentiment < 0:
+                sentiment_score = "Negative"
+            else:
+                sentiment_score = "Neutral"
+
+            begin_offset = mention["text"].get("beginOffset")
+            end_offset = None
+            if begin_offset:
+                end_offset = mention["text"]["beginOffset"] + len(
+                    mention["text"]["content"]
+                )
+
+            std_entity = Entity(
+                text=mention["text"]["content"],
+                type=Entities.get_entity(entity["type"]),
+                sentiment=sentiment_score,
+                begin_offset=begin_offset,
+                end_offset=end_offset,
+            )
+            entity_items.append(std_entity)
+
+    return ResponseType(
+        original_response=original_response,
+        standardized_response=EntitySentimentDataClass(items=entity_items),
+    )
+
+
+def _moderation_response(original_response: Dict) -> ResponseType[ModerationDataClass]:
+    # Create output response
+    items: Sequence[TextModerationItem] = []
+    for moderation in original_response.get("moderationCategories", []) or []:
+        items.append(
+            TextModerationItem(
+                label=moderation.get("name"),
+                likelihood=standardized_confidence_score(moderation.get("confidence", 0)),
+            )
+        )
+    standardized_response: ModerationDataClass = ModerationDataClass(
+        nsfw_likelihood=ModerationDataClass.calculate_nsfw_likelihood(items),
+        items=items,
+    )
+
+    return ResponseType[ModerationDataClass](
+        original_response=original_response,
+        standardized_response=standardized_response,
+    )
+
+
+# `annotate_text` features and standardization of the subfeatures it computes at once
+_ANNOTATE_TEXT_SUBFEATURES = {
+    "named_entity_recognition": (
+        "extract_entities",
+        _named_entity_recognition_response,
+    ),
+    "sentiment_analysis": ("extract_document_sentiment", _sentiment_analysis_response),
+    "syntax_analysis": ("extract_syntax", _syntax_analysis_response),
+    "topic_extraction": ("classify_text", _topic_extraction_response),
+    "entity_sentiment": ("extract_entity_sentiment", _entity_sentiment_response),
+    "moderation": ("moderate_text", _moderation_response),
+}
+
+
 class GoogleTextApi(TextInterface):
+    # subfeatures `_text__multi` analyzes with a single request
+    _text__multi_subfeatures = frozenset(_ANNOTATE_TEXT_SUBFEATURES)
+
+    def _text__multi(
+        self, subfeatures: Sequence[str], language: str, text: str
+    ) -> Dict[str, ResponseType]:
+        """
+        Analyze the text for several subfeatures with a single `annotate_text` request,
+        the original response of each subfeature is the whole `annotate_text` response
+
+        :param subfeatures:     Subfeatures of `_text__multi_subfeatures`
+        :param language:        String that contains the language code
+        :param text:            String that contains the text to analyse
+        """
+        document = GoogleDocument(
+            content=text, type_=GoogleDocument.Type.PLAIN_TEXT, language=language
+        )
+        features = language_v1.AnnotateTextRequest.Features(
+            **{
+                _ANNOTATE_TEXT_SUBFEATURES[subfeature][0]: True
+                for subfeature in subfeatures
+            }
+        )
+        response = handle_google_call(
+            self.clients["text"].annotate_text,
+            document=document,
+            features=features,
+            encoding_type="UTF8",
+        )
+
+        original_response = MessageToDict(response._pb)
+        return {
+            subfeature: _ANNOTATE_TEXT_SUBFEATURES[subfeature][1](original_response)
+            for subfeature in subfeatures
+        }
+
     def text__named_entity_recognition(
         self, language: str, text: str
     ) -> ResponseType[NamedEntityRecognitionDataClass]:
@@ -72,31 +294,8 @@ class GoogleTextApi(TextInterface):
             "encoding_type": "UTF8"
         }
         response = handle_google_call(self.clients["text"].analyze_entities, **payload)
-        
-        # Create output response
-        # Convert response to dict
-        response = MessageToDict(response._pb)
-        items: Sequence[InfosNamedEntityRecognitionDataClass] = []
-
-        # Analyse response
-        # Getting name of entity, its category and its score of confidence
-        if response.get("entities") and isinstance(response["entities"], list):
-            for ent in response["entities"]:
-                if ent.get("salience"):
-                    items.append(
-                        InfosNamedEntityRecognitionDataClass(
-                            entity=ent["name"],
-                            importance=ent.get("salience"),
-                            category=ent["type"],
-                            #    url=ent.get("metadata", {}).get("wikipedia_url", None),
-                        )
-                    )
-
-        standardized_response = NamedEntityRecognitionDataClass(items=items)
 
-        return ResponseType[NamedEntityRecognitionDataClass](
-            original_response=response, standardized_response=standardized_response
-        )
+        return _named_entity_recognition_response(MessageToDict(response._pb))
 
     def text__sentiment_analysis(
         self, language: str, text: str
@@ -119,30 +318,8 @@ class GoogleTextApi(TextInterface):
             "encoding_type": "UTF8",
         }
         response = handle_google_call(self.clients["text"].analyze_sentiment, **payload)
-        
-        # Convert response to dict
-        response = MessageToDict(response._pb)
-        # Create output response
-        items: Sequence[SegmentSentimentAnalysisDataClass] = []
-        for segment in response["sentences"]:
-            items.append(
-                SegmentSentimentAnalysisDataClass(
-                    segment=segment["text"].get("content"),
-                    sentiment=score_to_sentiment(segment["sentiment"].get("score", 0)),
-                    sentiment_rate=abs(segment["sentiment"].get("score", 0)),
-                )
-            )
-        standarize = SentimentAnalysisDataClass(
-            general_sentiment=score_to_sentiment(
-                response["documentSentiment"].get("score", 0)
-            ),
-            general_sentiment_rate=abs(response["documentSentiment"].get("score", 0)),
-            items=items,
-        )
 
-        return ResponseType[SentimentAnalysisDataClass](
-            original_response=response, standardized_response=standarize
-        )
+        return _sentiment_analysis_response(MessageToDict(response._pb))
 
     def text__syntax_analysis(
         self, language: str, text: str
@@ -164,47 +341,8 @@ class GoogleTextApi(TextInterface):
             "encoding_type": "UTF8",
         }
         response = handle_google_call(self.clients["text"].analyze_syntax, **payload)
-        # Convert response to dict
-        response = MessageToDict(response._pb)
-
-        items: Sequence[InfosSyntaxAnalysisDataClass] = []
-
-        # Analysing response
-        # Getting syntax detected of word and its score of confidence
-        for token in response["tokens"]:
-            part_of_speech_tag = {}
-            part_of_speech_filter = {}
-            part_of_speech = token["partOfSpeech"]
-            part_of_speech_keys = list(part_of_speech.keys())
-            part_of_speech_values = list(part_of_speech.values())
-            for key, prop in enumerate(part_of_speech_keys):
-                tag_ = ""
-                if "proper" in part_of_speech_keys[key]:
-                    prop = "proper_name"
-                if "UNKNOWN" not in part_of_speech_values[key]:
-                    if "tag" in prop:
-                        tag_ = get_tag_name(part_of_speech_values[key])
-                        part_of_speech_tag[prop] = tag_
-                    else:
-                        part_of_speech_filter[prop] = part_of_speech_values[key]
-
-            items.append(
-                InfosSyntaxAnalysisDataClass(
-                    word=token["text"]["content"],
-                    tag=part_of_speech_tag["tag"],
-                    lemma=token["lemma"],
-                    others=part_of_speech_filter,
-                    importance=None,
-                )
-            )
 
-        standardized_response = SyntaxAnalysisDataClass(items=items)
-
-        result = ResponseType[SyntaxAnalysisDataClass](
-            original_response=response,
-            standardized_response=standardized_response,
-        )
-        return result
+        return _syntax_analysis_response(MessageToDict(response._pb))
 
     def text__topic_extraction(
         self, language: str, text: str
@@ -218,27 +356,8 @@ class GoogleTextApi(TextInterface):
             "document": document,
         }
         response = handle_google_call(self.clients["text"].classify_text, **payload)
-    
-        # Create output response
-        # Convert response to dict
-        original_response = MessageToDict(response._pb)
 
-        # Standardize the response
-        categories: Sequence[ExtractedTopic] = []
-        for category in original_response.get("categories", []):
-            categories.append(
-                ExtractedTopic(
-                    category=category.get("name"), importance=category.get("confidence")
-                )
-            )
-        standardized_response = TopicExtractionDataClass(items=categories)
-
-        result = ResponseType[TopicExtractionDataClass](
-            original_response=original_response,
-            standardized_response=standardized_response,
-        )
-
-        return result
+        return _topic_extraction_response(MessageToDict(response._pb))
 
     def text__generation(
         self,
@@ -335,7 +454,10 @@ class GoogleTextApi(TextInterface):
     def text__embeddings(
         self, 
         texts: List[str],
-        model: str) -> ResponseType[EmbeddingsDataClass]:
+        model: str,
+        output_options: Optional[Dict] = None,
+    ) -> ResponseType[Union[EmbeddingsDataClass, CompactEmbeddingsDataClass]]:
+        options = EmbeddingsOutputOptions.from_output_options(output_options)
         model = model.split("__")
         url_subdomain = "us-central1-aiplatform"
         location = "us-central1"
@@ -357,6 +479,21 @@ class GoogleTextApi(TextInterface):
                 code = response.status_code
             )
 
+        if options is not None:
+            predictions = original_response["predictions"]
+            vectors = [
+                prediction["embeddings"]["values"] for prediction in predictions
+            ]
+            if not options.include_original_vectors:
+                for prediction in predictions:
+                    prediction["embeddings"].pop("values", None)
+            return ResponseType[CompactEmbeddingsDataClass].model_construct(
+                original_response=original_response,
+                standardized_response=CompactEmbeddingsDataClass.from_vectors(
+                    vectors, options
+                ),
+            )
+
         items: Sequence[EmbeddingsDataClass] = []
         for prediction in original_response["predictions"]:
             embedding = prediction["embeddings"]["values"]
@@ -419,41 +556,8 @@ class GoogleTextApi(TextInterface):
             "request": {"document": document, "encoding_type": encoding_type}
         }
         response = handle_google_call(client.analyze_entity_sentiment, **payload)
-        
-        original_response = MessageToDict(response._pb)
 
-        entity_items: List[Entity] = []
-        for entity in original_response['entities']:
-            for mention in entity['mentions']:
-
-                sentiment = mention['sentiment'].get("score")
-                if sentiment is None:
-                    sentiment_score = 'Neutral'
-                elif sentiment > 0:
-                    sentiment_score = 'Positive'
-                elif sentiment < 0:
-                    sentiment_score = 'Negative'
-                else:
-                    sentiment_score = 'Neutral'
-
-                begin_offset = mention['text'].get("beginOffset")
-                end_offset = None
-                if begin_offset:
-                    end_offset = mention["text"]["beginOffset"] + len(mention["text"]["content"])
-
-                std_entity = Entity(
-                    text=mention['text']['content'],
-                    type=Entities.get_entity(entity['type']),
-                    sentiment=sentiment_score,
-                    begin_offset=begin_offset,
-                    end_offset=end_offset
-                )
-                entity_items.append(std_entity)
-
-        return ResponseType(
-            original_response=original_response,
-            standardized_response=EntitySentimentDataClass(items=entity_items),
-        )
+        return _entity_sentiment_response(MessageToDict(response._pb))
 
     def text__moderation(
         self, language: str, text: str
@@ -476,26 +580,5 @@ class GoogleTextApi(TextInterface):
             "document": document
         }
         response = handle_google_call(client.moderate_text, **payload)
-        
-        # Convert response to dict
-        original_response = MessageToDict(response._pb)
-        
-        # Create output response
-        items: Sequence[TextModerationItem] = []
-        for moderation in original_response.get("moderationCategories", []) or []:
-            items.append(
-                TextModerationItem(
-                    label= moderation.get("name"),
-                    likelihood= standardized_confidence_score(moderation.get("confidence", 0))
-                )
-            )
-        standardized_response: ModerationDataClass = ModerationDataClass(
-            nsfw_likelihood=ModerationDataClass.calculate_nsfw_likelihood(
-                items
-            ),
-            items=items
-        ) 
-
-        return ResponseType[ModerationDataClass](
-            original_response=original_response, standardized_response=standardized_response
-        )
+
+        return _moderation_response(MessageToDict(response._pb))
@@ -0,0 +1,127 @@
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .mt_models_huggingface import models
+
+# translation models families, by order of preference for a language pair
+TRANSLATION_MODEL_FAMILIES = (
+    "Helsinki-NLP/opus-mt",
+    "Helsinki-NLP/opus-mt-tc-big",
+    "Helsinki-NLP/opus-tatoeba",
+)
+WARMUP_INTERVAL = 300  # seconds, hosted models are unloaded after a few idle minutes
+WARMUP_INPUT = "Hello"
+
+LanguagePair = Tuple[str, str]
+
+
+def _translation_models(model_names: Sequence[str]) -> Dict[LanguagePair, str]:
+    """Model of each (source, target) language pair, from the preferred family"""
+    pair_models: Dict[LanguagePair, str] = {}
+    for family in reversed(TRANSLATION_MODEL_FAMILIES):
+        pattern = re.compile(rf"{re.escape(family)}-([a-z]+)-([a-z]+)")
+        for model_name in model_names:
+            match = pattern.fullmatch(model_name)
+            if match:
+                pair_models[(match.group(1), match.group(2))] = model_name
+    return pair_models
+
+
+TRANSLATION_MODELS = _translation_models(models)
+
+_pairs_lock = threading.Lock()
+_pairs_counts: Counter = Counter()
+
+
+def translation_model(source_language: str, target_language: str) -> Optional[str]:
+    """Name of the model translating `source_language` to `target_language`"""
+    return TRANSLATION_MODELS.get((source_language, target_language))
+
+
+def record_translation_pair(source_language: str, target_language: str) -> None:
+    with _pairs_lock:
+        _pairs_counts[(source_language, target_language)] += 1
+
+
+def hottest_translation_pairs(top: int) -> List[LanguagePair]:
+    """Most translated language pairs since the start of the process"""
+    with _pairs_lock:
+        return [pair for pair, _ in _pairs_counts.most_common(top)]
+
+
+class TranslationWarmup:
+    """Keep the models of the hottest (or given) language pairs loaded, by translating
+    a short text with each of them every `interval` seconds in a background thread
+
+    Args:
+        api_keys (dict): user's api keys for huggingface
+        pairs (list, optional): language pairs to warm up, else the `top` most
+            translated pairs
+        top (int): number of language pairs to warm up
+        interval (float): seconds between two warm ups
+    """
+
+    def __init__(
+        self,
+        api_keys: Dict = {},
+        pairs: Optional[Sequence[LanguagePair]] = None,
+        top: int = 5,
+        interval: float = WARMUP_INTERVAL,
+    ) -> None:
+        self.api_keys = api_keys
+        self.pairs = pairs
+        self.top = top
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(
+            target=self._run, name="edenai_huggingface_warmup", daemon=True
+        )
+
+    def start(self) -> "TranslationWarmup":
+        self._worker.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        if self._worker.is_alive():
+            self._worker.join(timeout)
+
+    def warm_up(self) -> List[str]:
+        """Call the models of the language pairs once, returns the models called"""
+        # the api module imports this one
+        from .huggingface_api import HuggingfaceApi
+
+        api = HuggingfaceApi(self.api_keys)
+        pairs = self.pairs
+        if pairs is None:
+            pairs = hottest_translation_pairs(self.top)
+        warmed = []
+        for pair in pairs:
+            model = translation_model(*pair)
+            if model is None:
+                continue
+            try:
+                api._post(f"{api.base_url}/{model}", WARMUP_INPUT)
+            except Exception:
+                # warm up is best effort, the next translation will wait for the model
+                continue
+            warmed.append(model)
+        return warmed
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.warm_up()
+            self._stopped.wait(self.interval)
+
+
+def start_translation_warmup(
+    api_keys: Dict = {},
+    pairs: Optional[Sequence[LanguagePair]] = None,
+    top: int = 5,
+    interval: float = WARMUP_INTERVAL,
+) -> TranslationWarmup:
+    """Start warming up the translation models in the background, see
+    `TranslationWarmup`"""
+    return TranslationWarmup(api_keys, pairs, top, interval).start()
@@ -1,4 +1,4 @@
-from asyncio import sleep
+from time import monotonic, sleep
 from typing import Dict, List, Optional
 import requests
 
@@ -7,14 +7,26 @@ from edenai_apis.features.text import SummarizeDataClass, QuestionAnswerDataClas
 from edenai_apis.features.translation import AutomaticTranslationDataClass
 from edenai_apis.loaders.loaders import load_provider
 from edenai_apis.loaders.data_loader import ProviderDataEnum
-from edenai_apis.utils.conversion import concatenate_params_in_url
 from edenai_apis.utils.exception import ProviderException
 from edenai_apis.utils.types import ResponseType
 
+from .helpers import record_translation_pair, translation_model
+
+
+def _model_loading(res: requests.Response) -> bool:
+    """The model is loading (503 response with its `estimated_time`)"""
+    try:
+        response = res.json()
+    except ValueError:
+        return False
+    return isinstance(response, dict) and "estimated_time" in response
+
 
 class HuggingfaceApi(ProviderInterface, TextInterface, TranslationInterface):
     provider_name = "huggingface"
     base_url = "https://api-inference.huggingface.co/models"
+    # seconds waited at most for a model to load
+    model_loading_timeout = 60
 
     def __init__(self, api_keys: Dict = {}) -> None:
         self.api_key = load_provider(
@@ -28,12 +40,28 @@ class HuggingfaceApi(ProviderInterface, TextInterface, TranslationInterface):
 
     def _post(self, url: str, inputs: dict):
         res = requests.post(url, headers=self.headers, json={"inputs": inputs})
-        if res.status_code >= 500:
+        if res.status_code >= 500 and not _model_loading(res):
             raise ProviderException(
                 message="Internal Server Error", code=res.status_code
             )
         return (res.status_code, res.json())
 
+    def _post_model(self, url: str, inputs: dict):
+        """Post to a model, waiting for it to load (`estimated_time` of the loading
+        responses) up to `model_loading_timeout` seconds"""
+        deadline = monotonic() + self.model_loading_timeout
+        while True:
+            status_code, response = self._post(url, inputs)
+            if not (isinstance(response, dict) and "estimated_time" in response):
+                return (status_code, response)
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                raise ProviderException(
+                    message=response.get("error") or "Model is loading",
+                    code=status_code,
+                )
+            sleep(min(max(float(response["estimated_time"]), 1.0), remaining))
+
     def translation__automatic_translation(
         self, source_language: str, target_language: str, text: str
     ) -> ResponseType[AutomaticTranslationDataClass]:
@@ -44,41 +72,15 @@ class HuggingfaceApi(ProviderInterface, TextInterface, TranslationInterface):
         :return:            String that contains output result
         """
 
-        model_types = [
-            "Helsinki-NLP/opus-mt",
-            "Helsinki-NLP/opus-mt-tc-big",
-            "Helsinki-NLP/opus-tatoeba",
-        ]
-        for model_type in model_types:
-            url = concatenate_params_in_url(
-                url=f"{self.base_url}/{model_type}",
-                params=[source_language, target_language],
-                sep="-",
+        model = translation_model(source_language, target_language)
+        if model is None:
+            raise ProviderException(
+                f"No model translates {source_language} to {target_language}",
+                code=400,
             )
-            # url = format_string_url_language(
-            #     f"{self.base_url}/{model_type}",
-            #     source_language,
-            #     "-",
-            #     self.provider_name,
-            #     False,
-            # )
-            # url = format_string_url_language(
-            #     url, target_language, "-", self.provider_name, False
-            # )
-
-            status_code, response = self._post(url, text)
-
-            # If the model does not handle the languages, check another type of models
-            if "error" in response:
-                if "does not exist" in response["error"]:
-                    continue
-
-            # Wait for model to load and _post again
-            if "estimated_time" in response:
-                sleep(int(response["estimated_time"]) + 1)
-                status_code, response = self._post(url, text)
-
-            break
+        record_translation_pair(source_language, target_language)
+
+        status_code, response = self._post_model(f"{self.base_url}/{model}", text)
 
         if isinstance(response, dict) and response.get("error"):
             raise ProviderException(response["error"], code = status_code)
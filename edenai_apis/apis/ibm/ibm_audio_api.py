@@ -1,6 +1,5 @@
-import base64
-from io import BufferedReader, BytesIO
-from typing import List, Optional
+from io import BufferedReader
+from typing import List, Optional, Tuple
 from edenai_apis.apis.ibm.ibm_helpers import (
     generate_right_ssml_text,
     get_right_audio_support_and_sampling_rate,
@@ -27,13 +26,13 @@ from edenai_apis.utils.types import (
     AsyncResponseType,
     ResponseType,
 )
-from edenai_apis.utils.upload_s3 import USER_PROCESS, upload_file_bytes_to_s3
+from edenai_apis.utils.tts_streaming import text_to_speech_response
 
 from watson_developer_cloud.watson_service import WatsonApiException
 
 
 class IbmAudioApi(AudioInterface):
-    def audio__text_to_speech(
+    def _text_to_speech_chunks(
         self,
         language: str,
         text: str,
@@ -44,7 +43,7 @@ class IbmAudioApi(AudioInterface):
         speaking_pitch: int,
         speaking_volume: int,
         sampling_rate: int,
-    ) -> ResponseType[TextToSpeechDataClass]:
+    ) -> Tuple[str, bytes]:
         """
         :param language:    String that contains language name 'fr-FR', 'en-US', 'es-EN'
         :param text:        String that contains text to transform
@@ -61,21 +60,33 @@ class IbmAudioApi(AudioInterface):
 
         request = handle_ibm_call(self.clients["texttospeech"].synthesize, **params)
         response = handle_ibm_call(request.get_result)
+        # the whole audio is received at once
+        return ext, response.content
 
-        audio_content = BytesIO(response.content)
-        audio = base64.b64encode(audio_content.read()).decode("utf-8")
-        voice_type = 1
-
-        audio_content.seek(0)
-        resource_url = upload_file_bytes_to_s3(audio_content, f".{ext}", USER_PROCESS)
-
-        standardized_response = TextToSpeechDataClass(
-            audio=audio, voice_type=voice_type, audio_resource_url=resource_url
-        )
-
-        return ResponseType[TextToSpeechDataClass](
-            original_response={}, standardized_response=standardized_response
+    def audio__text_to_speech(
+        self,
+        language: str,
+        text: str,
+        option: str,
+        voice_id: str,
+        audio_format: str,
+        speaking_rate: int,
+        speaking_pitch: int,
+        speaking_volume: int,
+        sampling_rate: int,
+    ) -> ResponseType[TextToSpeechDataClass]:
+        ext, audio = self._text_to_speech_chunks(
+            language,
+            text,
+            option,
+            voice_id,
+            audio_format,
+            speaking_rate,
+            speaking_pitch,
+            speaking_volume,
+            sampling_rate,
         )
+        return text_to_speech_response(audio, ext)
 
     def audio__speech_to_text_async__launch_job(
         self,
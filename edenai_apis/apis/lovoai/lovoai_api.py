@@ -1,7 +1,6 @@
 import base64
-from io import BytesIO
 import json
-from typing import Dict
+from typing import Dict, Iterator, Tuple
 import requests
 from edenai_apis.features.audio.text_to_speech_async.text_to_speech_async_dataclass import TextToSpeechAsyncDataClass
 from edenai_apis.features.audio.text_to_speech.text_to_speech_dataclass import (
@@ -12,7 +11,7 @@ from edenai_apis.features.audio import AudioInterface
 from edenai_apis.loaders.loaders import load_provider, ProviderDataEnum
 from edenai_apis.utils.types import AsyncBaseResponseType, AsyncLaunchJobResponseType, ResponseType, AsyncResponseType, AsyncPendingResponseType
 from edenai_apis.utils.exception import ProviderException, AsyncJobException, AsyncJobExceptionReason
-from edenai_apis.utils.upload_s3 import USER_PROCESS, upload_file_bytes_to_s3
+from edenai_apis.utils.tts_streaming import AUDIO_CHUNK_SIZE, text_to_speech_response
 from .config import voice_ids
 
 class LovoaiApi(ProviderInterface, AudioInterface):
@@ -38,7 +37,7 @@ class LovoaiApi(ProviderInterface, AudioInterface):
         speaking_rate = 10 * round(speaking_rate / 10)
         return speaking_rate / 200 + 1
 
-    def audio__text_to_speech(
+    def _text_to_speech_chunks(
         self,
         language: str,
         text: str,
@@ -49,7 +48,7 @@ class LovoaiApi(ProviderInterface, AudioInterface):
         speaking_pitch: int,
         speaking_volume: int,
         sampling_rate: int,
-    ) -> ResponseType[TextToSpeechDataClass]:
+    ) -> Tuple[str, Iterator[bytes]]:
         data = json.dumps(
             {
                 "text": text,
@@ -58,8 +57,9 @@ class LovoaiApi(ProviderInterface, AudioInterface):
             }
         )
 
+        # the audio is read as it's received
         response = requests.post(
-            f"{self.url}v1/conversion", headers=self.headers, data=data
+            f"{self.url}v1/conversion", headers=self.headers, data=data, stream=True
         )
 
         if response.status_code != 200:
@@ -71,18 +71,32 @@ class LovoaiApi(ProviderInterface, AudioInterface):
             except json.JSONDecodeError:
                 raise ProviderException("Internal Server Error", code = 500)
 
-        audio_content = BytesIO(response.content)
-        audio = base64.b64encode(audio_content.read()).decode("utf-8")
+        return "wav", response.iter_content(AUDIO_CHUNK_SIZE)
 
-        audio_content.seek(0)
-        resource_url = upload_file_bytes_to_s3(audio_content, ".wav", USER_PROCESS)
-
-        return ResponseType[TextToSpeechDataClass](
-            original_response={},
-            standardized_response=TextToSpeechDataClass(
-                audio=audio, voice_type=1, audio_resource_url=resource_url
-            ),
+    def audio__text_to_speech(
+        self,
+        language: str,
+        text: str,
+        option: str,
+        voice_id: str,
+        audio_format: str,
+        speaking_rate: int,
+        speaking_pitch: int,
+        speaking_volume: int,
+        sampling_rate: int,
+    ) -> ResponseType[TextToSpeechDataClass]:
+        ext, chunks = self._text_to_speech_chunks(
+            language,
+            text,
+            option,
+            voice_id,
+            audio_format,
+            speaking_rate,
+            speaking_pitch,
+            speaking_volume,
+            sampling_rate,
         )
+        return text_to_speech_response(chunks, ext)
 
     def audio__text_to_speech_async__launch_job(
         self,
@@ -1,8 +1,6 @@
-import base64
 import json
-from io import BufferedReader, BytesIO
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import azure.cognitiveservices.speech as speechsdk
 import requests
@@ -35,17 +33,14 @@ from edenai_apis.utils.types import (
     AsyncResponseType,
     ResponseType,
 )
-from edenai_apis.utils.upload_s3 import (
-    USER_PROCESS,
-    upload_file_bytes_to_s3,
-    upload_file_to_s3,
-)
+from edenai_apis.utils.tts_streaming import text_to_speech_response
+from edenai_apis.utils.upload_s3 import upload_file_to_s3
 
 from .config import audio_voice_ids
 
 
 class MicrosoftAudioApi(AudioInterface):
-    def audio__text_to_speech(
+    def _text_to_speech_chunks(
         self,
         language: str,
         text: str,
@@ -56,7 +51,7 @@ class MicrosoftAudioApi(AudioInterface):
         speaking_pitch: int,
         speaking_volume: int,
         sampling_rate: int,
-    ) -> ResponseType[TextToSpeechDataClass]:
+    ) -> Tuple[str, bytes]:
         speech_config = speechsdk.SpeechConfig(
             subscription=self.api_settings["speech"]["subscription_key"],
             region=self.api_settings["speech"]["service_region"],
@@ -87,20 +82,33 @@ class MicrosoftAudioApi(AudioInterface):
             cancellation_details = response.cancellation_details
             raise ProviderException(str(cancellation_details.error_details))
 
-        audio_content = BytesIO(response.audio_data)
-        audio = base64.b64encode(audio_content.read()).decode("utf-8")
-        voice_type = 1
+        # the whole audio is received at once
+        return ext, response.audio_data
 
-        audio_content.seek(0)
-        resource_url = upload_file_bytes_to_s3(audio_content, f".{ext}", USER_PROCESS)
-
-        standardized_response = TextToSpeechDataClass(
-            audio=audio, voice_type=voice_type, audio_resource_url=resource_url
-        )
-
-        return ResponseType[TextToSpeechDataClass](
-            original_response={}, standardized_response=standardized_response
+    def audio__text_to_speech(
+        self,
+        language: str,
+        text: str,
+        option: str,
+        voice_id: str,
+        audio_format: str,
+        speaking_rate: int,
+        speaking_pitch: int,
+        speaking_volume: int,
+        sampling_rate: int,
+    ) -> ResponseType[TextToSpeechDataClass]:
+        ext, audio = self._text_to_speech_chunks(
+            language,
+            text,
+            option,
+            voice_id,
+            audio_format,
+            speaking_rate,
+            speaking_pitch,
+            speaking_volume,
+            sampling_rate,
         )
+        return text_to_speech_response(audio, ext)
 
     def audio__speech_to_text_async__launch_job(
         self,
@@ -42,9 +42,9 @@ from edenai_apis.features.image.face_recognition.list_faces.face_recognition_lis
 )
 from edenai_apis.features.image.image_interface import ImageInterface
 from edenai_apis.utils.conversion import standardized_confidence_score
+from edenai_apis.utils.file_probe import get_image_dimensions
 from edenai_apis.utils.exception import ProviderException
 from edenai_apis.utils.types import ResponseType
-from PIL import Image as Img
 
 
 class MicrosoftImageApi(ImageInterface):
@@ -149,10 +149,8 @@ class MicrosoftImageApi(ImageInterface):
     def image__face_detection(
         self, file: str, file_url: str = ""
     ) -> ResponseType[FaceDetectionDataClass]:
-        file_ = open(file, "rb")
-        file_content = file_.read()
         # Getting size of image
-        img_size = Img.open(file).size
+        img_size = get_image_dimensions(file)
 
         # Create params for returning face attribute
         params = {
@@ -164,13 +162,14 @@ class MicrosoftImageApi(ImageInterface):
                 "hair,makeup,occlusion,accessories,blur,exposure,noise"
             ),
         }
-        # Getting response of API
-        request = requests.post(
-            f"{self.url['face']}/detect",
-            params=params,
-            headers=self.headers["face"],
-            data=file_content,
-        )
+        # Getting response of API, the file is streamed from disk
+        with open(file, "rb") as file_:
+            request = requests.post(
+                f"{self.url['face']}/detect",
+                params=params,
+                headers=self.headers["face"],
+                data=file_,
+            )
         response = request.json()
 
         # handle error
@@ -236,15 +235,13 @@ class MicrosoftImageApi(ImageInterface):
     def image__landmark_detection(
         self, file: str, file_url: str = ""
     ) -> ResponseType[LandmarkDetectionDataClass]:
-        with open(file, "rb") as file_:
-            file_content = file_.read()
-
         # Getting response of API
-        response = requests.post(
-            f"{self.url['vision']}analyze?details=Landmarks",
-            headers=self.headers["vision"],
-            data=file_content,
-        ).json()
+        with open(file, "rb") as file_:
+            response = requests.post(
+                f"{self.url['vision']}analyze?details=Landmarks",
+                headers=self.headers["vision"],
+                data=file_,
+            ).json()
         items: Sequence[LandmarkItem] = []
         for key in response.get("categories", []):
             for landmark in key.get("detail", {}).get("landmarks", []):
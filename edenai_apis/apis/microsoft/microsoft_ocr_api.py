@@ -38,6 +38,7 @@ from edenai_apis.features.ocr.receipt_parser.receipt_parser_dataclass import (
     MerchantInformation,
 )
 from edenai_apis.utils.conversion import add_query_param_in_url
+from edenai_apis.utils.file_probe import get_image_dimensions
 from edenai_apis.utils.exception import (
     AsyncJobException,
     AsyncJobExceptionReason,
@@ -50,7 +51,6 @@ from edenai_apis.utils.types import (
     AsyncResponseType,
     ResponseType,
 )
-from PIL import Image as Img
 
 
 class MicrosoftOcrApi(OcrInterface):
@@ -60,16 +60,15 @@ class MicrosoftOcrApi(OcrInterface):
         language: str,
         file_url: str = "",
     ) -> ResponseType[OcrDataClass]:
-        with open(file, "rb") as file_:
-            file_content = file_.read()
-
         url = f"{self.api_settings['vision']['url']}/ocr?detectOrientation=true"
 
-        request = requests.post(
-            url=add_query_param_in_url(url, {"language": language}),
-            headers=self.headers["vision"],
-            data=file_content,
-        )
+        # the file is streamed from disk
+        with open(file, "rb") as file_:
+            request = requests.post(
+                url=add_query_param_in_url(url, {"language": language}),
+                headers=self.headers["vision"],
+                data=file_,
+            )
         response = request.json()
 
         final_text = ""
@@ -78,7 +77,7 @@ class MicrosoftOcrApi(OcrInterface):
             raise ProviderException(response["error"]["message"], request.status_code)
 
         # Get width and hight
-        width, height = Img.open(file).size
+        width, height = get_image_dimensions(file)
 
         boxes: Sequence[Bounding_box] = []
         # Get region of text
@@ -347,24 +346,23 @@ class MicrosoftOcrApi(OcrInterface):
     def ocr__ocr_tables_async__launch_job(
         self, file: str, file_type: str, language: str, file_url: str = ""
     ) -> AsyncLaunchJobResponseType:
-        with open(file, "rb") as file_:
-            file_content = file_.read()
         url = (
             f"{self.api_settings['form_recognizer']['url']}formrecognizer/documentModels/"
             f"prebuilt-layout:analyze?api-version=2022-08-31"
         )
         url = add_query_param_in_url(url, {"locale": language})
 
-        response = requests.post(
-            url,
-            headers={
-                "Content-Type": "application/octet-stream",
-                "Ocp-Apim-Subscription-Key": self.api_settings["form_recognizer"][
-                    "subscription_key"
-                ],
-            },
-            data=file_content,
-        )
+        with open(file, "rb") as file_:
+            response = requests.post(
+                url,
+                headers={
+                    "Content-Type": "application/octet-stream",
+                    "Ocp-Apim-Subscription-Key": self.api_settings["form_recognizer"][
+                        "subscription_key"
+                    ],
+                },
+                data=file_,
+            )
 
         if response.status_code != 202:
             error = response.json()["error"]["innererror"]["message"]
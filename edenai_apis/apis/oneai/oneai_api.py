@@ -275,12 +275,12 @@ class OneaiApi(
             "multilingual": True,
         }
 
-        file_ = open(file, "rb")
-        response = requests.post(
-            url=f"{self.url}/async/file?pipeline={json.dumps(data)}",
-            headers=self.header,
-            data=file_.read(),
-        )
+        with open(file, "rb") as file_:
+            response = requests.post(
+                url=f"{self.url}/async/file?pipeline={json.dumps(data)}",
+                headers=self.header,
+                data=file_,
+            )
         original_response = response.json()
 
         if response.status_code != 200:
@@ -1,6 +1,5 @@
 import requests
 import base64
-from io import BytesIO
 from typing import Sequence, Literal
 from edenai_apis.features.image.generation import (
     GenerationDataClass as ImageGenerationDataClass,
@@ -11,7 +10,7 @@ from edenai_apis.features import ImageInterface
 from .helpers import (
     check_openai_errors,
 )
-from edenai_apis.utils.upload_s3 import USER_PROCESS, upload_file_bytes_to_s3
+from edenai_apis.utils.upload_s3 import USER_PROCESS, upload_files_bytes_to_s3
 
 
 class OpenaiImageApi(ImageInterface):
@@ -36,18 +35,19 @@ class OpenaiImageApi(ImageInterface):
         # Handle errors
         check_openai_errors(original_response, response.status_code)
 
-        generations: Sequence[GeneratedImageDataClass] = []
-        for generated_image in original_response.get("data"):
-            image_b64 = generated_image.get("b64_json")
-
-            image_data = image_b64.encode()
-            image_content = BytesIO(base64.b64decode(image_data))
-            resource_url = upload_file_bytes_to_s3(image_content, ".png", USER_PROCESS)
-            generations.append(
-                GeneratedImageDataClass(
-                    image=image_b64, image_resource_url=resource_url
-                )
-            )
+        images_b64 = [
+            generated_image.get("b64_json")
+            for generated_image in original_response.get("data")
+        ]
+        # images are uploaded concurrently
+        resource_urls = upload_files_bytes_to_s3(
+            [(base64.b64decode(image_b64.encode()), ".png") for image_b64 in images_b64],
+            USER_PROCESS,
+        )
+        generations: Sequence[GeneratedImageDataClass] = [
+            GeneratedImageDataClass(image=image_b64, image_resource_url=resource_url)
+            for image_b64, resource_url in zip(images_b64, resource_urls)
+        ]
 
         return ResponseType[ImageGenerationDataClass](
             original_response=original_response,
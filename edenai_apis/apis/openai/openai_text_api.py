@@ -1,5 +1,5 @@
 from pprint import pprint
-from typing import List, Literal, Optional, Sequence, Dict
+from typing import List, Literal, Optional, Sequence, Dict, Union
 import requests
 import numpy as np
 import json
@@ -51,7 +51,12 @@ from edenai_apis.features.text.prompt_optimization import (
     PromptDataClass,
 )
 from edenai_apis.features.text.moderation import ModerationDataClass, TextModerationItem
-from edenai_apis.features.text.embeddings import EmbeddingDataClass, EmbeddingsDataClass
+from edenai_apis.features.text.embeddings import (
+    CompactEmbeddingsDataClass,
+    EmbeddingDataClass,
+    EmbeddingsDataClass,
+    EmbeddingsOutputOptions,
+)
 from edenai_apis.features.text.chat import ChatDataClass, ChatMessageDataClass
 from .helpers import (
     construct_ner_instruction,
@@ -682,7 +687,10 @@ class OpenaiTextApi(TextInterface):
     def text__embeddings(
         self, 
         texts: List[str],
-        model: str) -> ResponseType[EmbeddingsDataClass]:
+        model: str,
+        output_options: Optional[Dict] = None,
+    ) -> ResponseType[Union[EmbeddingsDataClass, CompactEmbeddingsDataClass]]:
+        options = EmbeddingsOutputOptions.from_output_options(output_options)
         url = "https://api.openai.com/v1/embeddings"
         model = model.split("__")
         if len(texts) == 1:
@@ -705,9 +713,22 @@ class OpenaiTextApi(TextInterface):
 
         check_openai_errors(original_response, response.status_code)
 
-        items: Sequence[EmbeddingsDataClass] = []
         embeddings = original_response["data"]
 
+        if options is not None:
+            vectors = [embedding["embedding"] for embedding in embeddings]
+            if not options.include_original_vectors:
+                for embedding in embeddings:
+                    embedding.pop("embedding", None)
+            return ResponseType[CompactEmbeddingsDataClass].model_construct(
+                original_response=original_response,
+                standardized_response=CompactEmbeddingsDataClass.from_vectors(
+                    vectors, options
+                ),
+            )
+
+        items: Sequence[EmbeddingsDataClass] = []
+
         for embedding in embeddings:
             items.append(EmbeddingDataClass(embedding=embedding["embedding"]))
 
@@ -1,7 +1,6 @@
 from io import BufferedReader
 import json
 from typing import Dict
-from PIL import Image as Img
 import requests
 
 from edenai_apis.features import ProviderInterface, ImageInterface
@@ -27,6 +26,7 @@ from edenai_apis.features.image.face_detection.face_detection_dataclass import (
 from edenai_apis.loaders.data_loader import ProviderDataEnum
 from edenai_apis.loaders.loaders import load_provider
 from edenai_apis.utils.conversion import standardized_confidence_score_picpurify
+from edenai_apis.utils.file_probe import get_image_dimensions
 from edenai_apis.utils.exception import ProviderException
 from edenai_apis.utils.types import ResponseType
 
@@ -62,7 +62,7 @@ class PicpurifyApi(ProviderInterface, ImageInterface):
             )
 
         # Std response
-        img_size = Img.open(file).size
+        img_size = get_image_dimensions(file)
         width, height = img_size
         face_detection = original_response["face_detection"]["results"]
         faces = []
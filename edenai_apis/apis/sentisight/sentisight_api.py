@@ -26,6 +26,7 @@ from edenai_apis.features.ocr import OcrDataClass, Bounding_box
 from edenai_apis.loaders.data_loader import ProviderDataEnum
 from edenai_apis.loaders.loaders import load_provider
 from edenai_apis.utils.conversion import add_query_param_in_url
+from edenai_apis.utils.file_probe import get_image_dimensions
 from edenai_apis.utils.exception import ProviderException, LanguageException
 from edenai_apis.utils.types import ResponseType, ResponseSuccess
 from .sentisight_helpers import (
@@ -71,7 +72,7 @@ class SentiSightApi(ProviderInterface, OcrInterface, ImageInterface):
         if response.status_code != 200:
             raise ProviderException(response.text, code= response.status_code)
         response = response.json()
-        width, height = Img.open(file).size
+        width, height = get_image_dimensions(file)
         # response["width"], response["height"] = Img.open(file).size
 
         bounding_boxes: Sequence[Bounding_box] = []
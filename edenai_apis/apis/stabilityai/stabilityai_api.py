@@ -1,5 +1,4 @@
 import base64
-from io import BytesIO
 import json
 import requests
 from typing import Dict, Sequence, Literal
@@ -12,7 +11,7 @@ from edenai_apis.features.image.generation import (
     GenerationDataClass,
     GeneratedImageDataClass,
 )
-from edenai_apis.utils.upload_s3 import USER_PROCESS, upload_file_bytes_to_s3
+from edenai_apis.utils.upload_s3 import USER_PROCESS, upload_files_bytes_to_s3
 
 
 class StabilityAIApi(ProviderInterface, ImageInterface):
@@ -63,18 +62,19 @@ class StabilityAIApi(ProviderInterface, ImageInterface):
                 code = response.status_code
             )
 
-        generations: Sequence[GeneratedImageDataClass] = []
-        for generated_image in original_response.get("artifacts"):
-            image_b64 = generated_image.get("base64")
-
-            image_data = image_b64.encode()
-            image_content = BytesIO(base64.b64decode(image_data))
-            resource_url = upload_file_bytes_to_s3(image_content, ".png", USER_PROCESS)
-            generations.append(
-                GeneratedImageDataClass(
-                    image=image_b64, image_resource_url=resource_url
-                )
-            )
+        images_b64 = [
+            generated_image.get("base64")
+            for generated_image in original_response.get("artifacts")
+        ]
+        # images are uploaded concurrently
+        resource_urls = upload_files_bytes_to_s3(
+            [(base64.b64decode(image_b64.encode()), ".png") for image_b64 in images_b64],
+            USER_PROCESS,
+        )
+        generations: Sequence[GeneratedImageDataClass] = [
+            GeneratedImageDataClass(image=image_b64, image_resource_url=resource_url)
+            for image_b64, resource_url in zip(images_b64, resource_urls)
+        ]
 
         return ResponseType[GenerationDataClass](
             original_response=original_response,
@@ -2,8 +2,8 @@ import mimetypes
 from typing import Dict
 import os
 
+from edenai_apis.utils.file_probe import get_audio_info
 from edenai_apis.utils.files import FileInfo, FileWrapper
-from pydub.utils import mediainfo
 
 
 feature_path = os.path.dirname(os.path.dirname(__file__))
@@ -13,12 +13,13 @@ data_path = os.path.join(feature_path, "data")
 audio_path = f"{data_path}/conversation.mp3"
 
 mime_type = mimetypes.guess_type(audio_path)[0]
+audio_info = get_audio_info(audio_path)
 file_info = FileInfo(
     os.stat(audio_path).st_size,
     mime_type,
     [extension[1:] for extension in mimetypes.guess_all_extensions(mime_type)],
-    mediainfo(audio_path).get("sample_rate", "44100"),
-    mediainfo(audio_path).get("channels", "1"),
+    str(audio_info.sample_rate),
+    str(audio_info.channels),
 )
 file_wrapper = FileWrapper(audio_path, "", file_info)
 
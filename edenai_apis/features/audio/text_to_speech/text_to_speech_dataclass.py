@@ -1,9 +1,10 @@
-from typing import Dict
+from typing import Dict, Optional
 from pydantic import BaseModel, StrictStr
 
 
 class TextToSpeechDataClass(BaseModel):
-    audio: StrictStr
+    # base64 audio, optional for streamed audio (see `utils.tts_streaming`)
+    audio: Optional[StrictStr] = None
     voice_type: int
     audio_resource_url: StrictStr
 
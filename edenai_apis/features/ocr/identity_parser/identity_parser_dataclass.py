@@ -3,7 +3,10 @@ from dateutil import parser
 from enum import Enum
 import json
 import os
-from typing import Any, List, Optional, Sequence, Union
+import unicodedata
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
 from pydantic import (
     BaseModel,
@@ -47,27 +50,63 @@ class InfoCountry(Enum):
     ALPHA3 = "alpha3"
 
 
-def get_info_country(key: InfoCountry, value: StrictStr) -> Optional[Country]:
-    feature_path = os.path.dirname(os.path.dirname(__file__))
+COUNTRIES_PATH = os.path.join(os.path.dirname(__file__), "countries.json")
+COUNTRY_ALIASES_PATH = os.path.join(os.path.dirname(__file__), "country_aliases.json")
 
+
+def _normalize_country(value: str) -> str:
+    """casefold, remove accents, punctuation & spaces: `U.S.A.` -> `usa`"""
+    value = unicodedata.normalize("NFKD", value.casefold())
+    return "".join(char for char in value if char.isalnum())
+
+
+@lru_cache(maxsize=None)
+def _countries_index() -> Tuple[Mapping[str, Mapping], Mapping[str, Mapping]]:
+    """Build once the countries lookup tables
+
+    Returns:
+        - for each `InfoCountry` key, the countries by case-folded key value
+        - the countries by normalized name or alias
+    """
+    with open(COUNTRIES_PATH, "r", encoding="utf-8") as f:
+        countries = [MappingProxyType(country) for country in json.load(f)]
+    with open(COUNTRY_ALIASES_PATH, "r", encoding="utf-8") as f:
+        aliases = json.load(f)
+
+    by_key = {
+        info.value: MappingProxyType(
+            {country[info.value].casefold(): country for country in countries}
+        )
+        for info in InfoCountry
+    }
+    by_alias = {_normalize_country(country["name"]): country for country in countries}
+    by_alias.update(
+        {
+            _normalize_country(alias): by_key[InfoCountry.ALPHA3.value][alpha3]
+            for alias, alpha3 in aliases.items()
+        }
+    )
+    return MappingProxyType(by_key), MappingProxyType(by_alias)
+
+
+def get_info_country(key: InfoCountry, value: StrictStr) -> Optional[Dict[str, str]]:
+    """Find a country by name, alpha2 or alpha3 code (case insensitive)
+
+    If no country name matches exactly, the name is looked up in the country names and
+    aliases ignoring accents and punctuation (eg: `U.S.`, `Deutschland`). Codes only
+    match exactly.
+    Returns a new dict (name, alpha2, alpha3) or None if the country is unknown.
+    """
     if not value or not key:
         return None
 
-    with open(
-        f"{feature_path}/identity_parser/countries.json", "r", encoding="utf-8"
-    ) as f:
-        countries = json.load(f)
-        country_idx = next(
-            (
-                index
-                for (index, country) in enumerate(countries)
-                if country[key.value].lower() == value.lower()
-            ),
-            None,
-        )
-        if country_idx:
-            return countries[country_idx]
-    return None
+    by_key, by_alias = _countries_index()
+    country = by_key[key.value].get(value.strip().casefold())
+    if country is None and key == InfoCountry.NAME:
+        country = by_alias.get(_normalize_country(value))
+    if country is None:
+        return None
+    return dict(country)
 
 
 class ItemIdentityParserDataClass(BaseModel):
@@ -52,7 +52,13 @@ from .moderation import (
     TextModerationCategoriesMicrosoftEnum,
     moderation_arguments,
 )
-from .embeddings import EmbeddingsDataClass, EmbeddingDataClass, embeddings_arguments
+from .embeddings import (
+    CompactEmbeddingsDataClass,
+    EmbeddingsDataClass,
+    EmbeddingDataClass,
+    EmbeddingsOutputOptions,
+    embeddings_arguments,
+)
 
 from .code_generation import CodeGenerationDataClass, code_generation_arguments
 
@@ -1,2 +1,7 @@
-from .embeddings_dataclass import EmbeddingDataClass, EmbeddingsDataClass
+from .embeddings_dataclass import (
+    CompactEmbeddingsDataClass,
+    EmbeddingDataClass,
+    EmbeddingsDataClass,
+    EmbeddingsOutputOptions,
+)
 from .embeddings_args import embeddings_arguments
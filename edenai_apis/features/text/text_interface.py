@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List, Optional, Dict, Literal
+from typing import List, Optional, Dict, Literal, Union
 from edenai_apis.features.text import (
     KeywordExtractionDataClass,
     NamedEntityRecognitionDataClass,
@@ -23,6 +23,7 @@ from edenai_apis.features.text.spell_check.spell_check_dataclass import (
     SpellCheckDataClass,
 )
 from edenai_apis.features.text.embeddings.embeddings_dataclass import (
+    CompactEmbeddingsDataClass,
     EmbeddingsDataClass,
 )
 from edenai_apis.utils.types import ResponseType
@@ -276,14 +277,19 @@ class TextInterface:
     def text__embeddings(
         self,
         texts: List[str],
-        model : Optional[str] = None) -> ResponseType[EmbeddingsDataClass]:
-        """Spell check
+        model : Optional[str] = None,
+        output_options: Optional[Dict] = None,
+    ) -> ResponseType[Union[EmbeddingsDataClass, CompactEmbeddingsDataClass]]:
+        """Text embeddings
 
         Args:
             texts (list): texts input
+            model (str, optional): embeddings model
+            output_options (dict, optional): if given, return compact embeddings
+                (see `EmbeddingsOutputOptions`)
 
         Returns:
-            ResponseType[EmbeddingsDataClass]
+            ResponseType[EmbeddingsDataClass | CompactEmbeddingsDataClass]
         """
         raise NotImplementedError
 
@@ -2,18 +2,57 @@
 import os
 import random
 import time
-from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Type, Union, overload
+from contextlib import nullcontext
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    overload,
+)
 from uuid import uuid4
 
 from edenai_apis import interface_v2
 from edenai_apis.features.provider.provider_interface import ProviderInterface
 from edenai_apis.loaders.data_loader import FeatureDataEnum, ProviderDataEnum
 from edenai_apis.loaders.loaders import load_feature, load_provider
+from edenai_apis.utils.audio_chunking import (
+    get_chunked_speech_to_text_result,
+    is_chunked_job_id,
+    launch_chunked_speech_to_text,
+)
+from edenai_apis.utils.audio_conversion import convert_input_audio
 from edenai_apis.utils.compare import assert_equivalent_dict
 from edenai_apis.utils.constraints import validate_all_provider_constraints
+from edenai_apis.utils.embeddings_search import search_with_embeddings
 from edenai_apis.utils.exception import ProviderException, get_appropriate_error
+from edenai_apis.utils.image_preprocessing import (
+    preprocess_input_image,
+    rescale_image_result,
+)
+from edenai_apis.utils.instrumentation import instrument_call, traced
 from edenai_apis.utils.monitoring import insert_api_call, monitor_call
+from edenai_apis.utils.rate_limit import get_rate_limiter
+from edenai_apis.utils.resilience import get_resilience_policy
+from edenai_apis.utils.routing import route_call
+from edenai_apis.utils.serialization import (
+    VALIDATE_OUTPUT,
+    dump_response,
+    get_response_model,
+    response_fields,
+    serialize_response,
+    validate_response,
+)
+from edenai_apis.utils.text_chunking import MERGERS, analyze_long_text
+from edenai_apis.utils.tts_chunking import long_text_to_speech
 from edenai_apis.utils.types import AsyncLaunchJobResponseType
+from edenai_apis.utils.upload_s3 import deferred_uploads
 
 IS_MONITORING = os.environ.get("MONITORING") is not None  # see utils.monitoring
 
@@ -171,9 +210,11 @@ def list_providers(
 STATUS_SUCCESS = "success"
 
 
+@route_call
 @monitor_call(condition=IS_MONITORING)
+@instrument_call
 def compute_output(
-    provider_name: str,
+    provider_name: Union[str, List[str]],
     feature: str,
     subfeature: str,
     args: Dict[str, Any],
@@ -181,32 +222,87 @@ def compute_output(
     fake: bool = False,
     api_keys: Dict = {},
     user_email: Optional[str] = None,
-) -> Dict:
+    as_json: bool = False,
+    preprocess_images: bool = False,
+    convert_audio: bool = False,
+    chunk_audio: bool = False,
+    chunk_text: bool = False,
+    embeddings_search: bool = False,
+    defer_uploads: bool = False,
+    rate_limit: bool = False,
+    resilience: bool = False,
+) -> Union[Dict, bytes]:
     """
     Compute subfeature for provider and subfeature
 
     Args:
-        provider_name (str): EdenAI provider name
+        provider_name (str | list): EdenAI provider name, `"auto"` or a list of providers
+            to call the best available provider (see `utils.routing`)
         feature (str): EdenAI feature name
         subfeature (str): EdenAI subfeature name
         phase (str): Eden AI phase name if give, Default to `Literal[""]`
         args (Dict): inputs arguments for the feature call
         fake (bool, optional): take result from sample. Defaults to `False`.
-        api_keys (dict, optional): optional user's api_keys for each providers
+        api_keys (dict, optional): optional user's api_keys for each providers (by
+            provider name if routed)
         user_email (str, optional): optinal user email for monitoring (opted-out by default)
+        as_json (bool, optional): serialize the result straight to json bytes. Defaults to `False`.
+        preprocess_images (bool, optional): downscale/re-encode input images according to
+            the provider constraints (see `utils.image_preprocessing`). Defaults to `False`.
+        convert_audio (bool, optional): convert input audio files to a format accepted by the
+            provider instead of failing (see `utils.audio_conversion`). Defaults to `False`.
+        chunk_audio (bool, optional): transcribe long audio files in concurrent overlapping
+            segments with `speech_to_text_async` (see `utils.audio_chunking`). Defaults to `False`.
+        chunk_text (bool, optional): synthesize long texts with `text_to_speech`, or analyze
+            them with text subfeatures, in concurrent chunks under the provider limit (see
+            `utils.tts_chunking`, `utils.text_chunking`). Defaults to `False`.
+        embeddings_search (bool, optional): compute `text__search` locally with the provider
+            `text__embeddings`, documents being embedded once (see `utils.embeddings_search`).
+            Defaults to `False`.
+        defer_uploads (bool, optional): don't upload results assets (generated images, audio)
+            to s3, results keep their raw content with empty urls. Defaults to `False`.
+        rate_limit (bool, optional): wait for the provider rate limits before calling it
+            instead of getting rate limit errors (see `utils.rate_limit`). Defaults to `False`.
+        resilience (bool, optional): retry transient provider errors, hedge slow calls and
+            stop calling failing providers (see `utils.resilience`). Defaults to `False`.
 
     Returns:
-        dict: Result dict
+        dict | bytes: Result dict, or its json serialization if `as_json` is `True`
     """
     # check if the function we're running is asyncronous
     is_async = ("_async" in phase) if phase else ("_async" in subfeature)
     # suffix is used for async
     suffix = "__launch_job" if is_async else ""
 
-    # if language input, update args with a standardized language
-    args = validate_all_provider_constraints(
-        provider_name, feature, subfeature, phase, args
+    preprocessed_image = None
+    if preprocess_images and not fake:
+        with traced("file_conversion"):
+            args, preprocessed_image = preprocess_input_image(
+                provider_name, feature, subfeature, phase, args
+            )
+    if convert_audio and not fake:
+        with traced("file_conversion"):
+            args = convert_input_audio(provider_name, feature, subfeature, phase, args)
+    chunked_audio = (
+        chunk_audio
+        and not fake
+        and (feature, subfeature) == ("audio", "speech_to_text_async")
     )
+    chunked_text = (
+        chunk_text and not fake and (feature, subfeature) == ("audio", "text_to_speech")
+    )
+    chunked_analysis = chunk_text and not fake and (feature, subfeature) in MERGERS
+    searched_embeddings = (
+        embeddings_search and not fake and (feature, subfeature) == ("text", "search")
+    )
+    # segments are validated by the chunking, the input file is needed to split it
+    input_args = args
+
+    # if language input, update args with a standardized language
+    with traced("constraints"):
+        args = validate_all_provider_constraints(
+            provider_name, feature, subfeature, phase, args
+        )
 
     if fake:
         time.sleep(random.uniform(0.5, 1.5))  # sleep to fake the response time from a provider
@@ -247,12 +343,77 @@ def compute_output(
         subfeature_class = getattr(feature_class, subfeature_method_name)
 
         try:
-            subfeature_result = subfeature_class(provider_name, api_keys)(
-                **args
-            ).model_dump()
+            with deferred_uploads(defer_uploads):
+
+                def guarded(provider_call: Callable[[], Any]) -> Any:
+                    """Call the provider within its rate limits, with retries"""
+
+                    def limited_call() -> Any:
+                        limits = (
+                            get_rate_limiter().acquire(
+                                provider_name, feature, subfeature, api_keys
+                            )
+                            if rate_limit
+                            else nullcontext()
+                        )
+                        with limits, traced("provider_call"):
+                            return provider_call()
+
+                    if not resilience:
+                        return limited_call()
+                    return get_resilience_policy().call(
+                        provider_name, feature, subfeature, limited_call, phase
+                    )
+
+                if chunked_audio:
+                    provider_result = launch_chunked_speech_to_text(
+                        provider_name, input_args, api_keys
+                    )
+                elif chunked_text:
+                    provider_result = long_text_to_speech(
+                        provider_name, input_args, api_keys, call=guarded
+                    )
+                elif searched_embeddings:
+                    provider_result = guarded(
+                        lambda: search_with_embeddings(
+                            provider_name, **args, api_keys=api_keys
+                        )
+                    )
+                else:
+                    provider_method = subfeature_class(provider_name, api_keys)
+
+                    def call(provider_args: Dict) -> Any:
+                        return guarded(lambda: provider_method(**provider_args))
+
+                    if chunked_analysis:
+                        provider_result = analyze_long_text(
+                            provider_name, feature, subfeature, args, call
+                        )
+                    else:
+                        provider_result = call(args)
         except ProviderException as exc:
             raise get_appropriate_error(provider_name, exc)
 
+        if preprocessed_image is not None:
+            provider_result = rescale_image_result(provider_result, preprocessed_image)
+
+        # providers can skip validation (`model_construct` or plain dicts),
+        # outputs are then only validated in tests or debug mode
+        if VALIDATE_OUTPUT:
+            with traced("validation"):
+                provider_result = validate_response(
+                    provider_result,
+                    get_response_model(
+                        feature, subfeature, phase, is_async_launch=is_async
+                    ),
+                )
+        with traced("model_dump"):
+            subfeature_result = (
+                response_fields(provider_result)
+                if as_json
+                else dump_response(provider_result)
+            )
+
     final_result: Dict[str, Any] = {
         "status": STATUS_SUCCESS,
         "provider": provider_name,
@@ -269,6 +430,9 @@ def compute_output(
             error=error,
         )
 
+    if as_json:
+        with traced("model_dump"):
+            return serialize_response(final_result)
     return final_result
 
 
@@ -343,6 +507,7 @@ def check_provider_constraints(
 
 
 @monitor_call(condition=IS_MONITORING)
+@instrument_call
 def get_async_job_result(
     provider_name: str,
     feature: str,
@@ -351,7 +516,8 @@ def get_async_job_result(
     phase: str = "",
     fake: bool = False,
     user_email=None,
-) -> Dict:
+    as_json: bool = False,
+) -> Union[Dict, bytes]:
     """Get async result from job id
 
     Args:
@@ -361,9 +527,10 @@ def get_async_job_result(
         async_job_id (str): async job id to get result to
         phase (str): EdenAI phase. Default to empty string ("")
         fake (bool): Load fake results
+        as_json (bool, optional): serialize the result straight to json bytes. Defaults to `False`.
 
     Returns:
-        Dict: Result dict
+        dict | bytes: Result dict, or its json serialization if `as_json` is `True`
     """
 
     if fake is True:
@@ -378,6 +545,8 @@ def get_async_job_result(
         )
         fake_result["provider_job_id"] = async_job_id
 
+        if as_json:
+            return serialize_response(fake_result)
         return fake_result
 
     feature_class = getattr(interface_v2, feature.title())
@@ -387,8 +556,30 @@ def get_async_job_result(
     subfeature_class = getattr(feature_class, subfeature_method_name)
 
     try:
-        subfeature_result = subfeature_class(provider_name)(async_job_id).model_dump()
+        if is_chunked_job_id(async_job_id):
+            provider_result = get_chunked_speech_to_text_result(
+                provider_name, async_job_id
+            )
+        else:
+            provider_method = subfeature_class(provider_name)
+            with traced("provider_call"):
+                provider_result = provider_method(async_job_id)
     except ProviderException as exc:
         raise get_appropriate_error(provider_name, exc)
 
-    return subfeature_result
+    if VALIDATE_OUTPUT:
+        status = (
+            provider_result.get("status")
+            if isinstance(provider_result, dict)
+            else getattr(provider_result, "status", None)
+        )
+        with traced("validation"):
+            provider_result = validate_response(
+                provider_result,
+                get_response_model(feature, subfeature, phase, async_status=status),
+            )
+
+    with traced("model_dump"):
+        if as_json:
+            return serialize_response(response_fields(provider_result))
+        return dump_response(provider_result)
@@ -17,6 +17,7 @@ from edenai_apis.features import ProviderInterface
 from edenai_apis.features import TextInterface, TranslationInterface, VideoInterface
 from edenai_apis.loaders.data_loader import ProviderDataEnum
 from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.utils.instrumentation import traced
 
 
 def return_provider_method(func: Callable) -> Callable:
@@ -38,13 +39,16 @@ def return_provider_method(func: Callable) -> Callable:
         Returns:
             Callable: provider's function
         """
-        # Get the provider's class.
-        # Example : GoogleAPI
-        ProviderClass = load_provider(ProviderDataEnum.CLASS, provider_name=provider)
-
-        # Instantiate the provider's class.
-        # Example : google_api = GoogleAPI()
-        provider_instance = ProviderClass(api_keys)
+        with traced("provider_instantiation"):
+            # Get the provider's class.
+            # Example : GoogleAPI
+            ProviderClass = load_provider(
+                ProviderDataEnum.CLASS, provider_name=provider
+            )
+
+            # Instantiate the provider's class.
+            # Example : google_api = GoogleAPI()
+            provider_instance = ProviderClass(api_keys)
 
         # Get the right function.
         # Example : google_api.image__object_detection
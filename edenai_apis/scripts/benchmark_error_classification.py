@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark `utils.exception.get_appropriate_error` over all providers' `errors.py`
+
+For each provider with an errors list, builds messages matching each of its patterns
+plus messages matching none, and compares classifying them with the previous
+implementation (module import & `re.search` of every pattern per error) and with the
+cached `ErrorClassifier`. Both must return the same exception types.
+
+Usage:
+    python scripts/benchmark_error_classification.py [--repeat 5]
+"""
+import argparse
+import importlib
+import os
+import re
+import timeit
+
+from edenai_apis.utils.exception import (
+    ProviderException,
+    get_appropriate_error,
+    get_error_classifier,
+)
+
+APIS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "apis")
+UNKNOWN_ERRORS = [
+    "Internal Server Error",
+    "upstream connect error or disconnect/reset before headers",
+]
+
+
+def previous_get_appropriate_error(provider: str, exception: ProviderException):
+    try:
+        provider_mod = importlib.import_module(f"apis.{provider}.errors")
+    except ModuleNotFoundError:
+        return exception
+    error_dict = getattr(provider_mod, "ERRORS")
+    error_msg = str(exception)
+    error_code = exception.status_code
+
+    for exception_type, error_list in error_dict.items():
+        if any([re.search(error_pattern, error_msg) for error_pattern in error_list]):
+            return exception_type(error_msg, error_code)
+
+    return exception
+
+
+def pattern_message(pattern: str) -> str:
+    """Message matched by most of the patterns: their literal parts"""
+    return re.sub(r"\\[dDsSwW][*+?]?|[\^$]|\\", "", pattern)
+
+
+def providers_errors():
+    errors = {}
+    for provider in sorted(os.listdir(APIS_PATH)):
+        if not os.path.exists(os.path.join(APIS_PATH, provider, "errors.py")):
+            continue
+        provider_errors = importlib.import_module(f"apis.{provider}.errors").ERRORS
+        messages = [
+            f"Error: {pattern_message(pattern)}"
+            for patterns in provider_errors.values()
+            for pattern in patterns
+        ]
+        errors[provider] = messages + UNKNOWN_ERRORS
+    return errors
+
+
+def classify_all(func, errors):
+    return [
+        type(func(provider, ProviderException(message, 400)))
+        for provider, messages in errors.items()
+        for message in messages
+    ]
+
+
+def benchmark(repeat: int):
+    errors = providers_errors()
+    count = sum(len(messages) for messages in errors.values())
+    patterns = sum(
+        len(regex.pattern.split("|(?:"))
+        for provider in errors
+        for regex in get_error_classifier(provider).regexes
+    )
+    assert classify_all(previous_get_appropriate_error, errors) == classify_all(
+        get_appropriate_error, errors
+    ), "classifications differ"
+
+    print(f"{len(errors)} providers, {patterns} patterns, {count} errors")
+    for name, func in (
+        ("previous", previous_get_appropriate_error),
+        ("compiled", get_appropriate_error),
+    ):
+        timing = min(
+            timeit.repeat(lambda: classify_all(func, errors), number=1, repeat=repeat)
+        )
+        print(
+            f"{name:<10} {timing * 1000:>9.2f}ms {timing / count * 1e6:>9.2f}us/error"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    cli_args = parser.parse_args()
+    benchmark(cli_args.repeat)
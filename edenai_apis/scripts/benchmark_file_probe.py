@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark `utils.file_probe` against Pillow & PyPDF2 on large images and pdfs
+
+Generates a large JPEG, a large PNG and a many pages pdf in a temporary directory and
+compares reading their dimensions with `PIL.Image.open(file).size` /
+`PyPDF2.PdfReader(file).pages[0].mediabox` and with `utils.file_probe` (first call & cached).
+
+Usage:
+    python scripts/benchmark_file_probe.py [--repeat 20] [--pages 500]
+"""
+import argparse
+import os
+import tempfile
+import timeit
+
+import PyPDF2
+from PIL import Image as Img
+
+from edenai_apis.utils import file_probe
+
+
+def generate_files(directory: str, pages: int):
+    image = Img.effect_noise((6000, 4000), 64).convert("RGB")
+    jpeg_path = os.path.join(directory, "large.jpg")
+    png_path = os.path.join(directory, "large.png")
+    image.save(jpeg_path, quality=95)
+    image.save(png_path)
+
+    pdf_path = os.path.join(directory, "large.pdf")
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=595, height=842)
+    with open(pdf_path, "wb") as pdf_file:
+        writer.write(pdf_file)
+    return jpeg_path, png_path, pdf_path
+
+
+def uncached(func, file_path):
+    return lambda: func.__wrapped__(file_probe._file_key(file_path))
+
+
+def benchmark(repeat: int, pages: int):
+    with tempfile.TemporaryDirectory() as directory:
+        jpeg_path, png_path, pdf_path = generate_files(directory, pages)
+        cases = []
+        for image_path in (jpeg_path, png_path):
+            cases.append(
+                (
+                    os.path.basename(image_path),
+                    lambda path=image_path: Img.open(path).size,
+                    uncached(file_probe._cached_image_dimensions, image_path),
+                    lambda path=image_path: file_probe.get_image_dimensions(path),
+                )
+            )
+        cases.append(
+            (
+                f"large.pdf ({pages} pages)",
+                lambda: PyPDF2.PdfReader(pdf_path).pages[0].mediabox,
+                uncached(file_probe._cached_pdf_dimensions, pdf_path),
+                lambda: file_probe.get_pdf_dimensions(pdf_path),
+            )
+        )
+
+        print(
+            f"{'file':<25} {'size':>8} {'pillow/pypdf2':>14} {'probe':>10} {'cached':>10}"
+        )
+        for name, *funcs in cases:
+            path = os.path.join(directory, name.split(" ")[0])
+            timings = [
+                min(timeit.repeat(func, number=1, repeat=repeat)) for func in funcs
+            ]
+            print(
+                f"{name:<25} {os.path.getsize(path) // 1024:>6}KB "
+                + " ".join(f"{timing * 1000:>11.3f}ms" for timing in timings)
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=500)
+    cli_args = parser.parse_args()
+    benchmark(cli_args.repeat, cli_args.pages)
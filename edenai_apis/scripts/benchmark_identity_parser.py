@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the identity parser standardization throughput
+
+Rebuilds the standardized documents of the recorded `ocr__identity_parser` outputs, looking
+their country up again like the providers do, with the indexed `get_info_country` and with
+the previous implementation (countries file loaded & scanned on every call).
+
+Usage:
+    python scripts/benchmark_identity_parser.py [--documents 1000]
+"""
+import argparse
+import glob
+import json
+import os
+import timeit
+
+from edenai_apis.features.ocr.identity_parser.identity_parser_dataclass import (
+    COUNTRIES_PATH,
+    Country,
+    InfoCountry,
+    InfosIdentityParserDataClass,
+    get_info_country,
+)
+from settings import apis_path
+
+# country values as returned by the providers, before standardization
+COUNTRY_VALUES = [
+    (InfoCountry.ALPHA3, "USA"),
+    (InfoCountry.ALPHA3, "FRA"),
+    (InfoCountry.ALPHA3, "AFG"),
+    (InfoCountry.ALPHA3, "ZWE"),
+    (InfoCountry.NAME, "United States of America"),
+    (InfoCountry.NAME, "Germany"),
+]
+
+
+def legacy_get_info_country(key: InfoCountry, value: str):
+    with open(COUNTRIES_PATH, "r", encoding="utf-8") as f:
+        countries = json.load(f)
+        country_idx = next(
+            (
+                index
+                for (index, country) in enumerate(countries)
+                if country[key.value].lower() == value.lower()
+            ),
+            None,
+        )
+        if country_idx:
+            return countries[country_idx]
+    return None
+
+
+def recorded_documents():
+    documents = []
+    for path in glob.glob(
+        os.path.join(apis_path, "*", "outputs", "ocr", "identity_parser_output.json")
+    ):
+        with open(path, "r", encoding="utf-8") as file:
+            output = json.load(file)
+        documents.extend(output["standardized_response"]["extracted_data"])
+    return documents
+
+
+def standardize(documents, lookup):
+    for index, document in enumerate(documents):
+        key, value = COUNTRY_VALUES[index % len(COUNTRY_VALUES)]
+        country = lookup(key, value)
+        if country:
+            country["confidence"] = document["country"]["confidence"]
+        InfosIdentityParserDataClass(
+            **{**document, "country": country or Country.default()}
+        )
+
+
+def benchmark(n_documents: int):
+    documents = recorded_documents()
+    documents = (documents * (n_documents // len(documents) + 1))[:n_documents]
+
+    print(f"{'lookup':<10} {'total':>10} {'documents/s':>12}")
+    for name, lookup in (
+        ("legacy", legacy_get_info_country),
+        ("indexed", get_info_country),
+    ):
+        timing = min(
+            timeit.repeat(lambda: standardize(documents, lookup), number=1, repeat=3)
+        )
+        print(f"{name:<10} {timing * 1000:>8.1f}ms {n_documents / timing:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=1000)
+    cli_args = parser.parse_args()
+    benchmark(cli_args.documents)
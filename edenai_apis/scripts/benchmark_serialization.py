@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark `compute_output` response building on the largest recorded provider outputs
+
+Compares the default path (validated models -> `model_dump` -> dict, then `json.dumps`
+for the http response) with the fast paths of `utils.serialization` (already standardized
+outputs, dumped to a dict or serialized straight to json bytes).
+
+Usage:
+    python scripts/benchmark_serialization.py [--top 10] [--repeat 5]
+"""
+import argparse
+import glob
+import json
+import os
+import timeit
+from typing import List, Tuple
+
+from edenai_apis.utils.serialization import (
+    dump_response,
+    get_response_model,
+    response_fields,
+    serialize_response,
+)
+from settings import apis_path
+
+
+def largest_outputs(top: int) -> List[Tuple[str, str, str, str]]:
+    """Returns (path, provider, feature, subfeature) of the `top` biggest recorded outputs"""
+    paths = glob.glob(os.path.join(apis_path, "*", "outputs", "*", "*_output.json"))
+    paths.sort(key=os.path.getsize, reverse=True)
+    outputs = []
+    for path in paths:
+        provider, _, feature, file_name = path.split(os.sep)[-4:]
+        subfeature = file_name.replace("_output.json", "")
+        outputs.append((path, provider, feature, subfeature))
+    return outputs[:top]
+
+
+def benchmark(top: int, repeat: int):
+    print(
+        f"{'output':<45} {'size':>8} {'default dict':>12} {'default json':>12} "
+        f"{'fast dict':>12} {'fast json':>12}"
+    )
+    for path, provider, feature, subfeature in largest_outputs(top):
+        with open(path, "r", encoding="utf-8") as file:
+            output = json.load(file)
+        async_status = output.get("status") if "_async" in subfeature else None
+        response_model = get_response_model(
+            feature, subfeature, async_status=async_status
+        )
+        if response_model is None:
+            continue
+
+        # validated model built by the provider, as done by default
+        model = response_model.model_validate(output)
+
+        def default_path():
+            validated = response_model.model_validate(output)
+            return {"status": "success", "provider": provider, **validated.model_dump()}
+
+        def default_json_path():
+            return json.dumps(default_path(), default=str).encode()
+
+        def fast_dict_path():
+            return {"status": "success", "provider": provider, **dump_response(output)}
+
+        def fast_json_path():
+            return serialize_response(
+                {"status": "success", "provider": provider, **response_fields(model)}
+            )
+
+        timings = [
+            min(timeit.repeat(func, number=1, repeat=repeat))
+            for func in (
+                default_path,
+                default_json_path,
+                fast_dict_path,
+                fast_json_path,
+            )
+        ]
+        name = f"{provider}/{feature}/{subfeature}"
+        size = f"{os.path.getsize(path) // 1024}KB"
+        print(
+            f"{name:<45} {size:>8} "
+            + " ".join(f"{timing * 1000:>10.2f}ms" for timing in timings)
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    cli_args = parser.parse_args()
+    benchmark(cli_args.top, cli_args.repeat)
@@ -0,0 +1,5 @@
+import sys
+
+from edenai_apis.tests.benchmarks.runner import main
+
+sys.exit(main())
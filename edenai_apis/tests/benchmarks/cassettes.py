@@ -0,0 +1,481 @@
+"""
+Record provider HTTP/SDK exchanges into cassettes, and replay them offline
+
+Unlike the recorded outputs, a cassette keeps every exchange of a call with its status
+code, headers and duration: async jobs polling (launch -> pending -> pending ->
+succeeded), errors, pagination... Exchanges are captured at the `requests` transport
+adapter and boto3 `_make_api_call`, so every provider using them is covered.
+
+- record: calls go to the providers with the real settings (`api_keys/`), secrets
+  (settings values, auth headers & query parameters) are scrubbed from the cassette
+- replay: requests are matched by method & url (boto3: service & operation) and
+  served in recording order, the last exchange of a request is repeated once the
+  others are consumed (a finished job keeps its status). Each response waits its
+  recorded duration multiplied by `time_scale`
+
+Record a flow, with the real api keys:
+    python -m edenai_apis.tests.benchmarks.cassettes speechmatics audio speech_to_text_async
+
+Replay it:
+    >>> with Cassette(path, time_scale=0) as cassette:
+    ...     result = run_flow(**cassette.call)
+"""
+import argparse
+import base64
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from copy import deepcopy
+from io import BytesIO
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from unittest import mock
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from edenai_apis.interface import compute_output, get_async_job_result
+from edenai_apis.loaders import data_loader
+from edenai_apis.loaders.data_loader import FeatureDataEnum
+from edenai_apis.loaders.loaders import load_feature
+from edenai_apis.tests.benchmarks.stubs import write_stub_settings
+
+CASSETTES_PATH = os.path.join(os.path.dirname(__file__), "cassettes")
+RECORD = "record"
+REPLAY = "replay"
+SCRUBBED = "<scrubbed>"
+# headers & query parameters whose name contains one of these are secrets
+SECRET_NAMES = (
+    "auth",
+    "key",
+    "token",
+    "secret",
+    "signature",
+    "password",
+    "cookie",
+    "credential",
+)
+# shorter settings values (eg: regions, booleans) aren't secrets
+MIN_SECRET_LENGTH = 6
+# request bodies are recorded for debugging only, large ones (files) are summarized
+MAX_RECORDED_BODY = 4096
+# the recorded body is decoded
+_DROPPED_HEADERS = ("content-encoding", "transfer-encoding", "content-length")
+
+
+class CassetteError(Exception):
+    """Request without recorded exchange"""
+
+
+def _is_secret_name(name: str) -> bool:
+    name = name.lower()
+    return any(secret in name for secret in SECRET_NAMES)
+
+
+def scrub_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {
+        name: SCRUBBED if _is_secret_name(name) else value
+        for name, value in headers.items()
+    }
+
+
+def scrub_url(url: str) -> str:
+    """Url with the secret query parameters scrubbed"""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [
+        (name, SCRUBBED if _is_secret_name(name) else value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query, safe="<>")))
+
+
+def settings_secrets() -> List[str]:
+    """String values of the providers settings files (real api keys)"""
+    secrets = set()
+
+    def collect(value: Any) -> None:
+        if isinstance(value, dict):
+            for item in value.values():
+                collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+        elif isinstance(value, str) and len(value) >= MIN_SECRET_LENGTH:
+            secrets.add(value)
+
+    keys_path = data_loader.keys_path
+    for file_name in os.listdir(keys_path):
+        if not file_name.endswith("_settings.json"):
+            continue
+        try:
+            with open(os.path.join(keys_path, file_name), "r", encoding="utf-8") as f:
+                collect(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            continue
+    return sorted(secrets, key=len, reverse=True)
+
+
+def _summary(value: Any) -> Any:
+    """Recordable version of request parameters: large bytes & files summarized"""
+    if isinstance(value, dict):
+        return {key: _summary(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_summary(item) for item in value]
+    if isinstance(value, bytes):
+        try:
+            if len(value) <= MAX_RECORDED_BODY:
+                return value.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str) and len(value) > MAX_RECORDED_BODY:
+        return f"<{len(value)} characters>"
+    if hasattr(value, "read"):
+        return "<stream>"
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _encode(value: Any) -> Any:
+    """Json version of a boto3 response, see `_decode`"""
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "__datetime__" in value:
+        return datetime.datetime.fromisoformat(value["__datetime__"])
+    if "__bytes__" in value:
+        return base64.b64decode(value["__bytes__"])
+    if "__stream__" in value:
+        content = base64.b64decode(value["__stream__"])
+        return StreamingBody(BytesIO(content), len(content))
+    return {key: _decode(item) for key, item in value.items()}
+
+
+class Cassette:
+    """Record or replay the providers exchanges of the calls made in its context
+
+    Args:
+        path (str): cassette file, written when leaving the context in record mode
+        mode (str, optional): `RECORD` or `REPLAY`. Defaults to `REPLAY`.
+        time_scale (float, optional): replayed responses wait their recorded duration
+            multiplied by `time_scale` (0: no wait). Defaults to 1.
+        secrets (Iterable[str], optional): values scrubbed from the recording, in
+            addition to the providers settings values
+        call (dict, optional): recorded call, kwargs of `run_flow`
+
+    Raises:
+        CassetteError: in replay mode, for a request without recorded exchange
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = REPLAY,
+        time_scale: float = 1.0,
+        secrets: Iterable[str] = (),
+        call: Optional[Dict] = None,
+    ) -> None:
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"mode must be {RECORD!r} or {REPLAY!r}, not {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.time_scale = time_scale
+        self.secrets = list(secrets)
+        self.call: Dict = call or {}
+        self.interactions: List[Dict] = []
+        self.replay_time = 0.0
+        self.calls = 0
+        self._queues: Dict[Tuple, Deque[Dict]] = {}
+        self._lock = threading.Lock()
+        self._exit_stack: Optional[ExitStack] = None
+        self._settings_directory: Optional[str] = None
+        if mode == REPLAY:
+            with open(path, "r", encoding="utf-8") as cassette_file:
+                cassette = json.load(cassette_file)
+            self.call = cassette.get("call") or self.call
+            self.interactions = cassette["interactions"]
+            self.rewind()
+
+    def rewind(self) -> None:
+        """Replay the exchanges from the start, counters are reset"""
+        with self._lock:
+            self._queues = {}
+            for interaction in self.interactions:
+                key = self._key(interaction["request"])
+                self._queues.setdefault(key, deque()).append(interaction)
+            self.replay_time = 0.0
+            self.calls = 0
+
+    @staticmethod
+    def _key(request: Dict) -> Tuple:
+        if "operation" in request:
+            return ("aws", request["service"], request["operation"])
+        return ("http", request["method"], scrub_url(request["url"]))
+
+    def _next_interaction(self, request: Dict) -> Dict:
+        with self._lock:
+            queue = self._queues.get(self._key(request))
+            if not queue:
+                raise CassetteError(f"No recorded exchange for {self._key(request)}")
+            # the last exchange is kept: a finished job stays finished
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def _replay(self, request: Dict, build) -> Any:
+        start = time.perf_counter()
+        try:
+            interaction = self._next_interaction(request)
+            if self.time_scale:
+                time.sleep(interaction["elapsed"] * self.time_scale)
+            return build(interaction["response"])
+        finally:
+            with self._lock:
+                self.replay_time += time.perf_counter() - start
+                self.calls += 1
+
+    def _record(self, request: Dict, response: Dict, elapsed: float) -> None:
+        with self._lock:
+            self.interactions.append(
+                {"request": request, "response": response, "elapsed": elapsed}
+            )
+
+    # requests
+
+    @staticmethod
+    def _http_request(request: requests.PreparedRequest) -> Dict:
+        return {
+            "method": request.method,
+            "url": scrub_url(request.url),
+            "headers": scrub_headers(dict(request.headers)),
+            "body": _summary(request.body),
+        }
+
+    @staticmethod
+    def _http_response(
+        recorded: Dict, request: requests.PreparedRequest
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = recorded["status_code"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        if "body_base64" in recorded:
+            response._content = base64.b64decode(recorded["body_base64"])
+        else:
+            response._content = recorded["body"].encode("utf-8")
+        response._content_consumed = True
+        return response
+
+    def _send(self, original_send, adapter, request, *args, **kwargs):
+        if self.mode == REPLAY:
+            return self._replay(
+                self._http_request(request),
+                lambda recorded: self._http_response(recorded, request),
+            )
+        start = time.perf_counter()
+        response = original_send(adapter, request, *args, **kwargs)
+        # streamed responses are read: the content stays available to the caller
+        content = response.content
+        elapsed = time.perf_counter() - start
+        recorded = {
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": scrub_headers(
+                {
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() not in _DROPPED_HEADERS
+                }
+            ),
+        }
+        try:
+            recorded["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            recorded["body_base64"] = base64.b64encode(content).decode()
+        self._record(self._http_request(request), recorded, elapsed)
+        return response
+
+    # boto3
+
+    def _make_api_call(self, original_call, client, operation_name, api_params):
+        request = {
+            "service": client.meta.service_model.service_name,
+            "operation": operation_name,
+            "params": _summary(api_params),
+        }
+        if self.mode == REPLAY:
+
+            def build(recorded: Dict) -> Dict:
+                if "error" in recorded:
+                    raise ClientError(deepcopy(recorded["error"]), operation_name)
+                return _decode(recorded)
+
+            return self._replay(request, build)
+
+        start = time.perf_counter()
+        try:
+            response = original_call(client, operation_name, api_params)
+        except ClientError as exc:
+            self._record(
+                request, {"error": _encode(exc.response)}, time.perf_counter() - start
+            )
+            raise
+        elapsed = time.perf_counter() - start
+        recorded = {}
+        for key, value in response.items():
+            if isinstance(value, StreamingBody):
+                content = value.read()
+                response[key] = StreamingBody(BytesIO(content), len(content))
+                recorded[key] = {"__stream__": base64.b64encode(content).decode()}
+            else:
+                recorded[key] = _encode(value)
+        self._record(request, recorded, elapsed)
+        return response
+
+    def save(self) -> None:
+        """Write the recorded exchanges, secrets scrubbed"""
+        content = json.dumps(
+            {"call": self.call, "interactions": self.interactions}, indent=2
+        )
+        secrets = sorted(
+            set(self.secrets) | set(settings_secrets()), key=len, reverse=True
+        )
+        for secret in secrets:
+            # values are scrubbed as they appear in the json (escaped)
+            content = content.replace(json.dumps(secret)[1:-1], SCRUBBED)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as cassette_file:
+            cassette_file.write(content + "\n")
+
+    def __enter__(self) -> "Cassette":
+        cassette = self
+        original_send = HTTPAdapter.send
+        original_call = BaseClient._make_api_call
+
+        def send(adapter, request, *args, **kwargs):
+            return cassette._send(original_send, adapter, request, *args, **kwargs)
+
+        def make_api_call(client, operation_name, api_params):
+            return cassette._make_api_call(
+                original_call, client, operation_name, api_params
+            )
+
+        exit_stack = ExitStack()
+        if self.mode == REPLAY:
+            # providers need settings, not their real values
+            self._settings_directory = tempfile.mkdtemp(
+                prefix="edenai_cassette_settings_"
+            )
+            write_stub_settings(self._settings_directory)
+            exit_stack.enter_context(
+                mock.patch(
+                    "edenai_apis.loaders.data_loader.keys_path",
+                    self._settings_directory,
+                )
+            )
+        exit_stack.enter_context(mock.patch.object(HTTPAdapter, "send", send))
+        exit_stack.enter_context(
+            mock.patch.object(BaseClient, "_make_api_call", make_api_call)
+        )
+        self._exit_stack = exit_stack
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if self._exit_stack is not None:
+            self._exit_stack.close()
+        if self._settings_directory is not None:
+            shutil.rmtree(self._settings_directory, ignore_errors=True)
+            self._settings_directory = None
+        if self.mode == RECORD and exc_type is None:
+            self.save()
+
+
+def run_flow(
+    provider: str,
+    feature: str,
+    subfeature: str,
+    args: Optional[Dict] = None,
+    poll_interval: float = 0.0,
+    max_polls: int = 100,
+) -> Dict:
+    """`compute_output` of a subfeature, async jobs are polled until they're finished
+
+    Args:
+        args (dict, optional): subfeature arguments, its samples arguments if `None`
+        poll_interval (float, optional): seconds between two polls of an async job
+        max_polls (int, optional): polls before giving up
+
+    Raises:
+        TimeoutError: if the async job is still pending after `max_polls`
+    """
+    if args is None:
+        args = load_feature(
+            FeatureDataEnum.SAMPLES_ARGS, feature=feature, subfeature=subfeature
+        )
+    result = compute_output(provider, feature, subfeature, dict(args))
+    if "_async" not in subfeature:
+        return result
+    job_id = result["provider_job_id"]
+    for _ in range(max_polls):
+        result = get_async_job_result(provider, feature, subfeature, job_id)
+        if result["status"] != "pending":
+            return result
+        time.sleep(poll_interval)
+    raise TimeoutError(f"Async job {job_id} still pending after {max_polls} polls")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Record a cassette of a subfeature")
+    parser.add_argument("provider")
+    parser.add_argument("feature")
+    parser.add_argument("subfeature")
+    parser.add_argument("--output", help="cassette path")
+    parser.add_argument(
+        "--poll-interval", type=float, default=5.0, help="seconds between polls"
+    )
+    cli_args = parser.parse_args(argv)
+
+    call = {
+        "provider": cli_args.provider,
+        "feature": cli_args.feature,
+        "subfeature": cli_args.subfeature,
+    }
+    path = cli_args.output or os.path.join(
+        CASSETTES_PATH,
+        f"{cli_args.provider}_{cli_args.feature}_{cli_args.subfeature}.json",
+    )
+    with Cassette(path, mode=RECORD, call=call) as cassette:
+        run_flow(**call, poll_interval=cli_args.poll_interval)
+    print(f"{len(cassette.interactions)} exchanges recorded in {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Measure the library overhead of `compute_output`, offline
+
+Each synchronous subfeature with a recorded output is called through `compute_output`
+with its samples arguments while `ReplayStubs` replays the recorded provider response.
+The overhead is the call duration minus the time spent in the stubs (provider latency):
+constraints validation, languages, provider instantiation, standardization, dump...
+
+Recorded cassettes (see `cassettes`) are benchmarked the same way: the whole flow,
+async jobs polling included, minus the time spent replaying the exchanges.
+
+Reported per provider/subfeature: p50 & p99 overhead, peak memory allocated during a
+call (tracemalloc) and the process max RSS growth. Results can be saved as a baseline,
+and compared to it to detect regressions (exit code 1). Timings depend on the machine:
+baselines are not versioned, save one on the machine running the comparisons (eg: from
+the main branch, then benchmark a change against it).
+
+Usage:
+    python -m edenai_apis.tests.benchmarks [--providers deepl openai] [--features text]
+        [--iterations 50] [--latency 0] [--save-baseline] [--tolerance 0.25]
+        [--cassettes [path ...]] [--time-scale 0]
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from edenai_apis.interface import compute_output, list_features
+from edenai_apis.loaders.data_loader import FeatureDataEnum
+from edenai_apis.loaders.loaders import load_feature
+from edenai_apis.tests.benchmarks.cassettes import CASSETTES_PATH, Cassette, run_flow
+from edenai_apis.tests.benchmarks.stubs import ReplayStubs
+from settings import apis_path
+
+# generated per machine with `--save-baseline`, ignored by git
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_ITERATIONS = 50
+DEFAULT_TOLERANCE = 0.25
+# regressions under this duration (ms) are noise
+MIN_REGRESSION_MS = 0.2
+
+
+@dataclass
+class BenchmarkResult:
+    p50_ms: float
+    p99_ms: float
+    alloc_peak_kb: float
+    rss_growth_kb: int
+
+
+def output_path(provider: str, feature: str, subfeature: str) -> str:
+    return os.path.join(
+        apis_path, provider, "outputs", feature, f"{subfeature}_output.json"
+    )
+
+
+def recorded_subfeatures(
+    providers: Optional[Sequence[str]] = None,
+    features: Optional[Sequence[str]] = None,
+) -> List[Tuple[str, str, str]]:
+    """Synchronous (provider, feature, subfeature) with a recorded output"""
+    subfeatures = []
+    for provider, feature, subfeature, *phase in list_features():
+        if phase or "_async" in subfeature:
+            continue
+        if providers and provider not in providers:
+            continue
+        if features and feature not in features:
+            continue
+        if os.path.exists(output_path(provider, feature, subfeature)):
+            subfeatures.append((provider, feature, subfeature))
+    return subfeatures
+
+
+def percentile(values: Sequence[float], ratio: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(ratio * len(ordered)) - 1, 0)]
+
+
+def measure(call: Callable[[], float], iterations: int) -> BenchmarkResult:
+    """Overheads percentiles & memory of `call`, returning its overhead in seconds"""
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # warm up: imports, caches, clients
+    call()
+    overheads = [call() for _ in range(iterations)]
+
+    tracemalloc.start()
+    try:
+        call()
+        _, alloc_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return BenchmarkResult(
+        p50_ms=round(percentile(overheads, 0.5) * 1000, 3),
+        p99_ms=round(percentile(overheads, 0.99) * 1000, 3),
+        alloc_peak_kb=round(alloc_peak / 1024, 1),
+        rss_growth_kb=rss_after - rss_before,
+    )
+
+
+def benchmark_subfeature(
+    stubs: ReplayStubs,
+    provider: str,
+    feature: str,
+    subfeature: str,
+    iterations: int = DEFAULT_ITERATIONS,
+) -> BenchmarkResult:
+    """Library overhead of `compute_output` for a subfeature, replaying its output
+
+    Raises:
+        Exception: the error of the first call if the recorded output can't be replayed
+    """
+    with open(output_path(provider, feature, subfeature), "r", encoding="utf-8") as f:
+        stubs.replay(json.load(f).get("original_response"))
+    args = load_feature(
+        FeatureDataEnum.SAMPLES_ARGS, feature=feature, subfeature=subfeature
+    )
+
+    def call() -> float:
+        stubs.reset()
+        start = time.perf_counter()
+        compute_output(provider, feature, subfeature, dict(args), defer_uploads=True)
+        return time.perf_counter() - start - stubs.stub_time
+
+    return measure(call, iterations)
+
+
+def benchmark_cassette(
+    path: str, iterations: int = DEFAULT_ITERATIONS, time_scale: float = 0.0
+) -> BenchmarkResult:
+    """Library overhead of the flow recorded in a cassette, polling included"""
+    with Cassette(path, time_scale=time_scale) as cassette:
+
+        def call() -> float:
+            cassette.rewind()
+            start = time.perf_counter()
+            run_flow(**cassette.call)
+            return time.perf_counter() - start - cassette.replay_time
+
+        return measure(call, iterations)
+
+
+def _error(exc: Exception) -> str:
+    message = " ".join(str(exc).split())
+    return f"{type(exc).__name__}: {message[:80]}"
+
+
+def run(
+    subfeatures: Iterable[Tuple[str, str, str]],
+    iterations: int = DEFAULT_ITERATIONS,
+    latency: float = 0.0,
+) -> Tuple[Dict[str, BenchmarkResult], Dict[str, str]]:
+    """Benchmark subfeatures, returns results and errors by 'provider/feature/subfeature'"""
+    results: Dict[str, BenchmarkResult] = {}
+    errors: Dict[str, str] = {}
+    with ReplayStubs(latency=latency) as stubs:
+        for provider, feature, subfeature in subfeatures:
+            name = f"{provider}/{feature}/{subfeature}"
+            try:
+                results[name] = benchmark_subfeature(
+                    stubs, provider, feature, subfeature, iterations
+                )
+            except Exception as exc:
+                # the recorded output doesn't match the provider calls
+                errors[name] = _error(exc)
+    return results, errors
+
+
+def run_cassettes(
+    paths: Iterable[str],
+    iterations: int = DEFAULT_ITERATIONS,
+    time_scale: float = 0.0,
+) -> Tuple[Dict[str, BenchmarkResult], Dict[str, str]]:
+    """Benchmark cassettes, returns results and errors by 'cassette/<name>'"""
+    results: Dict[str, BenchmarkResult] = {}
+    errors: Dict[str, str] = {}
+    for path in paths:
+        name = f"cassette/{os.path.splitext(os.path.basename(path))[0]}"
+        try:
+            results[name] = benchmark_cassette(path, iterations, time_scale)
+        except Exception as exc:
+            errors[name] = _error(exc)
+    return results, errors
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, BenchmarkResult]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as baseline_file:
+        return {
+            name: BenchmarkResult(**result)
+            for name, result in json.load(baseline_file).items()
+        }
+
+
+def save_baseline(
+    results: Dict[str, BenchmarkResult], path: str = BASELINE_PATH
+) -> None:
+    """Update the baseline with `results`, other subfeatures are kept"""
+    baseline = {name: asdict(result) for name, result in load_baseline(path).items()}
+    baseline.update({name: asdict(result) for name, result in results.items()})
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(dict(sorted(baseline.items())), baseline_file, indent=2)
+        baseline_file.write("\n")
+
+
+def regressions(
+    results: Dict[str, BenchmarkResult],
+    baseline: Dict[str, BenchmarkResult],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Dict[str, List[str]]:
+    """Metrics worse than the baseline by more than `tolerance`, by subfeature"""
+    found = {}
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        metrics = []
+        for metric, minimum in (
+            ("p50_ms", MIN_REGRESSION_MS),
+            ("p99_ms", MIN_REGRESSION_MS),
+            ("alloc_peak_kb", 1),
+        ):
+            value, reference_value = getattr(result, metric), getattr(reference, metric)
+            if value > reference_value * (1 + tolerance) + minimum:
+                metrics.append(f"{metric} {reference_value} -> {value}")
+        if metrics:
+            found[name] = metrics
+    return found
+
+
+def report(
+    results: Dict[str, BenchmarkResult],
+    errors: Dict[str, str],
+    baseline: Dict[str, BenchmarkResult],
+) -> None:
+    print(
+        f"{'subfeature':<55} {'p50':>9} {'p99':>9} {'alloc':>10} {'rss':>8} "
+        f"{'baseline p50':>13}"
+    )
+    for name, result in results.items():
+        reference = baseline.get(name)
+        print(
+            f"{name:<55} {result.p50_ms:>7.2f}ms {result.p99_ms:>7.2f}ms "
+            f"{result.alloc_peak_kb:>8.1f}KB {result.rss_growth_kb:>6}KB "
+            + (f"{reference.p50_ms:>11.2f}ms" if reference else f"{'-':>13}")
+        )
+    if errors:
+        print(f"\n{len(errors)} subfeatures can't be replayed:")
+        for name, error in errors.items():
+            print(f"  {name:<55} {error}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--providers", nargs="*")
+    parser.add_argument("--features", nargs="*")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="stubs latency in seconds"
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--cassettes",
+        nargs="*",
+        help="benchmark cassettes instead of recorded outputs, all if no path",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.0,
+        help="cassettes responses wait their recorded duration times this scale",
+    )
+    cli_args = parser.parse_args(argv)
+
+    if cli_args.cassettes is not None:
+        results, errors = run_cassettes(
+            cli_args.cassettes
+            or sorted(glob.glob(os.path.join(CASSETTES_PATH, "*.json"))),
+            cli_args.iterations,
+            cli_args.time_scale,
+        )
+    else:
+        results, errors = run(
+            recorded_subfeatures(cli_args.providers, cli_args.features),
+            cli_args.iterations,
+            cli_args.latency,
+        )
+    baseline = load_baseline(cli_args.baseline)
+    report(results, errors, baseline)
+
+    if cli_args.save_baseline:
+        save_baseline(results, cli_args.baseline)
+        print(f"\nbaseline saved to {cli_args.baseline}")
+        return 0
+    if not baseline:
+        print(
+            f"\nno baseline at {cli_args.baseline}, run with --save-baseline on this "
+            "machine to compare the next runs to this one"
+        )
+        return 0
+
+    found = regressions(results, baseline, cli_args.tolerance)
+    if found:
+        print(f"\n{len(found)} regressions (tolerance {cli_args.tolerance:.0%}):")
+        for name, metrics in found.items():
+            print(f"  {name:<55} {', '.join(metrics)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Replay recorded provider outputs instead of calling the providers
+
+Every provider call returns the `original_response` recorded in
+`apis/<provider>/outputs/<feature>/<subfeature>_output.json`, after a configurable
+latency, whatever the client used:
+
+    - `requests`: responses are built by the transport adapter, no socket is opened
+    - boto3: `BaseClient._make_api_call` returns the recorded dict
+    - google clients: anonymous credentials, and grpc channels return the recorded
+      message parsed to the expected response type
+
+Providers settings are replaced by their `api_keys/*_settings_template.json`, filled
+with placeholder values.
+
+Example:
+    >>> with ReplayStubs(latency=0.05) as stubs:
+    ...     stubs.replay(recorded_output["original_response"])
+    ...     compute_output("deepl", "translation", "automatic_translation", args)
+    ...     stubs.stub_time  # seconds spent in the stubs, latency included
+"""
+import glob
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from copy import deepcopy
+from typing import Any, Callable, Optional
+from unittest import mock
+
+import requests
+from botocore.client import BaseClient
+from requests.adapters import HTTPAdapter
+
+from settings import keys_path
+
+STUB_REGION = "us-east-1"
+STUB_VALUE = "stub"
+STUB_URL = "https://stub.edenai.run/"
+
+
+def write_stub_settings(directory: str) -> None:
+    """Providers settings files built from their templates, with placeholder values"""
+
+    def fill(value: Any, key: str = "") -> Any:
+        if isinstance(value, dict):
+            return {name: fill(item, name) for name, item in value.items()}
+        if value == "":
+            if "region" in key:
+                return STUB_REGION
+            return STUB_URL if "url" in key or "endpoint" in key else STUB_VALUE
+        return value
+
+    for template_path in glob.glob(os.path.join(keys_path, "*_settings_template.json")):
+        with open(template_path, "r", encoding="utf-8") as template:
+            try:
+                settings = fill(json.load(template))
+            except json.JSONDecodeError:
+                # the provider calls fail, it's reported as not replayable
+                continue
+        settings_name = os.path.basename(template_path).replace("_template", "")
+        with open(os.path.join(directory, settings_name), "w") as settings_file:
+            json.dump(settings, settings_file)
+
+
+class _ReplayChannel:
+    """grpc channel returning the recorded response to every call"""
+
+    def __init__(self, stubs: "ReplayStubs") -> None:
+        self._stubs = stubs
+
+    def unary_unary(
+        self, method: str, request_serializer=None, response_deserializer=None, **_
+    ) -> Callable:
+        def call(request, *args, **kwargs):
+            return self._stubs.respond(
+                lambda response: _message(response_deserializer, response)
+            )
+
+        return call
+
+    def unary_stream(self, *args, **kwargs) -> Callable:
+        call = self.unary_unary(*args, **kwargs)
+        return lambda request, *args, **kwargs: iter([call(request)])
+
+    stream_unary = unary_unary
+    stream_stream = unary_stream
+
+    def subscribe(self, *args, **kwargs) -> None:
+        pass
+
+    def unsubscribe(self, *args, **kwargs) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _message(deserializer: Optional[Callable], response: Any) -> Any:
+    """Recorded response (dict) as the message type returned by `deserializer`"""
+    message_class = getattr(deserializer, "__self__", None)
+    if message_class is None or not isinstance(response, (dict, list)):
+        return response
+    payload = json.dumps(response)
+    if hasattr(message_class, "from_json"):
+        # proto-plus messages
+        return message_class.from_json(payload, ignore_unknown_fields=True)
+    from google.protobuf import json_format
+
+    return json_format.Parse(payload, message_class(), ignore_unknown_fields=True)
+
+
+class ReplayStubs:
+    """Patch the providers clients to return a recorded response
+
+    Args:
+        latency (float, optional): seconds each stubbed call waits before returning,
+            to simulate the providers latency. Defaults to 0.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.response: Any = None
+        self.stub_time = 0.0
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._exit_stack: Optional[ExitStack] = None
+        self._settings_directory: Optional[str] = None
+
+    def replay(self, response: Any) -> None:
+        """Response returned by the next calls, counters are reset"""
+        self.response = response
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stub_time = 0.0
+            self.calls = 0
+
+    def respond(self, build: Callable[[Any], Any] = deepcopy) -> Any:
+        """Recorded response built by `build`, after the latency"""
+        start = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        try:
+            return build(self.response)
+        finally:
+            with self._lock:
+                self.stub_time += time.perf_counter() - start
+                self.calls += 1
+
+    def _http_response(self, request: requests.PreparedRequest) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        content = self.response
+        if isinstance(content, (dict, list)) or content is None:
+            content = json.dumps(content).encode("utf-8")
+            response.headers["Content-Type"] = "application/json"
+        elif isinstance(content, str):
+            content = content.encode("utf-8")
+        response._content = content
+        response._content_consumed = True
+        return response
+
+    def __enter__(self) -> "ReplayStubs":
+        stubs = self
+        self._settings_directory = tempfile.mkdtemp(prefix="edenai_stub_settings_")
+        write_stub_settings(self._settings_directory)
+
+        def send(adapter, request, *args, **kwargs):
+            return stubs.respond(lambda _: stubs._http_response(request))
+
+        def make_api_call(client, operation_name, api_params):
+            return stubs.respond(
+                lambda response: (
+                    deepcopy(response) if isinstance(response, dict) else {}
+                )
+            )
+
+        exit_stack = ExitStack()
+        exit_stack.enter_context(
+            mock.patch(
+                "edenai_apis.loaders.data_loader.keys_path", self._settings_directory
+            )
+        )
+        exit_stack.enter_context(mock.patch.object(HTTPAdapter, "send", send))
+        exit_stack.enter_context(
+            mock.patch.object(BaseClient, "_make_api_call", make_api_call)
+        )
+        try:
+            import google.auth
+            from google.api_core import grpc_helpers
+            from google.auth.credentials import AnonymousCredentials
+        except ImportError:
+            pass
+        else:
+            exit_stack.enter_context(
+                mock.patch.object(
+                    google.auth,
+                    "default",
+                    return_value=(AnonymousCredentials(), STUB_VALUE),
+                )
+            )
+            exit_stack.enter_context(
+                mock.patch.object(
+                    grpc_helpers,
+                    "create_channel",
+                    side_effect=lambda *args, **kwargs: _ReplayChannel(stubs),
+                )
+            )
+        self._exit_stack = exit_stack
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._exit_stack is not None:
+            self._exit_stack.close()
+        if self._settings_directory is not None:
+            shutil.rmtree(self._settings_directory, ignore_errors=True)
@@ -0,0 +1,163 @@
+import datetime
+import json
+import os
+from io import BytesIO
+from unittest import mock
+
+import boto3
+import pytest
+import requests
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+from requests.adapters import HTTPAdapter
+
+from edenai_apis.tests.benchmarks.cassettes import (
+    CASSETTES_PATH,
+    RECORD,
+    SCRUBBED,
+    Cassette,
+    CassetteError,
+    run_flow,
+    scrub_url,
+)
+from edenai_apis.tests.benchmarks.runner import benchmark_cassette
+
+SPEECHMATICS_CASSETTE = os.path.join(
+    CASSETTES_PATH, "speechmatics_audio_speech_to_text_async.json"
+)
+
+
+def fake_send(statuses):
+    """Transport answering the job status in order"""
+    statuses = iter(statuses)
+
+    def send(adapter, request, *args, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response.headers["Set-Cookie"] = "session=secret-cookie"
+        response._content = json.dumps({"status": next(statuses)}).encode()
+        response.request = request
+        response.url = request.url
+        return response
+
+    return send
+
+
+@pytest.fixture
+def s3_client():
+    return boto3.client(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+    )
+
+
+class TestRecordReplay:
+    def test_http_exchanges_scrubbed_and_replayed_in_order(self, tmp_path):
+        path = str(tmp_path / "cassette.json")
+        url = "https://api.example.com/v1/jobs/42?api_key=query-secret&page=2"
+        headers = {"Authorization": "Bearer header-secret"}
+
+        with mock.patch.object(
+            HTTPAdapter,
+            "send",
+            fake_send(["pending", "pending", "succeeded", "created"]),
+        ):
+            with Cassette(path, mode=RECORD, secrets=["value-secret"]):
+                for _ in range(3):
+                    requests.get(url, headers=headers)
+                requests.post("https://api.example.com/v1", json={"x": "value-secret"})
+
+        content = open(path).read()
+        assert "query-secret" not in content
+        assert "header-secret" not in content
+        assert "secret-cookie" not in content
+        assert "value-secret" not in content
+        assert SCRUBBED in content
+
+        with Cassette(path, time_scale=0) as cassette:
+            statuses = [requests.get(url, headers=headers).json() for _ in range(4)]
+
+        assert [status["status"] for status in statuses] == [
+            "pending",
+            "pending",
+            "succeeded",
+            # the last exchange is repeated
+            "succeeded",
+        ]
+        assert cassette.calls == 4
+
+    def test_unknown_request(self, tmp_path):
+        path = tmp_path / "cassette.json"
+        path.write_text(json.dumps({"call": {}, "interactions": []}))
+
+        with Cassette(str(path)):
+            with pytest.raises(CassetteError):
+                requests.get("https://api.example.com/v1/unknown")
+
+    def test_boto3_exchanges(self, tmp_path, s3_client):
+        path = str(tmp_path / "cassette.json")
+        modified = datetime.datetime(2023, 4, 13, tzinfo=datetime.timezone.utc)
+
+        def make_api_call(client, operation_name, api_params):
+            if api_params["Key"] == "missing":
+                raise ClientError(
+                    {"Error": {"Code": "NoSuchKey", "Message": "Not found"}},
+                    operation_name,
+                )
+            return {
+                "Body": StreamingBody(BytesIO(b"\x00audio"), 6),
+                "LastModified": modified,
+            }
+
+        with mock.patch.object(BaseClient, "_make_api_call", make_api_call):
+            with Cassette(path, mode=RECORD):
+                recorded = s3_client.get_object(Bucket="bucket", Key="file")
+                assert recorded["Body"].read() == b"\x00audio"
+                with pytest.raises(ClientError):
+                    s3_client.get_object(Bucket="bucket", Key="missing")
+
+        with Cassette(path, time_scale=0):
+            response = s3_client.get_object(Bucket="bucket", Key="file")
+
+        assert response["Body"].read() == b"\x00audio"
+        assert response["LastModified"] == modified
+
+    def test_scaled_timing(self):
+        with open(SPEECHMATICS_CASSETTE) as cassette_file:
+            recorded = sum(
+                interaction["elapsed"]
+                for interaction in json.load(cassette_file)["interactions"]
+            )
+
+        with Cassette(SPEECHMATICS_CASSETTE, time_scale=0.1) as cassette:
+            run_flow(**cassette.call)
+
+        assert recorded * 0.1 <= cassette.replay_time < recorded
+
+
+def test_scrub_url():
+    assert (
+        scrub_url("https://api.example.com/v1?key=abc&text=hello+world")
+        == f"https://api.example.com/v1?key={SCRUBBED}&text=hello+world"
+    )
+    assert scrub_url("https://api.example.com/v1") == "https://api.example.com/v1"
+
+
+def test_async_flow():
+    with Cassette(SPEECHMATICS_CASSETTE, time_scale=0) as cassette:
+        result = run_flow(**cassette.call)
+
+    assert result["status"] == "succeeded"
+    assert result["standardized_response"]["text"].strip().startswith("Unit one")
+    # launch, running, running, done, transcript
+    assert cassette.calls == 5
+
+
+def test_benchmark_cassette():
+    result = benchmark_cassette(SPEECHMATICS_CASSETTE, iterations=3)
+
+    assert 0 < result.p50_ms <= result.p99_ms
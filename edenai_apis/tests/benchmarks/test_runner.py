@@ -0,0 +1,97 @@
+import pytest
+
+from edenai_apis.interface import compute_output
+from edenai_apis.tests.benchmarks import runner
+from edenai_apis.tests.benchmarks.runner import (
+    BenchmarkResult,
+    benchmark_subfeature,
+    load_baseline,
+    main,
+    percentile,
+    recorded_subfeatures,
+    regressions,
+    save_baseline,
+)
+from edenai_apis.tests.benchmarks.stubs import ReplayStubs
+
+
+def result(p50_ms=1.0, p99_ms=2.0, alloc_peak_kb=10.0):
+    return BenchmarkResult(
+        p50_ms=p50_ms, p99_ms=p99_ms, alloc_peak_kb=alloc_peak_kb, rss_growth_kb=0
+    )
+
+
+class TestReplayStubs:
+    def test_http_provider(self):
+        with ReplayStubs(latency=0.01) as stubs:
+            stubs.replay({"translations": [{"text": "Bonjour"}]})
+
+            response = compute_output(
+                "deepl",
+                "translation",
+                "automatic_translation",
+                {"text": "Hello", "source_language": "en", "target_language": "fr"},
+            )
+
+        assert response["status"] == "success"
+        assert response["standardized_response"]["text"] == "Bonjour"
+        assert stubs.calls == 1
+        assert stubs.stub_time >= 0.01
+
+    def test_benchmark_subfeature(self):
+        with ReplayStubs() as stubs:
+            benchmark = benchmark_subfeature(
+                stubs, "deepl", "translation", "automatic_translation", iterations=3
+            )
+
+        assert 0 < benchmark.p50_ms <= benchmark.p99_ms
+        assert benchmark.alloc_peak_kb > 0
+
+
+def test_recorded_subfeatures():
+    subfeatures = recorded_subfeatures(["deepl"], ["translation"])
+
+    assert ("deepl", "translation", "automatic_translation") in subfeatures
+    assert all(provider == "deepl" for provider, _, _ in subfeatures)
+
+
+@pytest.mark.parametrize(
+    ("ratio", "expected"), [(0.5, 5), (0.99, 10), (0.1, 1), (0.0, 1)]
+)
+def test_percentile(ratio, expected):
+    assert percentile(list(range(10, 0, -1)), ratio) == expected
+
+
+def test_regressions():
+    baseline = {"a": result(), "b": result(), "c": result()}
+    results = {
+        "a": result(p50_ms=1.1),
+        "b": result(p50_ms=2.0, alloc_peak_kb=30.0),
+        "d": result(p50_ms=100),
+    }
+
+    found = regressions(results, baseline, tolerance=0.25)
+
+    assert found == {"b": ["p50_ms 1.0 -> 2.0", "alloc_peak_kb 10.0 -> 30.0"]}
+
+
+def test_save_baseline_keeps_other_subfeatures(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline({"a": result(), "b": result()}, path)
+
+    save_baseline({"b": result(p50_ms=3.0)}, path)
+
+    assert load_baseline(path) == {"a": result(), "b": result(p50_ms=3.0)}
+
+
+def test_compare_to_machine_baseline(mocker, tmp_path):
+    path = str(tmp_path / "baseline.json")
+    run = mocker.patch.object(runner, "run", return_value=({"a": result()}, {}))
+
+    # no baseline yet on this machine: nothing to compare to
+    assert main(["--baseline", path]) == 0
+    assert load_baseline(path) == {}
+
+    assert main(["--baseline", path, "--save-baseline"]) == 0
+    run.return_value = ({"a": result(p50_ms=2.0)}, {})
+    assert main(["--baseline", path]) == 1
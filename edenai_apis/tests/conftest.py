@@ -128,3 +128,11 @@ def subfeature(request):
 @pytest.fixture
 def phase(request):
     return request.config.getoption("--phase")
+
+
+@pytest.fixture(autouse=True)
+def validate_output(monkeypatch):
+    """Validate the outputs built without validation (`model_construct` or plain
+    dicts) in every test, see `utils.serialization`"""
+    monkeypatch.setattr("edenai_apis.interface.VALIDATE_OUTPUT", True)
+    monkeypatch.setattr("edenai_apis.utils.multi_subfeatures.VALIDATE_OUTPUT", True)
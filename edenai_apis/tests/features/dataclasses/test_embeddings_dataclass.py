@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from edenai_apis.features.text.embeddings import (
+    CompactEmbeddingsDataClass,
+    EmbeddingsOutputOptions,
+)
+from edenai_apis.loaders.data_loader import ProviderDataEnum
+from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.tests.benchmarks.stubs import ReplayStubs
+from edenai_apis.utils.exception import ProviderException
+
+VECTORS = [[3.0, 4.0], [0.0, 0.0]]
+
+
+@pytest.mark.text
+@pytest.mark.embeddings
+class TestCompactEmbeddingsDataClass:
+    def test_contiguous_float32_array(self):
+        instance = CompactEmbeddingsDataClass.from_vectors(
+            VECTORS, EmbeddingsOutputOptions()
+        )
+
+        assert instance.vectors.dtype == np.float32
+        assert instance.vectors.shape == (2, 2)
+        assert instance.vectors.flags["C_CONTIGUOUS"]
+        assert instance.model_dump()["items"] == [
+            {"embedding": [3.0, 4.0]},
+            {"embedding": [0.0, 0.0]},
+        ]
+
+    def test_normalize_and_float16(self):
+        instance = CompactEmbeddingsDataClass.from_vectors(
+            VECTORS, EmbeddingsOutputOptions(dtype="float16", normalize=True)
+        )
+
+        assert instance.vectors.dtype == np.float16
+        assert instance.to_bytes() == instance.vectors.tobytes()
+        np.testing.assert_allclose(
+            instance.vectors, [[0.6, 0.8], [0.0, 0.0]], atol=1e-3
+        )
+
+    @pytest.mark.parametrize("dtype", ["float32", "float16"])
+    def test_base64_round_trip(self, dtype):
+        instance = CompactEmbeddingsDataClass.from_vectors(
+            VECTORS, EmbeddingsOutputOptions(dtype=dtype, encoding="base64")
+        )
+        serialized = instance.model_dump()
+
+        assert all(isinstance(item["embedding"], str) for item in serialized["items"])
+        decoded = CompactEmbeddingsDataClass.model_validate(serialized)
+        np.testing.assert_array_equal(decoded.vectors, instance.vectors)
+
+
+@pytest.mark.text
+@pytest.mark.embeddings
+class TestEmbeddingsOutputOptions:
+    def test_no_options(self):
+        assert EmbeddingsOutputOptions.from_output_options(None) is None
+
+    def test_invalid_options(self):
+        with pytest.raises(ProviderException) as error:
+            EmbeddingsOutputOptions.from_output_options({"dtype": "int8"})
+
+        assert error.value.code == 400
+
+    @pytest.mark.parametrize(
+        ("provider", "model"),
+        [
+            ("openai", "1536__text-embedding-ada-002"),
+            ("cohere", "4096__embed-english-v2.0"),
+            ("google", "768__textembedding-gecko"),
+        ],
+    )
+    def test_validated_before_the_request(self, provider, model):
+        with ReplayStubs() as stubs:
+            stubs.replay({})
+            provider_class = load_provider(
+                ProviderDataEnum.CLASS, provider_name=provider
+            )
+            # not initialized (no settings needed): the options are checked first
+            api = provider_class.__new__(provider_class)
+            with pytest.raises(ProviderException) as error:
+                api.text__embeddings(["Hello"], model, {"encoding": "hex"})
+
+        assert error.value.code == 400
+        assert stubs.calls == 0
@@ -0,0 +1,65 @@
+import pytest
+
+from edenai_apis.features.ocr.identity_parser import InfoCountry, get_info_country
+
+AFGHANISTAN = {"alpha2": "af", "alpha3": "afg", "name": "Afghanistan"}
+GERMANY = {"alpha2": "de", "alpha3": "deu", "name": "Germany"}
+USA = {"alpha2": "us", "alpha3": "usa", "name": "United States of America"}
+
+
+@pytest.mark.ocr
+@pytest.mark.identity_parser
+class TestGetInfoCountry:
+    @pytest.mark.parametrize(
+        ("key", "value", "expected"),
+        [
+            (InfoCountry.ALPHA3, "afg", AFGHANISTAN),
+            (InfoCountry.ALPHA2, "AF", AFGHANISTAN),
+            (InfoCountry.NAME, "afghanistan", AFGHANISTAN),
+            (InfoCountry.ALPHA3, " DEU ", GERMANY),
+            (InfoCountry.NAME, "Germany", GERMANY),
+        ],
+    )
+    def test_exact_match(self, key, value, expected):
+        assert get_info_country(key, value) == expected
+
+    @pytest.mark.parametrize(
+        ("key", "value", "expected"),
+        [
+            (InfoCountry.NAME, "U.S.", USA),
+            (InfoCountry.NAME, "U.S.A.", USA),
+            (InfoCountry.NAME, "USA", USA),
+            (InfoCountry.NAME, "united states", USA),
+            (InfoCountry.NAME, "Deutschland", GERMANY),
+            (InfoCountry.NAME, "México", get_info_country(InfoCountry.ALPHA3, "mex")),
+            (
+                InfoCountry.NAME,
+                "Cote d Ivoire",
+                get_info_country(InfoCountry.ALPHA3, "civ"),
+            ),
+        ],
+    )
+    def test_alias_match(self, key, value, expected):
+        assert get_info_country(key, value) == expected
+
+    @pytest.mark.parametrize(
+        ("key", "value"),
+        [
+            (InfoCountry.ALPHA3, "zzz"),
+            # aliases are only looked up for names
+            (InfoCountry.ALPHA2, "d"),
+            (InfoCountry.ALPHA3, "d"),
+            (InfoCountry.ALPHA3, "U.S.A."),
+            (InfoCountry.NAME, "Atlantis"),
+            (InfoCountry.ALPHA3, ""),
+            (InfoCountry.ALPHA3, None),
+        ],
+    )
+    def test_unknown_country(self, key, value):
+        assert get_info_country(key, value) is None
+
+    def test_returns_new_dict(self):
+        country = get_info_country(InfoCountry.ALPHA3, "deu")
+        country["confidence"] = 0.5
+
+        assert get_info_country(InfoCountry.ALPHA3, "deu") == GERMANY
@@ -0,0 +1,236 @@
+import os
+import struct
+import wave
+
+import pytest
+
+from edenai_apis.features.audio.speech_to_text_async.speech_to_text_async_dataclass import (
+    SpeechDiarization,
+    SpeechDiarizationEntry,
+    SpeechToTextAsyncDataClass,
+)
+from edenai_apis.utils.audio_chunking import (
+    AudioChunk,
+    detect_silences,
+    get_chunked_speech_to_text_result,
+    is_chunked_job_id,
+    launch_chunked_speech_to_text,
+    merge_chunks_results,
+    plan_chunks,
+    split_audio,
+)
+from edenai_apis.utils.constraints import transform_file_args
+from edenai_apis.utils.files import FileInfo, FileWrapper
+from edenai_apis.utils.types import (
+    AsyncLaunchJobResponseType,
+    AsyncPendingResponseType,
+    AsyncResponseType,
+)
+
+FRAME_RATE = 8000
+
+
+@pytest.fixture
+def wav_path(tmp_path):
+    """3s of noise, 1s of silence, 3s of noise"""
+    path = str(tmp_path / "meeting.wav")
+    noise = b"".join(
+        struct.pack("<h", 8000 if i % 16 < 8 else -8000) for i in range(3 * FRAME_RATE)
+    )
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(FRAME_RATE)
+        wav.writeframes(noise + b"\x00\x00" * FRAME_RATE + noise)
+    return path
+
+
+def transcription(*words):
+    """words as (segment, start, end, speaker)"""
+    return SpeechToTextAsyncDataClass(
+        text=" ".join(word[0] for word in words),
+        diarization=SpeechDiarization(
+            total_speakers=len({word[3] for word in words}),
+            entries=[
+                SpeechDiarizationEntry(
+                    segment=segment,
+                    start_time=str(start),
+                    end_time=str(end),
+                    speaker=speaker,
+                    confidence=0.9,
+                )
+                for segment, start, end, speaker in words
+            ],
+        ),
+    )
+
+
+class TestPlanChunks:
+    def test_short_audio(self):
+        assert plan_chunks(30, [], max_segment_duration=60) == [
+            AudioChunk(0, 30, 0, 30)
+        ]
+
+    def test_cut_in_silences(self):
+        chunks = plan_chunks(
+            250, [(10, 12), (85, 89), (170, 171)], max_segment_duration=100, overlap=2
+        )
+
+        assert chunks == [
+            AudioChunk(0, 89, 0, 87),
+            AudioChunk(85, 172.5, 87, 170.5),
+            AudioChunk(168.5, 250, 170.5, 250),
+        ]
+
+    def test_hard_cut_without_silence(self):
+        chunks = plan_chunks(150, [(10, 12)], max_segment_duration=100, overlap=1)
+
+        assert [(chunk.keep_start, chunk.keep_end) for chunk in chunks] == [
+            (0, 100),
+            (100, 150),
+        ]
+
+
+class TestSplitAudio:
+    def test_detect_silences(self, wav_path):
+        [(start, end)] = detect_silences(wav_path)
+
+        assert start == pytest.approx(3, abs=0.05)
+        assert end == pytest.approx(4, abs=0.05)
+
+    def test_split(self, wav_path, tmp_path):
+        chunks = plan_chunks(7, detect_silences(wav_path), 5, overlap=0.5)
+
+        paths = split_audio(wav_path, str(tmp_path), chunks, "wav")
+
+        assert len(paths) == 2
+        for path, chunk in zip(paths, chunks):
+            with wave.open(path, "rb") as wav:
+                duration = wav.getnframes() / wav.getframerate()
+            assert duration == pytest.approx(chunk.end - chunk.start, abs=0.05)
+
+
+class TestMergeChunksResults:
+    def test_offsets_overlaps_and_speakers(self):
+        chunks = [AudioChunk(0, 12, 0, 10), AudioChunk(8, 20, 10, 20)]
+        first = transcription(
+            ("hello", 0, 1, 1),
+            ("hi", 8.5, 9.5, 2),
+            ("there", 10.5, 11.5, 1),
+        )
+        # speakers labels are swapped in the second segment
+        second = transcription(
+            ("hi", 0.5, 1.5, 1),
+            ("there", 2.5, 3.5, 2),
+            ("bye", 5, 6, 1),
+            ("new", 8, 9, 3),
+        )
+
+        merged = merge_chunks_results([first, second], chunks)
+
+        assert merged.text == "hello hi there bye new"
+        assert [
+            (entry.segment, entry.start_time, entry.speaker)
+            for entry in merged.diarization.entries
+        ] == [
+            ("hello", "0", 1),
+            ("hi", "8.5", 2),
+            ("there", "10.5", 1),
+            ("bye", "13", 2),
+            ("new", "16", 3),
+        ]
+        assert merged.diarization.total_speakers == 3
+
+    def test_without_timestamps(self):
+        chunks = [AudioChunk(0, 12, 0, 10), AudioChunk(8, 20, 10, 20)]
+        results = [
+            SpeechToTextAsyncDataClass(
+                text=text, diarization=SpeechDiarization(total_speakers=0)
+            )
+            for text in ("first part", "second part")
+        ]
+
+        assert merge_chunks_results(results, chunks).text == "first part second part"
+
+
+class TestChunkedJobs:
+    @pytest.fixture
+    def audio_interface(self, mocker):
+        # segments are launched concurrently, job ids are named after the files
+        launch = mocker.Mock(
+            side_effect=lambda **args: AsyncLaunchJobResponseType(
+                provider_job_id=os.path.basename(args["file"])
+            )
+        )
+        mocker.patch(
+            "edenai_apis.interface_v2.Audio.speech_to_text_async__launch_job",
+            return_value=launch,
+        )
+        mocker.patch(
+            "edenai_apis.utils.audio_chunking.validate_all_provider_constraints",
+            side_effect=lambda provider, feature, subfeature, phase, args: (
+                transform_file_args(dict(args))
+            ),
+        )
+        return launch
+
+    def test_launch_segments(self, wav_path, audio_interface):
+        file = FileWrapper(
+            wav_path, "", FileInfo(os.path.getsize(wav_path), "audio/x-wav", ["wav"])
+        )
+
+        response = launch_chunked_speech_to_text(
+            "deepgram", {"file": file, "language": "en"}, max_segment_duration=5
+        )
+
+        assert is_chunked_job_id(response.provider_job_id)
+        assert audio_interface.call_count == 2
+        assert all(
+            call.kwargs["language"] == "en" for call in audio_interface.call_args_list
+        )
+
+    def test_short_audio_single_job(self, wav_path, audio_interface):
+        file = FileWrapper(
+            wav_path, "", FileInfo(os.path.getsize(wav_path), "audio/x-wav", ["wav"])
+        )
+
+        response = launch_chunked_speech_to_text(
+            "deepgram", {"file": file}, max_segment_duration=60
+        )
+
+        assert response.provider_job_id == "meeting.wav"
+
+    def test_get_result(self, wav_path, audio_interface, mocker):
+        file = FileWrapper(
+            wav_path, "", FileInfo(os.path.getsize(wav_path), "audio/x-wav", ["wav"])
+        )
+        job_id = launch_chunked_speech_to_text(
+            "deepgram", {"file": file}, max_segment_duration=5
+        ).provider_job_id
+        results = {
+            "segment_0.wav": transcription(("one", 0.2, 0.5, 1)),
+            "segment_1.wav": transcription(("two", 2.5, 2.8, 1)),
+        }
+
+        def get_job_result(provider_job_id):
+            if provider_job_id not in results:
+                return AsyncPendingResponseType(provider_job_id=provider_job_id)
+            return AsyncResponseType(
+                provider_job_id=provider_job_id,
+                original_response={},
+                standardized_response=results[provider_job_id],
+            )
+
+        mocker.patch(
+            "edenai_apis.interface_v2.Audio.speech_to_text_async__get_job_result",
+            return_value=get_job_result,
+        )
+
+        response = get_chunked_speech_to_text_result("deepgram", job_id)
+
+        assert response.status == "succeeded"
+        assert response.provider_job_id == job_id
+        assert response.standardized_response.text == "one two"
+
+        del results["segment_1.wav"]
+        assert get_chunked_speech_to_text_result("deepgram", job_id).status == "pending"
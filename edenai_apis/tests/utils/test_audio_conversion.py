@@ -0,0 +1,182 @@
+import os
+import struct
+import wave
+
+import pytest
+
+from edenai_apis.utils import audio_conversion
+from edenai_apis.utils.audio_conversion import (
+    convert_audio,
+    convert_audio_for_providers,
+    convert_input_audio,
+    select_audio_formats,
+    transcode_audio,
+)
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.file_cache import TemporaryFilesCache
+from edenai_apis.utils.file_probe import get_audio_info
+from edenai_apis.utils.files import FileInfo, FileWrapper
+
+
+@pytest.fixture
+def wav_path(tmp_path):
+    path = str(tmp_path / "speech.wav")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(
+            b"".join(struct.pack("<hh", i * 7 % 3000, -i % 2000) for i in range(8000))
+        )
+    return path
+
+
+@pytest.fixture(autouse=True)
+def conversions_cache(mocker, tmp_path):
+    cache = TemporaryFilesCache(2, prefix="edenai_audios_")
+    mocker.patch.object(audio_conversion, "_cache", cache)
+    return cache
+
+
+def file_wrapper(path, media_type="audio/x-wav"):
+    return FileWrapper(
+        path, "", FileInfo(os.path.getsize(path), media_type, ["wav"], "16000", "2")
+    )
+
+
+class TestSelectAudioFormats:
+    def test_accepted_source_format_is_kept(self):
+        assert select_audio_formats(
+            "mp3", {"google": ["flac", "mp3"], "other": []}
+        ) == {"google": None, "other": None}
+
+    def test_fewest_conversions(self):
+        targets = select_audio_formats(
+            "aiff",
+            {
+                "google": ["flac", "mp3", "wav"],
+                "oneai": ["wav", "mp3"],
+                "voxist": ["mp3", "wav", "flac"],
+                "openai": ["m4a", "webm"],
+            },
+        )
+
+        assert targets == {
+            "google": "wav",
+            "oneai": "wav",
+            "voxist": "wav",
+            "openai": "webm",
+        }
+
+
+class TestAudioInfo:
+    def test_wav_header(self, wav_path, mocker):
+        mediainfo = mocker.patch("edenai_apis.utils.file_probe.mediainfo")
+
+        audio_info = get_audio_info(wav_path)
+
+        assert (audio_info.sample_rate, audio_info.channels) == (16000, 2)
+        assert audio_info.duration == 0.5
+        mediainfo.assert_not_called()
+
+    def test_probed_once(self, tmp_path, mocker):
+        path = str(tmp_path / "speech.mp3")
+        with open(path, "wb") as file:
+            file.write(b"ID3")
+        mediainfo = mocker.patch(
+            "edenai_apis.utils.file_probe.mediainfo",
+            return_value={"sample_rate": "48000", "duration": "1.5"},
+        )
+
+        wrapper = file_wrapper(path, "audio/mpeg")
+        assert wrapper.audio_info == get_audio_info(path)
+
+        assert wrapper.audio_info.sample_rate == 48000
+        assert wrapper.audio_info.channels == 1
+        assert wrapper.audio_info.duration == 1.5
+        mediainfo.assert_called_once()
+
+
+class TestConvertAudio:
+    def test_convert(self, wav_path):
+        converted = convert_audio(file_wrapper(wav_path), "wav", 8000, 1)
+
+        with wave.open(converted.file_path, "rb") as wav:
+            assert (wav.getframerate(), wav.getnchannels()) == (8000, 1)
+        assert converted.file_info.file_frame_rate == "8000"
+        assert converted.file_info.file_channels == "1"
+
+    def test_same_format_not_converted(self, wav_path):
+        wrapper = file_wrapper(wav_path)
+
+        assert convert_audio(wrapper, "wav", 16000) is wrapper
+
+    def test_conversions_cached(self, wav_path, mocker):
+        transcode = mocker.spy(audio_conversion, "transcode_audio")
+
+        first = convert_audio(file_wrapper(wav_path), "flac")
+        second = convert_audio(file_wrapper(wav_path), "flac")
+
+        assert first.file_path == second.file_path
+        assert first.file_path.endswith(".flac")
+        transcode.assert_called_once()
+
+    def test_evicted_files_deleted(self, wav_path):
+        first = convert_audio(file_wrapper(wav_path), "flac").file_path
+        convert_audio(file_wrapper(wav_path), "wav", 8000)
+        convert_audio(file_wrapper(wav_path), "wav", 11025)
+
+        assert not os.path.exists(first)
+
+    def test_evicted_files_kept_while_used(self, wav_path):
+        first = convert_audio(file_wrapper(wav_path), "flac")
+        convert_audio(file_wrapper(wav_path), "wav", 8000)
+        convert_audio(file_wrapper(wav_path), "wav", 11025)
+
+        assert os.path.exists(first.file_path)
+        path = first.file_path
+        del first
+        assert not os.path.exists(path)
+
+    def test_conversion_error(self, tmp_path):
+        path = str(tmp_path / "speech.mp3")
+        with open(path, "wb") as file:
+            file.write(b"not an audio file")
+
+        with pytest.raises(ProviderException):
+            transcode_audio(path, str(tmp_path / "speech.wav"), "wav")
+
+
+class TestConvertForProviders:
+    def test_one_conversion_for_several_providers(self, wav_path, mocker):
+        mocker.patch.object(
+            audio_conversion,
+            "_provider_audio_formats",
+            side_effect=lambda provider, *_: {
+                "amazon": ["wav", "flac"],
+                "google": ["flac", "mp3"],
+                "voxist": ["mp3", "flac"],
+            }[provider],
+        )
+
+        files = convert_audio_for_providers(
+            file_wrapper(wav_path), ["amazon", "google", "voxist"]
+        )
+
+        assert files["amazon"].file_path == wav_path
+        assert files["google"].file_path == files["voxist"].file_path
+        assert files["google"].file_path.endswith(".flac")
+
+    def test_input_audio(self, wav_path, mocker):
+        mocker.patch.object(
+            audio_conversion, "_provider_audio_formats", return_value=["mp3"]
+        )
+        args = {"file": file_wrapper(wav_path), "language": "en"}
+
+        new_args = convert_input_audio(
+            "oneai", "audio", "speech_to_text_async", "", args
+        )
+
+        assert new_args["file"].file_path.endswith(".mp3")
+        assert new_args["language"] == "en"
+        assert args["file"].file_path == wav_path
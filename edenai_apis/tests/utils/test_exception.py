@@ -1,5 +1,16 @@
+import importlib
+
 import pytest
-from edenai_apis.utils.exception import ProviderException, LanguageException
+from edenai_apis.utils.exception import (
+    ErrorClassifier,
+    LanguageException,
+    ProviderException,
+    ProviderInvalidInputError,
+    ProviderInvalidInputFileError,
+    ProviderInvalidInputTextLengthError,
+    get_appropriate_error,
+    get_error_classifier,
+)
 
 
 def test_provider_exception():
@@ -16,3 +27,68 @@ def test_language_exception():
     except LanguageException as exc:
         assert exc.code == 400
         assert str(exc) == "Error"
+
+
+class TestErrorClassifier:
+    errors = {
+        ProviderInvalidInputTextLengthError: [r"\d*\S*Text is too long"],
+        ProviderInvalidInputError: [r"Invalid (\w+) argument", r"Wrong voice id"],
+        ProviderInvalidInputFileError: [],
+    }
+
+    def test_classify(self):
+        classifier = ErrorClassifier(self.errors)
+
+        assert classifier.classify("400 Text is too long") == (
+            ProviderInvalidInputTextLengthError
+        )
+        assert classifier.classify("Wrong voice id") == ProviderInvalidInputError
+        assert classifier.classify("Invalid language argument") == (
+            ProviderInvalidInputError
+        )
+        assert classifier.classify("Internal Server Error") is None
+
+    def test_errors_list_order(self):
+        classifier = ErrorClassifier(self.errors)
+
+        # the first type of the list wins, even if another one matches before
+        assert classifier.classify("Wrong voice id: Text is too long") == (
+            ProviderInvalidInputTextLengthError
+        )
+
+    def test_empty_errors_list(self):
+        assert ErrorClassifier({}).classify("Wrong voice id") is None
+
+
+class TestGetAppropriateError:
+    def test_provider_error(self):
+        error = get_appropriate_error(
+            "google", ProviderException("Text is too long", code=400)
+        )
+
+        assert isinstance(error, ProviderInvalidInputTextLengthError)
+        assert error.code == 400
+
+    def test_unknown_error(self):
+        exception = ProviderException("Internal Server Error", code=500)
+
+        assert get_appropriate_error("google", exception) is exception
+
+    def test_classified_error_kept(self):
+        exception = ProviderInvalidInputError("Text is too long", code=400)
+
+        assert get_appropriate_error("google", exception) is exception
+
+    def test_errors_compiled_once(self, mocker):
+        import_module = mocker.spy(importlib, "import_module")
+        get_error_classifier.cache_clear()
+
+        for _ in range(3):
+            get_appropriate_error("google", ProviderException("Text is too long"))
+
+        import_module.assert_called_once_with("apis.google.errors")
+
+    def test_provider_without_errors(self):
+        exception = ProviderException("Error")
+
+        assert get_appropriate_error("not_a_provider", exception) is exception
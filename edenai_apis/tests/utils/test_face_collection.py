@@ -0,0 +1,147 @@
+import pytest
+import requests
+
+from edenai_apis.features.image.face_recognition.add_face.face_recognition_add_face_dataclass import (
+    FaceRecognitionAddFaceDataClass,
+)
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.face_collection import LocalFaceCollections
+from edenai_apis.utils.types import ResponseType
+
+FACES = {
+    "alice.jpg": [[1.0, 0.0, 0.0]],
+    "bob.jpg": [[0.0, 1.0, 0.0]],
+    "alice_and_bob.jpg": [[0.9, 0.1, 0.0], [0.1, 0.9, 0.0]],
+    "nobody.jpg": [],
+}
+
+
+class TestEmbeddingsMode:
+    @pytest.fixture
+    def collections(self, tmp_path):
+        collections = LocalFaceCollections(
+            "amazon", str(tmp_path), embed_faces=lambda file: FACES[file]
+        )
+        collections.create_collection("team")
+        return collections
+
+    def test_recognize_locally(self, collections):
+        alice = collections.add_face("team", "alice.jpg").standardized_response
+        bob = collections.add_face("team", "bob.jpg").standardized_response
+
+        items = collections.recognize("team", "alice.jpg").standardized_response.items
+        assert items[0].face_id == alice.face_ids[0]
+        assert items[0].confidence == 1.0
+
+        items = collections.recognize(
+            "team", "alice_and_bob.jpg"
+        ).standardized_response.items
+        assert {item.face_id for item in items} == {
+            alice.face_ids[0],
+            bob.face_ids[0],
+        }
+
+    def test_list_faces_invalidated_on_add_and_delete(self, collections, tmp_path):
+        face_ids = collections.add_face(
+            "team", "alice.jpg"
+        ).standardized_response.face_ids
+        assert collections.list_faces("team").standardized_response.face_ids == face_ids
+
+        collections.add_face("team", "bob.jpg")
+        assert len(collections.list_faces("team").standardized_response.face_ids) == 2
+
+        collections.delete_face("team", face_ids[0])
+        assert (
+            face_ids[0]
+            not in collections.list_faces("team").standardized_response.face_ids
+        )
+
+        # persisted on disk
+        reloaded = LocalFaceCollections(
+            "amazon", str(tmp_path), embed_faces=lambda file: FACES[file]
+        )
+        assert len(reloaded.list_faces("team").standardized_response.face_ids) == 1
+
+    def test_no_face_detected(self, collections):
+        with pytest.raises(ProviderException):
+            collections.add_face("team", "nobody.jpg")
+
+    def test_image_url_downloaded(self, mocker, tmp_path):
+        def embed_faces(file):
+            assert file.endswith(".jpg")
+            with open(file) as image_file:
+                return FACES[image_file.read()]
+
+        collections = LocalFaceCollections(
+            "amazon", str(tmp_path), embed_faces=embed_faces
+        )
+        collections.create_collection("team")
+        get = mocker.patch("edenai_apis.utils.face_collection.requests.get")
+        get.return_value.content = b"alice.jpg"
+
+        alice = collections.add_face(
+            "team", "", file_url="https://example.com/alice.jpg"
+        ).standardized_response
+        items = collections.recognize(
+            "team", "", file_url="https://example.com/alice.jpg?size=large"
+        ).standardized_response.items
+
+        assert items[0].face_id == alice.face_ids[0]
+        get.assert_called_with(
+            "https://example.com/alice.jpg?size=large", timeout=mocker.ANY
+        )
+
+    def test_image_file_or_url_required(self, collections):
+        with pytest.raises(ProviderException) as error:
+            collections.add_face("team", "")
+        assert error.value.code == 400
+
+    def test_image_url_download_failed(self, mocker, collections):
+        mocker.patch(
+            "edenai_apis.utils.face_collection.requests.get",
+            side_effect=requests.ConnectionError("unreachable"),
+        )
+        with pytest.raises(ProviderException, match="unreachable") as error:
+            collections.add_face("team", "", file_url="https://example.com/a.jpg")
+        assert error.value.code == 400
+
+
+@pytest.mark.parametrize(
+    "collection_id", ["..", ".", "", "team/../..", "/tmp", "outside", "link"]
+)
+def test_collection_outside_store_rejected(tmp_path, collection_id):
+    store = tmp_path / "collections"
+    (tmp_path / "outside").mkdir()
+    collections = LocalFaceCollections(
+        "amazon", str(store), embed_faces=lambda file: FACES[file]
+    )
+    (store / "link").symlink_to(tmp_path / "outside")
+    if collection_id == "outside":
+        collection_id = str(tmp_path / "outside")
+
+    with pytest.raises(ProviderException, match="Invalid collection id"):
+        collections.delete_collection(collection_id)
+    with pytest.raises(ProviderException, match="Invalid collection id"):
+        collections.create_collection(collection_id)
+    assert (tmp_path / "outside").is_dir()
+    assert store.is_dir()
+
+
+def test_tokens_mode_list_faces_without_provider_call(mocker, tmp_path):
+    provider_method = mocker.patch.object(
+        LocalFaceCollections,
+        "_provider_method",
+        return_value=lambda **kwargs: ResponseType[FaceRecognitionAddFaceDataClass](
+            original_response={},
+            standardized_response=FaceRecognitionAddFaceDataClass(face_ids=["token"]),
+        ),
+    )
+    collections = LocalFaceCollections("amazon", str(tmp_path))
+    collections.create_collection("team")
+    collections.add_face("team", "alice.jpg")
+    provider_method.reset_mock()
+
+    face_ids = collections.list_faces("team").standardized_response.face_ids
+
+    assert face_ids == ["token"]
+    provider_method.assert_not_called()
@@ -0,0 +1,93 @@
+import gc
+import os
+import threading
+from dataclasses import dataclass
+
+import pytest
+
+from edenai_apis.utils.file_cache import TemporaryFilesCache
+from edenai_apis.utils.files import FileInfo
+
+
+@dataclass
+class CachedFile:
+    file_path: str
+
+
+@pytest.fixture
+def cache():
+    return TemporaryFilesCache(2, prefix="edenai_test_")
+
+
+def get(cache, key, created=None):
+    def create(directory):
+        if created is not None:
+            created.append(key)
+        path = os.path.join(directory, f"{key}.txt")
+        with open(path, "w") as file:
+            file.write(key)
+        return CachedFile(path)
+
+    return cache.get(key, create, lambda _: FileInfo(1, "text/plain", ["txt"]))
+
+
+def test_created_once(cache):
+    created = []
+
+    first, first_file = get(cache, "a", created)
+    second, second_file = get(cache, "a", created)
+
+    assert created == ["a"]
+    assert first is second
+    assert first_file is not second_file
+    assert first_file.file_path == second_file.file_path == first.file_path
+
+
+def test_no_file(cache):
+    assert cache.get("a", lambda _: None, lambda _: None) == (None, None)
+
+
+def test_evicted_file_deleted_once_released(cache):
+    cached, used = get(cache, "a")
+    get(cache, "b")
+    get(cache, "c")
+
+    # evicted, but still used
+    assert os.path.exists(cached.file_path)
+    del used
+    gc.collect()
+    assert not os.path.exists(cached.file_path)
+
+
+def test_released_file_kept_while_cached(cache):
+    cached, used = get(cache, "a")
+    del used
+    gc.collect()
+
+    assert os.path.exists(cached.file_path)
+
+
+def test_concurrent_creations(cache):
+    created = []
+    started = threading.Barrier(4, timeout=5)
+
+    def worker():
+        started.wait()
+        get(cache, "a", created)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert created == ["a"]
+
+
+def test_failed_creation(cache):
+    def create(directory):
+        raise ValueError("could not create")
+
+    with pytest.raises(ValueError):
+        cache.get("a", create, lambda _: None)
+    assert get(cache, "a")[0] is not None
@@ -0,0 +1,140 @@
+import os
+
+import pytest
+import PyPDF2
+from PyPDF2.generic import ArrayObject, DictionaryObject, FloatObject, NameObject
+from PIL import Image as Img
+from settings import base_path
+
+from edenai_apis.utils.file_probe import (
+    get_image_dimensions,
+    get_pdf_dimensions,
+    get_pdf_page_count,
+)
+from edenai_apis.utils.files import FileInfo, FileWrapper
+
+IMAGES = [
+    "features/ocr/data/ocr.png",
+    "features/ocr/data/receipt.jpg",
+    "features/image/data/face.jpeg",
+    "features/image/data/32x24.jpg",
+]
+PDFS = ["features/ocr/data/resume.pdf", "features/ocr/data/ocr_multipages.pdf"]
+
+
+def _mediabox(width, height):
+    return ArrayObject(
+        [FloatObject(0), FloatObject(0), FloatObject(width), FloatObject(height)]
+    )
+
+
+def _write_pdf(path, writer):
+    with open(path, "wb") as pdf_file:
+        writer.write(pdf_file)
+    return path
+
+
+class TestFileProbe:
+    @pytest.mark.parametrize("image", IMAGES)
+    def test_image_dimensions_same_as_pillow(self, image):
+        image_path = os.path.join(base_path, image)
+        assert get_image_dimensions(image_path) == Img.open(image_path).size
+
+    def test_image_dimensions_fallback_to_pillow(self, tmp_path):
+        image_path = str(tmp_path / "image.bmp")
+        Img.new("RGB", (13, 7)).save(image_path)
+        assert get_image_dimensions(image_path) == (13, 7)
+
+    @pytest.mark.parametrize("pdf", PDFS)
+    def test_pdf_same_as_pypdf2(self, pdf):
+        pdf_path = os.path.join(base_path, pdf)
+        reader = PyPDF2.PdfReader(pdf_path)
+        mediabox = reader.pages[0].mediabox
+
+        assert get_pdf_dimensions(pdf_path) == (
+            float(mediabox.width),
+            float(mediabox.height),
+        )
+        assert get_pdf_page_count(pdf_path) == len(reader.pages)
+
+    def test_pdf_mediabox_inherited(self, tmp_path):
+        writer = PyPDF2.PdfWriter()
+        writer.add_blank_page(width=100, height=200)
+        del writer.pages[0][NameObject("/MediaBox")]
+        writer._root_object["/Pages"][NameObject("/MediaBox")] = _mediabox(300, 400)
+        pdf_path = _write_pdf(str(tmp_path / "inherited.pdf"), writer)
+
+        assert get_pdf_dimensions(pdf_path) == (300, 400)
+
+    def test_pdf_unused_mediabox(self, tmp_path):
+        writer = PyPDF2.PdfWriter()
+        writer.add_blank_page(width=100, height=200)
+        # objects outside of the page tree are ignored
+        writer._add_object(DictionaryObject({NameObject("/MediaBox"): _mediabox(1, 1)}))
+        pdf_path = _write_pdf(str(tmp_path / "unused.pdf"), writer)
+
+        assert get_pdf_dimensions(pdf_path) == (100, 200)
+
+    def test_pdf_incremental_update(self, tmp_path):
+        writer = PyPDF2.PdfWriter()
+        writer.add_blank_page(width=100, height=200)
+        pdf_path = _write_pdf(str(tmp_path / "updated.pdf"), writer)
+        reader = PyPDF2.PdfReader(pdf_path)
+        page_reference = reader.trailer["/Root"]["/Pages"].raw_get("/Kids")[0]
+        with open(pdf_path, "rb") as pdf_file:
+            content = pdf_file.read()
+        xref_offset = int(content.rsplit(b"startxref", 1)[1].split()[0])
+        update = (
+            f"{page_reference.idnum} 0 obj\n<< /Type /Page /Parent "
+            f"{reader.trailer.raw_get('/Root').get_object().raw_get('/Pages').idnum} 0 R "
+            "/MediaBox [0 0 300 400] /Resources << >> >>\nendobj\n"
+        ).encode()
+        update_offset = len(content)
+        new_xref_offset = update_offset + len(update)
+        trailer = (
+            f"xref\n{page_reference.idnum} 1\n{update_offset:010d} 00000 n \n"
+            f"trailer\n<< /Size {reader.trailer['/Size']} "
+            f"/Root {reader.trailer.raw_get('/Root').idnum} 0 R /Prev {xref_offset} >>\n"
+            f"startxref\n{new_xref_offset}\n%%EOF\n"
+        ).encode()
+        with open(pdf_path, "ab") as pdf_file:
+            pdf_file.write(update + trailer)
+
+        # the first page is the updated object
+        assert get_pdf_dimensions(pdf_path) == (300, 400)
+
+    def test_empty_pdf(self, tmp_path):
+        pdf_path = tmp_path / "empty.pdf"
+        pdf_path.write_bytes(b"")
+        with pytest.raises(PyPDF2.errors.PdfReadError):
+            get_pdf_dimensions(str(pdf_path))
+
+
+class TestFileWrapperProbe:
+    def test_image(self):
+        image_path = os.path.join(base_path, "features/image/data/32x24.jpg")
+        file_wrapper = FileWrapper(image_path, "", FileInfo(0, "image/jpeg", ["jpg"]))
+        assert file_wrapper.dimensions == (32, 24)
+        assert file_wrapper.page_count == 1
+
+    def test_pdf(self):
+        pdf_path = os.path.join(base_path, "features/ocr/data/ocr_multipages.pdf")
+        file_wrapper = FileWrapper(
+            pdf_path, "", FileInfo(0, "application/pdf", ["pdf"])
+        )
+        assert file_wrapper.page_count == 4
+
+    def test_probed_once(self, mocker):
+        image_path = os.path.join(base_path, "features/image/data/32x24.jpg")
+        file_wrapper = FileWrapper(image_path, "", FileInfo(0, "image/jpeg", ["jpg"]))
+        probe = mocker.patch(
+            "edenai_apis.utils.files.get_image_dimensions", return_value=(32, 24)
+        )
+        assert file_wrapper.dimensions == file_wrapper.dimensions == (32, 24)
+        probe.assert_called_once_with(image_path)
+
+    def test_other_files(self):
+        audio_path = os.path.join(base_path, "features/audio/data/small.mp3")
+        file_wrapper = FileWrapper(audio_path, "", FileInfo(0, "audio/mpeg", ["mp3"]))
+        assert file_wrapper.dimensions is None
+        assert file_wrapper.page_count is None
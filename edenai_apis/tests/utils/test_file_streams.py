@@ -0,0 +1,107 @@
+import base64
+import json
+import os
+
+import pytest
+
+from edenai_apis.utils.file_streams import (
+    CHUNK_SIZE,
+    Base64FileStream,
+    JsonFileStream,
+    open_file_mmap,
+)
+from edenai_apis.utils.files import FileInfo, FileWrapper
+
+
+def read_all(stream, size=8192):
+    return b"".join(iter(lambda: stream.read(size), b""))
+
+
+@pytest.fixture(params=[0, 1, 2, 3, 1000, CHUNK_SIZE, 2 * CHUNK_SIZE + 1])
+def file_path(request, tmp_path):
+    path = tmp_path / "document.pdf"
+    path.write_bytes(os.urandom(request.param))
+    return str(path)
+
+
+def file_base64(file_path):
+    with open(file_path, "rb") as file:
+        return base64.b64encode(file.read())
+
+
+class TestBase64FileStream:
+    def test_read_by_chunks(self, file_path):
+        stream = Base64FileStream(file_path, prefix=b"<", suffix=b">")
+
+        content = read_all(stream)
+
+        assert content == b"<" + file_base64(file_path) + b">"
+        assert len(stream) == len(content)
+
+    def test_rewind(self, file_path):
+        stream = Base64FileStream(file_path)
+        stream.read(10)
+
+        assert stream.seek(0) == 0
+        assert stream.read() == file_base64(file_path)
+        assert stream.tell() == len(stream)
+
+    def test_chunk_size_multiple_of_3(self, file_path):
+        with pytest.raises(ValueError):
+            Base64FileStream(file_path, chunk_size=1000)
+
+
+class TestJsonFileStream:
+    def test_files_embedded(self, file_path):
+        stream = JsonFileStream(
+            {"modelTypes": ["finance/"], "name": "é"},
+            {"image": file_path, "reference": file_path},
+            data_uri=True,
+        )
+
+        content = read_all(stream, 1000)
+
+        assert len(stream) == len(content)
+        payload = json.loads(content)
+        expected = "data:application/pdf;base64," + file_base64(file_path).decode()
+        assert payload == {
+            "modelTypes": ["finance/"],
+            "name": "é",
+            "image": expected,
+            "reference": expected,
+        }
+
+    def test_rewind(self, file_path):
+        stream = JsonFileStream({}, {"image": file_path})
+        content = stream.read()
+
+        stream.seek(0)
+
+        assert stream.read() == content
+        assert json.loads(content)["image"] == file_base64(file_path).decode()
+
+
+class TestFileWrapperStreams:
+    def test_streams(self, file_path):
+        wrapper = FileWrapper(
+            file_path,
+            "",
+            FileInfo(os.path.getsize(file_path), "application/pdf", ".pdf"),
+        )
+        with open(file_path, "rb") as file:
+            content = file.read()
+
+        with wrapper.open() as file:
+            assert file.read() == content
+        with wrapper.mmap() as mapped:
+            assert mapped[:] == content
+        assert wrapper.base64_stream(
+            data_uri=True
+        ).read() == b"data:application/pdf;base64," + base64.b64encode(content)
+
+    def test_mmap_empty_file(self, tmp_path):
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+
+        with open_file_mmap(str(path)) as mapped:
+            assert mapped == b""
@@ -0,0 +1,147 @@
+import pytest
+
+from edenai_apis.apis.huggingface import helpers, huggingface_api
+from edenai_apis.apis.huggingface.helpers import (
+    TranslationWarmup,
+    _translation_models,
+    hottest_translation_pairs,
+    record_translation_pair,
+    translation_model,
+)
+from edenai_apis.apis.huggingface.huggingface_api import HuggingfaceApi
+from edenai_apis.tests.benchmarks.stubs import ReplayStubs
+from edenai_apis.utils.exception import ProviderException
+
+LOADING = {"error": "Model is currently loading", "estimated_time": 20.0}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(huggingface_api, "sleep", sleeps.append)
+    return sleeps
+
+
+@pytest.fixture
+def pairs_counts(monkeypatch):
+    monkeypatch.setattr(helpers, "_pairs_counts", helpers.Counter())
+
+
+def replay_responses(stubs, responses):
+    """Replay `responses` in turn (status code, json), the last one afterwards"""
+    urls = []
+
+    def http_response(request):
+        urls.append(request.url)
+        status_code, stubs.response = responses[min(len(urls), len(responses)) - 1]
+        response = stubs_http_response(request)
+        response.status_code = status_code
+        return response
+
+    stubs_http_response = stubs._http_response
+    stubs._http_response = http_response
+    return urls
+
+
+def translate(source_language="en", target_language="fr"):
+    return HuggingfaceApi().translation__automatic_translation(
+        source_language, target_language, "Hello"
+    )
+
+
+def test_translation_models():
+    models = _translation_models(
+        [
+            "Helsinki-NLP/opus-tatoeba-en-ja",
+            "Helsinki-NLP/opus-mt-tc-big-en-fi",
+            "Helsinki-NLP/opus-mt-en-fi",
+            "Helsinki-NLP/opus-mt-tc-base-uk-hu",
+            "Helsinki-NLP/opus-mt-en-ROMANCE",
+        ]
+    )
+
+    # opus-mt models are preferred
+    assert models == {
+        ("en", "ja"): "Helsinki-NLP/opus-tatoeba-en-ja",
+        ("en", "fi"): "Helsinki-NLP/opus-mt-en-fi",
+    }
+    assert translation_model("en", "de") == "Helsinki-NLP/opus-mt-en-de"
+    assert translation_model("en", "xx") is None
+
+
+def test_translation_single_request(sleeps, pairs_counts):
+    with ReplayStubs() as stubs:
+        urls = replay_responses(stubs, [(200, [{"translation_text": "Bonjour"}])])
+        result = translate()
+
+    assert result.standardized_response.text == "Bonjour"
+    assert urls == [f"{HuggingfaceApi.base_url}/Helsinki-NLP/opus-mt-en-fr"]
+    assert sleeps == []
+
+
+def test_unknown_language_pair(pairs_counts):
+    with ReplayStubs() as stubs:
+        urls = replay_responses(stubs, [(200, [{"translation_text": "Bonjour"}])])
+        with pytest.raises(ProviderException, match="No model") as error:
+            translate("en", "xx")
+
+    assert error.value.code == 400
+    assert urls == []
+
+
+def test_wait_for_loading_model(sleeps, pairs_counts):
+    with ReplayStubs() as stubs:
+        urls = replay_responses(
+            stubs,
+            [
+                (503, LOADING),
+                (503, {**LOADING, "estimated_time": 0.2}),
+                (200, [{"translation_text": "Bonjour"}]),
+            ],
+        )
+        result = translate()
+
+    assert result.standardized_response.text == "Bonjour"
+    assert len(urls) == 3
+    assert sleeps == [20.0, 1.0]
+
+
+def test_loading_wait_bounded(monkeypatch, sleeps, pairs_counts):
+    monkeypatch.setattr(HuggingfaceApi, "model_loading_timeout", 30)
+    clock = [0.0]
+    monkeypatch.setattr(huggingface_api, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(
+        huggingface_api,
+        "sleep",
+        lambda seconds: (
+            sleeps.append(seconds),
+            clock.__setitem__(0, clock[0] + seconds),
+        ),
+    )
+    with ReplayStubs() as stubs:
+        urls = replay_responses(stubs, [(503, LOADING)])
+        with pytest.raises(ProviderException, match="loading"):
+            HuggingfaceApi().translation__automatic_translation("en", "fr", "Hello")
+
+    assert sleeps == [20.0, 10.0]
+    assert len(urls) == 3
+
+
+def test_hottest_pairs(pairs_counts):
+    for pair in [("en", "fr"), ("en", "de"), ("en", "fr"), ("fr", "en")]:
+        record_translation_pair(*pair)
+
+    assert hottest_translation_pairs(2) == [("en", "fr"), ("en", "de")]
+
+
+def test_warmup(pairs_counts):
+    record_translation_pair("en", "fr")
+    record_translation_pair("en", "xx")
+    with ReplayStubs() as stubs:
+        urls = replay_responses(stubs, [(503, LOADING)])
+        warmup = TranslationWarmup(interval=60)
+        assert warmup.warm_up() == ["Helsinki-NLP/opus-mt-en-fr"]
+        warmup.start()
+        warmup.stop(timeout=5)
+
+    assert urls == [f"{HuggingfaceApi.base_url}/Helsinki-NLP/opus-mt-en-fr"] * 2
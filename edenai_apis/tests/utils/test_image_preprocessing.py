@@ -0,0 +1,169 @@
+import os
+
+import pytest
+from PIL import Image as Img
+
+from edenai_apis.features.image.landmark_detection.landmark_detection_dataclass import (
+    LandmarkDetectionDataClass,
+    LandmarkItem,
+    LandmarkVertice,
+)
+from edenai_apis.features.image.logo_detection.logo_detection_dataclass import (
+    LogoBoundingPoly,
+    LogoDetectionDataClass,
+    LogoItem,
+    LogoVertice,
+)
+from edenai_apis.utils.files import FileInfo, FileWrapper
+from edenai_apis.utils.image_preprocessing import (
+    PreprocessedImage,
+    preprocess_image,
+    preprocess_input_image,
+    rescale_image_result,
+)
+from edenai_apis.utils.types import ResponseType
+
+
+@pytest.fixture
+def png_path(tmp_path):
+    path = str(tmp_path / "photo.png")
+    Img.effect_noise((400, 200), 64).convert("RGB").save(path)
+    return path
+
+
+def file_wrapper(path):
+    return FileWrapper(path, "", FileInfo(os.path.getsize(path), "image/png", ".png"))
+
+
+class TestPreprocessImage:
+    def test_image_within_limits_is_kept(self, png_path, tmp_path):
+        assert (
+            preprocess_image(
+                png_path,
+                str(tmp_path),
+                max_pixels=400 * 200,
+                preferred_file_types=["image/png"],
+            )
+            is None
+        )
+
+    def test_downscale(self, png_path, tmp_path):
+        preprocessed = preprocess_image(png_path, str(tmp_path), max_pixels=100 * 50)
+
+        with Img.open(preprocessed.file_path) as image:
+            assert image.size == (100, 50)
+            assert image.format == "PNG"
+        assert (preprocessed.scale_x, preprocessed.scale_y) == (4, 4)
+
+    def test_reencode_to_preferred_type(self, png_path, tmp_path):
+        preprocessed = preprocess_image(
+            png_path, str(tmp_path), preferred_file_types=["image/jpeg"]
+        )
+
+        assert preprocessed.media_type == "image/jpeg"
+        with Img.open(preprocessed.file_path) as image:
+            assert image.format == "JPEG"
+            assert image.size == (400, 200)
+
+    def test_max_bytes(self, png_path, tmp_path):
+        preprocessed = preprocess_image(png_path, str(tmp_path), max_bytes=10_000)
+
+        assert os.path.getsize(preprocessed.file_path) <= 10_000
+        assert preprocessed.scale_x > 1
+
+
+class TestPreprocessInputImage:
+    @pytest.fixture(autouse=True)
+    def constraints(self, mocker):
+        return mocker.patch(
+            "edenai_apis.utils.image_preprocessing._image_constraints",
+            return_value={
+                "max_pixels": 100 * 50,
+                "preferred_file_types": ["image/jpeg"],
+            },
+        )
+
+    def test_file_replaced(self, png_path):
+        args = {"file": file_wrapper(png_path)}
+
+        new_args, preprocessed = preprocess_input_image(
+            "google", "image", "logo_detection", "", args
+        )
+
+        assert new_args["file"].file_path == preprocessed.file_path
+        assert new_args["file"].file_info.file_media_type == "image/jpeg"
+        assert "jpg" in new_args["file"].file_info.file_extension
+        assert args["file"].file_path == png_path
+
+    def test_preprocessed_once(self, png_path):
+        args = {"file": file_wrapper(png_path)}
+
+        _, first = preprocess_input_image("google", "image", "logo_detection", "", args)
+        _, second = preprocess_input_image(
+            "amazon", "image", "face_detection", "", args
+        )
+
+        assert first is second
+
+    @pytest.mark.parametrize(
+        ("feature", "subfeature"),
+        [("image", "anonymization"), ("ocr", "ocr"), ("image", "face_recognition")],
+    )
+    def test_not_preprocessed_subfeatures(self, png_path, feature, subfeature):
+        args = {"file": file_wrapper(png_path)}
+
+        new_args, preprocessed = preprocess_input_image(
+            "google", feature, subfeature, "", args
+        )
+
+        assert new_args is args
+        assert preprocessed is None
+
+
+class TestRescaleImageResult:
+    def test_pixel_coordinates_rescaled(self):
+        result = ResponseType[LogoDetectionDataClass](
+            original_response={},
+            standardized_response=LogoDetectionDataClass(
+                items=[
+                    LogoItem(
+                        description="logo",
+                        score=0.9,
+                        bounding_poly=LogoBoundingPoly(
+                            vertices=[
+                                LogoVertice(x=10, y=20),
+                                LogoVertice(x=None, y=5),
+                            ]
+                        ),
+                    )
+                ]
+            ),
+        )
+
+        rescale_image_result(result, PreprocessedImage("", "image/jpeg", 2, 4))
+
+        vertices = result.standardized_response.items[0].bounding_poly.vertices
+        assert [(vertice.x, vertice.y) for vertice in vertices] == [
+            (20, 80),
+            (None, 20),
+        ]
+
+    def test_integer_coordinates_stay_integers(self):
+        result = ResponseType[LandmarkDetectionDataClass](
+            original_response={},
+            standardized_response=LandmarkDetectionDataClass(
+                items=[
+                    LandmarkItem(
+                        description="tower",
+                        confidence=0.9,
+                        bounding_box=[LandmarkVertice(x=3, y=5)],
+                    )
+                ]
+            ),
+        )
+
+        rescale_image_result(result, PreprocessedImage("", "image/jpeg", 1.5, 1.5))
+
+        vertice = result.standardized_response.items[0].bounding_box[0]
+        assert (vertice.x, vertice.y) == (4, 8)
+        assert isinstance(vertice.x, int)
@@ -0,0 +1,115 @@
+import pytest
+
+from edenai_apis.interface import compute_output
+from edenai_apis.tests.benchmarks.stubs import ReplayStubs
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.instrumentation import (
+    CallTrace,
+    LatencyHistograms,
+    add_hook,
+    current_trace,
+    instrument_call,
+    remove_hook,
+    traced,
+)
+
+TRANSLATION_ARGS = {"text": "Hello", "source_language": "en", "target_language": "fr"}
+
+
+@pytest.fixture
+def traces():
+    recorded = []
+    add_hook(recorded.append)
+    yield recorded
+    remove_hook(recorded.append)
+
+
+def test_disabled():
+    calls = []
+
+    @instrument_call
+    def compute(provider_name, feature, subfeature):
+        calls.append(current_trace())
+        with traced("provider_call"):
+            return "result"
+
+    assert compute("deepl", "translation", "automatic_translation") == "result"
+    assert calls == [None]
+
+
+def test_compute_output_phases(traces):
+    with ReplayStubs() as stubs:
+        stubs.replay({"translations": [{"text": "Bonjour"}]})
+        compute_output(
+            "deepl", "translation", "automatic_translation", TRANSLATION_ARGS
+        )
+
+    assert len(traces) == 1
+    trace = traces[0]
+    assert (trace.provider, trace.feature, trace.subfeature) == (
+        "deepl",
+        "translation",
+        "automatic_translation",
+    )
+    assert {
+        "constraints",
+        "languages",
+        "provider_instantiation",
+        "provider_call",
+        "http",
+        "standardization",
+        "model_dump",
+    } <= set(trace.phases)
+    assert trace.http_calls == 1
+    assert trace.bytes_sent > 0
+    assert trace.bytes_received == len('{"translations": [{"text": "Bonjour"}]}')
+    assert trace.phases["provider_call"] >= trace.phases["http"]
+    assert sum(trace.phases.values()) > 0
+    assert trace.duration >= trace.phases["constraints"] + trace.phases["provider_call"]
+    assert trace.error is None
+    assert all(
+        trace.start_time_ns <= start <= end <= trace.end_time_ns
+        for _, start, end in trace.spans
+    )
+
+
+def test_error(traces):
+    @instrument_call
+    def compute(provider_name, feature, subfeature):
+        raise ProviderException("Quota exceeded")
+
+    with pytest.raises(ProviderException):
+        compute("deepl", "translation", "automatic_translation")
+
+    assert traces[0].error == "ProviderException: Quota exceeded"
+
+
+def test_failing_hook_does_not_fail_the_call():
+    def hook(trace):
+        raise ValueError("hook error")
+
+    @instrument_call
+    def compute(provider_name, feature, subfeature):
+        return "result"
+
+    add_hook(hook)
+    try:
+        with pytest.warns(RuntimeWarning, match="hook error"):
+            assert compute("deepl", "translation", "automatic_translation") == "result"
+    finally:
+        remove_hook(hook)
+
+
+def test_latency_histograms():
+    histograms = LatencyHistograms(buckets_ms=(10, 100))
+    for duration, error in ((0.005, False), (0.05, False), (0.06, True), (2, False)):
+        trace = CallTrace("google", "text", "sentiment_analysis", duration=duration)
+        trace.error = "error" if error else None
+        histograms(trace)
+
+    snapshot = histograms.snapshot()["google/text/sentiment_analysis"]
+
+    assert snapshot["count"] == 4
+    assert snapshot["errors"] == 1
+    assert snapshot["sum_ms"] == pytest.approx(2115)
+    assert snapshot["buckets"] == {"10": 1, "100": 2, "+Inf": 1}
@@ -0,0 +1,229 @@
+import sqlite3
+import threading
+
+import pytest
+
+from edenai_apis.utils import monitoring
+from edenai_apis.utils.monitoring import (
+    BLOCK,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    HISTORY_COLUMNS,
+    MonitoringWriter,
+    insert_api_call,
+    set_monitoring_writer,
+)
+
+
+def event(provider="google", error=None):
+    return {
+        "provider": provider,
+        "feature": "text",
+        "subfeature": "sentiment_analysis",
+        "error": error,
+    }
+
+
+@pytest.fixture
+def sqlite_connect(tmp_path):
+    path = str(tmp_path / "history.db")
+    connection = sqlite3.connect(path)
+    connection.execute(f"create table history ({', '.join(HISTORY_COLUMNS)})")
+    connection.close()
+
+    def connect():
+        return sqlite3.connect(path, check_same_thread=False)
+
+    return connect
+
+
+def rows(connect, columns="provider, error"):
+    connection = connect()
+    try:
+        return connection.execute(f"select {columns} from history").fetchall()
+    finally:
+        connection.close()
+
+
+class FakeConnection:
+    """Records the statements, `execute` waits for `release` if given"""
+
+    def __init__(self, statements, release=None, fail=False):
+        self.statements = statements
+        self.release = release
+        self.fail = fail
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement, parameters):
+        if self.release is not None:
+            assert self.release.wait(5)
+        if self.fail:
+            raise ConnectionError("server closed the connection")
+        self.statements.append((statement, parameters))
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class TestMonitoringWriter:
+    def test_flush(self, sqlite_connect):
+        writer = MonitoringWriter(sqlite_connect, placeholder="?", flush_interval=10)
+        for provider in ("google", "amazon", "microsoft"):
+            assert writer.submit(event(provider))
+
+        assert writer.flush(timeout=5)
+
+        assert sorted(rows(sqlite_connect)) == [
+            ("amazon", None),
+            ("google", None),
+            ("microsoft", None),
+        ]
+        assert writer.written == 3
+        writer.close()
+
+    def test_batches(self):
+        statements = []
+        writer = MonitoringWriter(
+            lambda: FakeConnection(statements), batch_size=2, flush_interval=10
+        )
+        for _ in range(5):
+            writer.submit(event())
+
+        assert writer.flush(timeout=5)
+
+        assert [len(parameters) for _, parameters in statements] == [
+            2 * len(HISTORY_COLUMNS),
+            2 * len(HISTORY_COLUMNS),
+            len(HISTORY_COLUMNS),
+        ]
+        assert statements[0][0].count("(%s") == 2
+        writer.close()
+
+    def test_written_after_flush_interval(self, sqlite_connect):
+        writer = MonitoringWriter(sqlite_connect, placeholder="?", flush_interval=0.05)
+        writer.submit(event())
+
+        with writer._queue.all_tasks_done:
+            assert writer._queue.all_tasks_done.wait_for(
+                lambda: not writer._queue.unfinished_tasks, timeout=5
+            )
+
+        assert rows(sqlite_connect) == [("google", None)]
+        writer.close()
+
+    @pytest.mark.parametrize(
+        ("policy", "kept"),
+        [(DROP_NEWEST, ["first", "second"]), (DROP_OLDEST, ["first", "third"])],
+    )
+    def test_queue_full(self, policy, kept):
+        statements = []
+        release = threading.Event()
+        writer = MonitoringWriter(
+            lambda: FakeConnection(statements, release),
+            max_queue_size=1,
+            batch_size=1,
+            flush_interval=0.01,
+            policy=policy,
+        )
+        writer.submit(event("first"))
+        # the worker is writing "first", the queue has room for one event
+        while writer._queue.qsize():
+            pass
+        writer.submit(event("second"))
+        writer.submit(event("third"))
+        release.set()
+
+        assert writer.flush(timeout=5)
+
+        assert [parameters[0] for _, parameters in statements] == kept
+        assert writer.dropped == 1
+        writer.close()
+
+    def test_block_policy_timeout(self):
+        release = threading.Event()
+        writer = MonitoringWriter(
+            lambda: FakeConnection([], release),
+            max_queue_size=1,
+            batch_size=1,
+            flush_interval=0.01,
+            policy=BLOCK,
+            block_timeout=0.01,
+        )
+        writer.submit(event())
+        while writer._queue.qsize():
+            pass
+        assert writer.submit(event())
+
+        assert not writer.submit(event())
+
+        release.set()
+        writer.close()
+        assert writer.dropped == 1
+
+    def test_broken_connection_replaced(self):
+        statements = []
+        connections = [
+            FakeConnection(statements, fail=True),
+            FakeConnection(statements),
+        ]
+        writer = MonitoringWriter(connections.pop(0), flush_interval=10)
+        writer.pool._connect = lambda: connections.pop(0)
+        writer.submit(event())
+
+        assert writer.flush(timeout=5)
+
+        assert len(statements) == 1
+        assert writer.written == 1
+        assert writer.failed == 0
+        writer.close()
+
+    def test_failed_connection(self):
+        def connect():
+            raise ConnectionError("db unreachable")
+
+        writer = MonitoringWriter(connect, flush_interval=10)
+        writer.submit(event())
+
+        with pytest.warns(RuntimeWarning, match="db unreachable"):
+            assert writer.flush(timeout=5)
+
+        assert writer.failed == 1
+        writer.close()
+
+    def test_close_flushes(self, sqlite_connect):
+        writer = MonitoringWriter(sqlite_connect, placeholder="?", flush_interval=10)
+        writer.submit(event())
+
+        writer.close()
+
+        assert rows(sqlite_connect) == [("google", None)]
+        assert not writer.submit(event())
+
+
+def test_insert_api_call(sqlite_connect):
+    writer = MonitoringWriter(sqlite_connect, placeholder="?", flush_interval=10)
+    set_monitoring_writer(writer)
+    try:
+        insert_api_call(
+            provider="deepl",
+            feature="translation",
+            subfeature="automatic_translation",
+            user_email="user@example.com",
+            error="x" * 300,
+        )
+        writer.flush(timeout=5)
+    finally:
+        set_monitoring_writer(None)
+
+    ((provider, edenai_user, error, host),) = rows(
+        sqlite_connect, "provider, edenai_user, error, host"
+    )
+    assert (provider, edenai_user) == ("deepl", "user@example.com")
+    assert error == "x" * 255
+    assert host == monitoring._host()
@@ -0,0 +1,217 @@
+import json
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+import pytest
+
+from edenai_apis.tests.benchmarks.stubs import ReplayStubs
+from edenai_apis.utils import multi_subfeatures
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.instrumentation import add_hook, remove_hook
+from edenai_apis.utils.multi_subfeatures import (
+    combinable_subfeatures,
+    compute_output_multi,
+)
+
+ARGS = {"text": "Eden AI is great", "language": "en"}
+ANNOTATE_TEXT_RESPONSE = {
+    "sentences": [
+        {
+            "text": {"content": "Eden AI is great", "beginOffset": 0},
+            "sentiment": {"magnitude": 0.9, "score": 0.9},
+        }
+    ],
+    "tokens": [
+        {
+            "text": {"content": "great", "beginOffset": 11},
+            "partOfSpeech": {"tag": "ADJ"},
+            "lemma": "great",
+        }
+    ],
+    "entities": [
+        {
+            "name": "Eden AI",
+            "type": "ORGANIZATION",
+            "salience": 0.8,
+            "mentions": [
+                {
+                    "text": {"content": "Eden AI", "beginOffset": 0},
+                    "type": "PROPER",
+                    "sentiment": {"magnitude": 0.6, "score": 0.6},
+                }
+            ],
+        }
+    ],
+    "documentSentiment": {"magnitude": 0.9, "score": 0.9},
+    "language": "en",
+}
+
+
+@pytest.fixture
+def separate_calls(monkeypatch):
+    """`compute_output` calls of the subfeatures computed separately"""
+    calls = []
+
+    def compute_output(provider_name, feature, subfeature, args, **kwargs):
+        calls.append((subfeature, threading.current_thread(), kwargs))
+        time.sleep(0.02)
+        return {
+            "status": "success",
+            "provider": provider_name,
+            "subfeature": subfeature,
+        }
+
+    monkeypatch.setattr(multi_subfeatures, "compute_output", compute_output)
+    return calls
+
+
+def test_combinable_subfeatures():
+    assert combinable_subfeatures(
+        "google", "text", ["sentiment_analysis", "generation", "syntax_analysis"]
+    ) == ["sentiment_analysis", "syntax_analysis"]
+    assert combinable_subfeatures("amazon", "text", ["sentiment_analysis"]) == []
+
+
+def test_combined_request():
+    subfeatures = [
+        "sentiment_analysis",
+        "named_entity_recognition",
+        "syntax_analysis",
+        "entity_sentiment",
+    ]
+    with ReplayStubs() as stubs:
+        stubs.replay(ANNOTATE_TEXT_RESPONSE)
+        results = compute_output_multi("google", "text", subfeatures, ARGS)
+
+    assert stubs.calls == 1
+    assert list(results) == subfeatures
+    assert all(result["provider"] == "google" for result in results.values())
+    sentiment = results["sentiment_analysis"]["standardized_response"]
+    assert sentiment["general_sentiment"] == "Positive"
+    entities = results["named_entity_recognition"]["standardized_response"]["items"]
+    assert [entity["entity"] for entity in entities] == ["Eden AI"]
+    syntax = results["syntax_analysis"]["standardized_response"]["items"]
+    assert [(token["word"], token["lemma"]) for token in syntax] == [("great", "great")]
+    mentions = results["entity_sentiment"]["standardized_response"]["items"]
+    assert [(m["text"], m["sentiment"]) for m in mentions] == [("Eden AI", "Positive")]
+
+
+def test_fallback_concurrent_calls(separate_calls):
+    subfeatures = ["sentiment_analysis", "keyword_extraction", "sentiment_analysis"]
+
+    results = compute_output_multi("amazon", "text", subfeatures, ARGS)
+
+    assert list(results) == ["sentiment_analysis", "keyword_extraction"]
+    assert results["keyword_extraction"]["subfeature"] == "keyword_extraction"
+    assert sorted(subfeature for subfeature, *_ in separate_calls) == [
+        "keyword_extraction",
+        "sentiment_analysis",
+    ]
+    assert len({thread for _, thread, _ in separate_calls}) == 2
+
+
+def test_combined_and_separate_calls(separate_calls):
+    subfeatures = ["generation", "sentiment_analysis", "named_entity_recognition"]
+    with ReplayStubs() as stubs:
+        stubs.replay(ANNOTATE_TEXT_RESPONSE)
+        results = compute_output_multi("google", "text", subfeatures, ARGS)
+
+    assert stubs.calls == 1
+    assert [subfeature for subfeature, *_ in separate_calls] == ["generation"]
+    assert list(results) == subfeatures
+    assert results["sentiment_analysis"]["standardized_response"]["items"]
+
+
+def test_single_combinable_subfeature(separate_calls):
+    compute_output_multi("google", "text", ["sentiment_analysis", "generation"], ARGS)
+
+    assert sorted(subfeature for subfeature, *_ in separate_calls) == [
+        "generation",
+        "sentiment_analysis",
+    ]
+
+
+def test_no_subfeature():
+    with pytest.raises(ProviderException, match="At least one subfeature"):
+        compute_output_multi("google", "text", [], ARGS)
+
+
+def test_separate_calls_caller_context(monkeypatch):
+    variable = ContextVar("variable", default="unset")
+    variable.set("caller")
+    values = []
+
+    def compute_output(provider_name, feature, subfeature, args, **kwargs):
+        values.append(variable.get())
+        time.sleep(0.01)
+        return {}
+
+    monkeypatch.setattr(multi_subfeatures, "compute_output", compute_output)
+
+    compute_output_multi(
+        "amazon", "text", ["sentiment_analysis", "syntax_analysis"], ARGS
+    )
+
+    assert values == ["caller", "caller"]
+
+
+def test_combined_request_options(monkeypatch):
+    acquired = []
+    policy_calls = []
+
+    class RateLimiter:
+        def acquire(self, provider, feature, subfeature, api_keys):
+            acquired.append((provider, feature, subfeature))
+            return nullcontext()
+
+    class Policy:
+        def call(self, provider, feature, subfeature, func):
+            policy_calls.append(subfeature)
+            return func()
+
+    monkeypatch.setattr(multi_subfeatures, "get_rate_limiter", RateLimiter)
+    monkeypatch.setattr(multi_subfeatures, "get_resilience_policy", Policy)
+    traces = []
+    add_hook(traces.append)
+    try:
+        with ReplayStubs() as stubs:
+            stubs.replay(ANNOTATE_TEXT_RESPONSE)
+            results = compute_output_multi(
+                "google",
+                "text",
+                ["sentiment_analysis", "syntax_analysis"],
+                ARGS,
+                as_json=True,
+                rate_limit=True,
+                resilience=True,
+            )
+    finally:
+        remove_hook(traces.append)
+
+    assert stubs.calls == 1
+    assert acquired == [("google", "text", "sentiment_analysis")]
+    assert policy_calls == ["sentiment_analysis"]
+    sentiment = json.loads(results["sentiment_analysis"])
+    assert sentiment["standardized_response"]["general_sentiment"] == "Positive"
+    assert [trace.subfeature for trace in traces] == [
+        "sentiment_analysis+syntax_analysis"
+    ]
+    assert "provider_call" in traces[0].phases
+
+
+def test_unsupported_options_computed_separately(separate_calls):
+    compute_output_multi(
+        "google",
+        "text",
+        ["sentiment_analysis", "syntax_analysis"],
+        ARGS,
+        chunk_text=True,
+    )
+
+    assert sorted(subfeature for subfeature, *_ in separate_calls) == [
+        "sentiment_analysis",
+        "syntax_analysis",
+    ]
+    assert all(kwargs["chunk_text"] for *_, kwargs in separate_calls)
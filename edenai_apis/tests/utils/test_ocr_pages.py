@@ -0,0 +1,133 @@
+import PyPDF2
+import pytest
+
+from edenai_apis.features.ocr import Bounding_box, OcrDataClass
+from edenai_apis.interface_v2 import Ocr
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.ocr_pages import merge_pages_results, ocr_pdf_pages
+from edenai_apis.utils.types import ResponseType
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """3 pages pdf, the last page being twice as high as the others"""
+    writer = PyPDF2.PdfWriter()
+    for height in (100, 100, 200):
+        writer.add_blank_page(width=50, height=height)
+    path = tmp_path / "document.pdf"
+    with open(path, "wb") as pdf_file:
+        writer.write(pdf_file)
+    return str(path)
+
+
+def fake_ocr(file, language, file_url=""):
+    page = file.split("page_")[-1].split(".")[0]
+    return ResponseType[OcrDataClass](
+        original_response={"file": file, "language": language},
+        standardized_response=OcrDataClass(
+            text=f"page {page}",
+            bounding_boxes=[
+                Bounding_box(text=page, left=0.1, top=0.5, width=0.2, height=0.5)
+            ],
+        ),
+    )
+
+
+class TestMergePagesResults:
+    def test_boxes_are_stacked_by_page_height(self):
+        page = OcrDataClass(
+            text="text",
+            bounding_boxes=[
+                Bounding_box(text="a", left=0.1, top=0.5, width=0.2, height=0.5),
+                Bounding_box(text="b", left=None, top=None, width=None, height=None),
+            ],
+        )
+
+        merged = merge_pages_results([page, page], [100, 300])
+
+        assert merged.text == "text\ntext"
+        boxes = merged.bounding_boxes
+        assert [(box.top, box.height) for box in boxes] == [
+            (0.125, 0.125),
+            (None, None),
+            (0.625, 0.375),
+            (None, None),
+        ]
+        assert all(box.left in (0.1, None) for box in boxes)
+
+
+class TestOcrPdfPages:
+    @pytest.fixture
+    def ocr_mock(self, mocker):
+        return mocker.patch.object(Ocr, "ocr", return_value=fake_ocr)
+
+    def test_all_pages(self, ocr_mock, pdf_path):
+        response = ocr_pdf_pages("google", pdf_path, "en")
+
+        standardized = response.standardized_response
+        assert standardized.text == "page 1\npage 2\npage 3"
+        assert [box.text for box in standardized.bounding_boxes] == ["1", "2", "3"]
+        assert [box.top for box in standardized.bounding_boxes] == [0.125, 0.375, 0.75]
+        assert [page["page"] for page in response.original_response] == [1, 2, 3]
+        assert all(
+            page["response"]["file"].endswith(".pdf")
+            for page in response.original_response
+        )
+
+    def test_page_range(self, ocr_mock, pdf_path):
+        response = ocr_pdf_pages("google", pdf_path, "en", pages="2-3", max_workers=1)
+
+        assert response.standardized_response.text == "page 2\npage 3"
+        assert [page["page"] for page in response.original_response] == [2, 3]
+
+    def test_pages_as_images_for_providers_without_pdf_support(
+        self, mocker, ocr_mock, pdf_path
+    ):
+        def fake_convert(pdf_path, output_dir, pages, dpi):
+            paths = []
+            for page in pages:
+                path = f"{output_dir}/page_{page + 1}.png"
+                with open(path, "wb") as image_file:
+                    image_file.write(b"\x89PNG\r\n\x1a\n")
+                paths.append(path)
+            return paths
+
+        convert_mock = mocker.patch(
+            "edenai_apis.utils.ocr_pages.convert_pdf_pages_to_images",
+            side_effect=fake_convert,
+        )
+
+        response = ocr_pdf_pages("microsoft", pdf_path, "en", pages=[1])
+
+        convert_mock.assert_called_once()
+        assert response.original_response[0]["response"]["file"].endswith(".png")
+
+    def test_pages_file_info(self, mocker, ocr_mock, pdf_path):
+        constraints_mock = mocker.patch(
+            "edenai_apis.utils.ocr_pages.validate_all_provider_constraints",
+            side_effect=lambda provider, feature, subfeature, phase, args: args,
+        )
+
+        ocr_pdf_pages("google", pdf_path, "en", pages=[1])
+
+        file_info = constraints_mock.call_args.args[4]["file"].file_info
+        assert file_info.file_media_type == "application/pdf"
+        assert file_info.file_extension == ["pdf"]
+
+    def test_provider_errors_are_classified(self, mocker, pdf_path):
+        def failing_ocr(file, language, file_url=""):
+            raise ProviderException("Too many requests", code=429)
+
+        mocker.patch.object(Ocr, "ocr", return_value=failing_ocr)
+        get_appropriate_error = mocker.patch(
+            "edenai_apis.utils.ocr_pages.get_appropriate_error",
+            side_effect=lambda provider_name, exc: exc,
+        )
+
+        with pytest.raises(ProviderException, match="Too many requests"):
+            ocr_pdf_pages("google", pdf_path, "en")
+        assert get_appropriate_error.call_args.args[0] == "google"
+
+    def test_not_a_pdf(self, ocr_mock):
+        with pytest.raises(ProviderException):
+            ocr_pdf_pages("google", "image.png", "en")
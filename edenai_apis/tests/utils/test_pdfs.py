@@ -2,7 +2,14 @@ import pytest
 from settings import base_path
 import os
 
-from edenai_apis.utils.pdfs import get_pdf_width_height
+import PyPDF2
+
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.pdfs import (
+    get_pdf_width_height,
+    parse_page_range,
+    split_pdf_pages,
+)
 
 
 class TestGetPdfWidthHeight:
@@ -13,3 +20,35 @@ class TestGetPdfWidthHeight:
 
             assert isinstance(width, float)
             assert isinstance(height, float)
+
+
+class TestParsePageRange:
+    @pytest.mark.parametrize(
+        ("pages", "expected"),
+        [
+            (None, [0, 1, 2, 3, 4]),
+            ("2", [1]),
+            ("1-2, 4", [0, 1, 3]),
+            ("4-", [3, 4]),
+            ("-2,2", [0, 1]),
+            ([5, 1], [0, 4]),
+        ],
+    )
+    def test_valid_page_range(self, pages, expected):
+        assert parse_page_range(pages, 5) == expected
+
+    @pytest.mark.parametrize("pages", ["0", "6", "2-7", "5-2", "a-b", "", []])
+    def test_invalid_page_range(self, pages):
+        with pytest.raises(ProviderException):
+            parse_page_range(pages, 5)
+
+
+class TestSplitPdfPages:
+    def test_split_selected_pages(self, tmp_path):
+        file_pdf_path = os.path.join(base_path, "features/ocr/data/resume.pdf")
+
+        paths = split_pdf_pages(file_pdf_path, str(tmp_path), [0])
+
+        assert paths == [os.path.join(str(tmp_path), "page_1.pdf")]
+        assert len(PyPDF2.PdfReader(paths[0]).pages) == 1
+        assert get_pdf_width_height(paths[0]) == get_pdf_width_height(file_pdf_path)
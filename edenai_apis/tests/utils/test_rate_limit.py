@@ -0,0 +1,292 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from edenai_apis.interface import compute_output
+from edenai_apis.tests.benchmarks.stubs import ReplayStubs
+from edenai_apis.utils.exception import ProviderLimitationError
+from edenai_apis.utils.rate_limit import (
+    LocalRateLimitStore,
+    RateLimit,
+    RateLimiter,
+    RedisRateLimitStore,
+    get_rate_limiter,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLocalRateLimitStore:
+    def test_token_bucket(self):
+        clock = FakeClock()
+        store = LocalRateLimitStore(clock)
+        limit = RateLimit(requests_per_second=2, burst=2)
+
+        waits = [store.reserve("key", limit, max_wait=10) for _ in range(4)]
+
+        # the burst, then reservations served in order every 1/rate second
+        assert waits == [0, 0, 0.5, 1.0]
+        clock.now = 2.0
+        assert store.reserve("key", limit, max_wait=10) == 0
+
+    def test_wait_over_deadline_not_reserved(self):
+        store = LocalRateLimitStore(FakeClock())
+        limit = RateLimit(requests_per_second=1)
+        assert store.reserve("key", limit, max_wait=0) == 0
+
+        assert store.reserve("key", limit, max_wait=0.5) is None
+        assert store.reserve("key", limit, max_wait=1) == 1
+
+    def test_concurrency(self):
+        store = LocalRateLimitStore()
+        limit = RateLimit(max_concurrency=1)
+        lease = store.try_enter("key", limit)
+
+        assert lease is not None
+        assert store.try_enter("key", limit) is None
+        assert store.try_enter("other", limit) is not None
+        store.exit("key", lease)
+        assert store.try_enter("key", limit) is not None
+
+
+def test_from_info():
+    assert RateLimit.from_info(None) is None
+    limit = RateLimit.from_info({"requests_per_minute": 600, "max_concurrency": 4})
+    assert limit == RateLimit(requests_per_second=10, max_concurrency=4)
+    assert limit.capacity == 10
+
+
+def test_limit_precedence():
+    limiter = RateLimiter()
+    info_limit = limiter.get_limit("google", "text", "sentiment_analysis")
+    assert info_limit == RateLimit(requests_per_second=10)
+    assert limiter.get_limit("deepl", "translation", "automatic_translation") is None
+
+    limiter.set_limit("google", RateLimit(requests_per_second=1))
+    limiter.set_limit(
+        "google", RateLimit(max_concurrency=2), "text", "sentiment_analysis"
+    )
+
+    assert limiter.get_limit("google", "text", "sentiment_analysis") == RateLimit(
+        max_concurrency=2
+    )
+    assert limiter.get_limit("google", "text", "syntax_analysis") == RateLimit(
+        requests_per_second=1
+    )
+    limiter.set_limit("google", None, "text", "sentiment_analysis")
+    assert limiter.get_limit("google", "text", "sentiment_analysis") == RateLimit(
+        requests_per_second=1
+    )
+
+
+def test_feature_limit():
+    limiter = RateLimiter()
+    limiter.set_limit("openai", RateLimit(requests_per_second=1))
+    limiter.set_limit("openai", RateLimit(requests_per_second=5), feature="text")
+
+    assert limiter.get_limit("openai", "text", "generation") == RateLimit(
+        requests_per_second=5
+    )
+    assert limiter.get_limit("openai", "image", "generation") == RateLimit(
+        requests_per_second=1
+    )
+    with pytest.raises(ValueError):
+        limiter.set_limit("openai", RateLimit(), subfeature="generation")
+
+
+def test_acquire_waits_for_tokens():
+    limiter = RateLimiter()
+    limiter.set_limit("deepl", RateLimit(requests_per_second=20, burst=1))
+    start = time.monotonic()
+
+    for _ in range(3):
+        with limiter.acquire("deepl", "translation", "automatic_translation"):
+            pass
+
+    assert time.monotonic() - start >= 0.09
+
+
+def test_acquire_deadline():
+    limiter = RateLimiter()
+    limiter.set_limit("deepl", RateLimit(requests_per_second=0.1))
+    with limiter.acquire("deepl", "translation", "automatic_translation"):
+        pass
+
+    with pytest.raises(ProviderLimitationError) as exc:
+        with limiter.acquire(
+            "deepl", "translation", "automatic_translation", timeout=1
+        ):
+            pass
+    assert exc.value.status_code == 429
+
+
+def test_api_keys_have_their_own_limits():
+    limiter = RateLimiter()
+    limiter.set_limit("deepl", RateLimit(requests_per_second=0.1))
+    with limiter.acquire("deepl", "translation", "automatic_translation"):
+        pass
+
+    with limiter.acquire(
+        "deepl", "translation", "automatic_translation", {"api_key": "user"}, timeout=0
+    ):
+        pass
+
+
+def test_acquire_concurrency():
+    limiter = RateLimiter()
+    limiter.set_limit("deepl", RateLimit(max_concurrency=2))
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def call():
+        with limiter.acquire("deepl", "translation", "automatic_translation"):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(peak) == 6
+    assert max(peak) == 2
+
+    # the slot is released on errors too
+    with pytest.raises(ValueError):
+        with limiter.acquire("deepl", "translation", "automatic_translation"):
+            raise ValueError()
+    assert limiter.store._in_flight == {key: 0 for key in limiter.store._in_flight}
+
+
+def test_acquire_concurrency_deadline():
+    limiter = RateLimiter()
+    limiter.set_limit("deepl", RateLimit(max_concurrency=1))
+
+    with limiter.acquire("deepl", "translation", "automatic_translation"):
+        with pytest.raises(ProviderLimitationError):
+            with limiter.acquire(
+                "deepl", "translation", "automatic_translation", timeout=0.02
+            ):
+                pass
+
+
+def test_concurrency_backoff():
+    limiter = RateLimiter()
+    limit = RateLimit(max_concurrency=1)
+    limiter.set_limit("deepl", limit)
+
+    with limiter.acquire("deepl", "translation", "automatic_translation"):
+        key = next(iter(limiter.store._in_flight))
+        admission = limiter._admit("deepl", key, limit, time.monotonic() + 60)
+        delays = [next(admission) for _ in range(7)]
+
+    assert delays == [0.05, 0.1, 0.2, 0.4, 0.8, 1.0, 1.0]
+    # the slot is free: admitted without token wait
+    with pytest.raises(StopIteration) as admitted:
+        next(admission)
+    assert admitted.value.value == (key, 0.0)
+
+
+def test_acquire_async():
+    limiter = RateLimiter()
+    limiter.set_limit("deepl", RateLimit(requests_per_second=20, max_concurrency=1))
+    order = []
+
+    async def call(index):
+        async with limiter.acquire_async(
+            "deepl", "translation", "automatic_translation"
+        ):
+            order.append(index)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(*(call(index) for index in range(4)))
+        return time.monotonic() - start
+
+    duration = asyncio.run(main())
+
+    assert sorted(order) == [0, 1, 2, 3]
+    # 4 calls after a burst of 20 tokens: the concurrency limit is the bottleneck
+    assert duration >= 0.04
+
+
+def test_compute_output_rate_limit():
+    limiter = get_rate_limiter()
+    # a call per 100 seconds: the next one can't be made within the 30s deadline
+    limiter.set_limit("deepl", RateLimit(requests_per_second=0.01))
+    args = {"text": "Hello", "source_language": "en", "target_language": "fr"}
+    try:
+        with ReplayStubs() as stubs:
+            stubs.replay({"translations": [{"text": "Bonjour"}]})
+            result = compute_output(
+                "deepl", "translation", "automatic_translation", args, rate_limit=True
+            )
+            assert result["standardized_response"]["text"] == "Bonjour"
+
+            # without `rate_limit`, the limits don't apply
+            compute_output("deepl", "translation", "automatic_translation", args)
+
+            with pytest.raises(ProviderLimitationError):
+                compute_output(
+                    "deepl",
+                    "translation",
+                    "automatic_translation",
+                    args,
+                    rate_limit=True,
+                )
+    finally:
+        limiter.set_limit("deepl", None)
+
+
+class TestRedisRateLimitStore:
+    @pytest.fixture
+    def store(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        return RedisRateLimitStore(fakeredis.FakeRedis())
+
+    def test_token_bucket(self, store):
+        limit = RateLimit(requests_per_second=1, burst=2)
+
+        assert store.reserve("key", limit, max_wait=10) == 0
+        assert store.reserve("key", limit, max_wait=10) == 0
+        assert store.reserve("key", limit, max_wait=0.5) is None
+        assert 0.9 < store.reserve("key", limit, max_wait=10) <= 1
+
+    def test_concurrency(self, store):
+        limit = RateLimit(max_concurrency=1)
+        lease = store.try_enter("key", limit)
+
+        assert lease is not None
+        assert store.try_enter("key", limit) is None
+        store.exit("key", lease)
+        assert store.try_enter("key", limit) is not None
+
+    def test_shared_between_limiters(self, store):
+        limit = RateLimit(requests_per_second=0.1)
+        limiters = [RateLimiter(store), RateLimiter(store)]
+        for limiter in limiters:
+            limiter.set_limit("deepl", limit)
+        with limiters[0].acquire("deepl", "translation", "automatic_translation"):
+            pass
+
+        with pytest.raises(ProviderLimitationError):
+            with limiters[1].acquire(
+                "deepl", "translation", "automatic_translation", timeout=0
+            ):
+                pass
@@ -0,0 +1,344 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from edenai_apis.interface import compute_output
+from edenai_apis.tests.benchmarks.stubs import ReplayStubs
+from edenai_apis.utils import resilience
+from edenai_apis.utils.exception import (
+    ErrorClassifier,
+    ProviderCircuitOpenError,
+    ProviderException,
+    ProviderInternalServerError,
+    ProviderInvalidInputError,
+    ProviderInvalidInputTextLengthError,
+    ProviderLimitationError,
+    ProviderRateLimitTimeoutError,
+    get_appropriate_error,
+)
+from edenai_apis.utils.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    LatencyWindow,
+    ResiliencePolicy,
+    get_resilience_policy,
+    is_idempotent,
+    is_retryable,
+    set_resilience_policy,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def failing(errors, result="result"):
+    """Raises the given errors in turn, then returns `result`"""
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    call.calls = calls
+    return call
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def policy(sleeps):
+    return ResiliencePolicy(hedge=False, sleep=sleeps.append)
+
+
+@pytest.mark.parametrize(
+    ("error", "retryable"),
+    [
+        (ProviderInternalServerError("Internal error"), True),
+        (ProviderException("Bad gateway", code=502), True),
+        (ProviderLimitationError("Too many requests", code=429), True),
+        (requests.ConnectionError(), True),
+        (ProviderInvalidInputError("Text too long", code=400), False),
+        (ProviderException("Unauthorized", code=401), False),
+        (ProviderRateLimitTimeoutError("Rate limit reached", code=429), False),
+        (ProviderCircuitOpenError("Unavailable", code=503), False),
+    ],
+)
+def test_is_retryable(error, retryable):
+    assert is_retryable(error) is retryable
+
+
+def test_is_idempotent():
+    assert is_idempotent("text", "sentiment_analysis")
+    assert is_idempotent("image", "face_recognition", "recognize")
+    assert not is_idempotent("audio", "speech_to_text_async")
+    assert not is_idempotent("image", "face_recognition", "add_face")
+    assert not is_idempotent("image", "search", "upload_image")
+
+
+class TestRetries:
+    def test_transient_errors_retried(self, policy, sleeps):
+        call = failing(
+            [ProviderInternalServerError("error"), ProviderException("", 503)]
+        )
+
+        assert policy.call("google", "text", "sentiment_analysis", call) == "result"
+
+        assert len(call.calls) == 3
+        assert len(sleeps) == 2
+        assert all(policy.base_delay <= delay <= policy.max_delay for delay in sleeps)
+
+    def test_max_attempts(self, policy):
+        call = failing([ProviderInternalServerError("error")] * 3)
+
+        with pytest.raises(ProviderInternalServerError):
+            policy.call("google", "text", "sentiment_analysis", call)
+        assert len(call.calls) == 3
+
+    def test_caller_errors_not_retried(self, policy):
+        call = failing([ProviderInvalidInputError("Text too long", code=400)])
+
+        with pytest.raises(ProviderInvalidInputError):
+            policy.call("google", "text", "sentiment_analysis", call)
+        assert len(call.calls) == 1
+
+    def test_non_idempotent_not_retried(self, policy):
+        call = failing([ProviderInternalServerError("error")])
+
+        with pytest.raises(ProviderInternalServerError):
+            policy.call("amazon", "audio", "speech_to_text_async", call)
+        assert len(call.calls) == 1
+
+    def test_retry_budget(self, sleeps):
+        policy = ResiliencePolicy(hedge=False, retry_ratio=0, sleep=sleeps.append)
+        policy.retry_budget._balance = 1
+        call = failing([ProviderInternalServerError("error")] * 3)
+
+        with pytest.raises(ProviderInternalServerError):
+            policy.call("google", "text", "sentiment_analysis", call)
+        assert len(call.calls) == 2
+
+    def test_provider_errors_classified(self, policy):
+        # matches a pattern of the google errors list
+        call = failing([ProviderException("500 Internal error encountered")] * 3)
+
+        with pytest.raises(ProviderInternalServerError):
+            policy.call("google", "text", "sentiment_analysis", call)
+
+
+class TestCircuitBreaker:
+    def test_opens_then_half_open_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(
+            window=4, min_calls=4, failure_rate=0.5, reset_timeout=10, clock=clock
+        )
+        for failure in (False, True, False, True):
+            assert breaker.allow()
+            breaker.record(failure)
+
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+        clock.now = 10
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        # a single probe at a time
+        assert not breaker.allow()
+        breaker.record(True)
+        assert breaker.state == OPEN
+
+        clock.now = 20
+        assert breaker.allow()
+        breaker.record(False)
+        assert breaker.state == CLOSED
+
+    def test_policy_fails_fast(self, sleeps):
+        clock = FakeClock()
+        policy = ResiliencePolicy(
+            hedge=False,
+            sleep=sleeps.append,
+            breaker_factory=lambda: CircuitBreaker(
+                window=4, min_calls=4, reset_timeout=10, clock=clock
+            ),
+        )
+        call = failing([ProviderInternalServerError("error")] * 4)
+        for _ in range(2):
+            with pytest.raises(ProviderInternalServerError):
+                policy.call("google", "text", "sentiment_analysis", call)
+
+        assert policy.circuit_states() == {"google": OPEN}
+        with pytest.raises(ProviderCircuitOpenError):
+            policy.call("google", "text", "syntax_analysis", call)
+        assert len(call.calls) == 4
+        assert policy.circuit_state("amazon") == CLOSED
+
+        clock.now = 10
+        assert policy.call("google", "text", "sentiment_analysis", call) == "result"
+        assert policy.circuit_state("google") == CLOSED
+
+    def test_caller_errors_not_counted(self):
+        breaker = CircuitBreaker(window=2, min_calls=2)
+        policy = ResiliencePolicy(hedge=False, breaker_factory=lambda: breaker)
+        for _ in range(2):
+            with pytest.raises(ProviderInvalidInputError):
+                policy.call(
+                    "google",
+                    "text",
+                    "sentiment_analysis",
+                    failing([ProviderInvalidInputError("Text too long")]),
+                )
+
+        assert breaker.state == CLOSED
+
+
+def test_latency_window():
+    window = LatencyWindow(size=3)
+    for latency in (5, 1, 3, 2):
+        window.add(latency)
+
+    assert len(window) == 3
+    assert window.quantile(0) == 1
+    assert window.quantile(0.95) == 3
+
+
+class TestHedging:
+    def test_slow_call_hedged(self):
+        policy = ResiliencePolicy(hedge_min_samples=5)
+        for _ in range(5):
+            policy.call("google", "text", "sentiment_analysis", lambda: "fast")
+        first_call = threading.Event()
+        release = threading.Event()
+
+        def call():
+            if not first_call.is_set():
+                first_call.set()
+                # slower than all the previous calls
+                release.wait(5)
+                return "slow"
+            return "hedged"
+
+        try:
+            assert policy.call("google", "text", "sentiment_analysis", call) == "hedged"
+        finally:
+            release.set()
+
+    def test_busy_pool(self, monkeypatch):
+        policy = ResiliencePolicy(hedge_min_samples=1)
+        policy.call("google", "text", "sentiment_analysis", lambda: "fast")
+        # no free thread in the hedge pool
+        monkeypatch.setattr(resilience, "_hedge_slots", threading.Semaphore(0))
+        calls = []
+
+        def call():
+            calls.append(threading.current_thread())
+            return "result"
+
+        assert policy.call("google", "text", "sentiment_analysis", call) == "result"
+        assert calls == [threading.current_thread()]
+
+    def test_pool_threads_released(self):
+        policy = ResiliencePolicy(hedge_min_samples=1)
+        for _ in range(resilience.HEDGE_WORKERS + 5):
+            policy.call("google", "text", "sentiment_analysis", lambda: "fast")
+
+        assert resilience._hedge_slots._value == resilience.HEDGE_WORKERS
+
+    def test_no_hedge_without_latencies(self):
+        policy = ResiliencePolicy(hedge_min_samples=5)
+        calls = []
+
+        def call():
+            calls.append(threading.current_thread())
+            time.sleep(0.01)
+            return "result"
+
+        assert policy.call("google", "text", "sentiment_analysis", call) == "result"
+        assert calls == [threading.current_thread()]
+
+    def test_no_hedge_for_non_idempotent(self):
+        policy = ResiliencePolicy(hedge_min_samples=0)
+        calls = []
+
+        assert (
+            policy.call(
+                "google",
+                "image",
+                "face_recognition",
+                lambda: calls.append(1),
+                "add_face",
+            )
+            is None
+        )
+        assert calls == [1]
+
+    def test_hedge_budget(self):
+        policy = ResiliencePolicy(hedge_min_samples=1, hedge_ratio=0)
+        policy.hedge_budget._balance = 0
+        policy.call("google", "text", "sentiment_analysis", lambda: "fast")
+        calls = []
+
+        def call():
+            calls.append(1)
+            time.sleep(0.02)
+            return "result"
+
+        assert policy.call("google", "text", "sentiment_analysis", call) == "result"
+        assert calls == [1]
+
+
+def test_error_classified_once(mocker, policy):
+    classify = mocker.spy(ErrorClassifier, "classify")
+
+    with pytest.raises(ProviderInvalidInputTextLengthError) as error:
+        policy.call(
+            "google",
+            "text",
+            "sentiment_analysis",
+            failing([ProviderException("Text is too long", code=400)]),
+        )
+
+    assert get_appropriate_error("google", error.value) is error.value
+    assert classify.call_count == 1
+
+
+def test_compute_output_resilience():
+    previous = get_resilience_policy()
+    sleeps = []
+    set_resilience_policy(ResiliencePolicy(hedge=False, sleep=sleeps.append))
+    args = {"text": "Hello", "source_language": "en", "target_language": "fr"}
+    try:
+        with ReplayStubs() as stubs:
+            stubs.replay(
+                {"translations": [{"text": "Bonjour"}], "message": "Internal error"}
+            )
+            http_response = stubs._http_response
+            statuses = [500]
+
+            def flaky_response(request):
+                response = http_response(request)
+                if statuses:
+                    response.status_code = statuses.pop()
+                return response
+
+            stubs._http_response = flaky_response
+            result = compute_output(
+                "deepl", "translation", "automatic_translation", args, resilience=True
+            )
+    finally:
+        set_resilience_policy(previous)
+
+    assert result["standardized_response"]["text"] == "Bonjour"
+    assert len(sleeps) == 1
@@ -0,0 +1,209 @@
+import pytest
+
+from edenai_apis.interface import compute_output
+from edenai_apis.tests.benchmarks.stubs import ReplayStubs
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.resilience import (
+    CircuitBreaker,
+    ResiliencePolicy,
+    get_resilience_policy,
+    set_resilience_policy,
+)
+from edenai_apis.utils.routing import ProviderStats, Router, get_router
+
+FEATURE = ("text", "sentiment_analysis")
+
+
+@pytest.fixture
+def router():
+    return Router()
+
+
+def test_provider_stats():
+    stats = ProviderStats(alpha=0.5)
+    stats.record("google", *FEATURE, 1.0)
+    stats.record("google", *FEATURE, 3.0)
+    stats.record("google", *FEATURE, 10.0, error=True)
+
+    score = stats.get("google", *FEATURE)
+
+    # errors don't change the latency
+    assert score.latency == 2.0
+    assert score.error_rate == 0.5
+    assert score.calls == 3
+    assert stats.get("amazon", *FEATURE).latency is None
+    assert stats.snapshot()["google/text/sentiment_analysis"]["calls"] == 3
+
+
+class TestRank:
+    def test_latency(self, router):
+        router.stats.record("google", *FEATURE, 0.5)
+        router.stats.record("amazon", *FEATURE, 0.2)
+
+        assert router.rank(["google", "amazon"], *FEATURE) == ["amazon", "google"]
+
+    def test_unmeasured_keep_order(self, router):
+        assert router.rank(["google", "amazon", "ibm"], *FEATURE) == [
+            "google",
+            "amazon",
+            "ibm",
+        ]
+
+    def test_error_rate(self, router):
+        router.stats.record("google", *FEATURE, 0.2)
+        router.stats.record("google", *FEATURE, 0.2, error=True)
+        router.stats.record("amazon", *FEATURE, 0.24)
+
+        # 0.2s with 20% errors (0.25s to a success) is slower than 0.24s
+        assert router.rank(["google", "amazon"], *FEATURE) == ["amazon", "google"]
+
+    def test_cost(self):
+        router = Router(costs={"google": 0.001, "amazon": 0.0001}, cost_weight=1000)
+        router.stats.record("google", *FEATURE, 0.2)
+        router.stats.record("amazon", *FEATURE, 0.5)
+
+        # 0.2s + 1s against 0.5s + 0.1s
+        assert router.rank(["google", "amazon"], *FEATURE) == ["amazon", "google"]
+
+    def test_open_circuit_last(self, router):
+        previous = get_resilience_policy()
+        policy = ResiliencePolicy(
+            breaker_factory=lambda: CircuitBreaker(window=1, min_calls=1)
+        )
+        policy.breaker("amazon").record(True)
+        set_resilience_policy(policy)
+        router.stats.record("amazon", *FEATURE, 0.1)
+        router.stats.record("google", *FEATURE, 0.5)
+        try:
+            assert router.rank(["amazon", "google"], *FEATURE) == ["google", "amazon"]
+        finally:
+            set_resilience_policy(previous)
+
+
+def test_candidates(router):
+    assert "deepl" in router.candidates("translation", "automatic_translation")
+    assert "google" in router.candidates(*FEATURE)
+    assert router.candidates(*FEATURE, providers=["deepl", "google"]) == ["google"]
+    # amazon entity sentiment only supports english
+    assert router.candidates(
+        "text",
+        "entity_sentiment",
+        args={"text": "こんにちは", "language": "ja"},
+        providers=["amazon", "google"],
+    ) == ["google"]
+
+
+def test_failover(router):
+    calls = []
+
+    def compute(provider_name, feature, subfeature, args, phase="", api_keys={}):
+        calls.append((provider_name, api_keys))
+        if provider_name == "google":
+            raise ProviderException("Internal error", code=500)
+        return {"provider": provider_name}
+
+    result = router.call(
+        compute,
+        ["google", "amazon"],
+        *FEATURE,
+        {"text": "Hello", "language": "en"},
+        api_keys={"amazon": {"key": "amazon key"}},
+    )
+
+    assert result == {"provider": "amazon"}
+    assert calls == [("google", {}), ("amazon", {"key": "amazon key"})]
+    assert router.stats.get("google", *FEATURE).error_rate > 0
+    # google is now ranked after amazon
+    assert router.rank(["google", "amazon"], *FEATURE) == ["amazon", "google"]
+
+
+def test_all_providers_fail():
+    router = Router(max_attempts=2)
+    calls = []
+
+    def compute(provider_name, *args, **kwargs):
+        calls.append(provider_name)
+        raise ProviderException(f"{provider_name} error")
+
+    with pytest.raises(ProviderException, match="amazon error"):
+        router.call(compute, ["google", "amazon", "ibm"], *FEATURE, {"text": "Hi"})
+    assert calls == ["google", "amazon"]
+
+
+def test_caller_error_not_retried(router):
+    calls = []
+
+    def compute(provider_name, *args, **kwargs):
+        calls.append(provider_name)
+        raise ProviderException("Text is empty", code=400)
+
+    with pytest.raises(ProviderException, match="Text is empty"):
+        router.call(compute, ["google", "amazon"], *FEATURE, {"text": "Hi"})
+    assert calls == ["google"]
+    assert router.stats.get("google", *FEATURE).calls == 0
+
+
+def test_constraints_checked_lazily(router, mocker):
+    accepts = mocker.spy(Router, "_accepts")
+
+    def compute(provider_name, *args, **kwargs):
+        return {"provider": provider_name}
+
+    router.call(compute, ["google", "amazon", "ibm"], *FEATURE, {"text": "Hi"})
+
+    assert [call.args[0] for call in accepts.call_args_list] == ["google"]
+
+
+def test_rejected_providers_not_attempts():
+    router = Router(max_attempts=1)
+    calls = []
+
+    def compute(provider_name, *args, **kwargs):
+        calls.append(provider_name)
+        return {"provider": provider_name}
+
+    # amazon entity sentiment only supports english
+    router.call(
+        compute,
+        ["amazon", "google"],
+        "text",
+        "entity_sentiment",
+        {"text": "こんにちは", "language": "ja"},
+    )
+
+    assert calls == ["google"]
+
+
+def test_invalid_max_attempts():
+    with pytest.raises(ValueError):
+        Router(max_attempts=0)
+
+
+def test_flat_api_keys_rejected(router):
+    with pytest.raises(ProviderException, match="by provider name") as error:
+        router.call(
+            lambda *args, **kwargs: None,
+            ["google"],
+            *FEATURE,
+            {"text": "Hi"},
+            api_keys={"api_key": "key"},
+        )
+    assert error.value.code == 400
+
+
+def test_no_candidate(router):
+    with pytest.raises(ProviderException, match="No provider available"):
+        router.call(lambda *args, **kwargs: None, ["deepl"], *FEATURE, {"text": "Hi"})
+
+
+def test_compute_output_routed():
+    args = {"text": "Hello", "source_language": "en", "target_language": "fr"}
+    with ReplayStubs() as stubs:
+        stubs.replay({"translations": [{"text": "Bonjour"}]})
+        result = compute_output(
+            ["deepl"], "translation", "automatic_translation", args=args
+        )
+
+    assert result["provider"] == "deepl"
+    assert result["standardized_response"]["text"] == "Bonjour"
+    assert get_router().stats.get("deepl", "translation", "automatic_translation").calls
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from edenai_apis import interface_v2
+from edenai_apis.features.text.embeddings import EmbeddingDataClass, EmbeddingsDataClass
+from edenai_apis.interface import compute_output
+from edenai_apis.utils.serialization import (
+    dump_response,
+    get_response_model,
+    response_fields,
+    serialize_response,
+    validate_response,
+)
+from edenai_apis.utils.types import AsyncLaunchJobResponseType, ResponseType
+
+
+def _constructed_response(embedding):
+    return ResponseType[EmbeddingsDataClass].model_construct(
+        original_response={"data": []},
+        standardized_response=EmbeddingsDataClass.model_construct(
+            items=[EmbeddingDataClass.model_construct(embedding=embedding)]
+        ),
+    )
+
+
+class TestValidateResponse:
+    def test_valid_constructed_model(self):
+        response = validate_response(_constructed_response([0.1, 0.2]))
+        assert response.standardized_response.items[0].embedding == [0.1, 0.2]
+
+    def test_invalid_constructed_model(self):
+        with pytest.raises(ValidationError):
+            validate_response(_constructed_response(["not a float"]))
+
+    def test_valid_dict(self):
+        response_model = get_response_model("text", "embeddings")
+        response = validate_response(
+            {
+                "original_response": {},
+                "standardized_response": {"items": [{"embedding": [0.1]}]},
+            },
+            response_model,
+        )
+        assert isinstance(response.standardized_response, EmbeddingsDataClass)
+
+    def test_invalid_dict(self):
+        response_model = get_response_model("text", "embeddings")
+        with pytest.raises(ValidationError):
+            validate_response({"original_response": {}}, response_model)
+
+    def test_async_launch_model(self):
+        assert (
+            get_response_model("audio", "speech_to_text_async", is_async_launch=True)
+            == AsyncLaunchJobResponseType
+        )
+
+
+class TestDumpResponse:
+    def test_same_output_as_model_dump(self):
+        response = _constructed_response([0.1, 0.2])
+        assert dump_response(response) == response.model_dump()
+
+    def test_dict_with_nested_models(self):
+        response = {
+            "original_response": {},
+            "standardized_response": EmbeddingsDataClass(items=[]),
+        }
+        assert dump_response(response) == {
+            "original_response": {},
+            "standardized_response": {"items": []},
+        }
+
+    def test_serialize_response(self):
+        response = _constructed_response([0.1, 0.2])
+        result = serialize_response(
+            {"status": "success", "provider": "openai", **response_fields(response)}
+        )
+        assert json.loads(result) == {
+            "status": "success",
+            "provider": "openai",
+            **response.model_dump(),
+        }
+
+
+class TestComputeOutputValidation:
+    @pytest.fixture
+    def unvalidated_output(self, mocker):
+        mocker.patch(
+            "edenai_apis.interface.validate_all_provider_constraints",
+            return_value={"texts": ["hello"]},
+        )
+        mocker.patch.object(
+            interface_v2.Text,
+            "embeddings",
+            lambda provider_name, api_keys: lambda **args: {
+                "original_response": {},
+                "standardized_response": {"items": [{"embedding": ["not a float"]}]},
+            },
+        )
+
+    def test_not_validated_by_default(self, monkeypatch, unvalidated_output):
+        monkeypatch.setattr("edenai_apis.interface.VALIDATE_OUTPUT", False)
+        result = compute_output("openai", "text", "embeddings", {})
+        assert result["standardized_response"]["items"][0]["embedding"] == [
+            "not a float"
+        ]
+
+    def test_validated(self, unvalidated_output):
+        with pytest.raises(ValidationError):
+            compute_output("openai", "text", "embeddings", {})
@@ -0,0 +1,305 @@
+import threading
+import time
+from contextvars import ContextVar
+
+import pytest
+
+from edenai_apis.apis.amazon.amazon_text_api import AmazonTextApi
+from edenai_apis.interface import compute_output
+from edenai_apis.tests.benchmarks.stubs import ReplayStubs
+from edenai_apis.utils.text_chunking import (
+    analyze_long_text,
+    merge_anonymization,
+    merge_entity_sentiment,
+    merge_keyword_extraction,
+    merge_named_entity_recognition,
+    merge_sentiment_analysis,
+    provider_text_limit,
+    split_text_spans,
+    utf8_size,
+)
+from edenai_apis.utils.types import ResponseType
+
+
+def chunks_of(text, spans):
+    return [text[start:end] for start, end in spans]
+
+
+class TestSplitTextSpans:
+    def test_short_text(self):
+        assert split_text_spans("Hello world.", 100) == [(0, 12)]
+
+    def test_sentence_boundaries(self):
+        text = "First sentence. Second one! Third? Fourth sentence."
+
+        spans = split_text_spans(text, 30)
+
+        assert chunks_of(text, spans) == [
+            "First sentence. Second one! ",
+            "Third? Fourth sentence.",
+        ]
+
+    def test_words_then_characters(self):
+        text = "a long sentence without end " + "x" * 25
+
+        spans = split_text_spans(text, 10)
+
+        assert all(end - start <= 10 for start, end in spans)
+        assert chunks_of(text, spans)[:3] == ["a long ", "sentence ", "without "]
+        assert "".join(chunks_of(text, spans)) == text
+
+    def test_bytes(self):
+        text = "Été à Paris. " * 20
+
+        spans = split_text_spans(text, 40, utf8_size)
+
+        assert all(utf8_size(chunk) <= 40 for chunk in chunks_of(text, spans))
+        assert all(chunk.startswith("Été") for chunk in chunks_of(text, spans))
+        assert "".join(chunks_of(text, spans)) == text
+
+    def test_whitespace_chunks_skipped(self):
+        text = "First.\n\n\n\n\n\n\n\nSecond."
+
+        assert chunks_of(text, split_text_spans(text, 7)) == ["First.\n", "Second."]
+
+
+def test_provider_text_limit():
+    assert provider_text_limit("amazon", "text", "sentiment_analysis") == (
+        5000,
+        utf8_size,
+    )
+    assert provider_text_limit("microsoft", "text", "sentiment_analysis") == (
+        5120,
+        len,
+    )
+    assert provider_text_limit("google", "text", "sentiment_analysis") is None
+
+
+def test_merge_anonymization():
+    text = "Call John. Mail to a@b.c now."
+    chunks = [
+        (
+            0,
+            "Call John. ",
+            {
+                "result": "Call ****. ",
+                "entities": [{"offset": 5, "length": 4, "content": "John"}],
+            },
+        ),
+        (
+            11,
+            "Mail to a@b.c now.",
+            {
+                "result": "Mail to ***** now.",
+                "entities": [{"offset": 8, "length": 5, "content": "a@b.c"}],
+            },
+        ),
+    ]
+
+    merged = merge_anonymization(text, chunks)
+
+    assert merged["result"] == "Call ****. Mail to ***** now."
+    assert [(e["offset"], e["content"]) for e in merged["entities"]] == [
+        (5, "John"),
+        (19, "a@b.c"),
+    ]
+    for entity in merged["entities"]:
+        assert text[entity["offset"] : entity["offset"] + entity["length"]] == (
+            entity["content"]
+        )
+
+
+def test_merge_entity_sentiment():
+    chunks = [
+        (0, "", {"items": [{"text": "Paris", "begin_offset": 3, "end_offset": 8}]}),
+        (100, "", {"items": [{"text": "Lyon", "begin_offset": 0, "end_offset": 4}]}),
+    ]
+
+    items = merge_entity_sentiment("", chunks)["items"]
+
+    assert [(i["begin_offset"], i["end_offset"]) for i in items] == [(3, 8), (100, 104)]
+
+
+def test_merge_deduplicates():
+    chunks = [
+        (0, "", {"items": [{"entity": "Paris", "category": "LOC", "importance": 0.2}]}),
+        (
+            10,
+            "",
+            {
+                "items": [
+                    {"entity": "Paris", "category": "LOC", "importance": 0.9},
+                    {"entity": "Eden", "category": "ORG", "importance": 0.5},
+                ]
+            },
+        ),
+    ]
+    keywords = [
+        (0, "", {"items": [{"keyword": "Rate limit", "importance": 0.4}]}),
+        (10, "", {"items": [{"keyword": "rate limit", "importance": 0.3}]}),
+    ]
+
+    assert merge_named_entity_recognition("", chunks)["items"] == [
+        {"entity": "Paris", "category": "LOC", "importance": 0.9},
+        {"entity": "Eden", "category": "ORG", "importance": 0.5},
+    ]
+    assert merge_keyword_extraction("", keywords)["items"] == [
+        {"keyword": "Rate limit", "importance": 0.4}
+    ]
+
+
+def test_merge_sentiment_analysis():
+    segment = {"segment": "Great.", "sentiment": "Positive", "sentiment_rate": 0.9}
+    chunks = [
+        (0, "a" * 30, {"general_sentiment": "Positive", "general_sentiment_rate": 0.8}),
+        (
+            30,
+            "b" * 10,
+            {"general_sentiment": "Negative", "general_sentiment_rate": 0.6},
+        ),
+        (
+            40,
+            "c" * 10,
+            {
+                "general_sentiment": "Positive",
+                "general_sentiment_rate": 0.4,
+                "items": [segment],
+            },
+        ),
+    ]
+
+    merged = merge_sentiment_analysis("", chunks)
+
+    assert merged["general_sentiment"] == "Positive"
+    assert merged["general_sentiment_rate"] == pytest.approx((0.8 * 30 + 0.4 * 10) / 40)
+    assert merged["items"] == [
+        {"segment": "a" * 30, "sentiment": "Positive", "sentiment_rate": 0.8},
+        {"segment": "b" * 10, "sentiment": "Negative", "sentiment_rate": 0.6},
+        segment,
+    ]
+
+
+def test_analyze_long_text_concurrent_chunks():
+    text = "One sentence here. " * 600
+    threads = set()
+
+    def call(args):
+        threads.add(threading.current_thread())
+        time.sleep(0.02)
+        assert utf8_size(args["text"]) <= 5000
+        return ResponseType(
+            original_response={"length": len(args["text"])},
+            standardized_response={
+                "general_sentiment": "Neutral",
+                "general_sentiment_rate": 0.5,
+                "items": [],
+            },
+        )
+
+    result = analyze_long_text(
+        "amazon", "text", "sentiment_analysis", {"text": text, "language": "en"}, call
+    )
+
+    assert sum(r["length"] for r in result.original_response) == len(text)
+    assert len(result.original_response) == 3
+    assert len(threads) > 1
+    assert result.standardized_response["general_sentiment"] == "Neutral"
+
+
+def test_analyze_short_text_single_call():
+    calls = []
+
+    def call(args):
+        calls.append(args)
+        return "result"
+
+    args = {"text": "Short.", "language": "en"}
+    assert analyze_long_text("amazon", "text", "sentiment_analysis", args, call) == (
+        "result"
+    )
+    assert calls == [args]
+
+
+def test_analyze_long_text_caller_context():
+    variable = ContextVar("variable", default="unset")
+    variable.set("caller")
+    values = []
+
+    def call(args):
+        values.append(variable.get())
+        return ResponseType(
+            original_response={},
+            standardized_response={"items": []},
+        )
+
+    analyze_long_text(
+        "amazon",
+        "text",
+        "keyword_extraction",
+        {"text": "One sentence here. " * 60000, "language": "en"},
+        call,
+    )
+
+    assert len(values) > 1
+    assert set(values) == {"caller"}
+
+
+def test_analyze_whitespace_text():
+    calls = []
+    args = {"text": " " * 6000, "language": "en"}
+
+    def call(args):
+        calls.append(args)
+        return "result"
+
+    assert analyze_long_text("amazon", "text", "sentiment_analysis", args, call) == (
+        "result"
+    )
+    assert calls == [args]
+
+
+def test_compute_output_chunk_text():
+    text = "Bonjour Jean. " * 8000
+    with ReplayStubs() as stubs:
+        stubs.replay(
+            {
+                "Entities": [
+                    {"BeginOffset": 8, "EndOffset": 12, "Type": "NAME", "Score": 0.9}
+                ]
+            }
+        )
+        result = compute_output(
+            "amazon",
+            "text",
+            "anonymization",
+            {"text": text, "language": "en"},
+            chunk_text=True,
+        )
+
+    response = result["standardized_response"]
+    chunks = len(result["original_response"])
+    assert chunks == 2
+    assert len(response["entities"]) == chunks
+    assert response["result"].count("****") == chunks
+    assert len(response["result"]) == len(text)
+    for entity in response["entities"]:
+        assert text[entity["offset"] : entity["offset"] + 4] == "Jean"
+
+
+def test_amazon_anonymization_builder():
+    api = AmazonTextApi.__new__(AmazonTextApi)
+
+    class Client:
+        def detect_pii_entities(self, **payload):
+            return {
+                "Entities": [
+                    {"BeginOffset": 0, "EndOffset": 4, "Type": "NAME", "Score": 0.9},
+                    {"BeginOffset": 10, "EndOffset": 15, "Type": "EMAIL", "Score": 0.8},
+                ]
+            }
+
+    api.clients = {"text": Client()}
+
+    result = api.text__anonymization("John mail a@b.c now", "en")
+
+    assert result.standardized_response.result == "**** mail ***** now"
@@ -0,0 +1,234 @@
+import base64
+import threading
+import time
+import wave
+from contextvars import ContextVar
+from concurrent.futures import Future
+from io import BytesIO
+
+import pytest
+
+from edenai_apis.utils import tts_chunking
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.ssml import is_ssml
+from edenai_apis.utils.tts_chunking import (
+    iter_text_to_speech_segments,
+    long_text_to_speech,
+    split_text,
+)
+
+
+def wav_audio(frames: int, frame_rate: int = 8000) -> bytes:
+    output = BytesIO()
+    with wave.open(output, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(b"\x01\x00" * frames)
+    return output.getvalue()
+
+
+class TestSplitText:
+    def test_short_text(self):
+        assert split_text("Hello world.", 100) == ["Hello world."]
+
+    def test_sentences(self):
+        text = "Hello world. This is a test! Another sentence here? And the final one."
+
+        chunks = split_text(text, 30)
+
+        assert chunks == [
+            "Hello world. This is a test! ",
+            "Another sentence here? ",
+            "And the final one.",
+        ]
+        assert "".join(chunks) == text
+
+    def test_long_sentence_split_between_words(self):
+        chunks = split_text("one two three four five six seven", 10)
+
+        assert all(len(chunk) <= 10 for chunk in chunks)
+        assert "".join(chunks) == "one two three four five six seven"
+        assert chunks[0] == "one two "
+
+    def test_long_word(self):
+        assert split_text("x" * 25, 10) == ["x" * 10, "x" * 10, "x" * 5]
+
+    def test_cjk_sentences(self):
+        assert split_text("你好。世界很大。我们走吧。", 6) == [
+            "你好。",
+            "世界很大。",
+            "我们走吧。",
+        ]
+
+    def test_ssml_tags_kept(self):
+        text = (
+            '<speak>Intro. <prosody rate="slow">Slow sentence one. Slow sentence two.'
+            ' Slow three.</prosody> End <break time="1s"/> now.</speak>'
+        )
+
+        chunks = split_text(text, 80)
+
+        assert chunks == [
+            '<speak>Intro. <prosody rate="slow">Slow sentence one. </prosody></speak>',
+            '<speak><prosody rate="slow">Slow sentence two. Slow three.</prosody></speak>',
+            '<speak> End <break time="1s"/> now.</speak>',
+        ]
+        assert all(is_ssml(chunk) and len(chunk) <= 80 for chunk in chunks)
+
+    def test_ssml_tags_too_long(self):
+        text = f'<speak><prosody rate="slow">{"word " * 20}</prosody></speak>'
+
+        with pytest.raises(ProviderException):
+            split_text(text, 30)
+
+
+class TestSynthesizeSegments:
+    @pytest.fixture
+    def provider(self, mocker):
+        synthesized = []
+
+        def text_to_speech_chunks(text, **kwargs):
+            synthesized.append(text)
+            return "wav", iter([wav_audio(len(text) * 10)])
+
+        mocker.patch.object(
+            tts_chunking,
+            "validate_all_provider_constraints",
+            side_effect=lambda provider, feature, subfeature, phase, args: args,
+        )
+        mocker.patch.object(
+            tts_chunking,
+            "provider_text_to_speech_chunks",
+            return_value=text_to_speech_chunks,
+        )
+        mocker.patch.object(tts_chunking, "provider_max_characters", return_value=30)
+        return synthesized
+
+    def test_segments_in_order(self, provider):
+        text = "Hello world. This is a test! Another sentence here? And the final one."
+
+        segments = list(
+            iter_text_to_speech_segments("google", {"text": text, "language": "en"})
+        )
+
+        assert len(segments) == 3
+        assert sorted(provider) == sorted(split_text(text, 30))
+        for (extension, audio), chunk in zip(segments, split_text(text, 30)):
+            with wave.open(BytesIO(audio), "rb") as wav:
+                assert extension == "wav"
+                assert wav.getnframes() == len(chunk) * 10
+
+    def test_first_segment_before_the_others(self, mocker):
+        release = threading.Event()
+
+        def text_to_speech_chunks(text, **kwargs):
+            if not text.startswith("First"):
+                assert release.wait(5)
+            return "wav", wav_audio(10)
+
+        mocker.patch.object(
+            tts_chunking,
+            "validate_all_provider_constraints",
+            side_effect=lambda provider, feature, subfeature, phase, args: args,
+        )
+        mocker.patch.object(
+            tts_chunking,
+            "provider_text_to_speech_chunks",
+            return_value=text_to_speech_chunks,
+        )
+
+        segments = iter_text_to_speech_segments(
+            "google", {"text": "First one. Second one. Third one."}, max_characters=12
+        )
+
+        assert next(segments)[0] == "wav"
+        release.set()
+        assert len(list(segments)) == 2
+
+    def test_stopped_early(self, mocker):
+        synthesized = []
+
+        def text_to_speech_chunks(text, **kwargs):
+            synthesized.append(text)
+            time.sleep(0.05)
+            return "wav", wav_audio(10)
+
+        mocker.patch.object(
+            tts_chunking,
+            "validate_all_provider_constraints",
+            side_effect=lambda provider, feature, subfeature, phase, args: args,
+        )
+        mocker.patch.object(
+            tts_chunking,
+            "provider_text_to_speech_chunks",
+            return_value=text_to_speech_chunks,
+        )
+
+        segments = iter_text_to_speech_segments(
+            "google",
+            {"text": "First one. Second one. Third one."},
+            max_characters=12,
+            max_workers=1,
+        )
+        next(segments)
+        segments.close()
+        time.sleep(0.2)
+
+        # the chunk being synthesized completes, the next one is cancelled
+        assert synthesized == ["First one. ", "Second one. "]
+
+    def test_failed_chunk(self, provider, mocker):
+        def text_to_speech_chunks(text, **kwargs):
+            if text.startswith("Another"):
+                raise ProviderException("Synthesis failed")
+            return "wav", wav_audio(10)
+
+        mocker.patch.object(
+            tts_chunking,
+            "provider_text_to_speech_chunks",
+            return_value=text_to_speech_chunks,
+        )
+        text = "Hello world. This is a test! Another sentence here? And the final one."
+
+        with pytest.raises(ProviderException, match="Synthesis failed"):
+            list(iter_text_to_speech_segments("google", {"text": text}))
+
+    def test_calls_wrapped_in_caller_context(self, provider):
+        variable = ContextVar("variable", default="unset")
+        variable.set("caller")
+        calls = []
+
+        def call(provider_call):
+            calls.append(variable.get())
+            return provider_call()
+
+        text = "Hello world. This is a test! Another sentence here? And the final one."
+        segments = list(
+            iter_text_to_speech_segments("google", {"text": text}, call=call)
+        )
+
+        assert len(segments) == 3
+        assert calls == ["caller"] * 3
+
+    def test_long_text_to_speech(self, provider, mocker):
+        uploaded = []
+
+        def upload_in_background(file, file_name, process_type, executor=None):
+            uploaded.append(file.read())
+            future = Future()
+            future.set_result(None)
+            return "https://cdn.example.com/audio.wav", future
+
+        mocker.patch(
+            "edenai_apis.utils.tts_streaming.upload_file_bytes_to_s3_in_background",
+            side_effect=upload_in_background,
+        )
+        text = "Hello world. This is a test! Another sentence here? And the final one."
+
+        response = long_text_to_speech("google", {"text": text})
+
+        audio = base64.b64decode(response.standardized_response.audio)
+        assert uploaded == [audio]
+        with wave.open(BytesIO(audio), "rb") as wav:
+            assert wav.getnframes() == len(text) * 10
@@ -0,0 +1,118 @@
+import base64
+from concurrent.futures import Future
+
+import pytest
+
+from edenai_apis.utils import tts_streaming
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.tts_streaming import (
+    TextToSpeechStream,
+    iter_audio_chunks,
+    text_to_speech_response,
+    text_to_speech_stream,
+)
+
+AUDIO_URL = "https://cdn.example.com/audio.mp3"
+
+
+@pytest.fixture
+def upload(mocker):
+    uploaded = []
+
+    def upload_in_background(file, file_name, process_type, executor=None):
+        uploaded.append((file.read(), file_name))
+        future = Future()
+        future.set_result(None)
+        return AUDIO_URL, future
+
+    mocker.patch.object(
+        tts_streaming,
+        "upload_file_bytes_to_s3_in_background",
+        side_effect=upload_in_background,
+    )
+    return uploaded
+
+
+def test_iter_audio_chunks():
+    assert [bytes(chunk) for chunk in iter_audio_chunks(b"abcdefg", 3)] == [
+        b"abc",
+        b"def",
+        b"g",
+    ]
+
+
+class TestTextToSpeechResponse:
+    @pytest.mark.parametrize("audio", [b"audio data", iter([b"audio ", b"data"])])
+    def test_response(self, audio, upload):
+        response = text_to_speech_response(audio, "mp3")
+
+        assert upload == [(b"audio data", ".mp3")]
+        assert response.standardized_response.audio == base64.b64encode(
+            b"audio data"
+        ).decode("utf-8")
+        assert response.standardized_response.audio_resource_url == AUDIO_URL
+
+
+class TestTextToSpeechStream:
+    def test_chunks_yielded_then_uploaded(self, upload):
+        stream = TextToSpeechStream(iter([b"first ", b"", b"second"]), "mp3")
+
+        assert list(stream) == [b"first ", b"second"]
+        assert upload == [(b"first second", ".mp3")]
+        assert stream.wait_upload() == AUDIO_URL
+        with pytest.raises(ValueError):
+            list(stream)
+
+    def test_response_without_audio(self, upload):
+        with TextToSpeechStream(b"audio data", "wav") as stream:
+            response = stream.response()
+
+        assert response.standardized_response.audio is None
+        assert response.standardized_response.audio_resource_url == AUDIO_URL
+        assert len(upload) == 1
+
+    def test_response_with_audio(self, upload):
+        with TextToSpeechStream(iter([b"audio ", b"data"]), "wav") as stream:
+            response = stream.response(include_audio=True)
+
+        assert base64.b64decode(response.standardized_response.audio) == b"audio data"
+
+    def test_without_upload(self, upload):
+        with TextToSpeechStream(iter([b"audio"]), "wav", upload=False) as stream:
+            assert stream.read() == b"audio"
+
+        assert stream.audio_resource_url is None
+        assert upload == []
+
+
+class TestTextToSpeechStreamProvider:
+    def test_provider_without_streaming(self, mocker):
+        mocker.patch.object(
+            tts_streaming,
+            "validate_all_provider_constraints",
+            side_effect=lambda provider, feature, subfeature, phase, args: args,
+        )
+        mocker.patch.object(
+            tts_streaming, "load_provider", return_value=lambda api_keys: object()
+        )
+
+        with pytest.raises(ProviderException):
+            text_to_speech_stream("lovoai", {"text": "hello"})
+
+    def test_provider_chunks(self, mocker, upload):
+        provider = mocker.Mock()
+        provider._text_to_speech_chunks.return_value = ("mp3", iter([b"a", b"b"]))
+        mocker.patch.object(
+            tts_streaming,
+            "validate_all_provider_constraints",
+            side_effect=lambda provider, feature, subfeature, phase, args: args,
+        )
+        mocker.patch.object(
+            tts_streaming, "load_provider", return_value=lambda api_keys: provider
+        )
+
+        with text_to_speech_stream("amazon", {"text": "hello"}) as stream:
+            assert b"".join(stream) == b"ab"
+
+        provider._text_to_speech_chunks.assert_called_once_with(text="hello")
+        assert upload == [(b"ab", ".mp3")]
@@ -1,11 +1,20 @@
 import os
+import threading
+from concurrent.futures import Future
+
 import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
 from settings import base_path
 
+from edenai_apis.utils import upload_s3
 from edenai_apis.utils.upload_s3 import (
+    deferred_uploads,
     get_providers_json_from_s3,
+    rsa_signer,
     s3_client_load,
     upload_file_to_s3,
+    upload_files_bytes_to_s3,
 )
 
 
@@ -35,3 +44,101 @@ def test_upload_to_s3():
 def test_get_providers_json_from_s3():
     providers_info = get_providers_json_from_s3()
     assert isinstance(providers_info, dict)
+
+
+class TestUploadFilesBytes:
+    @pytest.fixture
+    def uploads(self, mocker):
+        uploaded = []
+
+        def upload_in_background(file, file_name, process_type, executor=None):
+            uploaded.append(file.read())
+            future = Future()
+            future.set_result(None)
+            return f"https://cdn.example.com/{len(uploaded)}{file_name}", future
+
+        mocker.patch.object(
+            upload_s3,
+            "upload_file_bytes_to_s3_in_background",
+            side_effect=upload_in_background,
+        )
+        return uploaded
+
+    def test_urls_in_order(self, uploads):
+        urls = upload_files_bytes_to_s3([(b"first", ".png"), (b"second", ".png")])
+
+        assert urls == [
+            "https://cdn.example.com/1.png",
+            "https://cdn.example.com/2.png",
+        ]
+        assert uploads == [b"first", b"second"]
+
+    def test_deferred_uploads(self, uploads):
+        with deferred_uploads():
+            urls = upload_files_bytes_to_s3([(b"first", ".png"), (b"second", ".png")])
+
+        assert urls == ["", ""]
+        assert uploads == []
+
+
+def test_files_uploads_not_queued_on_background_executor(mocker):
+    files = [(str(index).encode(), ".png") for index in range(6)]
+    # every upload waits for the others, they must all run at the same time
+    all_uploading = threading.Barrier(len(files), timeout=5)
+    client = mocker.Mock()
+    client.upload_fileobj.side_effect = lambda *args: all_uploading.wait()
+    mocker.patch.object(upload_s3, "s3_client_load", return_value=client)
+    mocker.patch.object(
+        upload_s3,
+        "set_time_and_presigned_url_process",
+        return_value=(lambda filename, _: filename, 0, "bucket"),
+    )
+    mocker.patch.object(
+        upload_s3, "_background_uploads_executor", side_effect=AssertionError
+    )
+
+    urls = upload_files_bytes_to_s3(files)
+
+    assert [url.split("_", 1)[1] for url in urls] == [".png"] * len(files)
+    assert client.upload_fileobj.call_count == len(files)
+
+
+def test_s3_client_reused(mocker):
+    mocker.patch.object(upload_s3, "_s3_client", None)
+    load_provider = mocker.patch.object(
+        upload_s3,
+        "load_provider",
+        return_value={
+            "aws_access_key_id": "key",
+            "aws_secret_access_key": "secret",
+            "providers_resource_bucket": "providers",
+            "users_resource_bucket": "users",
+            "cloudfront_key_id": "cloudfront",
+            "ressource_region": "eu-west-1",
+        },
+    )
+    client = mocker.patch.object(upload_s3.boto3, "client")
+
+    assert s3_client_load() is s3_client_load()
+    load_provider.assert_called_once()
+    client.assert_called_once()
+
+
+def test_private_key_loaded_once(mocker, tmp_path):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    (tmp_path / "cloudfront_private_key.pem").write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    mocker.patch.object(upload_s3, "keys_path", str(tmp_path))
+    upload_s3._cloudfront_private_key.cache_clear()
+    load_key = mocker.spy(serialization, "load_pem_private_key")
+
+    try:
+        assert rsa_signer(b"first") != rsa_signer(b"second")
+        load_key.assert_called_once()
+    finally:
+        upload_s3._cloudfront_private_key.cache_clear()
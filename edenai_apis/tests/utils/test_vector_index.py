@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from edenai_apis.interface import compute_output
+from edenai_apis.interface_v2 import Text
+from edenai_apis.utils import embeddings_search
+from edenai_apis.utils.embeddings_search import EmbeddingsSearch
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.vector_index import IVFVectorIndex, VectorIndex
+
+DIMENSIONS = 16
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).normal(size=(200, DIMENSIONS)).astype(np.float32)
+
+
+@pytest.fixture(params=["flat", "ivf"])
+def index(request):
+    if request.param == "ivf":
+        return IVFVectorIndex(DIMENSIONS, n_lists=8, n_probe=8, train_size=100)
+    return VectorIndex(DIMENSIONS)
+
+
+class TestVectorIndex:
+    def test_search_closest_first(self, index, vectors):
+        index.add(list(range(len(vectors))), vectors)
+
+        results = index.search(vectors[42], top_k=3)
+
+        assert len(results) == 3
+        assert results[0][0] == 42
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert results[0][1] >= results[1][1] >= results[2][1]
+
+    def test_add_and_delete(self, index, vectors):
+        index.add(list(range(len(vectors))), vectors)
+        index.delete([42, 1000])
+
+        assert len(index) == len(vectors) - 1
+        assert 42 not in index
+        assert index.search(vectors[42], top_k=1)[0][0] != 42
+
+        index.add([42], vectors[42:43])
+        assert index.search(vectors[42], top_k=1)[0][0] == 42
+
+    def test_save_and_load_memory_mapped(self, index, vectors, tmp_path):
+        index.add(list(range(len(vectors))), vectors, [{"i": i} for i in range(200)])
+        index.save(str(tmp_path))
+
+        loaded = VectorIndex.load(str(tmp_path))
+
+        assert type(loaded) is type(index)
+        assert isinstance(loaded.vectors, np.memmap)
+        assert loaded.metadata[7] == {"i": 7}
+        assert loaded.search(vectors[7], top_k=2) == index.search(vectors[7], top_k=2)
+
+
+def test_wrong_dimensions():
+    with pytest.raises(ValueError):
+        VectorIndex(DIMENSIONS).add([0], [[1.0, 2.0]])
+
+
+class TestEmbeddingsSearch:
+    def test_search_only_embeds_query(self, mocker, vectors):
+        embed = mocker.patch.object(
+            EmbeddingsSearch,
+            "embed",
+            side_effect=[vectors[:3], vectors[1:2], vectors[3:4], vectors[3:4]],
+        )
+        engine = EmbeddingsSearch("openai")
+
+        assert engine.add_documents(["a", "b", "c"]) == [0, 1, 2]
+        result = engine.search("b", top_k=2)
+        assert result.standardized_response.items[0].document == 1
+        assert len(result.standardized_response.items) == 2
+        embed.assert_called_with(["b"])
+
+        assert engine.add_documents(["d"]) == [3]
+        engine.delete_documents([0])
+        documents = [
+            item.document for item in engine.search("d").standardized_response.items
+        ]
+        assert documents[0] == 3
+        assert sorted(documents) == [1, 2, 3]
+
+    def test_embeddings_errors_are_classified(self, mocker):
+        def failing_embeddings(**args):
+            raise ProviderException("Too many requests", code=429)
+
+        mocker.patch.object(Text, "embeddings", return_value=failing_embeddings)
+        get_appropriate_error = mocker.patch(
+            "edenai_apis.utils.embeddings_search.get_appropriate_error",
+            side_effect=lambda provider_name, exc: exc,
+        )
+
+        with pytest.raises(ProviderException, match="Too many requests"):
+            EmbeddingsSearch("cohere").add_documents(["a"])
+        assert get_appropriate_error.call_args.args[0] == "cohere"
+
+
+def test_compute_output_embeddings_search(mocker, monkeypatch, vectors):
+    monkeypatch.setattr(embeddings_search, "_engines", embeddings_search.OrderedDict())
+    embed = mocker.patch.object(
+        EmbeddingsSearch, "embed", side_effect=[vectors[:3], vectors[2:3], vectors[0:1]]
+    )
+    args = {"texts": ["a", "b", "c"], "query": "c"}
+
+    result = compute_output("cohere", "text", "search", args, embeddings_search=True)
+
+    assert result["provider"] == "cohere"
+    assert result["standardized_response"]["items"][0]["document"] == 2
+    # the documents stay indexed, only the query is embedded
+    result = compute_output(
+        "cohere", "text", "search", {**args, "query": "a"}, embeddings_search=True
+    )
+    assert result["standardized_response"]["items"][0]["document"] == 0
+    assert [call.args[0] for call in embed.call_args_list] == [
+        ["a", "b", "c"],
+        ["c"],
+        ["a"],
+    ]
@@ -1,6 +1,6 @@
 import mimetypes
 import random
-from io import BufferedReader
+from io import BufferedReader, BytesIO
 from typing import Union, List, Tuple, Dict
 from pydub import AudioSegment
 from pydub.utils import mediainfo
@@ -68,6 +68,37 @@ def audio_converter(
     )
 
 
+def concatenate_audios(audios: List[bytes], audio_format: str) -> bytes:
+    """Concatenate audio files of the same format into one.
+    Sample rate, channels and sample width are aligned on the first audio.
+
+    Args:
+        audios (List[bytes]): The audio files content, in order.
+        audio_format (str): The ffmpeg format of the audio files. ('mp3', 'wav', 'ogg', ...)
+
+    Returns:
+        bytes: The concatenated audio file content
+    """
+    if len(audios) == 1:
+        return audios[0]
+
+    segments = [
+        AudioSegment.from_file(BytesIO(audio), format=audio_format) for audio in audios
+    ]
+    first = segments[0]
+    audio_out = first
+    for segment in segments[1:]:
+        audio_out += (
+            segment.set_frame_rate(first.frame_rate)
+            .set_channels(first.channels)
+            .set_sample_width(first.sample_width)
+        )
+
+    output = BytesIO()
+    audio_out.export(output, format=audio_format)
+    return output.getvalue()
+
+
 def get_audio_attributes(audio_file: BufferedReader):
     file_features = mediainfo(audio_file.name)
     return int(file_features.get("channels", "1")), int(
@@ -0,0 +1,423 @@
+"""
+Chunked `speech_to_text_async` for long audio files
+
+Speech to text providers transcribe a recording in one job, so multi-hours files take as
+long as the provider allows. `launch_chunked_speech_to_text` splits the audio on silences
+in overlapping segments (streamed through ffmpeg), launches one provider job per segment
+concurrently and returns a composite job id. `get_chunked_speech_to_text_result` polls
+the segments jobs and merges their results in one `SpeechToTextAsyncDataClass`:
+
+    - words timestamps are offset by the segment start
+    - words of the overlaps are kept once, from the segment owning their timestamp
+    - speakers labels, independent in each segment, are matched with the previous
+      segment's speakers talking at the same time in the overlap
+
+`compute_output(..., chunk_audio=True)` launches chunked jobs, `get_async_job_result`
+recognizes their job ids.
+
+Example:
+    >>> job = launch_chunked_speech_to_text("deepgram", args, max_segment_duration=600)
+    >>> get_chunked_speech_to_text_result("deepgram", job.provider_job_id)
+"""
+import base64
+import json
+import os
+import re
+import subprocess
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from pydub.utils import get_encoder_name
+
+from edenai_apis.features.audio.speech_to_text_async.speech_to_text_async_dataclass import (
+    SpeechDiarization,
+    SpeechDiarizationEntry,
+    SpeechToTextAsyncDataClass,
+)
+from edenai_apis.utils.audio_conversion import file_audio_format, transcode_audio
+from edenai_apis.utils.constraints import (
+    transform_file_args,
+    validate_all_provider_constraints,
+)
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.file_probe import get_audio_info
+from edenai_apis.utils.files import FileInfo, FileWrapper
+from edenai_apis.utils.types import (
+    AsyncBaseResponseType,
+    AsyncErrorResponseType,
+    AsyncLaunchJobResponseType,
+    AsyncPendingResponseType,
+    AsyncResponseType,
+)
+
+CHUNKED_JOB_PREFIX = "chunked:"
+DEFAULT_SEGMENT_DURATION = 600.0
+DEFAULT_OVERLAP = 2.0
+# silences searched in the last part of each segment, relative to its duration
+SILENCE_SEARCH_RATIO = 0.25
+SILENCE_THRESHOLD_DB = -35
+MIN_SILENCE_DURATION = 0.4
+
+SILENCE_PATTERN = re.compile(r"silence_(start|end): (-?[\d.]+)")
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    """Segment of the input audio, in seconds
+
+    The segment sent to the provider is [start, end], words are kept from it only if
+    they start in [keep_start, keep_end): overlaps are transcribed twice, kept once.
+    """
+
+    start: float
+    end: float
+    keep_start: float
+    keep_end: float
+
+
+def detect_silences(
+    file_path: str,
+    threshold_db: float = SILENCE_THRESHOLD_DB,
+    min_duration: float = MIN_SILENCE_DURATION,
+) -> List[Tuple[float, float]]:
+    """(start, end) of the silences of an audio file, detected by ffmpeg while streaming"""
+    command = [get_encoder_name(), "-nostdin", "-hide_banner", "-i", file_path]
+    command += ["-vn", "-af", f"silencedetect=n={threshold_db}dB:d={min_duration}"]
+    command += ["-f", "null", "-"]
+    process = subprocess.run(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    if process.returncode != 0:
+        raise ProviderException("Could not read the audio file")
+
+    silences = []
+    silence_start = None
+    for kind, value in SILENCE_PATTERN.findall(
+        process.stderr.decode("utf-8", "ignore")
+    ):
+        if kind == "start":
+            silence_start = max(float(value), 0.0)
+        elif silence_start is not None:
+            silences.append((silence_start, float(value)))
+            silence_start = None
+    return silences
+
+
+def plan_chunks(
+    duration: float,
+    silences: Sequence[Tuple[float, float]],
+    max_segment_duration: float = DEFAULT_SEGMENT_DURATION,
+    overlap: float = DEFAULT_OVERLAP,
+) -> List[AudioChunk]:
+    """Cut the audio in segments of at most `max_segment_duration` (plus overlaps)
+
+    Each cut is made in the middle of the longest silence of the last quarter of the
+    segment, or at the maximum duration if there is no silence there.
+    """
+    cuts = [0.0]
+    while duration - cuts[-1] > max_segment_duration:
+        segment_end = cuts[-1] + max_segment_duration
+        search_start = segment_end - max_segment_duration * SILENCE_SEARCH_RATIO
+        candidates = [
+            (min(end, segment_end) - max(start, search_start), (start + end) / 2)
+            for start, end in silences
+            if search_start < (start + end) / 2 < segment_end
+        ]
+        cuts.append(max(candidates)[1] if candidates else segment_end)
+    cuts.append(duration)
+
+    return [
+        AudioChunk(
+            start=max(cut - overlap, 0.0) if index else 0.0,
+            end=min(next_cut + overlap, duration),
+            keep_start=cut,
+            keep_end=next_cut,
+        )
+        for index, (cut, next_cut) in enumerate(zip(cuts, cuts[1:]))
+    ]
+
+
+def split_audio(
+    file_path: str, output_dir: str, chunks: Sequence[AudioChunk], export_format: str
+) -> List[str]:
+    """Write the segments of an audio file in `output_dir`, returns their paths"""
+    paths = []
+    for index, chunk in enumerate(chunks):
+        path = os.path.join(output_dir, f"segment_{index}.{export_format}")
+        transcode_audio(
+            file_path,
+            path,
+            export_format,
+            start=chunk.start,
+            duration=chunk.end - chunk.start,
+        )
+        paths.append(path)
+    return paths
+
+
+def _format_time(seconds: float) -> str:
+    return f"{seconds:.3f}".rstrip("0").rstrip(".")
+
+
+def _match_speakers(
+    previous: Sequence[Tuple[float, float, int]],
+    current: Sequence[Tuple[float, float, int]],
+) -> Dict[int, int]:
+    """Map the current segment speakers to the previous segment ones (global labels)
+
+    Speakers are matched by decreasing time spoken together in the overlap.
+    """
+    shared_time: Dict[Tuple[int, int], float] = defaultdict(float)
+    for start, end, speaker in current:
+        for previous_start, previous_end, previous_speaker in previous:
+            common = min(end, previous_end) - max(start, previous_start)
+            if common > 0:
+                shared_time[(speaker, previous_speaker)] += common
+
+    mapping: Dict[int, int] = {}
+    for (speaker, previous_speaker), _ in sorted(
+        shared_time.items(), key=lambda item: -item[1]
+    ):
+        if speaker not in mapping and previous_speaker not in mapping.values():
+            mapping[speaker] = previous_speaker
+    return mapping
+
+
+def merge_chunks_results(
+    chunks_results: Sequence[SpeechToTextAsyncDataClass],
+    chunks: Sequence[AudioChunk],
+) -> SpeechToTextAsyncDataClass:
+    """Merge the transcriptions of consecutive overlapping segments"""
+    entries: List[SpeechDiarizationEntry] = []
+    texts: List[str] = []
+    errors: List[str] = []
+    previous_turns: List[Tuple[float, float, int]] = []
+    speakers_count = 0
+
+    for index, (result, chunk) in enumerate(zip(chunks_results, chunks)):
+        if result.diarization.error_message:
+            errors.append(result.diarization.error_message)
+
+        # absolute (start, end, entry) of the segment words
+        words = [
+            (
+                float(entry.start_time) + chunk.start,
+                float(entry.end_time) + chunk.start,
+                entry,
+            )
+            for entry in result.diarization.entries
+        ]
+        if not words:
+            # no timestamps, the overlaps can't be deduplicated
+            if result.text:
+                texts.append(result.text)
+            continue
+
+        # overlap with the previous segment, transcribed by both segments
+        previous_end = chunks[index - 1].end if index else chunk.start
+        mapping = _match_speakers(
+            previous_turns,
+            [
+                (start, end, entry.speaker)
+                for start, end, entry in words
+                if start < previous_end
+            ],
+        )
+        for speaker in sorted({entry.speaker for _, _, entry in words}):
+            if speaker not in mapping:
+                speakers_count += 1
+                mapping[speaker] = speakers_count
+
+        kept_words = [
+            (start, end, entry)
+            for start, end, entry in words
+            if chunk.keep_start <= start < chunk.keep_end
+        ]
+        for start, end, entry in kept_words:
+            entries.append(
+                SpeechDiarizationEntry(
+                    segment=entry.segment,
+                    start_time=_format_time(start),
+                    end_time=_format_time(end),
+                    speaker=mapping[entry.speaker],
+                    confidence=entry.confidence,
+                )
+            )
+        texts.append(" ".join(entry.segment for _, _, entry in kept_words))
+
+        # overlap with the next segment, with the global speakers labels
+        next_start = chunks[index + 1].start if index + 1 < len(chunks) else chunk.end
+        previous_turns = [
+            (start, end, mapping[entry.speaker])
+            for start, end, entry in words
+            if end > next_start
+        ]
+
+    return SpeechToTextAsyncDataClass(
+        text=" ".join(text for text in texts if text),
+        diarization=SpeechDiarization(
+            total_speakers=len({entry.speaker for entry in entries}) or speakers_count,
+            entries=entries,
+            error_message=errors[0] if errors else None,
+        ),
+    )
+
+
+def _encode_job_id(jobs: Sequence[str], chunks: Sequence[AudioChunk]) -> str:
+    payload = {"jobs": list(jobs), "chunks": [asdict(chunk) for chunk in chunks]}
+    return CHUNKED_JOB_PREFIX + base64.urlsafe_b64encode(
+        json.dumps(payload, separators=(",", ":")).encode()
+    ).decode("ascii")
+
+
+def _decode_job_id(job_id: str) -> Tuple[List[str], List[AudioChunk]]:
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(job_id[len(CHUNKED_JOB_PREFIX) :].encode())
+        )
+        return payload["jobs"], [AudioChunk(**chunk) for chunk in payload["chunks"]]
+    except (ValueError, KeyError, TypeError):
+        raise ProviderException("Invalid chunked job id", code=400)
+
+
+def is_chunked_job_id(job_id: str) -> bool:
+    return isinstance(job_id, str) and job_id.startswith(CHUNKED_JOB_PREFIX)
+
+
+def _segment_file(path: str, file: FileWrapper) -> FileWrapper:
+    audio_info = get_audio_info(file.file_path)
+    return FileWrapper(
+        path,
+        "",
+        FileInfo(
+            os.path.getsize(path),
+            file.file_info.file_media_type,
+            file.file_info.file_extension,
+            str(audio_info.sample_rate),
+            str(audio_info.channels),
+        ),
+    )
+
+
+def launch_chunked_speech_to_text(
+    provider_name: str,
+    args: Dict,
+    api_keys: Dict = {},
+    max_segment_duration: float = DEFAULT_SEGMENT_DURATION,
+    overlap: float = DEFAULT_OVERLAP,
+    max_workers: int = 4,
+) -> AsyncLaunchJobResponseType:
+    """Launch one `speech_to_text_async` job per segment of the input audio
+
+    Args:
+        provider_name (str): provider implementing `audio__speech_to_text_async`
+        args (dict): not validated inputs of the subfeature, with a `file` FileWrapper
+        api_keys (dict, optional): user's api keys for the provider
+        max_segment_duration (float, optional): maximum duration of the segments, in
+            seconds, overlaps excluded. Defaults to 10 minutes.
+        overlap (float, optional): seconds transcribed by both segments around each cut,
+            used to match the speakers. Defaults to 2 seconds.
+        max_workers (int, optional): maximum number of concurrent launches. Defaults to 4.
+
+    Returns:
+        AsyncLaunchJobResponseType: composite job id of the segments jobs, or the
+            provider job id if the audio is short enough for one job
+    """
+    # import here to avoid circular import (interface_v2 imports features)
+    from edenai_apis.interface_v2 import Audio
+
+    file: FileWrapper = args["file"]
+    if not isinstance(file, FileWrapper) or not file.file_path:
+        raise ProviderException("Chunked speech to text requires a local audio file")
+
+    duration = (file.audio_info or get_audio_info(file.file_path)).duration
+    if not duration or duration <= max_segment_duration:
+        validated_args = validate_all_provider_constraints(
+            provider_name, "audio", "speech_to_text_async", "", args
+        )
+        return Audio.speech_to_text_async__launch_job(provider_name, api_keys)(
+            **validated_args
+        )
+
+    chunks = plan_chunks(
+        duration, detect_silences(file.file_path), max_segment_duration, overlap
+    )
+    export_format = file_audio_format(file)
+    if not export_format:
+        raise ProviderException("Unknown audio file format")
+
+    with tempfile.TemporaryDirectory() as segments_dir:
+        segments_paths = split_audio(
+            file.file_path, segments_dir, chunks, export_format
+        )
+
+        # segments have the same format, constraints are validated once
+        validated_args = validate_all_provider_constraints(
+            provider_name,
+            "audio",
+            "speech_to_text_async",
+            "",
+            {**args, "file": _segment_file(segments_paths[0], file)},
+        )
+        launch_job = Audio.speech_to_text_async__launch_job(provider_name, api_keys)
+
+        def launch_segment(segment_path: str) -> str:
+            segment_args = transform_file_args(
+                {**validated_args, "file": _segment_file(segment_path, file)}
+            )
+            return launch_job(**segment_args).provider_job_id
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            jobs = list(executor.map(launch_segment, segments_paths))
+
+    return AsyncLaunchJobResponseType(provider_job_id=_encode_job_id(jobs, chunks))
+
+
+def get_chunked_speech_to_text_result(
+    provider_name: str, job_id: str, api_keys: Dict = {}, max_workers: int = 4
+) -> AsyncBaseResponseType[SpeechToTextAsyncDataClass]:
+    """Result of a chunked job: pending until all the segments jobs succeeded
+
+    Returns:
+        AsyncBaseResponseType: merged result once all the segments succeeded, the
+            original response is the list of the segments original responses
+    """
+    # import here to avoid circular import (interface_v2 imports features)
+    from edenai_apis.interface_v2 import Audio
+
+    jobs, chunks = _decode_job_id(job_id)
+    get_job_result = Audio.speech_to_text_async__get_job_result(provider_name, api_keys)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        responses = list(executor.map(get_job_result, jobs))
+
+    for response in responses:
+        if response.status == "failed":
+            return AsyncErrorResponseType[SpeechToTextAsyncDataClass](
+                provider_job_id=job_id, error=response.error
+            )
+    if any(response.status != "succeeded" for response in responses):
+        return AsyncPendingResponseType[SpeechToTextAsyncDataClass](
+            provider_job_id=job_id
+        )
+
+    return AsyncResponseType[SpeechToTextAsyncDataClass](
+        provider_job_id=job_id,
+        original_response=[
+            {
+                "segment": index,
+                "start": chunk.start,
+                "response": response.original_response,
+            }
+            for index, (chunk, response) in enumerate(zip(chunks, responses))
+        ],
+        standardized_response=merge_chunks_results(
+            [response.standardized_response for response in responses], chunks
+        ),
+    )
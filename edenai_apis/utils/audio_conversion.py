@@ -0,0 +1,299 @@
+"""
+Convert input audio files to formats accepted by speech to text providers
+
+Providers only accept some audio containers (`file_extensions` constraint of their
+`info.json`). Converting with pydub decodes the whole file to PCM in memory, then
+re-encodes it, once per provider. This module instead:
+
+    - probes files once (`FileWrapper.audio_info`)
+    - picks the fewest target formats satisfying several providers at once
+      (`select_audio_formats`), keeping the original file for providers accepting it
+    - transcodes by streaming the file through ffmpeg to a temporary file, the decoded
+      audio is never held in memory
+    - caches conversions by (content hash, format, sample rate, channels), so a file sent
+      to several providers is converted once per target format. Converted files stay on
+      disk while the returned `FileWrapper`s are referenced (`utils.file_cache`)
+
+Example:
+    >>> files = convert_audio_for_providers(file, ["google", "oneai", "voxist"])
+    >>> files["oneai"].file_path  # same converted file for google & voxist if possible
+"""
+import hashlib
+import mimetypes
+import os
+import subprocess
+import tempfile
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydub.utils import get_encoder_name
+
+from edenai_apis.loaders.data_loader import ProviderDataEnum
+from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.file_cache import TemporaryFilesCache
+from edenai_apis.utils.file_probe import _file_key, get_audio_info
+from edenai_apis.utils.files import FileInfo, FileWrapper
+
+# ffmpeg muxer of the extensions which don't have the same name
+FFMPEG_FORMATS = {
+    "aac": "adts",
+    "m4a": "ipod",
+    "mpga": "mp3",
+    "mpeg": "mp3",
+    "oga": "ogg",
+    "opus": "ogg",
+    "wma": "asf",
+}
+# target formats by order of preference: lossless first, then widely supported ones
+PREFERRED_FORMATS = ("flac", "wav", "mp3", "ogg", "webm", "m4a", "mp4")
+CACHE_SIZE = 16
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_audio_format(file: FileWrapper) -> str:
+    """Format of an audio file, from its extension"""
+    return os.path.splitext(file.file_path)[1][1:].lower()
+
+
+def select_audio_formats(
+    source_format: str, providers_formats: Dict[str, Sequence[str]]
+) -> Dict[str, Optional[str]]:
+    """Target format of each provider, with as few different formats as possible
+
+    Providers accepting the source format get `None` (no conversion). The others are
+    greedily grouped: the format accepted by the most remaining providers is chosen
+    first, ties broken by `PREFERRED_FORMATS`.
+
+    Args:
+        source_format (str): format (extension) of the input file
+        providers_formats (dict): accepted formats by provider name
+
+    Returns:
+        dict: target format by provider name, `None` to send the file as is
+    """
+    targets: Dict[str, Optional[str]] = {}
+    remaining: Dict[str, set] = {}
+    for provider, formats in providers_formats.items():
+        formats = {extension.lower() for extension in formats}
+        if not formats or source_format in formats:
+            targets[provider] = None
+        else:
+            remaining[provider] = formats
+
+    def preference(extension: str) -> Tuple[int, str]:
+        if extension in PREFERRED_FORMATS:
+            return PREFERRED_FORMATS.index(extension), extension
+        return len(PREFERRED_FORMATS), extension
+
+    while remaining:
+        counts = Counter(
+            extension for formats in remaining.values() for extension in formats
+        )
+        target = min(
+            counts, key=lambda extension: (-counts[extension], *preference(extension))
+        )
+        for provider in [
+            name for name, formats in remaining.items() if target in formats
+        ]:
+            targets[provider] = target
+            del remaining[provider]
+    return targets
+
+
+@lru_cache(maxsize=256)
+def _cached_content_hash(file_key: Tuple[str, int, int]) -> str:
+    digest = hashlib.sha256()
+    with open(file_key[0], "rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(file_path: str) -> str:
+    """sha256 of the file content, cached per file"""
+    return _cached_content_hash(_file_key(file_path))
+
+
+def transcode_audio(
+    input_path: str,
+    output_path: str,
+    export_format: str,
+    frame_rate: Optional[int] = None,
+    channels: Optional[int] = None,
+    start: Optional[float] = None,
+    duration: Optional[float] = None,
+) -> None:
+    """Convert an audio file with ffmpeg, streaming from `input_path` to `output_path`
+
+    `start` & `duration` (seconds) only convert a segment of the input.
+
+    Raises:
+        ProviderException: if ffmpeg can't convert the file
+    """
+    command = [get_encoder_name(), "-nostdin", "-v", "error", "-y"]
+    if start:
+        # seek in the input before decoding
+        command += ["-ss", f"{start:.3f}"]
+    command += ["-i", input_path]
+    if duration is not None:
+        command += ["-t", f"{duration:.3f}"]
+    # drop video & cover art streams
+    command += ["-vn"]
+    if frame_rate:
+        command += ["-ar", str(frame_rate)]
+    if channels:
+        command += ["-ac", str(channels)]
+    command += ["-f", FFMPEG_FORMATS.get(export_format, export_format), output_path]
+
+    process = subprocess.run(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    if process.returncode != 0:
+        error = process.stderr.decode("utf-8", "ignore").strip().splitlines()
+        raise ProviderException(
+            f"Could not convert the audio file to {export_format}"
+            + (f": {error[-1]}" if error else "")
+        )
+
+
+_cache: Optional[TemporaryFilesCache[FileWrapper]] = None
+_cache_lock = threading.Lock()
+
+
+def _conversions_cache() -> TemporaryFilesCache[FileWrapper]:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TemporaryFilesCache(CACHE_SIZE, prefix="edenai_audios_")
+        return _cache
+
+
+def convert_audio(
+    file: FileWrapper,
+    export_format: str,
+    frame_rate: Optional[int] = None,
+    channels: Optional[int] = None,
+) -> FileWrapper:
+    """Converted copy of an audio file, cached
+
+    The converted file is shared with the other conversions of the same content, it's
+    kept on disk while the returned wrapper is referenced.
+
+    Args:
+        file (FileWrapper): audio file to convert
+        export_format (str): target format (extension), eg: "flac", "wav", "m4a"
+        frame_rate (int, optional): sample rate of the output, same as input if `None`
+        channels (int, optional): number of channels of the output, same as input if `None`
+
+    Returns:
+        FileWrapper: the converted file, or `file` if it already has the target
+            format, sample rate and channels
+    """
+    # files wrapped without an audio media type are probed by path
+    audio_info = file.audio_info or get_audio_info(file.file_path)
+    if (
+        export_format == file_audio_format(file)
+        and frame_rate in (None, audio_info.sample_rate)
+        and channels in (None, audio_info.channels)
+    ):
+        return file
+
+    def transcode(directory: str) -> FileWrapper:
+        file_descriptor, path = tempfile.mkstemp(
+            suffix=f".{export_format}", dir=directory
+        )
+        os.close(file_descriptor)
+        try:
+            transcode_audio(file.file_path, path, export_format, frame_rate, channels)
+        except Exception:
+            os.remove(path)
+            raise
+        return FileWrapper(
+            path,
+            "",
+            FileInfo(
+                os.path.getsize(path),
+                mimetypes.guess_type(path)[0],
+                [export_format],
+                str(frame_rate or audio_info.sample_rate),
+                str(channels or audio_info.channels),
+            ),
+        )
+
+    _, converted = _conversions_cache().get(
+        (content_hash(file.file_path), export_format, frame_rate, channels),
+        transcode,
+        lambda converted: converted.file_info,
+    )
+    return converted
+
+
+def _provider_audio_formats(
+    provider_name: str, feature: str, subfeature: str, phase: str = ""
+) -> List[str]:
+    try:
+        provider_info = load_provider(
+            ProviderDataEnum.PROVIDER_INFO,
+            provider_name=provider_name,
+            feature=feature,
+            subfeature=subfeature,
+            phase=phase,
+        )
+    except Exception:
+        return []
+    return (provider_info.get("constraints") or {}).get("file_extensions") or []
+
+
+def convert_audio_for_providers(
+    file: FileWrapper,
+    providers: Iterable[str],
+    subfeature: str = "speech_to_text_async",
+    feature: str = "audio",
+) -> Dict[str, FileWrapper]:
+    """Audio file to send to each provider, converted to as few formats as possible
+
+    Returns:
+        dict: file by provider name, the original file for providers accepting its format
+    """
+    targets = select_audio_formats(
+        file_audio_format(file),
+        {
+            provider: _provider_audio_formats(provider, feature, subfeature)
+            for provider in providers
+        },
+    )
+    return {
+        provider: file if target is None else convert_audio(file, target)
+        for provider, target in targets.items()
+    }
+
+
+def convert_input_audio(
+    provider_name: str, feature: str, subfeature: str, phase: str, args: Dict
+) -> Dict:
+    """Replace the `file` input by a copy in a format accepted by the provider
+
+    Returns:
+        args: same or updated args
+    """
+    input_file = args.get("file")
+    if (
+        feature != "audio"
+        or not isinstance(input_file, FileWrapper)
+        or not input_file.file_path
+    ):
+        return args
+
+    formats = _provider_audio_formats(provider_name, feature, subfeature, phase)
+    target = select_audio_formats(
+        file_audio_format(input_file), {provider_name: formats}
+    ).get(provider_name)
+    if target is None:
+        return args
+    return {**args, "file": convert_audio(input_file, target)}
@@ -7,6 +7,7 @@ from edenai_apis.loaders.loaders import load_provider
 from edenai_apis.utils.audio import get_file_extension, retreive_voice_id
 from edenai_apis.utils.exception import ProviderException
 from edenai_apis.utils.files import FileWrapper
+from edenai_apis.utils.instrumentation import traced
 from edenai_apis.utils.languages import (
     LanguageErrorMessage,
     provide_appropriate_language,
@@ -329,9 +330,10 @@ def validate_all_provider_constraints(
         )
 
         # languages
-        validated_args = validate_all_input_languages(
-            provider_constraints, validated_args, provider, feature, subfeature
-        )
+        with traced("languages"):
+            validated_args = validate_all_input_languages(
+                provider_constraints, validated_args, provider, feature, subfeature
+            )
 
         # file extensions for audio files
         validated_args = validate_input_file_extension(
@@ -0,0 +1,218 @@
+"""
+Semantic search engine on top of `text__embeddings`
+
+Unlike `text__search`, which sends all the documents to the provider for every query,
+documents are embedded once with any provider implementing `text__embeddings` and stored
+in a local `VectorIndex`. Each query then only embeds the query text and runs a vectorised
+top-k locally.
+
+`compute_output(provider, "text", "search", args, embeddings_search=True)` runs
+`text__search` this way (`search_with_embeddings`) with any provider implementing
+`text__embeddings`, the documents of recent searches staying indexed.
+
+Example:
+    >>> engine = EmbeddingsSearch("openai")
+    >>> engine.add_documents(["Rome was founded by Romulus", "Mars is the god of war"])
+    >>> engine.search("Rome", top_k=1).standardized_response
+    SearchDataClass(items=[InfosSearchDataClass(object='search_result', document=0, score=0.87)])
+    >>> engine.save("/path/to/index")
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from edenai_apis.features.text.search import InfosSearchDataClass, SearchDataClass
+from edenai_apis.utils.constraints import validate_all_provider_constraints
+from edenai_apis.utils.exception import ProviderException, get_appropriate_error
+from edenai_apis.utils.types import ResponseType
+from edenai_apis.utils.vector_index import IVFVectorIndex, VectorIndex
+
+EMBEDDINGS_OUTPUT_OPTIONS = {
+    "dtype": "float32",
+    "normalize": True,
+    "include_original_vectors": False,
+}
+# documents lists kept indexed by `search_with_embeddings`
+ENGINES_CACHE_SIZE = 16
+
+_engines: "OrderedDict[Hashable, EmbeddingsSearch]" = OrderedDict()
+_engines_lock = threading.Lock()
+
+
+class EmbeddingsSearch:
+    """Local semantic search on documents embedded with a provider
+
+    Args:
+        provider_name (str): provider implementing `text__embeddings`
+        model (str, optional): embeddings model, provider default model if `None`
+        api_keys (dict, optional): user's api keys for the provider
+        index (VectorIndex, optional): existing index, created on first add if `None`
+        approximate (bool, optional): create an approximate `IVFVectorIndex`
+            instead of a flat index. Defaults to False.
+        batch_size (int, optional): number of documents embedded per provider call.
+            Defaults to 32.
+    """
+
+    def __init__(
+        self,
+        provider_name: str,
+        model: Optional[str] = None,
+        api_keys: Dict = {},
+        index: Optional[VectorIndex] = None,
+        approximate: bool = False,
+        batch_size: int = 32,
+    ) -> None:
+        self.provider_name = provider_name
+        self.model = model
+        self.api_keys = api_keys
+        self.index = index
+        self.approximate = approximate
+        self.batch_size = batch_size
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with the provider, returns a `(len(texts), dimensions)` array"""
+        # import here to avoid circular import (interface_v2 imports features)
+        from edenai_apis.interface_v2 import Text
+
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            args = validate_all_provider_constraints(
+                self.provider_name,
+                "text",
+                "embeddings",
+                "",
+                {
+                    "texts": texts[start : start + self.batch_size],
+                    "settings": {self.provider_name: self.model} if self.model else {},
+                },
+            )
+            try:
+                response = Text.embeddings(self.provider_name, self.api_keys)(
+                    **args, output_options=EMBEDDINGS_OUTPUT_OPTIONS
+                )
+            except ProviderException as exc:
+                raise get_appropriate_error(self.provider_name, exc)
+            vectors.append(response.standardized_response.vectors)
+        return np.concatenate(vectors)
+
+    def add_documents(
+        self, texts: List[str], ids: Optional[Sequence[int]] = None
+    ) -> List[int]:
+        """Embed and index documents, documents with an already indexed id are replaced
+
+        Args:
+            texts (list): documents to index
+            ids (list, optional): documents ids, following the last indexed id if `None`
+
+        Returns:
+            list: ids of the indexed documents
+        """
+        if not texts:
+            return []
+        if ids is None:
+            next_id = max(self.index.ids, default=-1) + 1 if self.index else 0
+            ids = list(range(next_id, next_id + len(texts)))
+        if len(ids) != len(texts):
+            raise ProviderException("texts and ids must have the same length")
+
+        vectors = self.embed(texts)
+        if self.index is None:
+            index_class = IVFVectorIndex if self.approximate else VectorIndex
+            self.index = index_class(vectors.shape[1])
+        self.index.add(list(ids), vectors)
+        return list(ids)
+
+    def delete_documents(self, ids: Sequence[int]) -> None:
+        """Remove documents from the index"""
+        if self.index is not None:
+            self.index.delete(ids)
+
+    def search(
+        self, query: str, top_k: Optional[int] = None
+    ) -> ResponseType[SearchDataClass]:
+        """Search the indexed documents closest to the query
+
+        Args:
+            query (str): query text
+            top_k (int, optional): number of results, all documents if `None`
+
+        Returns:
+            ResponseType[SearchDataClass]: documents sorted by cosine similarity
+        """
+        if self.index is None or len(self.index) == 0:
+            raise ProviderException("No document indexed yet")
+
+        results = self.index.search(self.embed([query])[0], top_k)
+        items = [
+            InfosSearchDataClass(
+                object="search_result", document=document, score=round(score, 3)
+            )
+            for document, score in results
+        ]
+        return ResponseType[SearchDataClass](
+            original_response=[
+                {"document": document, "score": score} for document, score in results
+            ],
+            standardized_response=SearchDataClass(items=items),
+        )
+
+    def save(self, path: str) -> None:
+        """Persist the index to the `path` directory"""
+        if self.index is None:
+            raise ProviderException("No document indexed yet")
+        self.index.save(path)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        provider_name: str,
+        model: Optional[str] = None,
+        api_keys: Dict = {},
+        mmap: bool = True,
+    ) -> "EmbeddingsSearch":
+        """Load an engine from an index saved with `save`
+
+        The provider and model must be the ones used to embed the indexed documents.
+        """
+        return cls(
+            provider_name,
+            model=model,
+            api_keys=api_keys,
+            index=VectorIndex.load(path, mmap=mmap),
+        )
+
+
+def search_with_embeddings(
+    provider_name: str,
+    texts: List[str],
+    query: str,
+    model: Optional[str] = None,
+    api_keys: Dict = {},
+) -> ResponseType[SearchDataClass]:
+    """`text__search` of `query` in `texts` with the provider's `text__embeddings`
+
+    The last `ENGINES_CACHE_SIZE` documents lists searched (per provider, model and api
+    keys) stay indexed: searching them again only embeds the query.
+    """
+    key = (
+        provider_name,
+        model,
+        json.dumps(api_keys, sort_keys=True, default=str),
+        tuple(texts),
+    )
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is not None:
+            _engines.move_to_end(key)
+    if engine is None:
+        engine = EmbeddingsSearch(provider_name, model=model, api_keys=api_keys)
+        engine.add_documents(list(texts))
+        with _engines_lock:
+            _engines[key] = engine
+            while len(_engines) > ENGINES_CACHE_SIZE:
+                _engines.popitem(last=False)
+    return engine.search(query)
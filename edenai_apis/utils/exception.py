@@ -1,5 +1,6 @@
 import importlib
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional, Type
 from enum import Enum
 
@@ -18,7 +19,7 @@ class ProviderException(Exception):
         super().__init__(message)
         if code:
             self.code = code
-    
+
     @property
     def status_code(self):
         if not hasattr(self, "code"):
@@ -77,6 +78,16 @@ class ProviderLimitationError(ProviderException):
     """Provider limit concurrent requests or other recourses"""
 
 
+class ProviderRateLimitTimeoutError(ProviderLimitationError):
+    """When the client-side rate limits don't allow a call before its deadline
+    (the provider isn't reached)"""
+
+
+class ProviderCircuitOpenError(ProviderException):
+    """When calls to a failing provider are stopped for a while (circuit breaker open)
+    (the provider isn't reached)"""
+
+
 class ProviderParsingError(ProviderException):
     """When the provider couldn't analyze/parse inputs as expected
     Example:
@@ -134,24 +145,100 @@ class ProviderInvalidPromptError(ProviderInvalidInputError):
     """When an invalid Prompt is passed to generative features"""
 
 
+# leading `\d*`, `\S*`, `.*`... can match an empty string: they don't change whether a
+# pattern is found in a message, but prevent the regex engine from skipping positions
+_OPTIONAL_PREFIX_REGEX = re.compile(r"^(?:(?:\\[dDsSwW]|\.)\*\??)+")
+
+
+def _searched_pattern(pattern: str) -> str:
+    """Pattern found in the same messages, without its optional prefix"""
+    return _OPTIONAL_PREFIX_REGEX.sub("", pattern) or pattern
+
+
+class ErrorClassifier:
+    """Errors list of a provider, compiled once
+
+    Each exception type gets one alternation of its patterns, and all of them are joined
+    in a single regex with a group per type: one search finds a matching type. Types
+    are checked in the order of the errors list, so only the types before the found one
+    are searched again (they could match further in the message).
+    """
+
+    def __init__(self, errors: ProviderErrorLists) -> None:
+        errors = {
+            exception_type: patterns
+            for exception_type, patterns in errors.items()
+            if patterns
+        }
+        self.exception_types: List[Type[ProviderException]] = list(errors)
+        self.regexes = [
+            re.compile(
+                "|".join(f"(?:{_searched_pattern(pattern)})" for pattern in patterns)
+            )
+            for patterns in errors.values()
+        ]
+        self.regex: Optional[re.Pattern] = None
+        if not self.regexes:
+            return
+        try:
+            self.regex = re.compile(
+                "|".join(
+                    f"(?P<_{index}>{regex.pattern})"
+                    for index, regex in enumerate(self.regexes)
+                )
+            )
+        except re.error:
+            # eg: patterns with backreferences, types are searched one by one
+            pass
+
+    def classify(self, message: str) -> Optional[Type[ProviderException]]:
+        """First exception type of the errors list with a pattern found in `message`"""
+        if self.regex is not None:
+            match = self.regex.search(message)
+            if match is None:
+                return None
+            # type groups enclose the patterns groups, they're closed last
+            found = int(match.lastgroup[1:])
+            for index in range(found):
+                if self.regexes[index].search(message):
+                    return self.exception_types[index]
+            return self.exception_types[found]
+
+        for exception_type, regex in zip(self.exception_types, self.regexes):
+            if regex.search(message):
+                return exception_type
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_error_classifier(provider: str) -> Optional[ErrorClassifier]:
+    """Compiled errors list of the provider, `None` if it doesn't have one"""
+    try:
+        provider_mod = importlib.import_module(f"apis.{provider}.errors")
+    except ModuleNotFoundError:
+        # we didn't implement errors yet for this provider
+        return None
+    return ErrorClassifier(getattr(provider_mod, "ERRORS"))
+
+
 def get_appropriate_error(
     provider: str, exception: ProviderException
 ) -> ProviderException:
     """
     Given a ProviderException, check in the provider's errors list for corresponding error message
     return appropriate error if present else return original exception
+
+    Exceptions already of a specific type (classified before, or raised as such) are
+    returned as is.
     """
-    try:
-        provider_mod = importlib.import_module(f"apis.{provider}.errors")
-    except ModuleNotFoundError:
-        # we didn't implement errors yet for this provider
+    if type(exception) is not ProviderException:
+        return exception
+    classifier = get_error_classifier(provider)
+    if classifier is None:
         return exception
-    error_dict = getattr(provider_mod, "ERRORS")
     error_msg = str(exception)
-    error_code = exception.status_code
-
-    for exception_type, error_list in error_dict.items():
-        if any([re.search(error_pattern, error_msg) for error_pattern in error_list]):
-            return exception_type(error_msg, error_code)
 
-    return exception
+    exception_type = classifier.classify(error_msg)
+    if exception_type is None:
+        return exception
+    return exception_type(error_msg, exception.status_code)
@@ -0,0 +1,349 @@
+"""
+Local collection backend for `image__face_recognition`
+
+By default, face collections live on the provider side: every `recognize` is a remote
+search and `list_faces` pages through the provider api. `LocalFaceCollections` keeps
+collections locally instead, in one of two modes:
+
+    - tokens mode (default): faces are still indexed by the provider (`add_face`,
+      `delete_face` and `recognize` are delegated), but face ids are stored locally
+      with their metadata so `list_faces` doesn't call the provider.
+    - embeddings mode (`embed_faces` given): faces are embedded and stored in a
+      memory-mapped `VectorIndex`, recognition is a local top-k similarity search
+      and the provider is never called. Images given by url are downloaded to a
+      temporary file to be embedded.
+
+Example:
+    >>> collections = LocalFaceCollections("amazon", "/path/to/collections")
+    >>> collections.add_face("my_collection", "face.jpg")
+    >>> collections.list_faces("my_collection").standardized_response.face_ids
+"""
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlparse
+from uuid import uuid4
+
+import requests
+
+from edenai_apis.features.image.face_recognition.add_face.face_recognition_add_face_dataclass import (
+    FaceRecognitionAddFaceDataClass,
+)
+from edenai_apis.features.image.face_recognition.create_collection.face_recognition_create_collection_dataclass import (
+    FaceRecognitionCreateCollectionDataClass,
+)
+from edenai_apis.features.image.face_recognition.delete_collection.face_recognition_delete_collection_dataclass import (
+    FaceRecognitionDeleteCollectionDataClass,
+)
+from edenai_apis.features.image.face_recognition.delete_face.face_recognition_delete_face_dataclass import (
+    FaceRecognitionDeleteFaceDataClass,
+)
+from edenai_apis.features.image.face_recognition.list_collections.face_recognition_list_collections_dataclass import (
+    FaceRecognitionListCollectionsDataClass,
+)
+from edenai_apis.features.image.face_recognition.list_faces.face_recognition_list_faces_dataclass import (
+    FaceRecognitionListFacesDataClass,
+)
+from edenai_apis.features.image.face_recognition.recognize.face_recognition_recognize_dataclass import (
+    FaceRecognitionRecognizedFaceDataClass,
+    FaceRecognitionRecognizeDataClass,
+)
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.types import ResponseType
+from edenai_apis.utils.vector_index import INDEX_FILE, VectorIndex
+
+FACES_FILE = "faces.json"
+DOWNLOAD_TIMEOUT = 30  # seconds
+
+# returns one embedding per face detected in the image at the given path
+FaceEmbedder = Callable[[str], Sequence[Sequence[float]]]
+
+
+class LocalFaceCollections:
+    """Face collections stored locally
+
+    Args:
+        provider_name (str): provider used to index faces (tokens mode)
+        path (str): directory where collections are stored
+        api_keys (dict, optional): user's api keys for the provider
+        embed_faces (callable, optional): function returning the embeddings of the faces
+            found in an image, enables the embeddings mode
+        top_k (int, optional): number of faces returned by `recognize` in embeddings mode.
+            Defaults to 10.
+    """
+
+    def __init__(
+        self,
+        provider_name: str,
+        path: str,
+        api_keys: Dict = {},
+        embed_faces: Optional[FaceEmbedder] = None,
+        top_k: int = 10,
+    ) -> None:
+        self.provider_name = provider_name
+        self.path = path
+        self.api_keys = api_keys
+        self.embed_faces = embed_faces
+        self.top_k = top_k
+        self._faces_cache: Dict[str, List[str]] = {}
+        self._indexes: Dict[str, VectorIndex] = {}
+        os.makedirs(path, exist_ok=True)
+
+    def _provider_method(self, phase: str) -> Callable:
+        # import here to avoid circular import (interface_v2 imports features)
+        from edenai_apis.interface_v2 import Image
+
+        return getattr(Image, f"face_recognition__{phase}")(
+            self.provider_name, self.api_keys
+        )
+
+    def _collection_directory(self, collection_id: str) -> str:
+        """Directory of a collection, which must be a direct child of `path`
+
+        Raises:
+            ProviderException: if the id is not a plain name (eg: `..`, `a/b`, `/tmp`)
+        """
+        separators = [sep for sep in (os.sep, os.altsep) if sep]
+        if (
+            not collection_id
+            or collection_id in (os.curdir, os.pardir)
+            or os.path.isabs(collection_id)
+            or any(sep in collection_id for sep in separators)
+        ):
+            raise ProviderException(
+                f"Invalid collection id `{collection_id}`", code=400
+            )
+        root = os.path.realpath(self.path)
+        collection_path = os.path.realpath(os.path.join(root, collection_id))
+        if os.path.dirname(collection_path) != root:
+            raise ProviderException(
+                f"Invalid collection id `{collection_id}`", code=400
+            )
+        return collection_path
+
+    def _collection_path(self, collection_id: str) -> str:
+        collection_path = self._collection_directory(collection_id)
+        if not os.path.isdir(collection_path):
+            raise ProviderException(f"Collection `{collection_id}` not found")
+        return collection_path
+
+    # tokens mode storage
+    def _load_faces(self, collection_id: str) -> Dict[str, Dict]:
+        faces_path = os.path.join(self._collection_path(collection_id), FACES_FILE)
+        if not os.path.exists(faces_path):
+            return {}
+        with open(faces_path, "r", encoding="utf-8") as faces_file:
+            return json.load(faces_file)
+
+    def _save_faces(self, collection_id: str, faces: Dict[str, Dict]) -> None:
+        faces_path = os.path.join(self._collection_path(collection_id), FACES_FILE)
+        with open(faces_path, "w", encoding="utf-8") as faces_file:
+            json.dump(faces, faces_file)
+        self._faces_cache.pop(collection_id, None)
+
+    # embeddings mode storage
+    def _load_index(self, collection_id: str) -> Optional[VectorIndex]:
+        if collection_id not in self._indexes:
+            collection_path = self._collection_path(collection_id)
+            if not os.path.exists(os.path.join(collection_path, INDEX_FILE)):
+                return None
+            self._indexes[collection_id] = VectorIndex.load(collection_path)
+        return self._indexes[collection_id]
+
+    def _save_index(self, collection_id: str, index: VectorIndex) -> None:
+        index.save(self._collection_path(collection_id))
+        self._indexes[collection_id] = index
+        self._faces_cache.pop(collection_id, None)
+
+    def create_collection(
+        self, collection_id: str
+    ) -> FaceRecognitionCreateCollectionDataClass:
+        collection_path = self._collection_directory(collection_id)
+        if not self.embed_faces:
+            self._provider_method("create_collection")(collection_id=collection_id)
+        os.makedirs(collection_path, exist_ok=True)
+        return FaceRecognitionCreateCollectionDataClass(collection_id=collection_id)
+
+    def list_collections(self) -> ResponseType[FaceRecognitionListCollectionsDataClass]:
+        collections = sorted(
+            entry.name for entry in os.scandir(self.path) if entry.is_dir()
+        )
+        return ResponseType[FaceRecognitionListCollectionsDataClass](
+            original_response=collections,
+            standardized_response=FaceRecognitionListCollectionsDataClass(
+                collections=collections
+            ),
+        )
+
+    def delete_collection(
+        self, collection_id: str
+    ) -> ResponseType[FaceRecognitionDeleteCollectionDataClass]:
+        collection_path = self._collection_path(collection_id)
+        original_response = None
+        if not self.embed_faces:
+            original_response = self._provider_method("delete_collection")(
+                collection_id=collection_id
+            ).original_response
+        shutil.rmtree(collection_path)
+        self._indexes.pop(collection_id, None)
+        self._faces_cache.pop(collection_id, None)
+        return ResponseType[FaceRecognitionDeleteCollectionDataClass](
+            original_response=original_response,
+            standardized_response=FaceRecognitionDeleteCollectionDataClass(
+                deleted=True
+            ),
+        )
+
+    def add_face(
+        self, collection_id: str, file: str, file_url: str = ""
+    ) -> ResponseType[FaceRecognitionAddFaceDataClass]:
+        metadata = {
+            "file_name": os.path.basename(file or file_url),
+            "added_at": datetime.utcnow().isoformat(),
+        }
+
+        if self.embed_faces:
+            with _local_image(file, file_url) as image_path:
+                embeddings = self.embed_faces(image_path)
+            if len(embeddings) == 0:
+                raise ProviderException("No face detected in the image")
+            face_ids = [str(uuid4()) for _ in embeddings]
+            index = self._load_index(collection_id) or VectorIndex(len(embeddings[0]))
+            index.add(face_ids, embeddings, [metadata] * len(face_ids))
+            self._save_index(collection_id, index)
+            original_response = None
+        else:
+            response = self._provider_method("add_face")(
+                collection_id=collection_id, file=file, file_url=file_url
+            )
+            face_ids = response.standardized_response.face_ids
+            faces = self._load_faces(collection_id)
+            faces.update({face_id: metadata for face_id in face_ids})
+            self._save_faces(collection_id, faces)
+            original_response = response.original_response
+
+        return ResponseType[FaceRecognitionAddFaceDataClass](
+            original_response=original_response,
+            standardized_response=FaceRecognitionAddFaceDataClass(face_ids=face_ids),
+        )
+
+    def list_faces(
+        self, collection_id: str, refresh: bool = False
+    ) -> ResponseType[FaceRecognitionListFacesDataClass]:
+        """List the faces of a collection from the local store
+
+        Args:
+            collection_id (str): collection id
+            refresh (bool, optional): re-synchronize the local store with the provider
+                (tokens mode only). Defaults to False.
+        """
+        if refresh and not self.embed_faces:
+            response = self._provider_method("list_faces")(collection_id=collection_id)
+            faces = self._load_faces(collection_id)
+            self._save_faces(
+                collection_id,
+                {
+                    face_id: faces.get(face_id, {})
+                    for face_id in response.standardized_response.face_ids
+                },
+            )
+
+        if collection_id not in self._faces_cache:
+            if self.embed_faces:
+                index = self._load_index(collection_id)
+                face_ids = list(index.ids) if index else []
+            else:
+                face_ids = list(self._load_faces(collection_id))
+            self._faces_cache[collection_id] = face_ids
+
+        face_ids = self._faces_cache[collection_id]
+        return ResponseType[FaceRecognitionListFacesDataClass](
+            original_response=face_ids,
+            standardized_response=FaceRecognitionListFacesDataClass(face_ids=face_ids),
+        )
+
+    def delete_face(
+        self, collection_id: str, face_id: str
+    ) -> ResponseType[FaceRecognitionDeleteFaceDataClass]:
+        original_response = None
+        if self.embed_faces:
+            index = self._load_index(collection_id)
+            if index is None or face_id not in index:
+                raise ProviderException(f"Face `{face_id}` not found")
+            index.delete([face_id])
+            self._save_index(collection_id, index)
+        else:
+            original_response = self._provider_method("delete_face")(
+                collection_id=collection_id, face_id=face_id
+            ).original_response
+            faces = self._load_faces(collection_id)
+            faces.pop(face_id, None)
+            self._save_faces(collection_id, faces)
+
+        return ResponseType[FaceRecognitionDeleteFaceDataClass](
+            original_response=original_response,
+            standardized_response=FaceRecognitionDeleteFaceDataClass(deleted=True),
+        )
+
+    def recognize(
+        self, collection_id: str, file: str, file_url: str = ""
+    ) -> ResponseType[FaceRecognitionRecognizeDataClass]:
+        if not self.embed_faces:
+            return self._provider_method("recognize")(
+                collection_id=collection_id, file=file, file_url=file_url
+            )
+
+        index = self._load_index(collection_id)
+        if index is None or len(index) == 0:
+            raise ProviderException("Face Collection is empty.")
+        with _local_image(file, file_url) as image_path:
+            embeddings = self.embed_faces(image_path)
+        if len(embeddings) == 0:
+            raise ProviderException("No face detected in the image")
+
+        # best similarity of each collection face among all the faces of the image
+        similarities: Dict[str, float] = {}
+        for embedding in embeddings:
+            for face_id, score in index.search(embedding, self.top_k):
+                similarities[face_id] = max(score, similarities.get(face_id, -1))
+        matches = sorted(similarities.items(), key=lambda match: -match[1])
+
+        return ResponseType[FaceRecognitionRecognizeDataClass](
+            original_response=[
+                {"face_id": face_id, "similarity": score} for face_id, score in matches
+            ],
+            standardized_response=FaceRecognitionRecognizeDataClass(
+                items=[
+                    FaceRecognitionRecognizedFaceDataClass(
+                        face_id=face_id, confidence=round(max(score, 0), 3)
+                    )
+                    for face_id, score in matches[: self.top_k]
+                ]
+            ),
+        )
+
+
+@contextmanager
+def _local_image(file: str, file_url: str) -> Iterator[str]:
+    """Path of the image to embed, `file_url` is downloaded to a temporary file (removed
+    on exit) if no file is given"""
+    if file:
+        yield file
+        return
+    if not file_url:
+        raise ProviderException("An image file or url is required", code=400)
+    try:
+        response = requests.get(file_url, timeout=DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        raise ProviderException(f"Could not download `{file_url}`: {exc}", code=400)
+    extension = os.path.splitext(urlparse(file_url).path)[1]
+    with tempfile.TemporaryDirectory(prefix="edenai_faces_") as directory:
+        path = os.path.join(directory, f"image{extension}")
+        with open(path, "wb") as image_file:
+            image_file.write(response.content)
+        yield path
@@ -0,0 +1,132 @@
+"""
+LRU cache of temporary files derived from input files (converted audio, preprocessed
+images)
+
+Cached files are shared by the requests, each request gets its own `FileWrapper` of
+the file. A file stays on disk while a wrapper of it is referenced: an evicted file is
+only deleted once the requests using it are done with their wrappers. The cache
+directory is removed when the process exits.
+"""
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Set, Tuple, TypeVar
+
+from edenai_apis.utils.files import FileInfo, FileWrapper
+
+T = TypeVar("T")
+
+
+class TemporaryFilesCache(Generic[T]):
+    """LRU cache of the files created for (at most) `size` keys
+
+    Values are created by `create(directory)`, they have the `file_path` of the created
+    file, or are `None` if no file is needed for the key. Concurrent requests of the same
+    key wait for the first one instead of creating the file again.
+
+    Args:
+        size (int): number of cached values
+        prefix (str): prefix of the temporary directory of the files
+    """
+
+    def __init__(self, size: int, prefix: str) -> None:
+        self.size = size
+        # removed at exit
+        self._directory = tempfile.TemporaryDirectory(prefix=prefix)
+        self.directory = self._directory.name
+        self._values: "OrderedDict[Hashable, Optional[T]]" = OrderedDict()
+        self._cached_paths: Set[str] = set()
+        # number of live wrappers of each file
+        self._users: Dict[str, int] = {}
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        # reentrant: wrappers can be released by the garbage collector at any time
+        self._lock = threading.RLock()
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Optional[T]]:
+        if key not in self._values:
+            return False, None
+        value = self._values[key]
+        if value is not None and not os.path.exists(value.file_path):
+            del self._values[key]
+            self._cached_paths.discard(value.file_path)
+            return False, None
+        self._values.move_to_end(key)
+        return True, value
+
+    def _wrap(
+        self, value: Optional[T], file_info: Callable[[T], FileInfo]
+    ) -> Optional[FileWrapper]:
+        if value is None:
+            return None
+        path = value.file_path
+        wrapper = FileWrapper(path, "", file_info(value))
+        self._users[path] = self._users.get(path, 0) + 1
+        weakref.finalize(wrapper, self._release, path).atexit = False
+        return wrapper
+
+    def _release(self, path: str) -> None:
+        with self._lock:
+            self._users[path] -= 1
+            if self._users[path]:
+                return
+            del self._users[path]
+            if path not in self._cached_paths:
+                _remove(path)
+
+    def _evict(self) -> None:
+        while len(self._values) > self.size:
+            _, evicted = self._values.popitem(last=False)
+            if evicted is None:
+                continue
+            self._cached_paths.discard(evicted.file_path)
+            if not self._users.get(evicted.file_path):
+                _remove(evicted.file_path)
+
+    def get(
+        self,
+        key: Hashable,
+        create: Callable[[str], Optional[T]],
+        file_info: Callable[[T], FileInfo],
+    ) -> Tuple[Optional[T], Optional[FileWrapper]]:
+        """Cached value of `key`, created if needed, and a new wrapper of its file
+
+        Returns:
+            - the value, `None` if no file is needed for the key
+            - a wrapper of the value file (with `file_info(value)`), `None` if no file
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value, self._wrap(value, file_info)
+            creation_lock = self._locks.setdefault(key, threading.Lock())
+
+        with creation_lock:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value, self._wrap(value, file_info)
+            try:
+                value = create(self.directory)
+            except Exception:
+                with self._lock:
+                    self._locks.pop(key, None)
+                raise
+
+            with self._lock:
+                self._locks.pop(key, None)
+                self._values[key] = value
+                if value is not None:
+                    self._cached_paths.add(value.file_path)
+                # the new file is used before it can be evicted
+                wrapper = self._wrap(value, file_info)
+                self._evict()
+        return value, wrapper
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
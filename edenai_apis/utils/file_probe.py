@@ -0,0 +1,222 @@
+"""
+Read images, pdfs & audio metadata (dimensions, number of pages, sample rate...) without
+decoding them.
+
+Image dimensions are read from the file headers (PNG IHDR chunk, JPEG SOF segment, GIF
+logical screen), pdf dimensions from the page tree (first page MediaBox), with Pillow/PyPDF2
+as fallback for other formats. WAV attributes are read from the RIFF header, other audio
+files are probed with ffprobe.
+
+`FileWrapper` probes its file once (`dimensions`, `page_count`, `audio_info`) and the
+constraints validation uses these results. Providers only get file paths, their probes are
+cached per file (path, modification time and size).
+"""
+import os
+import struct
+import wave
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import PyPDF2
+from PyPDF2.generic import RectangleObject
+from PIL import Image as Img
+from pydub.utils import mediainfo
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8"
+GIF_SIGNATURES = (b"GIF87a", b"GIF89a")
+# JPEG start of frame markers (DHT, JPG and DAC markers excluded)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7}
+JPEG_SOF_MARKERS |= {0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+JPEG_SOS_MARKER = 0xDA
+
+# nested page tree nodes followed to find the first page
+PDF_MAX_TREE_DEPTH = 64
+
+# same defaults as the `mediainfo` calls of the features arguments
+DEFAULT_SAMPLE_RATE = 44100
+DEFAULT_CHANNELS = 1
+
+
+@dataclass(frozen=True)
+class AudioInfo:
+    """Attributes of the first audio stream of a file"""
+
+    # ffprobe container name, eg: "wav", "mp3", "ogg", "mov,mp4,m4a,3gp,3g2,mj2"
+    format_name: Optional[str]
+    codec_name: Optional[str]
+    sample_rate: int
+    channels: int
+    # seconds
+    duration: Optional[float]
+
+
+def _png_dimensions(header: bytes) -> Optional[Tuple[int, int]]:
+    # signature (8 bytes), IHDR length (4), b"IHDR" (4), width (4), height (4)
+    if len(header) < 24 or header[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def _jpeg_dimensions(file_path: str) -> Optional[Tuple[int, int]]:
+    """Walk JPEG segments until the start of frame, without reading the image data"""
+    with open(file_path, "rb") as file:
+        file.seek(2)
+        while True:
+            byte = file.read(1)
+            while byte and byte != b"\xff":
+                byte = file.read(1)
+            while byte == b"\xff":  # fill bytes
+                byte = file.read(1)
+            if not byte:
+                return None
+            marker = byte[0]
+            if marker in JPEG_STANDALONE_MARKERS:
+                continue
+            if marker == JPEG_SOS_MARKER:
+                return None
+            length_bytes = file.read(2)
+            if len(length_bytes) < 2:
+                return None
+            (length,) = struct.unpack(">H", length_bytes)
+            if marker in JPEG_SOF_MARKERS:
+                segment = file.read(5)
+                if len(segment) < 5:
+                    return None
+                height, width = struct.unpack(">HH", segment[1:5])
+                return width, height
+            file.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_image_dimensions(file_path: str) -> Tuple[int, int]:
+    with open(file_path, "rb") as file:
+        header = file.read(32)
+
+    dimensions = None
+    if header.startswith(PNG_SIGNATURE):
+        dimensions = _png_dimensions(header)
+    elif header.startswith(JPEG_SIGNATURE):
+        dimensions = _jpeg_dimensions(file_path)
+    elif header[:6] in GIF_SIGNATURES:
+        dimensions = struct.unpack("<HH", header[6:10])
+
+    if dimensions is None:
+        # other formats: Pillow only reads the header when opening the image
+        with Img.open(file_path) as image:
+            dimensions = image.size
+    return tuple(dimensions)
+
+
+def _first_page_mediabox(reader: PyPDF2.PdfReader) -> Optional[RectangleObject]:
+    """MediaBox of the first page, read from the page tree nodes leading to it (the
+    MediaBox can be inherited from these nodes), `None` if the tree can't be walked"""
+    node = reader.trailer["/Root"]["/Pages"]
+    mediabox = None
+    for _ in range(PDF_MAX_TREE_DEPTH):
+        if "/MediaBox" in node:
+            mediabox = node["/MediaBox"]
+        if "/Kids" not in node:
+            return RectangleObject(mediabox) if mediabox is not None else None
+        kids = (kid.get_object() for kid in node["/Kids"])
+        # skip the empty intermediate nodes
+        node = next(
+            (kid for kid in kids if "/Kids" not in kid or kid.get("/Count")), None
+        )
+        if node is None:
+            return None
+    return None
+
+
+def _read_pdf_dimensions(file_path: str) -> Tuple[float, float]:
+    """Dimensions of the first page of a pdf
+
+    Only the cross-reference table and the page tree nodes leading to the first page
+    are read, the other pages are not parsed. Malformed page trees are read with
+    `PdfReader.pages`.
+    """
+    reader = PyPDF2.PdfReader(file_path)
+    try:
+        mediabox = _first_page_mediabox(reader)
+    except (KeyError, TypeError, ValueError, PyPDF2.errors.PdfReadError):
+        mediabox = None
+    if mediabox is None:
+        mediabox = reader.pages[0].mediabox
+    return float(mediabox.width), float(mediabox.height)
+
+
+def _read_pdf_page_count(file_path: str) -> int:
+    # PyPDF2 only reads the xref table & the root pages count, pages are not parsed
+    return len(PyPDF2.PdfReader(file_path).pages)
+
+
+def _read_audio_info(file_path: str) -> AudioInfo:
+    try:
+        with wave.open(file_path, "rb") as wav:
+            sample_rate = wav.getframerate()
+            return AudioInfo(
+                format_name="wav",
+                codec_name=f"pcm_s{8 * wav.getsampwidth()}le",
+                sample_rate=sample_rate,
+                channels=wav.getnchannels(),
+                duration=wav.getnframes() / sample_rate if sample_rate else None,
+            )
+    except (wave.Error, EOFError):
+        # not a PCM wav file
+        pass
+
+    stream = mediainfo(file_path)
+    duration = stream.get("duration")
+    return AudioInfo(
+        format_name=stream.get("format_name"),
+        codec_name=stream.get("codec_name"),
+        sample_rate=int(stream.get("sample_rate") or DEFAULT_SAMPLE_RATE),
+        channels=int(stream.get("channels") or DEFAULT_CHANNELS),
+        duration=float(duration) if duration not in (None, "", "N/A") else None,
+    )
+
+
+def _file_key(file_path: str) -> Tuple[str, int, int]:
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=256)
+def _cached_image_dimensions(file_key: Tuple[str, int, int]) -> Tuple[int, int]:
+    return _read_image_dimensions(file_key[0])
+
+
+@lru_cache(maxsize=256)
+def _cached_pdf_dimensions(file_key: Tuple[str, int, int]) -> Tuple[float, float]:
+    return _read_pdf_dimensions(file_key[0])
+
+
+@lru_cache(maxsize=256)
+def _cached_pdf_page_count(file_key: Tuple[str, int, int]) -> int:
+    return _read_pdf_page_count(file_key[0])
+
+
+@lru_cache(maxsize=256)
+def _cached_audio_info(file_key: Tuple[str, int, int]) -> AudioInfo:
+    return _read_audio_info(file_key[0])
+
+
+def get_image_dimensions(file_path: str) -> Tuple[int, int]:
+    """Returns (width, height) of an image, same as `PIL.Image.open(file_path).size`"""
+    return _cached_image_dimensions(_file_key(file_path))
+
+
+def get_pdf_dimensions(file_path: str) -> Tuple[float, float]:
+    """Returns (width, height) of the first page of a pdf"""
+    return _cached_pdf_dimensions(_file_key(file_path))
+
+
+def get_pdf_page_count(file_path: str) -> int:
+    """Returns the number of pages of a pdf"""
+    return _cached_pdf_page_count(_file_key(file_path))
+
+
+def get_audio_info(file_path: str) -> AudioInfo:
+    """Returns the format, sample rate, channels & duration of an audio (or video) file"""
+    return _cached_audio_info(_file_key(file_path))
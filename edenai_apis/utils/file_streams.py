@@ -0,0 +1,238 @@
+"""
+Stream files to providers instead of reading them in memory
+
+Sending `base64.b64encode(open(file, "rb").read())` inside a json payload holds the file,
+its base64 encoding and the json string in memory at once (~2.3x the file size).
+The streams of this module are file-like objects with a known length that `requests`
+sends chunk by chunk, so only one chunk of the file is in memory at a time:
+
+    - `Base64FileStream`: base64 encoding of a file, read by chunks
+    - `JsonFileStream`: json payload with files embedded as base64 (or data uri) strings
+
+Example:
+    >>> body = JsonFileStream({"modelTypes": ["finance/"]}, {"image": file}, data_uri=True)
+    >>> requests.post(url, headers={"Content-Type": "application/json"}, data=body)
+"""
+import base64
+import io
+import json
+import mimetypes
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Union
+
+# multiple of 3, so the base64 encodings of the chunks can be concatenated
+CHUNK_SIZE = 3 * 64 * 1024
+
+
+@contextmanager
+def open_file_mmap(file_path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Memory-map a file for reading, the content is only loaded by the OS when read
+
+    The mapping supports the buffer protocol (slicing, `base64.b64encode`, `hashlib`...)
+    """
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # empty files can't be mapped
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            yield content
+
+
+def data_uri_prefix(file_path: str) -> str:
+    """`data:<mimetype>;base64,` prefix of the data uri of a file"""
+    return f"data:{mimetypes.guess_type(file_path)[0]};base64,"
+
+
+def base64_length(size: int) -> int:
+    """Length of the base64 encoding of `size` bytes"""
+    return 4 * ((size + 2) // 3)
+
+
+class Base64FileStream:
+    """Readable stream of the base64 encoding of a file, surrounded by `prefix` & `suffix`
+
+    The file is encoded `chunk_size` bytes at a time when the stream is read.
+    `len(stream)` is the total length, so `requests` sets the `Content-Length` header.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        prefix: bytes = b"",
+        suffix: bytes = b"",
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        if chunk_size % 3:
+            raise ValueError("chunk_size must be a multiple of 3")
+        self.file_path = file_path
+        self.prefix = prefix
+        self.suffix = suffix
+        self.chunk_size = chunk_size
+        self._length = (
+            len(prefix) + base64_length(os.path.getsize(file_path)) + len(suffix)
+        )
+        self._blocks = self._encode()
+        self._buffer = b""
+        self._offset = 0
+        self._position = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _encode(self) -> Iterator[bytes]:
+        yield self.prefix
+        with open(self.file_path, "rb") as file:
+            while chunk := file.read(self.chunk_size):
+                yield base64.b64encode(chunk)
+        yield self.suffix
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to `size` bytes, may return less before the end of the stream"""
+        if size < 0:
+            data = self._buffer[self._offset :] + b"".join(self._blocks)
+            self._buffer, self._offset = b"", 0
+        else:
+            while self._offset >= len(self._buffer):
+                block = next(self._blocks, None)
+                if block is None:
+                    return b""
+                self._buffer, self._offset = block, 0
+            data = self._buffer[self._offset : self._offset + size]
+            self._offset += len(data)
+        self._position += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Only supports rewinding (`seek(0)`), used by `requests` to resend a body"""
+        if whence == io.SEEK_CUR and offset == 0:
+            return self._position
+        if whence == io.SEEK_END and offset == 0:
+            # length lookup, the stream is not actually moved
+            return self._length
+        if whence != io.SEEK_SET or offset != 0:
+            raise io.UnsupportedOperation("Base64 streams can only be rewound")
+        self.close()
+        self._blocks = self._encode()
+        self._buffer = b""
+        self._offset = 0
+        self._position = 0
+        return 0
+
+    def close(self) -> None:
+        # closes the file if it's being read
+        self._blocks.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            data = self.read(self.chunk_size)
+            if not data:
+                return
+            yield data
+
+
+class JsonFileStream:
+    """Readable stream of a json payload with files embedded as base64 strings
+
+    Args:
+        payload (dict): json payload, without the files
+        files (dict): file paths by payload key
+        data_uri (bool, optional): embed files as data uris (`data:<mimetype>;base64,...`)
+            instead of plain base64. Defaults to False.
+    """
+
+    def __init__(
+        self, payload: Dict, files: Dict[str, str], data_uri: bool = False
+    ) -> None:
+        placeholders = {
+            key: f"__edenai_file_{index}__" for index, key in enumerate(files)
+        }
+        document = json.dumps({**payload, **placeholders}).encode()
+
+        # split the serialized payload around each placeholder (quotes included)
+        self._parts: List[Union[bytes, Base64FileStream]] = []
+        for key, placeholder in placeholders.items():
+            before, document = document.split(f'"{placeholder}"'.encode(), 1)
+            prefix = data_uri_prefix(files[key]).encode() if data_uri else b""
+            self._parts.append(before)
+            self._parts.append(Base64FileStream(files[key], b'"' + prefix, b'"'))
+        self._parts.append(document)
+
+        self._length = sum(len(part) for part in self._parts)
+        self._index = 0
+        self._offset = 0
+        self._position = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        blocks = []
+        length = 0
+        while (size < 0 or length < size) and self._index < len(self._parts):
+            part = self._parts[self._index]
+            remaining = -1 if size < 0 else size - length
+            if isinstance(part, bytes):
+                end = len(part) if remaining < 0 else self._offset + remaining
+                block = part[self._offset : end]
+                self._offset += len(block)
+                done = self._offset >= len(part)
+            else:
+                block = part.read(remaining)
+                done = not block
+            blocks.append(block)
+            length += len(block)
+            if done:
+                self._index += 1
+                self._offset = 0
+        data = b"".join(blocks)
+        self._position += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Only supports rewinding (`seek(0)`), used by `requests` to resend a body"""
+        if whence == io.SEEK_CUR and offset == 0:
+            return self._position
+        if whence == io.SEEK_END and offset == 0:
+            return self._length
+        if whence != io.SEEK_SET or offset != 0:
+            raise io.UnsupportedOperation("Json streams can only be rewound")
+        for part in self._parts:
+            if isinstance(part, Base64FileStream):
+                part.seek(0)
+        self._index = 0
+        self._offset = 0
+        self._position = 0
+        return 0
+
+    def close(self) -> None:
+        for part in self._parts:
+            if isinstance(part, Base64FileStream):
+                part.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            data = self.read(CHUNK_SIZE)
+            if not data:
+                return
+            yield data
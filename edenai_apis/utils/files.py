@@ -1,5 +1,19 @@
 import os
-from typing import Optional, List
+from functools import cached_property
+from typing import BinaryIO, ContextManager, Optional, List, Tuple, Union
+
+from edenai_apis.utils.file_probe import (
+    AudioInfo,
+    get_audio_info,
+    get_image_dimensions,
+    get_pdf_dimensions,
+    get_pdf_page_count,
+)
+from edenai_apis.utils.file_streams import (
+    Base64FileStream,
+    data_uri_prefix,
+    open_file_mmap,
+)
 
 
 class FileInfo:
@@ -30,6 +44,55 @@ class FileWrapper:
     file_url: Optional[str]
     file_info: FileInfo
 
+    @cached_property
+    def dimensions(self) -> Optional[Tuple[Union[int, float], Union[int, float]]]:
+        """(width, height) of an image or of the first page of a pdf, read from the
+        file headers once. `None` for other files"""
+        if not self.file_path:
+            return None
+        media_type = self.file_info.file_media_type or ""
+        if media_type == "application/pdf":
+            return get_pdf_dimensions(self.file_path)
+        if media_type.startswith("image"):
+            return get_image_dimensions(self.file_path)
+        return None
+
+    @cached_property
+    def page_count(self) -> Optional[int]:
+        """number of pages of a pdf (1 for images), read once. `None` for other files"""
+        if not self.file_path:
+            return None
+        media_type = self.file_info.file_media_type or ""
+        if media_type == "application/pdf":
+            return get_pdf_page_count(self.file_path)
+        if media_type.startswith("image"):
+            return 1
+        return None
+
+    @cached_property
+    def audio_info(self) -> Optional[AudioInfo]:
+        """format, sample rate, channels & duration of an audio or video file, probed
+        once. `None` for other files"""
+        if not self.file_path:
+            return None
+        media_type = self.file_info.file_media_type or ""
+        if media_type.startswith(("audio", "video")):
+            return get_audio_info(self.file_path)
+        return None
+
+    def open(self) -> BinaryIO:
+        """binary file handle, to stream the file (eg: `requests` data, boto3 `upload_fileobj`)"""
+        return open(self.file_path, "rb")
+
+    def mmap(self) -> ContextManager:
+        """memory-mapped content of the file, read lazily by the OS"""
+        return open_file_mmap(self.file_path)
+
+    def base64_stream(self, data_uri: bool = False) -> Base64FileStream:
+        """stream of the base64 encoding of the file, optionally as a data uri"""
+        prefix = data_uri_prefix(self.file_path).encode() if data_uri else b""
+        return Base64FileStream(self.file_path, prefix=prefix)
+
     def get_file_content(self):
         if self.file_url:
             return self.file_url
@@ -0,0 +1,275 @@
+"""
+Downscale & re-encode input images according to the provider constraints
+
+Image features send the original file to the provider, while most analyses (explicit
+content, objects, logos...) don't benefit from 20MP phone photos. When enabled
+(`compute_output(..., preprocess_images=True)`), input images are downscaled and/or
+re-encoded before the call, according to the provider's `info.json` constraints:
+
+    - `max_pixels`: maximum number of pixels (width * height) of the sent image
+    - `max_bytes`: maximum size of the sent file
+    - `preferred_file_types`: media types to send, the image is re-encoded to the first
+      one if its type is not part of the list
+    - `image_quality`: JPEG/WebP encoding quality, defaults to 85
+
+Pixel coordinates of the provider result (logos & landmarks vertices) are then rescaled
+back to the original image; other bounding boxes are already relative to the image size.
+
+Preprocessed images are cached per input file and constraints, so a file sent to several
+providers sharing the same limits is only re-encoded once. They stay on disk while the
+`FileWrapper`s sent to the providers are referenced (`utils.file_cache`).
+"""
+import mimetypes
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from PIL import Image as Img
+from pydantic import BaseModel
+
+from edenai_apis.features.image.landmark_detection.landmark_detection_dataclass import (
+    LandmarkVertice,
+)
+from edenai_apis.features.image.logo_detection.logo_detection_dataclass import (
+    LogoVertice,
+)
+from edenai_apis.loaders.data_loader import ProviderDataEnum
+from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.utils.file_cache import TemporaryFilesCache
+from edenai_apis.utils.file_probe import _file_key, get_image_dimensions
+from edenai_apis.utils.files import FileInfo, FileWrapper
+
+# subfeatures which results don't include the sent image
+PREPROCESSED_SUBFEATURES = {
+    "explicit_content",
+    "face_detection",
+    "landmark_detection",
+    "logo_detection",
+    "object_detection",
+}
+
+PIL_FORMATS = {
+    "image/jpeg": "JPEG",
+    "image/png": "PNG",
+    "image/webp": "WEBP",
+}
+DEFAULT_QUALITY = 85
+MIN_QUALITY = 40
+CACHE_SIZE = 32
+
+# models with absolute (pixels) coordinates
+PIXEL_COORDINATES_MODELS = (LogoVertice, LandmarkVertice)
+
+
+@dataclass(frozen=True)
+class PreprocessedImage:
+    """Image sent to the provider in place of the original one"""
+
+    file_path: str
+    media_type: str
+    # original size / sent size, on each axis
+    scale_x: float
+    scale_y: float
+
+
+def _image_constraints(
+    provider_name: str, feature: str, subfeature: str, phase: str
+) -> Dict[str, Any]:
+    try:
+        provider_info = load_provider(
+            ProviderDataEnum.PROVIDER_INFO,
+            provider_name=provider_name,
+            feature=feature,
+            subfeature=subfeature,
+            phase=phase,
+        )
+    except Exception:
+        return {}
+    return provider_info.get("constraints") or {}
+
+
+def _encode(
+    image: Img.Image, path: str, pil_format: str, quality: int, exif: Optional[bytes]
+) -> int:
+    save_args: Dict[str, Any] = {"format": pil_format}
+    if pil_format in ("JPEG", "WEBP"):
+        save_args["quality"] = quality
+    if pil_format == "PNG":
+        save_args["optimize"] = True
+    if exif:
+        # keep the orientation tag, providers read it
+        save_args["exif"] = exif
+    image.save(path, **save_args)
+    return os.path.getsize(path)
+
+
+def preprocess_image(
+    file_path: str,
+    output_dir: str,
+    max_pixels: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    preferred_file_types: Optional[Sequence[str]] = None,
+    quality: int = DEFAULT_QUALITY,
+    dimensions: Optional[Tuple[int, int]] = None,
+) -> Optional[PreprocessedImage]:
+    """Downscale and/or re-encode an image to satisfy the given limits
+
+    `dimensions` are the (width, height) of the image if already probed
+
+    Returns:
+        PreprocessedImage | None: the new image, `None` if the image already satisfies
+            the limits or can't be re-encoded
+    """
+    media_type = mimetypes.guess_type(file_path)[0]
+    width, height = dimensions or get_image_dimensions(file_path)
+    file_size = os.path.getsize(file_path)
+
+    too_many_pixels = bool(max_pixels) and width * height > max_pixels
+    too_big = bool(max_bytes) and file_size > max_bytes
+    wrong_type = bool(preferred_file_types) and media_type not in preferred_file_types
+    if not (too_many_pixels or too_big or wrong_type):
+        return None
+
+    target_type = next(
+        (
+            file_type
+            for file_type in preferred_file_types or []
+            if file_type in PIL_FORMATS
+        ),
+        media_type if media_type in PIL_FORMATS else "image/jpeg",
+    )
+    pil_format = PIL_FORMATS[target_type]
+
+    with Img.open(file_path) as image:
+        exif = image.info.get("exif")
+        if too_many_pixels:
+            ratio = (max_pixels / (width * height)) ** 0.5
+            # `thumbnail` lets JPEG decoders downscale while decoding (draft mode)
+            image.thumbnail(
+                (max(int(width * ratio), 1), max(int(height * ratio), 1)),
+                Img.LANCZOS,
+            )
+        else:
+            image.load()
+        if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        file_descriptor, output_path = tempfile.mkstemp(
+            suffix=mimetypes.guess_extension(target_type), dir=output_dir
+        )
+        os.close(file_descriptor)
+        size = _encode(image, output_path, pil_format, quality, exif)
+        # lower the quality, then the resolution, until the file is small enough
+        while max_bytes and size > max_bytes:
+            if pil_format != "PNG" and quality > MIN_QUALITY:
+                quality = max(quality - 15, MIN_QUALITY)
+            else:
+                new_size = (int(image.width * 0.75), int(image.height * 0.75))
+                if min(new_size) < 1:
+                    break
+                image = image.resize(new_size, Img.LANCZOS)
+            size = _encode(image, output_path, pil_format, quality, exif)
+
+        sent_width, sent_height = image.size
+
+    return PreprocessedImage(
+        file_path=output_path,
+        media_type=target_type,
+        scale_x=width / sent_width,
+        scale_y=height / sent_height,
+    )
+
+
+_cache: Optional[TemporaryFilesCache[PreprocessedImage]] = None
+_cache_lock = threading.Lock()
+
+
+def _preprocessed_file_info(preprocessed: PreprocessedImage) -> FileInfo:
+    return FileInfo(
+        os.path.getsize(preprocessed.file_path),
+        preprocessed.media_type,
+        [
+            extension[1:]
+            for extension in mimetypes.guess_all_extensions(preprocessed.media_type)
+        ],
+    )
+
+
+def preprocess_input_image(
+    provider_name: str, feature: str, subfeature: str, phase: str, args: Dict
+) -> Tuple[Dict, Optional[PreprocessedImage]]:
+    """Replace the `file` input by an image satisfying the provider constraints
+
+    Returns:
+        - args: same or updated args
+        - the preprocessed image, `None` if the input image is sent as is
+    """
+    global _cache
+
+    input_file = args.get("file")
+    if (
+        feature != "image"
+        or subfeature not in PREPROCESSED_SUBFEATURES
+        or not isinstance(input_file, FileWrapper)
+        or not input_file.file_path
+        or not (input_file.file_info.file_media_type or "").startswith("image")
+    ):
+        return args, None
+
+    constraints = _image_constraints(provider_name, feature, subfeature, phase)
+    limits = {
+        "max_pixels": constraints.get("max_pixels"),
+        "max_bytes": constraints.get("max_bytes"),
+        "preferred_file_types": tuple(constraints.get("preferred_file_types") or ()),
+        "quality": constraints.get("image_quality", DEFAULT_QUALITY),
+    }
+    if not (
+        limits["max_pixels"] or limits["max_bytes"] or limits["preferred_file_types"]
+    ):
+        return args, None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = TemporaryFilesCache(CACHE_SIZE, prefix="edenai_images_")
+    preprocessed, preprocessed_file = _cache.get(
+        (_file_key(input_file.file_path), tuple(sorted(limits.items()))),
+        lambda directory: preprocess_image(
+            input_file.file_path,
+            directory,
+            dimensions=input_file.dimensions,
+            **limits,
+        ),
+        _preprocessed_file_info,
+    )
+    if preprocessed is None:
+        return args, None
+    return {**args, "file": preprocessed_file}, preprocessed
+
+
+def _rescale(value: Any, scale_x: float, scale_y: float) -> None:
+    if isinstance(value, PIXEL_COORDINATES_MODELS):
+        for axis, scale in (("x", scale_x), ("y", scale_y)):
+            coordinate = getattr(value, axis)
+            if coordinate is not None:
+                rescaled = coordinate * scale
+                # landmarks vertices are integers
+                if isinstance(coordinate, int):
+                    rescaled = round(rescaled)
+                setattr(value, axis, rescaled)
+    elif isinstance(value, BaseModel):
+        for field_name in value.model_fields:
+            _rescale(getattr(value, field_name), scale_x, scale_y)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _rescale(item, scale_x, scale_y)
+
+
+def rescale_image_result(result: Any, preprocessed: PreprocessedImage) -> Any:
+    """Rescale the pixel coordinates of a provider result to the original image size"""
+    if isinstance(result, BaseModel) and hasattr(result, "standardized_response"):
+        _rescale(
+            result.standardized_response, preprocessed.scale_x, preprocessed.scale_y
+        )
+    return result
@@ -0,0 +1,354 @@
+"""
+Per-call instrumentation of `compute_output` and `get_async_job_result`
+
+Registered hooks receive a `CallTrace` at the end of each call, with the time spent in
+each of its phases:
+
+    - `file_conversion`: input image preprocessing, audio conversion
+    - `constraints`: validation of the arguments against the provider constraints,
+      `languages` resolution included
+    - `languages`: resolution of the input languages
+    - `provider_instantiation`: loading and instantiating the provider class
+    - `rate_limit`: waiting for the provider rate limits (`rate_limit=True`)
+    - `provider_call`: the provider method, its `http` round-trips and `upload`s included
+    - `http`: round-trips to the provider (requests and boto3), with bytes sent/received
+    - `upload`: files uploaded to s3
+    - `standardization`: `provider_call` minus its `http` and `upload` time
+    - `validation`: output validation (`VALIDATE_OUTPUT`)
+    - `model_dump`: result dump or serialization
+
+Only the work done in the calling thread is measured (eg: not the chunks synthesized
+by a thread pool). Without hook, nothing is measured: the overhead is a list check per
+call and a context variable lookup per phase.
+
+Example:
+    >>> histograms = LatencyHistograms()
+    >>> add_hook(histograms)
+    >>> add_hook(lambda trace: print(trace.provider, trace.phases))
+    >>> enable_opentelemetry()  # spans & latency histogram, needs `opentelemetry-api`
+"""
+import threading
+import time
+import warnings
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+CallHook = Callable[["CallTrace"], None]
+
+# upper bounds (ms) of the latency histograms buckets, the last one is unbounded
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+@dataclass
+class CallTrace:
+    """Timings of a `compute_output` or `get_async_job_result` call
+
+    Phases durations (seconds) are summed when a phase happens several times (eg: http
+    round-trips), `spans` keeps each occurrence as (name, start, end) epoch nanoseconds.
+    """
+
+    provider: str
+    feature: str
+    subfeature: str
+    phase: str = ""
+    start_time_ns: int = field(default_factory=time.time_ns)
+    duration: float = 0.0
+    phases: Dict[str, float] = field(default_factory=dict)
+    spans: List[Tuple[str, int, int]] = field(default_factory=list)
+    http_calls: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    error: Optional[str] = None
+    _start: int = field(default_factory=time.perf_counter_ns, repr=False)
+
+    def add_phase(self, name: str, start: int, end: int) -> None:
+        """Record a phase from its `perf_counter_ns` start & end"""
+        self.phases[name] = self.phases.get(name, 0.0) + (end - start) / 1e9
+        offset = self.start_time_ns - self._start
+        self.spans.append((name, start + offset, end + offset))
+
+    def add_http_call(self, start: int, end: int, sent: int, received: int) -> None:
+        self.add_phase("http", start, end)
+        self.http_calls += 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.duration = (time.perf_counter_ns() - self._start) / 1e9
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        if "provider_call" in self.phases:
+            self.phases["standardization"] = max(
+                self.phases["provider_call"]
+                - self.phases.get("http", 0.0)
+                - self.phases.get("upload", 0.0),
+                0.0,
+            )
+
+    @property
+    def end_time_ns(self) -> int:
+        return self.start_time_ns + int(self.duration * 1e9)
+
+
+_hooks: List[CallHook] = []
+_current_trace: ContextVar[Optional[CallTrace]] = ContextVar(
+    "edenai_call_trace", default=None
+)
+_install_lock = threading.Lock()
+_clients_instrumented = False
+
+
+def add_hook(hook: CallHook) -> None:
+    """Call `hook` with the `CallTrace` of each call, enables the instrumentation"""
+    _instrument_clients()
+    _hooks.append(hook)
+
+
+def remove_hook(hook: CallHook) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def instrumentation_enabled() -> bool:
+    return bool(_hooks)
+
+
+def current_trace() -> Optional[CallTrace]:
+    """Trace of the call in progress, `None` if not instrumented"""
+    return _current_trace.get()
+
+
+class _Phase:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: CallTrace, name: str) -> None:
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info) -> None:
+        self.trace.add_phase(self.name, self.start, time.perf_counter_ns())
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def traced(name: str):
+    """Context manager timing a phase of the current call, does nothing if not traced"""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NO_PHASE
+    return _Phase(trace, name)
+
+
+def instrument_call(compute_func: Callable) -> Callable:
+    """decorator for compute output functions, builds their `CallTrace` for the hooks"""
+
+    @wraps(compute_func)
+    def wrapper(provider_name, feature, subfeature, *args, **kwargs):
+        if not _hooks or _current_trace.get() is not None:
+            return compute_func(provider_name, feature, subfeature, *args, **kwargs)
+        trace = CallTrace(
+            provider=provider_name,
+            feature=feature,
+            subfeature=subfeature,
+            phase=kwargs.get("phase", ""),
+        )
+        token = _current_trace.set(trace)
+        error = None
+        try:
+            return compute_func(provider_name, feature, subfeature, *args, **kwargs)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            _current_trace.reset(token)
+            trace.finish(error)
+            _run_hooks(trace)
+
+    return wrapper
+
+
+def _run_hooks(trace: CallTrace) -> None:
+    for hook in list(_hooks):
+        try:
+            hook(trace)
+        except Exception as exc:
+            # monitoring must not fail the calls
+            warnings.warn(
+                f"Instrumentation hook {hook!r} failed: {exc!r}", RuntimeWarning
+            )
+
+
+def _body_size(body: Any) -> int:
+    if isinstance(body, (bytes, bytearray, str)):
+        return len(body)
+    return 0
+
+
+def _instrument_clients() -> None:
+    """Time the http round-trips of `requests` sessions and boto3 clients"""
+    global _clients_instrumented
+    with _install_lock:
+        if _clients_instrumented:
+            return
+        import requests
+        from botocore.client import BaseClient
+
+        session_request = requests.Session.request
+        make_api_call = BaseClient._make_api_call
+
+        # requests preparation (environment settings, body encoding) is part of the
+        # round-trip: `Session.request` rather than `Session.send`
+        @wraps(session_request)
+        def request(session, method, url, *args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return session_request(session, method, url, *args, **kwargs)
+            start = time.perf_counter_ns()
+            response = session_request(session, method, url, *args, **kwargs)
+            end = time.perf_counter_ns()
+            if kwargs.get("stream"):
+                # reading the content would consume the stream
+                received = int(response.headers.get("Content-Length") or 0)
+            else:
+                received = len(response.content or b"")
+            trace.add_http_call(start, end, _body_size(response.request.body), received)
+            return response
+
+        @wraps(make_api_call)
+        def traced_api_call(client, operation_name, api_params):
+            trace = _current_trace.get()
+            if trace is None:
+                return make_api_call(client, operation_name, api_params)
+            start = time.perf_counter_ns()
+            try:
+                return make_api_call(client, operation_name, api_params)
+            finally:
+                trace.add_http_call(start, time.perf_counter_ns(), 0, 0)
+
+        requests.Session.request = request
+        BaseClient._make_api_call = traced_api_call
+        _clients_instrumented = True
+
+
+class LatencyHistograms:
+    """Calls latency histograms by provider/feature/subfeature, to use as a hook
+
+    Example:
+        >>> histograms = LatencyHistograms()
+        >>> add_hook(histograms)
+        >>> histograms.snapshot()["google/text/sentiment_analysis"]["count"]
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = LATENCY_BUCKETS_MS) -> None:
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self._lock = threading.Lock()
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._errors: Dict[str, int] = {}
+
+    def __call__(self, trace: CallTrace) -> None:
+        self.record(
+            f"{trace.provider}/{trace.feature}/{trace.subfeature}",
+            trace.duration * 1000,
+            trace.error is not None,
+        )
+
+    def record(self, key: str, duration_ms: float, error: bool = False) -> None:
+        bucket = bisect_left(self.buckets_ms, duration_ms)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets_ms) + 1))
+            counts[bucket] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + duration_ms
+            self._errors[key] = self._errors.get(key, 0) + error
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Count, errors, sum and buckets counts (by upper bound in ms) of each key"""
+        with self._lock:
+            return {
+                key: {
+                    "count": sum(counts),
+                    "errors": self._errors[key],
+                    "sum_ms": self._sums[key],
+                    "buckets": dict(zip([*map(str, self.buckets_ms), "+Inf"], counts)),
+                }
+                for key, counts in self._counts.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+            self._errors.clear()
+
+
+def enable_opentelemetry(tracer_provider=None, meter_provider=None) -> CallHook:
+    """Export the calls as OpenTelemetry spans (a child span per phase occurrence) and
+    their duration to an `edenai_apis.call.duration` histogram (ms)
+
+    Uses the global tracer and meter providers if not given. Returns the registered
+    hook, to disable the export with `remove_hook`.
+
+    Raises:
+        ImportError: if `opentelemetry-api` is not installed
+    """
+    try:
+        from opentelemetry import metrics, trace
+        from opentelemetry.trace import Status, StatusCode
+    except ImportError as exc:
+        raise ImportError(
+            "OpenTelemetry export needs `opentelemetry-api`: pip install opentelemetry-api"
+        ) from exc
+
+    tracer = trace.get_tracer("edenai_apis", tracer_provider=tracer_provider)
+    meter = metrics.get_meter("edenai_apis", meter_provider=meter_provider)
+    histogram = meter.create_histogram(
+        "edenai_apis.call.duration", unit="ms", description="Providers calls latency"
+    )
+
+    def export(call: CallTrace) -> None:
+        attributes = {
+            "edenai.provider": call.provider,
+            "edenai.feature": call.feature,
+            "edenai.subfeature": call.subfeature,
+        }
+        if call.phase:
+            attributes["edenai.phase"] = call.phase
+        span = tracer.start_span(
+            f"{call.feature}.{call.subfeature}",
+            start_time=call.start_time_ns,
+            attributes={
+                **attributes,
+                "edenai.http.calls": call.http_calls,
+                "edenai.http.bytes_sent": call.bytes_sent,
+                "edenai.http.bytes_received": call.bytes_received,
+            },
+        )
+        context = trace.set_span_in_context(span)
+        for name, start, end in call.spans:
+            tracer.start_span(name, context=context, start_time=start).end(end_time=end)
+        if call.error:
+            span.set_status(Status(StatusCode.ERROR, call.error))
+        span.end(end_time=call.end_time_ns)
+        histogram.record(
+            call.duration * 1000, {**attributes, "edenai.error": bool(call.error)}
+        )
+
+    add_hook(export)
+    return export
@@ -22,29 +22,66 @@ CREATE TABLE IF NOT EXISTS history (
      );
      GRANT INSERT ON TABLE history TO history_write_only;
 ```
+
+Calls are not inserted on the request path: `insert_api_call` puts an event in a
+bounded queue, and a background `MonitoringWriter` inserts them in batches (one
+multi-row insert per batch) when `batch_size` events are waiting or every
+`flush_interval` seconds. When the queue is full, events are dropped (`DROP_NEWEST`,
+`DROP_OLDEST`) or the caller waits up to `block_timeout` (`BLOCK`). Pending events are
+flushed when the process exits.
+
+Any DB-API connection works, eg: a SQLite stand-in for tests
+    >>> writer = MonitoringWriter(
+    ...     lambda: sqlite3.connect(path, check_same_thread=False), placeholder="?"
+    ... )
+    >>> set_monitoring_writer(writer)
 """
+import atexit
 import getpass
 import os
+import queue
 import socket
+import threading
+import time
+import warnings
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional
 
 import psycopg2
 from loaders.data_loader import ProviderDataEnum
 from loaders.loaders import load_provider
-from psycopg2 import errors
-from psycopg2.extensions import AsIs
 
-from .upload_s3 import get_providers_json_from_s3
+# queue full policies
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+MAX_QUEUE_SIZE = 10000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 1.0
+BLOCK_TIMEOUT = 0.1
+HISTORY_COLUMNS = (
+    "provider",
+    "feature",
+    "subfeature",
+    "environment",
+    "host",
+    "start_date",
+    "edenai_user",
+    "error",
+    "host_user",
+)
 
-global INFOS_FROM_S3
-global POSTGRES_CONNECTION
+_writer: Optional["MonitoringWriter"] = None
+_writer_lock = threading.Lock()
 
 
 def monitor_call(condition=False):
     """decorator for compute output functions to add monitoring features"""
 
     def decorator_monitor_call(compute_func):
+        @wraps(compute_func)
         def wrapper(
             provider_name,
             feature,
@@ -81,6 +118,267 @@ def monitor_call(condition=False):
     return decorator_monitor_call
 
 
+class ConnectionPool:
+    """Thread safe pool of DB-API connections, opened on demand
+
+    Args:
+        connect (Callable): opens a new connection
+        size (int): maximum number of idle connections kept
+    """
+
+    def __init__(self, connect: Callable[[], Any], size: int = 1) -> None:
+        self._connect = connect
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue(maxsize=size)
+
+    def get(self) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def put(self, connection: Any) -> None:
+        """Give back a healthy connection, closed if the pool is full"""
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def discard(self, connection: Any) -> None:
+        """Close a broken connection"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class MonitoringWriter:
+    """Insert monitoring events in the `history` table from a background thread
+
+    Args:
+        connect (Callable): opens a DB-API connection (psycopg2, sqlite3...)
+        max_queue_size (int): events kept in memory while waiting to be written
+        batch_size (int): events inserted per statement
+        flush_interval (float): maximum seconds an event waits before being written
+        policy (str): what to do when the queue is full: `DROP_NEWEST` (the event
+            submitted), `DROP_OLDEST` (the oldest queued event) or `BLOCK` (wait up to
+            `block_timeout` seconds, then drop the event)
+        block_timeout (float): seconds a `BLOCK` submission waits for room
+        pool_size (int): connections kept open, the single writer thread uses one
+            at a time
+        placeholder (str): query parameters placeholder of the driver (`%s`, `?`)
+        table (str): table the events are inserted in
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        max_queue_size: int = MAX_QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        policy: str = DROP_NEWEST,
+        block_timeout: float = BLOCK_TIMEOUT,
+        pool_size: int = 1,
+        placeholder: str = "%s",
+        table: str = "history",
+    ) -> None:
+        if policy not in (DROP_NEWEST, DROP_OLDEST, BLOCK):
+            raise ValueError(f"Unknown queue full policy: {policy}")
+        self.pool = ConnectionPool(connect, pool_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.placeholder = placeholder
+        self.table = table
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue_size)
+        self._stats_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._closed = threading.Event()
+        self._worker = threading.Thread(
+            target=self._run, name="edenai_monitoring_writer", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, event: Dict[str, Any]) -> bool:
+        """Queue an event, returns `False` if it was dropped"""
+        if self._closed.is_set():
+            self._count("dropped")
+            return False
+        self._count("submitted")
+        try:
+            if self.policy == BLOCK:
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            pass
+        if self.policy == DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._count("dropped")
+                self._queue.put_nowait(event)
+                return True
+            except (queue.Empty, queue.Full):
+                pass
+        self._count("dropped")
+        return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write the queued events now, returns `False` if not done after `timeout`"""
+        self._flush_requested.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop accepting events, flush the queued ones and close the connections"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._flush_requested.set()
+        self._worker.join(timeout)
+        self.pool.close()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    def _count(self, stat: str, count: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, stat, getattr(self, stat) + count)
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """Events to write: `batch_size` of them or those queued by `flush_interval`"""
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._flush_requested.is_set():
+                # flush: only what's already queued
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                # short waits to notice flush requests
+                batch.append(self._queue.get(timeout=min(remaining, 0.05)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+                for _ in batch:
+                    self._queue.task_done()
+            elif self._queue.empty():
+                self._flush_requested.clear()
+                if self._closed.is_set():
+                    return
+
+    def _insert_statement(self, rows: int) -> str:
+        values = f"({', '.join([self.placeholder] * len(HISTORY_COLUMNS))})"
+        return (
+            f"insert into {self.table} ({', '.join(HISTORY_COLUMNS)}) "
+            f"values {', '.join([values] * rows)}"
+        )
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        parameters = [
+            event.get(column) for event in batch for column in HISTORY_COLUMNS
+        ]
+        statement = self._insert_statement(len(batch))
+        # a broken connection (db restart...) is replaced once
+        for attempt in range(2):
+            try:
+                connection = self.pool.get()
+            except Exception as exc:
+                # monitoring must not fail the calls
+                warnings.warn(f"Monitoring connection failed: {exc!r}", RuntimeWarning)
+                break
+            try:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(statement, parameters)
+                finally:
+                    cursor.close()
+                connection.commit()
+            except Exception as exc:
+                self.pool.discard(connection)
+                if attempt:
+                    warnings.warn(f"Monitoring insert failed: {exc!r}", RuntimeWarning)
+                continue
+            self.pool.put(connection)
+            self._count("written", len(batch))
+            return
+        self._count("failed", len(batch))
+
+
+def _connect_history_db():
+    rds_settings = load_provider(ProviderDataEnum.KEY, "rds")
+    # Connect to your postgres DB
+    return psycopg2.connect(
+        f"dbname=history_db user={rds_settings['write_only_user']} "
+        + f"password={rds_settings['write_only_password']} host={rds_settings['host']}"
+    )
+
+
+def get_monitoring_writer() -> MonitoringWriter:
+    """Writer of `insert_api_call`, connected to the history db on first write"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = MonitoringWriter(_connect_history_db)
+            atexit.register(_writer.close)
+        return _writer
+
+
+def set_monitoring_writer(writer: Optional[MonitoringWriter]) -> None:
+    """Replace the writer of `insert_api_call` (eg: SQLite for tests), the previous
+    one is flushed and closed"""
+    global _writer
+    with _writer_lock:
+        previous, _writer = _writer, writer
+        if writer is not None:
+            atexit.register(writer.close)
+    if previous is not None and previous is not writer:
+        previous.close()
+        atexit.unregister(previous.close)
+
+
+@lru_cache(maxsize=None)
+def _host() -> str:
+    return os.environ.get("HOSTNAME", socket.gethostname())
+
+
+@lru_cache(maxsize=None)
+def _host_user() -> str:
+    return getpass.getuser()
+
+
 def insert_api_call(
     provider: str,
     feature: str,
@@ -88,46 +386,20 @@ def insert_api_call(
     user_email: Optional[str],
     error: Optional[str],
 ):
-    global POSTGRES_CONNECTION
-    if not "POSTGRES_CONNECTION" in globals():
-        rds_settings = load_provider(ProviderDataEnum.KEY, "rds")
-        # Connect to your postgres DB
-        POSTGRES_CONNECTION = psycopg2.connect(
-            f"dbname=history_db user={rds_settings['write_only_user']} "
-            + f"password={rds_settings['write_only_password']} host={rds_settings['host']}"
-        )
-        print("Connect to postgres history ok")
-    global INFOS_FROM_S3
-    if not "INFOS_FROM_S3" in globals():
-        print("Download providers price from s3")
-        INFOS_FROM_S3 = get_providers_json_from_s3()
-
-    to_insert = {
-        "provider": provider,
-        "feature": feature,
-        "subfeature": subfeature,
-        "environment": os.environ.get(
-            "GIT_BRANCH", os.environ.get("CIRCLE_BRANCH", "local_dev")
-        ),
-        "host": os.environ.get("HOSTNAME", socket.gethostname()),
-        "start_date": datetime.utcnow(),
-        "edenai_user": user_email,
-        "error": error,
-        "host_user": getpass.getuser(),
-    }
-
-    columns = to_insert.keys()
-    values = [to_insert[column] for column in columns]
-
-    insert_statement = "insert into history (%s) values %s"
-
-    # Open a cursor to perform database operations
-    try:
-        cur = POSTGRES_CONNECTION.cursor()
-        cur.execute(insert_statement, (AsIs(",".join(columns)), tuple(values)))
-        POSTGRES_CONNECTION.commit()  # <--- makes sure the change is shown in the database
-    except errors.InFailedSqlTransaction as exc:
-        print(exc)
-        POSTGRES_CONNECTION.rollback()
-
-    cur.close()
+    """Queue a call to be inserted in the history db, see `MonitoringWriter`"""
+    get_monitoring_writer().submit(
+        {
+            "provider": provider,
+            "feature": feature,
+            "subfeature": subfeature,
+            "environment": os.environ.get(
+                "GIT_BRANCH", os.environ.get("CIRCLE_BRANCH", "local_dev")
+            ),
+            "host": _host(),
+            "start_date": datetime.utcnow(),
+            "edenai_user": user_email,
+            # `error varchar(255)`: a longer value would fail the whole batch insert
+            "error": error[:255] if error else error,
+            "host_user": _host_user(),
+        }
+    )
@@ -0,0 +1,229 @@
+"""
+Compute several subfeatures of a provider on the same input
+
+Some providers analyze an input for several subfeatures with a single request (eg:
+google `annotate_text` computes entities, sentiment, syntax, categories... at once).
+Providers declare the subfeatures they can compute together in
+`_{feature}__multi_subfeatures` and implement `_{feature}__multi(subfeatures, **args)`,
+returning the result of each subfeature standardized in its own dataclass.
+
+`compute_output_multi` makes a single combined request for the subfeatures the provider
+can compute together (when their validated arguments are the same), and calls
+`compute_output` concurrently for the others.
+
+The combined request supports the `compute_output` options of `COMBINED_OPTIONS`
+(it's rate limited and retried with the limits of its first subfeature). It's
+monitored and instrumented as a single call, whose subfeature is the names of the
+subfeatures joined by `+` (eg: `sentiment_analysis+syntax_analysis`). With other
+options (input conversions, chunking...), the subfeatures are computed separately.
+
+Example:
+    >>> results = compute_output_multi(
+    ...     "google",
+    ...     "text",
+    ...     ["sentiment_analysis", "named_entity_recognition", "syntax_analysis"],
+    ...     {"text": "Eden AI is great", "language": "en"},
+    ... )
+    >>> results["sentiment_analysis"]["standardized_response"]
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from contextvars import copy_context
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from edenai_apis.interface import IS_MONITORING, STATUS_SUCCESS, compute_output
+from edenai_apis.loaders.data_loader import ProviderDataEnum
+from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.utils.constraints import validate_all_provider_constraints
+from edenai_apis.utils.exception import ProviderException, get_appropriate_error
+from edenai_apis.utils.instrumentation import instrument_call, traced
+from edenai_apis.utils.monitoring import monitor_call
+from edenai_apis.utils.rate_limit import get_rate_limiter
+from edenai_apis.utils.resilience import get_resilience_policy
+from edenai_apis.utils.serialization import (
+    VALIDATE_OUTPUT,
+    dump_response,
+    get_response_model,
+    response_fields,
+    serialize_response,
+    validate_response,
+)
+from edenai_apis.utils.upload_s3 import deferred_uploads
+
+MAX_WORKERS = 4
+COMBINED_OPTIONS = frozenset(
+    {"user_email", "as_json", "defer_uploads", "rate_limit", "resilience"}
+)
+
+SubfeatureResult = Union[Dict[str, Any], bytes]
+
+
+def combinable_subfeatures(
+    provider_name: str, feature: str, subfeatures: Sequence[str]
+) -> List[str]:
+    """Subfeatures (among `subfeatures`) the provider can compute with a single request"""
+    provider_class = load_provider(ProviderDataEnum.CLASS, provider_name=provider_name)
+    multi_subfeatures = getattr(provider_class, f"_{feature}__multi_subfeatures", ())
+    return [subfeature for subfeature in subfeatures if subfeature in multi_subfeatures]
+
+
+@monitor_call(condition=IS_MONITORING)
+@instrument_call
+def _compute_combined(
+    provider_name: str,
+    feature: str,
+    subfeature: str,
+    args: Dict,
+    subfeatures: List[str],
+    api_keys: Dict = {},
+    user_email: Optional[str] = None,
+    as_json: bool = False,
+    defer_uploads: bool = False,
+    rate_limit: bool = False,
+    resilience: bool = False,
+) -> Dict[str, SubfeatureResult]:
+    """`compute_output` of `subfeatures` with a single request, `subfeature` names the
+    combined call for the monitoring and instrumentation"""
+    provider = load_provider(ProviderDataEnum.CLASS, provider_name=provider_name)(
+        api_keys
+    )
+    provider_method = getattr(provider, f"_{feature}__multi")
+
+    def call_provider() -> Dict[str, Any]:
+        limits = (
+            get_rate_limiter().acquire(provider_name, feature, subfeatures[0], api_keys)
+            if rate_limit
+            else nullcontext()
+        )
+        with limits, traced("provider_call"):
+            return provider_method(subfeatures, **args)
+
+    try:
+        with deferred_uploads(defer_uploads):
+            if resilience:
+                provider_results = get_resilience_policy().call(
+                    provider_name, feature, subfeatures[0], call_provider
+                )
+            else:
+                provider_results = call_provider()
+    except ProviderException as exc:
+        raise get_appropriate_error(provider_name, exc)
+
+    results: Dict[str, SubfeatureResult] = {}
+    for name in subfeatures:
+        provider_result = provider_results[name]
+        if VALIDATE_OUTPUT:
+            with traced("validation"):
+                provider_result = validate_response(
+                    provider_result, get_response_model(feature, name)
+                )
+        with traced("model_dump"):
+            result = {
+                "status": STATUS_SUCCESS,
+                "provider": provider_name,
+                **(
+                    response_fields(provider_result)
+                    if as_json
+                    else dump_response(provider_result)
+                ),
+            }
+            results[name] = serialize_response(result) if as_json else result
+    return results
+
+
+def compute_output_multi(
+    provider_name: str,
+    feature: str,
+    subfeatures: Sequence[str],
+    args: Dict[str, Any],
+    api_keys: Dict = {},
+    fake: bool = False,
+    max_workers: int = MAX_WORKERS,
+    **kwargs,
+) -> Dict[str, SubfeatureResult]:
+    """Compute several subfeatures of a provider on the same arguments
+
+    Args:
+        provider_name (str): EdenAI provider name
+        feature (str): EdenAI feature name
+        subfeatures (list): EdenAI subfeatures names
+        args (dict): inputs arguments of the subfeatures calls
+        api_keys (dict, optional): optional user's api_keys for the provider
+        fake (bool, optional): take results from samples. Defaults to `False`.
+        max_workers (int, optional): subfeatures computed at the same time
+        **kwargs: `compute_output` options of the calls
+
+    Returns:
+        dict: `compute_output` result of each subfeature, by subfeature name
+
+    Raises:
+        ProviderException: if no subfeature is given, or the error of the first
+            subfeature failing
+    """
+    if not subfeatures:
+        raise ProviderException("At least one subfeature is required", code=400)
+    subfeatures = list(dict.fromkeys(subfeatures))
+    combined: List[str] = []
+    combined_args: Dict = {}
+    if not fake and all(
+        option in COMBINED_OPTIONS or not value for option, value in kwargs.items()
+    ):
+        with traced("constraints"):
+            for subfeature in combinable_subfeatures(
+                provider_name, feature, subfeatures
+            ):
+                subfeature_args = validate_all_provider_constraints(
+                    provider_name, feature, subfeature, "", args
+                )
+                # a single request needs the same arguments (eg: language codes)
+                if not combined or subfeature_args == combined_args:
+                    combined.append(subfeature)
+                    combined_args = subfeature_args
+    if len(combined) < 2:
+        combined = []
+
+    calls: List[Callable[[], Dict[str, SubfeatureResult]]] = [
+        (
+            lambda subfeature=subfeature: {
+                subfeature: compute_output(
+                    provider_name,
+                    feature,
+                    subfeature,
+                    args,
+                    fake=fake,
+                    api_keys=api_keys,
+                    **kwargs,
+                )
+            }
+        )
+        for subfeature in subfeatures
+        if subfeature not in combined
+    ]
+    if combined:
+        calls.append(
+            lambda: _compute_combined(
+                provider_name,
+                feature,
+                "+".join(combined),
+                combined_args,
+                combined,
+                api_keys=api_keys,
+                **{
+                    option: value
+                    for option, value in kwargs.items()
+                    if option in COMBINED_OPTIONS
+                },
+            )
+        )
+
+    results: Dict[str, SubfeatureResult] = {}
+    if len(calls) == 1:
+        results.update(calls[0]())
+    else:
+        # calls keep the context of the caller (tracing, deferred uploads...)
+        context = copy_context()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+            futures = [executor.submit(context.copy().run, call) for call in calls]
+            for future in futures:
+                results.update(future.result())
+    return {subfeature: results[subfeature] for subfeature in subfeatures}
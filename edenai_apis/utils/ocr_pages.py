@@ -0,0 +1,174 @@
+"""
+Page by page `ocr__ocr` on multi-pages pdfs
+
+Synchronous ocr providers receive the whole file in one request: some of them only read
+the first page, others are slow on long documents. `ocr_pdf_pages` splits the pdf in
+single page pdfs (or page images for providers not accepting pdfs), runs the provider's
+`ocr__ocr` on each page concurrently and merges the pages results in one `OcrDataClass`.
+
+Bounding boxes of the merged result are relative to the whole document, pages being
+stacked vertically: a box at the top of the second page of a two pages (same size)
+document has `top=0.5`.
+
+Example:
+    >>> response = ocr_pdf_pages("google", "contract.pdf", "en", pages="1-3,10")
+    >>> response.standardized_response.text
+"""
+import mimetypes
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Union
+
+from edenai_apis.features.ocr import Bounding_box, OcrDataClass
+from edenai_apis.loaders.data_loader import ProviderDataEnum
+from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.utils.constraints import (
+    transform_file_args,
+    validate_all_provider_constraints,
+)
+from edenai_apis.utils.exception import ProviderException, get_appropriate_error
+from edenai_apis.utils.file_probe import get_pdf_page_count
+from edenai_apis.utils.files import FileInfo, FileWrapper
+from edenai_apis.utils.pdfs import (
+    convert_pdf_pages_to_images,
+    get_pdf_pages_heights,
+    parse_page_range,
+    split_pdf_pages,
+)
+from edenai_apis.utils.types import ResponseType
+
+PDF_MEDIA_TYPE = "application/pdf"
+
+
+def _provider_accepts_pdf(provider_name: str) -> bool:
+    provider_info = load_provider(
+        ProviderDataEnum.PROVIDER_INFO,
+        provider_name=provider_name,
+        feature="ocr",
+        subfeature="ocr",
+    )
+    file_types = (provider_info.get("constraints") or {}).get("file_types", [])
+    return not file_types or PDF_MEDIA_TYPE in file_types
+
+
+def _page_file(path: str) -> FileWrapper:
+    media_type = mimetypes.guess_type(path)[0]
+    return FileWrapper(
+        path,
+        "",
+        FileInfo(
+            os.path.getsize(path),
+            media_type,
+            [extension[1:] for extension in mimetypes.guess_all_extensions(media_type)],
+        ),
+    )
+
+
+def merge_pages_results(
+    pages_results: Sequence[OcrDataClass], pages_heights: Sequence[float]
+) -> OcrDataClass:
+    """Merge the ocr results of consecutive pages in one result
+
+    Pages are stacked vertically: boxes top & height, relative to their page, are
+    offset & scaled according to the pages heights. Boxes left & width are unchanged.
+    """
+    total_height = sum(pages_heights)
+    boxes: List[Bounding_box] = []
+    offset = 0.0
+    for page_result, page_height in zip(pages_results, pages_heights):
+        scale = page_height / total_height
+        for box in page_result.bounding_boxes:
+            boxes.append(
+                Bounding_box(
+                    text=box.text,
+                    left=box.left,
+                    top=None if box.top is None else offset + box.top * scale,
+                    width=box.width,
+                    height=None if box.height is None else box.height * scale,
+                )
+            )
+        offset += scale
+
+    text = "\n".join(page.text for page in pages_results if page.text)
+    return OcrDataClass(text=text, bounding_boxes=boxes)
+
+
+def ocr_pdf_pages(
+    provider_name: str,
+    file: str,
+    language: Optional[str],
+    api_keys: Dict = {},
+    pages: Union[str, Sequence[int], None] = None,
+    max_workers: int = 4,
+    as_images: Optional[bool] = None,
+    dpi: int = 200,
+) -> ResponseType[OcrDataClass]:
+    """Run the provider `ocr__ocr` on each page of a pdf and merge the results
+
+    Args:
+        provider_name (str): provider implementing `ocr__ocr`
+        file (str): path of the pdf
+        language (str): language of the document, as given to `ocr__ocr`
+        api_keys (dict, optional): user's api keys for the provider
+        pages (str | list, optional): 1-based pages to process, eg: "1-3,5" or [1, 2].
+            All the pages if `None`
+        max_workers (int, optional): maximum number of concurrent provider calls.
+            Defaults to 4.
+        as_images (bool, optional): send pages as png images instead of single page pdfs.
+            Defaults to images only if the provider doesn't accept pdfs.
+        dpi (int, optional): resolution of the page images. Defaults to 200.
+
+    Returns:
+        ResponseType[OcrDataClass]: merged result, the original response is the list of
+            the pages original responses
+    """
+    # import here to avoid circular import (interface_v2 imports features)
+    from edenai_apis.interface_v2 import Ocr
+
+    if mimetypes.guess_type(file)[0] != PDF_MEDIA_TYPE:
+        raise ProviderException("Page by page ocr is only available for pdf files")
+
+    selected_pages = parse_page_range(pages, get_pdf_page_count(file))
+    if as_images is None:
+        as_images = not _provider_accepts_pdf(provider_name)
+
+    with tempfile.TemporaryDirectory() as pages_dir:
+        if as_images:
+            pages_paths = convert_pdf_pages_to_images(
+                file, pages_dir, selected_pages, dpi
+            )
+        else:
+            pages_paths = split_pdf_pages(file, pages_dir, selected_pages)
+
+        # pages have the same type, constraints (file type, language) are validated once
+        args = validate_all_provider_constraints(
+            provider_name,
+            "ocr",
+            "ocr",
+            "",
+            {"file": _page_file(pages_paths[0]), "language": language},
+        )
+        ocr = Ocr.ocr(provider_name, api_keys)
+
+        def ocr_page(page_path: str) -> ResponseType[OcrDataClass]:
+            page_args = transform_file_args({**args, "file": _page_file(page_path)})
+            return ocr(**page_args)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pages_responses = list(executor.map(ocr_page, pages_paths))
+        except ProviderException as exc:
+            raise get_appropriate_error(provider_name, exc)
+
+    standardized_response = merge_pages_results(
+        [response.standardized_response for response in pages_responses],
+        get_pdf_pages_heights(file, selected_pages),
+    )
+    return ResponseType[OcrDataClass](
+        original_response=[
+            {"page": page + 1, "response": response.original_response}
+            for page, response in zip(selected_pages, pages_responses)
+        ],
+        standardized_response=standardized_response,
+    )
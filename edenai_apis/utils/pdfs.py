@@ -1,21 +1,125 @@
+import os
 import PyPDF2
 from io import BufferedReader
-from typing import Tuple
+from typing import List, Sequence, Tuple, Union
 
+from pdf2image.pdf2image import convert_from_path
 
-def get_pdf_width_height(pdf_file: BufferedReader) -> Tuple[float, float]:
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.file_probe import get_pdf_dimensions
+
+
+def get_pdf_width_height(pdf_file: Union[str, BufferedReader]) -> Tuple[float, float]:
     """
     Read a pdf file and returns its width and height
 
     Args:
-        - pdf_file (io.BufferedReaer): a pdf file
+        - pdf_file (str | io.BufferedReaer): a pdf file or its path
 
     Returns:
         - width, height: a tuple(float, float) representing width & height
     """
+    file_path = pdf_file if isinstance(pdf_file, str) else getattr(pdf_file, "name", None)
+    if isinstance(file_path, str) and os.path.isfile(file_path):
+        # read from the file MediaBoxes & cached
+        return get_pdf_dimensions(file_path)
+
     reader = PyPDF2.PdfReader(pdf_file)
     rectangle_box = reader.pages[0].mediabox
     width = float(rectangle_box.width)
     height = float(rectangle_box.height)
 
     return width, height
+
+
+def parse_page_range(pages: Union[str, Sequence[int], None], page_count: int) -> List[int]:
+    """
+    Convert a page selection to a sorted list of 0-based page indexes
+
+    Args:
+        - pages (str | list[int] | None): 1-based page numbers, either a list or a
+            string like "1-3,5,8-". `None` selects all the pages
+        - page_count (int): number of pages of the pdf
+
+    Returns:
+        - list of 0-based page indexes
+
+    Raises:
+        - `ProviderException`: if the selection is invalid or out of the pdf pages
+    """
+    if pages is None:
+        return list(range(page_count))
+
+    numbers = set()
+    if isinstance(pages, str):
+        for part in pages.replace(" ", "").split(","):
+            if not part:
+                continue
+            try:
+                if "-" in part:
+                    start, end = part.split("-", 1)
+                    start, end = int(start or 1), int(end or page_count)
+                    if start > end:
+                        raise ProviderException(
+                            f"Invalid page range: `{part}`, the first page is after the last one"
+                        )
+                    numbers.update(range(start, end + 1))
+                else:
+                    numbers.add(int(part))
+            except ValueError:
+                raise ProviderException(f"Invalid page range: `{pages}`")
+    else:
+        numbers.update(int(page) for page in pages)
+
+    if not numbers or min(numbers) < 1 or max(numbers) > page_count:
+        raise ProviderException(
+            f"Invalid page range: `{pages}`, the document has {page_count} pages"
+        )
+    return [number - 1 for number in sorted(numbers)]
+
+
+def get_pdf_pages_heights(pdf_path: str, pages: Sequence[int]) -> List[float]:
+    """
+    Returns the heights of the given pages (0-based indexes) of a pdf
+    """
+    reader = PyPDF2.PdfReader(pdf_path)
+    return [float(reader.pages[page].mediabox.height) for page in pages]
+
+
+def split_pdf_pages(pdf_path: str, output_dir: str, pages: Sequence[int]) -> List[str]:
+    """
+    Write each page (0-based indexes) of a pdf to a single page pdf
+
+    Returns:
+        - paths of the single page pdfs, in the same order as `pages`
+    """
+    reader = PyPDF2.PdfReader(pdf_path)
+    paths = []
+    for page in pages:
+        writer = PyPDF2.PdfWriter()
+        writer.add_page(reader.pages[page])
+        path = os.path.join(output_dir, f"page_{page + 1}.pdf")
+        with open(path, "wb") as page_file:
+            writer.write(page_file)
+        paths.append(path)
+    return paths
+
+
+def convert_pdf_pages_to_images(
+    pdf_path: str, output_dir: str, pages: Sequence[int], dpi: int = 200
+) -> List[str]:
+    """
+    Render each page (0-based indexes) of a pdf to a png image (requires poppler)
+
+    Returns:
+        - paths of the images, in the same order as `pages`
+    """
+    paths = []
+    for page in pages:
+        image = convert_from_path(
+            pdf_path, dpi=dpi, first_page=page + 1, last_page=page + 1
+        )[0]
+        path = os.path.join(output_dir, f"page_{page + 1}.png")
+        image.save(path)
+        paths.append(path)
+    return paths
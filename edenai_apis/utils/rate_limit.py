@@ -0,0 +1,401 @@
+"""
+Client-side rate limiting of the providers calls
+
+Calls are limited per (provider, api key, feature, subfeature):
+
+    - `requests_per_second` (or `requests_per_minute`): token bucket of `burst` tokens
+      (defaults to one second of requests), refilled continuously
+    - `max_concurrency`: calls in flight at the same time
+
+Limits are declared in the `rate_limit` entry of a subfeature in the provider
+`info.json`, or set at runtime with `RateLimiter.set_limit` (for a subfeature or for
+all the provider subfeatures), which takes precedence.
+
+Calls over the limits wait their turn (token reservations are served in order) until
+their deadline rather than reaching the provider and failing with a 429: if the wait
+exceeds the deadline, `ProviderRateLimitTimeoutError` is raised right away. Calls waiting
+for a concurrency slot check the store again with exponential backoff (from 50ms to 1s).
+
+State is kept in memory by default (`LocalRateLimitStore`), use `RedisRateLimitStore`
+to share the limits between processes.
+
+Example:
+    >>> limiter = get_rate_limiter()
+    >>> limiter.set_limit("openai", RateLimit(requests_per_second=5, max_concurrency=2))
+    >>> with limiter.acquire("openai", "text", "generation", api_keys, timeout=30):
+    ...     call_provider()
+    >>> set_rate_limiter(RateLimiter(RedisRateLimitStore(redis.Redis())))
+"""
+import asyncio
+import hashlib
+import json
+import math
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+from edenai_apis.loaders.data_loader import ProviderDataEnum
+from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.utils.exception import ProviderRateLimitTimeoutError
+from edenai_apis.utils.instrumentation import traced
+
+# seconds a call waits for its turn before `ProviderRateLimitTimeoutError`
+DEFAULT_TIMEOUT = 30.0
+# seconds between two checks of a free concurrency slot, doubled after each check
+MIN_POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Limits of a provider subfeature, `None` for no limit"""
+
+    requests_per_second: Optional[float] = None
+    burst: Optional[int] = None
+    max_concurrency: Optional[int] = None
+
+    @property
+    def capacity(self) -> float:
+        """Token bucket size"""
+        if self.burst:
+            return float(self.burst)
+        return float(max(1, math.ceil(self.requests_per_second or 1)))
+
+    @classmethod
+    def from_info(cls, rate_limit: Optional[Dict]) -> Optional["RateLimit"]:
+        """Limit of an `info.json` `rate_limit` entry"""
+        if not rate_limit:
+            return None
+        requests_per_second = rate_limit.get("requests_per_second")
+        if requests_per_second is None and rate_limit.get("requests_per_minute"):
+            requests_per_second = rate_limit["requests_per_minute"] / 60
+        return cls(
+            requests_per_second=requests_per_second,
+            burst=rate_limit.get("burst"),
+            max_concurrency=rate_limit.get("max_concurrency"),
+        )
+
+
+class LocalRateLimitStore:
+    """Limits state of the current process"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key: (tokens, last refill), tokens are negative when reserved in advance
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._in_flight: Dict[str, int] = {}
+
+    def reserve(self, key: str, limit: RateLimit, max_wait: float) -> Optional[float]:
+        """Reserve a token, returns the seconds to wait for it, or `None` (nothing
+        reserved) if it's more than `max_wait`"""
+        rate = limit.requests_per_second
+        with self._lock:
+            now = self._clock()
+            tokens, updated = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated) * rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            if wait > max_wait:
+                self._buckets[key] = (tokens, now)
+                return None
+            self._buckets[key] = (tokens - 1, now)
+            return wait
+
+    def try_enter(self, key: str, limit: RateLimit) -> Optional[str]:
+        """Take a concurrency slot, returns its lease or `None` if there is none free"""
+        with self._lock:
+            in_flight = self._in_flight.get(key, 0)
+            if in_flight >= limit.max_concurrency:
+                return None
+            self._in_flight[key] = in_flight + 1
+            return key
+
+    def exit(self, key: str, lease: str) -> None:
+        with self._lock:
+            self._in_flight[key] = max(self._in_flight.get(key, 0) - 1, 0)
+
+
+# KEYS[1]: bucket, ARGV: rate, capacity, max wait. Returns the wait, -1 if too long
+_RESERVE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens < 1 then wait = (1 - tokens) / rate end
+if wait > tonumber(ARGV[3]) then return '-1' end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity + 1) / rate + wait))
+return tostring(wait)
+"""
+
+# KEYS[1]: leases sorted by expiration, ARGV: max concurrency, lease, lease ttl
+_ENTER_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then return 0 end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[2])
+redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[3])) + 1)
+return 1
+"""
+
+
+class RedisRateLimitStore:
+    """Limits state shared by several processes in a Redis compatible store (>= 5)
+
+    Token buckets and concurrency slots are updated atomically by Lua scripts, with the
+    store clock. Concurrency slots are leases expiring after `lease_ttl` seconds, not
+    to be lost if a process dies during a call.
+
+    Args:
+        client: `redis.Redis` like client
+        prefix (str): keys prefix
+        lease_ttl (float): longest duration of a call
+    """
+
+    def __init__(
+        self, client: Any, prefix: str = "edenai:rate_limit", lease_ttl: float = 600.0
+    ) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.lease_ttl = lease_ttl
+
+    def reserve(self, key: str, limit: RateLimit, max_wait: float) -> Optional[float]:
+        wait = float(
+            self.client.eval(
+                _RESERVE_SCRIPT,
+                1,
+                f"{self.prefix}:bucket:{key}",
+                limit.requests_per_second,
+                limit.capacity,
+                max_wait,
+            )
+        )
+        return None if wait < 0 else wait
+
+    def try_enter(self, key: str, limit: RateLimit) -> Optional[str]:
+        lease = uuid.uuid4().hex
+        entered = self.client.eval(
+            _ENTER_SCRIPT,
+            1,
+            f"{self.prefix}:in_flight:{key}",
+            limit.max_concurrency,
+            lease,
+            self.lease_ttl,
+        )
+        return lease if int(entered) else None
+
+    def exit(self, key: str, lease: str) -> None:
+        self.client.zrem(f"{self.prefix}:in_flight:{key}", lease)
+
+
+def _api_keys_id(api_keys: Dict) -> str:
+    """Users api keys share their limits, identified without keeping the keys"""
+    if not api_keys:
+        return "default"
+    content = json.dumps(api_keys, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def _info_rate_limit(
+    provider: str, feature: str, subfeature: str
+) -> Optional[RateLimit]:
+    try:
+        info = load_provider(
+            ProviderDataEnum.PROVIDER_INFO,
+            provider_name=provider,
+            feature=feature,
+            subfeature=subfeature,
+        )
+    except Exception:
+        return None
+    return RateLimit.from_info(info.get("rate_limit"))
+
+
+class RateLimiter:
+    """Wait for the rate limits of the providers before calling them
+
+    Args:
+        store: limits state, `LocalRateLimitStore` or `RedisRateLimitStore`
+    """
+
+    def __init__(self, store: Any = None) -> None:
+        self.store = store if store is not None else LocalRateLimitStore()
+        self._overrides: Dict[Tuple[str, Optional[str], Optional[str]], RateLimit] = {}
+
+    def set_limit(
+        self,
+        provider: str,
+        limit: Optional[RateLimit],
+        feature: Optional[str] = None,
+        subfeature: Optional[str] = None,
+    ) -> None:
+        """Override the `info.json` limit of a provider subfeature (or of all the
+        subfeatures of its feature, or of all its subfeatures if not given), `None`
+        removes the override"""
+        if subfeature is not None and feature is None:
+            raise ValueError("A subfeature limit needs its feature")
+        key = (provider, feature, subfeature)
+        if limit is None:
+            self._overrides.pop(key, None)
+        else:
+            self._overrides[key] = limit
+
+    def get_limit(
+        self, provider: str, feature: str, subfeature: str
+    ) -> Optional[RateLimit]:
+        for key in (
+            (provider, feature, subfeature),
+            (provider, feature, None),
+            (provider, None, None),
+        ):
+            if key in self._overrides:
+                return self._overrides[key]
+        return _info_rate_limit(provider, feature, subfeature)
+
+    def _enter(
+        self, provider: str, key: str, limit: RateLimit, deadline: float, now: float
+    ) -> Tuple[Optional[str], float]:
+        """Takes the concurrency slot (if limited) and reserves the token, returns the
+        slot lease and the seconds to wait for the token, -1 if no slot is free"""
+        lease = None
+        if limit.max_concurrency:
+            lease = self.store.try_enter(key, limit)
+            if lease is None:
+                return None, -1.0
+        wait = 0.0
+        if limit.requests_per_second:
+            reserved = self.store.reserve(key, limit, max(deadline - now, 0.0))
+            if reserved is None:
+                if lease is not None:
+                    self.store.exit(key, lease)
+                raise ProviderRateLimitTimeoutError(
+                    f"Rate limit of {provider} reached, "
+                    "the call couldn't be made before its deadline",
+                    code=429,
+                )
+            wait = reserved
+        return lease, wait
+
+    def _admit(
+        self, provider: str, key: str, limit: RateLimit, deadline: float
+    ) -> Generator[float, None, Tuple[Optional[str], float]]:
+        """Wait for a concurrency slot and reserve the token, shared by `acquire` and
+        `acquire_async`: yields the seconds to sleep before checking the slots again,
+        returns the slot lease and the seconds to wait for the token"""
+        poll_interval = MIN_POLL_INTERVAL
+        while True:
+            now = time.monotonic()
+            lease, wait = self._enter(provider, key, limit, deadline, now)
+            if wait >= 0:
+                return lease, wait
+            if now >= deadline:
+                raise ProviderRateLimitTimeoutError(
+                    f"Too many concurrent calls to {provider}, "
+                    "the call couldn't be made before its deadline",
+                    code=429,
+                )
+            yield min(poll_interval, deadline - now)
+            poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL)
+
+    @contextmanager
+    def acquire(
+        self,
+        provider: str,
+        feature: str,
+        subfeature: str,
+        api_keys: Dict = {},
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> Iterator[None]:
+        """Wait for the provider limits (at most `timeout` seconds), the call is made
+        in the context
+
+        Raises:
+            ProviderRateLimitTimeoutError: if the limits don't allow the call before `timeout`
+        """
+        limit = self.get_limit(provider, feature, subfeature)
+        if limit is None:
+            yield
+            return
+        key = f"{provider}:{_api_keys_id(api_keys)}:{feature}:{subfeature}"
+        deadline = time.monotonic() + timeout
+        admission = self._admit(provider, key, limit, deadline)
+        with traced("rate_limit"):
+            try:
+                while True:
+                    time.sleep(next(admission))
+            except StopIteration as admitted:
+                lease, wait = admitted.value
+        try:
+            if wait:
+                with traced("rate_limit"):
+                    time.sleep(wait)
+            yield
+        finally:
+            if lease is not None:
+                self.store.exit(key, lease)
+
+    @asynccontextmanager
+    async def acquire_async(
+        self,
+        provider: str,
+        feature: str,
+        subfeature: str,
+        api_keys: Dict = {},
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> AsyncIterator[None]:
+        """`acquire` for asyncio code, waits without blocking the event loop"""
+        limit = self.get_limit(provider, feature, subfeature)
+        if limit is None:
+            yield
+            return
+        key = f"{provider}:{_api_keys_id(api_keys)}:{feature}:{subfeature}"
+        deadline = time.monotonic() + timeout
+        admission = self._admit(provider, key, limit, deadline)
+        with traced("rate_limit"):
+            try:
+                while True:
+                    await asyncio.sleep(next(admission))
+            except StopIteration as admitted:
+                lease, wait = admitted.value
+        try:
+            if wait:
+                with traced("rate_limit"):
+                    await asyncio.sleep(wait)
+            yield
+        finally:
+            if lease is not None:
+                self.store.exit(key, lease)
+
+
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Rate limiter of `compute_output(..., rate_limit=True)`"""
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: RateLimiter) -> None:
+    """Replace the rate limiter of `compute_output`, eg: with a shared Redis store"""
+    global _rate_limiter
+    _rate_limiter = limiter
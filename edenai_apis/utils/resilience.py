@@ -0,0 +1,452 @@
+"""
+Retries, hedged requests and circuit breaking of the providers calls
+
+`ResiliencePolicy.call` runs a provider call with:
+
+    - retries of transient errors (provider 5xx, timeouts, 429, connection errors) with
+      decorrelated jitter backoff, for idempotent subfeatures only: async job launches
+      and phases changing the provider state (`add_face`, `upload_image`...) are called
+      once
+    - hedging: when a call of an idempotent subfeature takes longer than the 95th
+      percentile of its recent latencies, a duplicate is sent and the first result wins.
+      Hedged calls run on a pool of `HEDGE_WORKERS` threads, they're made on the calling
+      thread without hedging when the pool is busy
+    - a circuit breaker per provider: after too many transient errors among its recent
+      calls, the provider isn't called for `reset_timeout` seconds
+      (`ProviderCircuitOpenError`), then probe calls decide whether it's closed again
+
+Errors of the caller (invalid input, authentication...) are neither retried nor counted
+as provider failures. Retries and hedges are limited to a ratio of the calls
+(`retry_ratio`, `hedge_ratio`) so that a degraded provider doesn't get more traffic.
+
+The circuit state of the providers is exposed with `circuit_state` for routing.
+
+Example:
+    >>> policy = get_resilience_policy()
+    >>> policy.call("google", "text", "sentiment_analysis", lambda: call_provider())
+    >>> policy.circuit_state("google")
+    'closed'
+"""
+import random
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+import requests
+
+from edenai_apis.utils.exception import (
+    ProviderCircuitOpenError,
+    ProviderException,
+    ProviderInternalServerError,
+    ProviderLimitationError,
+    ProviderRateLimitTimeoutError,
+    ProviderTimeoutError,
+    get_appropriate_error,
+)
+
+T = TypeVar("T")
+
+# circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+HEDGE_WORKERS = 32
+# phases changing the provider state, not to be sent twice
+NON_IDEMPOTENT_PHASE_PREFIXES = ("add_", "create_", "delete_", "upload_")
+RETRYABLE_STATUS_CODES = {408, 429}
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor_lock = threading.Lock()
+# calls are only sent to the pool when a thread is free, they never wait in its queue
+_hedge_slots = threading.BoundedSemaphore(HEDGE_WORKERS)
+
+
+def is_idempotent(feature: str, subfeature: str, phase: str = "") -> bool:
+    """Whether a subfeature call can be sent again without side effects"""
+    if phase:
+        return "_async" not in phase and not phase.startswith(
+            NON_IDEMPOTENT_PHASE_PREFIXES
+        )
+    return "_async" not in subfeature
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status_code = getattr(error, "status_code", None)
+    try:
+        return int(status_code) if status_code is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """Whether an error shows the provider is degraded (counted by the circuit breaker)"""
+    if isinstance(error, (ProviderRateLimitTimeoutError, ProviderCircuitOpenError)):
+        # the provider wasn't reached
+        return False
+    if isinstance(error, (ProviderInternalServerError, ProviderTimeoutError)):
+        return True
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    status_code = _status_code(error)
+    return status_code is not None and status_code >= 500
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is transient: the same call could succeed"""
+    if is_provider_failure(error):
+        return True
+    if isinstance(error, ProviderRateLimitTimeoutError):
+        # already waited for the client-side limits
+        return False
+    if isinstance(error, ProviderLimitationError):
+        return True
+    return _status_code(error) in RETRYABLE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """Stop calling a provider failing too often
+
+    The circuit opens when at least `failure_rate` of the last `window` calls (and
+    `min_calls` of them) failed. After `reset_timeout` seconds it's half open: up to
+    `half_open_calls` probe calls are let through at a time, a success closes the
+    circuit and a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if self._clock() - self._opened_at < self.reset_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    def allow(self) -> bool:
+        """Whether a call can be made, to report with `record` (probe calls included)"""
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record(self, failure: bool) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                if self._state() == HALF_OPEN:
+                    self._probes = max(self._probes - 1, 0)
+                    if failure:
+                        self._open()
+                    else:
+                        self._opened_at = None
+                        self._outcomes.clear()
+                # late results of calls made before the circuit opened are ignored
+                return
+            self._outcomes.append(failure)
+            failures = sum(self._outcomes)
+            if len(
+                self._outcomes
+            ) >= self.min_calls and failures >= self.failure_rate * len(self._outcomes):
+                self._open()
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self._probes = 0
+        self._outcomes.clear()
+
+
+class LatencyWindow:
+    """Recent latencies of successful calls, sorted for quantiles"""
+
+    def __init__(self, size: int = 200) -> None:
+        self._lock = threading.Lock()
+        self._recent: Deque[float] = deque()
+        self._sorted: List[float] = []
+        self.size = size
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def add(self, latency: float) -> None:
+        with self._lock:
+            if len(self._recent) == self.size:
+                oldest = self._recent.popleft()
+                del self._sorted[bisect_left(self._sorted, oldest)]
+            self._recent.append(latency)
+            insort(self._sorted, latency)
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        with self._lock:
+            if not self._sorted:
+                return None
+            index = min(int(quantile * len(self._sorted)), len(self._sorted) - 1)
+            return self._sorted[index]
+
+
+class Budget:
+    """Extra calls (retries, hedges) allowed: `ratio` per call, up to `reserve`"""
+
+    def __init__(self, ratio: float, reserve: float = 10.0) -> None:
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = reserve
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self._balance + self.ratio, self.reserve)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=HEDGE_WORKERS, thread_name_prefix="edenai_hedge"
+            )
+        return _hedge_executor
+
+
+class ResiliencePolicy:
+    """Retries, hedging and circuit breakers of the providers calls
+
+    Args:
+        max_attempts (int): calls made at most for a retried call
+        base_delay (float): minimum seconds between two attempts
+        max_delay (float): maximum seconds between two attempts
+        retry_ratio (float): retries allowed per call (with a reserve of 10 retries)
+        hedge (bool): send duplicates of slow calls
+        hedge_quantile (float): latency quantile after which a duplicate is sent
+        hedge_min_samples (int): latencies known before hedging a subfeature
+        hedge_ratio (float): duplicates allowed per call (with a reserve of 10)
+        breaker_factory (Callable): builds the circuit breaker of a provider
+        sleep (Callable): waits between attempts
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 5.0,
+        retry_ratio: float = 0.2,
+        hedge: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_ratio: float = 0.05,
+        breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.retry_budget = Budget(retry_ratio)
+        self.hedge_budget = Budget(hedge_ratio)
+        self._breaker_factory = breaker_factory
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[Tuple[str, str, str], LatencyWindow] = {}
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = self._breaker_factory()
+            return self._breakers[provider]
+
+    def circuit_state(self, provider: str) -> str:
+        """`CLOSED`, `OPEN` or `HALF_OPEN`"""
+        return self.breaker(provider).state
+
+    def circuit_states(self) -> Dict[str, str]:
+        """Circuit state of the providers called so far"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {provider: breaker.state for provider, breaker in breakers.items()}
+
+    def latency_quantile(
+        self, provider: str, feature: str, subfeature: str, quantile: float
+    ) -> Optional[float]:
+        """Quantile of the recent successful calls latency (seconds), `None` if unknown"""
+        latencies = self._latencies.get((provider, feature, subfeature))
+        return latencies.quantile(quantile) if latencies else None
+
+    def backoff(self, previous_delay: float) -> float:
+        """Decorrelated jitter: random between the base and 3 times the previous delay"""
+        return min(self.max_delay, random.uniform(self.base_delay, previous_delay * 3))
+
+    def call(
+        self,
+        provider: str,
+        feature: str,
+        subfeature: str,
+        func: Callable[[], T],
+        phase: str = "",
+    ) -> T:
+        """Call `func` (a provider call) with the policy
+
+        Raises:
+            ProviderCircuitOpenError: if the provider circuit is open
+            ProviderException: error of the last attempt
+        """
+        idempotent = is_idempotent(feature, subfeature, phase)
+        self.retry_budget.deposit()
+        self.hedge_budget.deposit()
+        delay = self.base_delay
+        attempt = 1
+        while True:
+            try:
+                if idempotent and self.hedge:
+                    return self._hedged(provider, feature, subfeature, func)
+                return self._attempt(provider, feature, subfeature, func)
+            except Exception as exc:
+                if (
+                    not idempotent
+                    or attempt >= self.max_attempts
+                    or not is_retryable(exc)
+                    or self.breaker(provider).state != CLOSED
+                    or not self.retry_budget.withdraw()
+                ):
+                    raise
+            delay = self.backoff(delay)
+            self._sleep(delay)
+            attempt += 1
+
+    def _attempt(
+        self, provider: str, feature: str, subfeature: str, func: Callable[[], T]
+    ) -> T:
+        breaker = self.breaker(provider)
+        if not breaker.allow():
+            raise ProviderCircuitOpenError(
+                f"{provider} is unavailable after repeated failures, "
+                f"calls resume in at most {breaker.reset_timeout:g} seconds",
+                code=503,
+            )
+        start = time.perf_counter()
+        try:
+            result = func()
+        except ProviderException as exc:
+            # classified once, `get_appropriate_error` returns it as is afterwards
+            error = get_appropriate_error(provider, exc)
+            breaker.record(is_provider_failure(error))
+            raise error
+        except Exception as exc:
+            breaker.record(is_provider_failure(exc))
+            raise
+        breaker.record(False)
+        with self._lock:
+            latencies = self._latencies.setdefault(
+                (provider, feature, subfeature), LatencyWindow()
+            )
+        latencies.add(time.perf_counter() - start)
+        return result
+
+    def _start_attempt(
+        self, provider: str, feature: str, subfeature: str, func: Callable[[], T]
+    ) -> Optional[Tuple["Future[T]", threading.Event]]:
+        """Start an attempt on the hedge pool, `None` if no thread is free
+
+        Returns:
+            - the attempt future
+            - an event set when the attempt starts
+        """
+        if not _hedge_slots.acquire(blocking=False):
+            return None
+        started = threading.Event()
+
+        def attempt() -> T:
+            started.set()
+            try:
+                return self._attempt(provider, feature, subfeature, func)
+            finally:
+                _hedge_slots.release()
+
+        try:
+            # calls in other threads keep the context (tracing, deferred uploads...)
+            return _hedge_pool().submit(copy_context().run, attempt), started
+        except BaseException:
+            _hedge_slots.release()
+            raise
+
+    def _hedged(
+        self, provider: str, feature: str, subfeature: str, func: Callable[[], T]
+    ) -> T:
+        """Send a duplicate of the call if it's slower than usual, first result wins"""
+        latencies = self._latencies.get((provider, feature, subfeature))
+        if latencies is None or len(latencies) < self.hedge_min_samples:
+            return self._attempt(provider, feature, subfeature, func)
+        hedge_delay = latencies.quantile(self.hedge_quantile)
+        primary = self._start_attempt(provider, feature, subfeature, func)
+        if primary is None:
+            return self._attempt(provider, feature, subfeature, func)
+        call, started = primary
+        # the delay is compared to latencies of calls, from their start
+        started.wait()
+        calls = [call]
+        done, _ = wait(calls, timeout=hedge_delay)
+        if not done and self.hedge_budget.withdraw():
+            hedge = self._start_attempt(provider, feature, subfeature, func)
+            if hedge is not None:
+                calls.append(hedge[0])
+        pending = set(calls)
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            failed = None
+            for call in done:
+                if call.exception() is None:
+                    # the slower call isn't stopped, its result is dropped
+                    return call.result()
+                failed = call
+            if not pending:
+                return failed.result()
+
+
+_policy = ResiliencePolicy()
+
+
+def get_resilience_policy() -> ResiliencePolicy:
+    """Policy of `compute_output(..., resilience=True)`"""
+    return _policy
+
+
+def set_resilience_policy(policy: ResiliencePolicy) -> None:
+    global _policy
+    _policy = policy
@@ -0,0 +1,329 @@
+"""
+Automatic choice of the provider of a call
+
+`compute_output("auto", feature, subfeature, args)` calls one of the providers of the
+subfeature, `compute_output(["google", "amazon"], ...)` one of the given providers:
+
+    - candidates implement the subfeature (`list_features`) and accept the arguments
+      (languages, models, files... constraints of their `info.json`)
+    - they're ranked by the latency (exponentially weighted moving average) and error
+      rate measured on the routed calls, and optionally by their cost: expected time to
+      a successful call plus `cost_weight` seconds per cost unit. Providers with an open
+      circuit (`utils.resilience`) come last, half open ones after the closed ones
+    - when a provider fails, the next one is called, `max_attempts` providers at most.
+      Errors of the caller (invalid or missing input, 400, 413, 422) are raised right
+      away, the other providers would fail the same way
+
+The constraints of a provider are only checked when it's its turn to be called.
+Unmeasured providers get the average latency of the measured candidates, ties keep the
+order of the given providers. `api_keys` of a routed call are the api keys of each
+provider: `{"google": {...}, "amazon": {...}}`, api keys of a single provider
+(`{"api_key": ...}`) are rejected. The `provider` of the result is the provider called.
+
+Example:
+    >>> set_router(Router(costs={"google": 0.001, "amazon": 0.0001}, cost_weight=1000))
+    >>> compute_output("auto", "text", "sentiment_analysis", args)["provider"]
+    'amazon'
+    >>> get_router().stats.snapshot()
+"""
+import inspect
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import requests
+
+from edenai_apis.utils.constraints import validate_all_provider_constraints
+from edenai_apis.utils.exception import (
+    ProviderException,
+    ProviderInvalidInputError,
+    ProviderMissingInputError,
+)
+from edenai_apis.utils.resilience import CLOSED, HALF_OPEN, get_resilience_policy
+
+AUTO_PROVIDER = "auto"
+# an error rate of 1 doesn't make a provider infinitely slow, only very slow
+MIN_SUCCESS_RATE = 0.05
+_CIRCUIT_RANKS = {CLOSED: 0, HALF_OPEN: 1}
+# errors of the caller, the same for all the providers
+CALLER_ERROR_STATUS_CODES = {400, 413, 422}
+
+
+@dataclass
+class ProviderScore:
+    """Measures of a provider subfeature, `latency` in seconds (successful calls)"""
+
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    calls: int = 0
+
+
+class ProviderStats:
+    """Latency and error rate moving averages of the providers subfeatures
+
+    Can also be registered as an instrumentation hook, to measure the calls made
+    without routing: `utils.instrumentation.add_hook(get_router().stats)`
+
+    Args:
+        alpha (float): weight of the last call in the averages
+    """
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._scores: Dict[Tuple[str, str, str], ProviderScore] = {}
+
+    def __call__(self, trace) -> None:
+        self.record(
+            trace.provider,
+            trace.feature,
+            trace.subfeature,
+            trace.duration,
+            trace.error is not None,
+        )
+
+    def record(
+        self,
+        provider: str,
+        feature: str,
+        subfeature: str,
+        duration: float,
+        error: bool = False,
+    ) -> None:
+        with self._lock:
+            score = self._scores.setdefault(
+                (provider, feature, subfeature), ProviderScore()
+            )
+            score.calls += 1
+            score.error_rate += self.alpha * (error - score.error_rate)
+            if error:
+                return
+            if score.latency is None:
+                score.latency = duration
+            else:
+                score.latency += self.alpha * (duration - score.latency)
+
+    def get(self, provider: str, feature: str, subfeature: str) -> ProviderScore:
+        with self._lock:
+            score = self._scores.get((provider, feature, subfeature))
+            return ProviderScore(**vars(score)) if score else ProviderScore()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Measures by provider/feature/subfeature"""
+        with self._lock:
+            return {
+                "/".join(key): dict(vars(score)) for key, score in self._scores.items()
+            }
+
+
+def is_caller_error(error: BaseException) -> bool:
+    """Whether an error comes from the call arguments, not from the provider"""
+    if isinstance(error, (ProviderInvalidInputError, ProviderMissingInputError)):
+        return True
+    return getattr(error, "status_code", None) in CALLER_ERROR_STATUS_CODES
+
+
+@lru_cache(maxsize=None)
+def _subfeature_providers(feature: str, subfeature: str, phase: str) -> Tuple[str]:
+    # the routed function is `interface.compute_output`, which imports this module
+    from edenai_apis.interface import list_features
+
+    return tuple(
+        provider
+        for provider, feature_i, subfeature_i, *phase_i in list_features()
+        if (feature_i, subfeature_i) == (feature, subfeature)
+        and (phase_i[0] if phase_i else "") == phase
+    )
+
+
+class Router:
+    """Rank the providers of a subfeature and call them until one succeeds
+
+    Args:
+        max_attempts (int): providers called at most
+        costs (dict): cost of a call by provider, or by (provider, feature, subfeature)
+        cost_weight (float): seconds of latency a cost unit is worth
+        stats (ProviderStats): measures of the providers, shared by the routers
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        costs: Optional[Dict[Union[str, Tuple[str, str, str]], float]] = None,
+        cost_weight: float = 0.0,
+        stats: Optional[ProviderStats] = None,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.costs = costs or {}
+        self.cost_weight = cost_weight
+        self.stats = stats if stats is not None else ProviderStats()
+
+    def candidates(
+        self,
+        feature: str,
+        subfeature: str,
+        phase: str = "",
+        args: Optional[Dict] = None,
+        providers: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        """Providers (among `providers` if given) implementing the subfeature, whose
+        constraints accept `args`"""
+        available = _subfeature_providers(feature, subfeature, phase or "")
+        if providers is None:
+            providers = available
+        return [
+            provider
+            for provider in providers
+            if provider in available
+            and (
+                args is None
+                or self._accepts(provider, feature, subfeature, phase, args)
+            )
+        ]
+
+    @staticmethod
+    def _accepts(
+        provider: str, feature: str, subfeature: str, phase: str, args: Dict
+    ) -> bool:
+        """Whether the provider constraints accept `args`"""
+        try:
+            validate_all_provider_constraints(
+                provider, feature, subfeature, phase, args
+            )
+        except ProviderException:
+            return False
+        return True
+
+    def _cost(self, provider: str, feature: str, subfeature: str) -> float:
+        return self.costs.get(
+            (provider, feature, subfeature), self.costs.get(provider, 0.0)
+        )
+
+    def rank(
+        self, providers: Sequence[str], feature: str, subfeature: str
+    ) -> List[str]:
+        """Providers by circuit state, then expected time to a successful call (and
+        cost) from the best to the worst"""
+        scores = {
+            provider: self.stats.get(provider, feature, subfeature)
+            for provider in providers
+        }
+        latencies = [s.latency for s in scores.values() if s.latency is not None]
+        default_latency = sum(latencies) / len(latencies) if latencies else 0.0
+        policy = get_resilience_policy()
+
+        def key(indexed_provider: Tuple[int, str]):
+            index, provider = indexed_provider
+            score = scores[provider]
+            latency = default_latency if score.latency is None else score.latency
+            expected = latency / max(1 - score.error_rate, MIN_SUCCESS_RATE)
+            return (
+                _CIRCUIT_RANKS.get(policy.circuit_state(provider), 2),
+                expected + self.cost_weight * self._cost(provider, feature, subfeature),
+                index,
+            )
+
+        return [provider for _, provider in sorted(enumerate(providers), key=key)]
+
+    def call(
+        self,
+        compute_func: Callable,
+        providers: Union[str, Sequence[str]],
+        feature: str,
+        subfeature: str,
+        args: Dict,
+        phase: str = "",
+        api_keys: Optional[Dict] = None,
+        **kwargs,
+    ) -> Any:
+        """Call `compute_func` with the best provider, then the next ones on errors
+
+        Raises:
+            ProviderException: if no provider can be called, the error of the caller,
+                or the last provider error
+        """
+        api_keys = api_keys or {}
+        if any(not isinstance(keys, dict) for keys in api_keys.values()):
+            raise ProviderException(
+                "api_keys of a routed call are given by provider name, "
+                'eg: {"google": {...}, "amazon": {...}}',
+                code=400,
+            )
+        candidates = self.candidates(
+            feature,
+            subfeature,
+            phase,
+            providers=None if providers == AUTO_PROVIDER else providers,
+        )
+        error = None
+        attempts = 0
+        for provider in self.rank(candidates, feature, subfeature):
+            if attempts == self.max_attempts:
+                break
+            # checked lazily, most calls don't go past the first provider
+            if not self._accepts(provider, feature, subfeature, phase, args):
+                continue
+            attempts += 1
+            start = time.perf_counter()
+            try:
+                result = compute_func(
+                    provider,
+                    feature,
+                    subfeature,
+                    args,
+                    phase=phase,
+                    api_keys=api_keys.get(provider, {}),
+                    **kwargs,
+                )
+            except (ProviderException, requests.RequestException) as exc:
+                if is_caller_error(exc):
+                    raise
+                self.stats.record(
+                    provider, feature, subfeature, time.perf_counter() - start, True
+                )
+                error = exc
+                continue
+            self.stats.record(
+                provider, feature, subfeature, time.perf_counter() - start
+            )
+            return result
+        if error is None:
+            raise ProviderException(
+                f"No provider available for {feature} {subfeature} "
+                "with these arguments",
+                code=400,
+            )
+        raise error
+
+
+_router = Router()
+
+
+def get_router() -> Router:
+    """Router of `compute_output("auto", ...)`"""
+    return _router
+
+
+def set_router(router: Router) -> None:
+    global _router
+    _router = router
+
+
+def route_call(compute_func: Callable) -> Callable:
+    """decorator for compute output functions, routes the calls with `AUTO_PROVIDER` or
+    a list of providers as provider name"""
+    signature = inspect.signature(compute_func)
+
+    @wraps(compute_func)
+    def wrapper(provider_name, *args, **kwargs):
+        if isinstance(provider_name, str) and provider_name != AUTO_PROVIDER:
+            return compute_func(provider_name, *args, **kwargs)
+        arguments = signature.bind(provider_name, *args, **kwargs).arguments
+        arguments.pop("provider_name")
+        return get_router().call(compute_func, provider_name, **arguments)
+
+    return wrapper
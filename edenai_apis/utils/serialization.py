@@ -0,0 +1,118 @@
+"""
+Helpers used by `compute_output` & `get_async_job_result` to turn the value returned
+by a provider subfeature method into the final response.
+
+Providers usually return fully validated pydantic models (`ResponseType[...]`).
+For big outputs (ocr words, speech to text diarization, embeddings...), building
+and validating every nested model is expensive, so providers can instead return:
+    - models built with `model_construct` (no validation)
+    - already standardized plain dicts
+    (eg: `{"original_response": ..., "standardized_response": {...}}`)
+
+These outputs are only validated when the `VALIDATE_OUTPUT` environment variable is set
+(in tests or debug mode).
+
+For now, only the compact embeddings (`text__embeddings` with `output_options`) are
+built with `model_construct`, other providers outputs are validated models.
+"""
+import os
+from typing import Any, Dict, Optional, Type, Union
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from edenai_apis.loaders.data_loader import FeatureDataEnum
+from edenai_apis.loaders.loaders import load_feature
+from edenai_apis.utils.types import (
+    AsyncErrorResponseType,
+    AsyncLaunchJobResponseType,
+    AsyncPendingResponseType,
+    AsyncResponseType,
+    ResponseType,
+)
+
+VALIDATE_OUTPUT = os.environ.get("VALIDATE_OUTPUT") is not None
+
+ProviderResult = Union[BaseModel, Dict[str, Any]]
+
+
+def get_response_model(
+    feature: str,
+    subfeature: str,
+    phase: str = "",
+    is_async_launch: bool = False,
+    async_status: Optional[str] = None,
+) -> Optional[Type[BaseModel]]:
+    """Return the pydantic model a subfeature output should conform to
+
+    Args:
+        feature (str): EdenAI feature name
+        subfeature (str): EdenAI subfeature name
+        phase (str, optional): EdenAI phase name. Defaults to "".
+        is_async_launch (bool, optional): output of an async `launch_job`. Defaults to False.
+        async_status (str, optional): status of an async job result. Defaults to None.
+
+    Returns:
+        BaseModel | None: response model, None if the subfeature has no dataclass
+    """
+    if is_async_launch:
+        return AsyncLaunchJobResponseType
+    if async_status == "pending":
+        return AsyncPendingResponseType
+    if async_status == "failed":
+        return AsyncErrorResponseType
+
+    try:
+        dataclass = load_feature(
+            FeatureDataEnum.DATA_CLASS,
+            feature=feature,
+            subfeature=subfeature,
+            phase=phase,
+        )
+    except (ModuleNotFoundError, AttributeError):
+        return None
+
+    if async_status is not None:
+        return AsyncResponseType[dataclass]
+    return ResponseType[dataclass]
+
+
+def validate_response(
+    result: ProviderResult, response_model: Optional[Type[BaseModel]] = None
+) -> ProviderResult:
+    """Validate a provider result that may have been built without validation
+
+    Models are validated against their own class (this also validates nested models
+    created with `model_construct`), dicts against the given `response_model`.
+
+    Raises:
+        pydantic.ValidationError: if the result is not well standardized
+    """
+    if isinstance(result, BaseModel):
+        return type(result).model_validate(result.model_dump())
+    if response_model is None:
+        return result
+    return response_model.model_validate(result)
+
+
+def response_fields(result: ProviderResult) -> Dict[str, Any]:
+    """Shallow mapping of the result fields, nested models are not dumped"""
+    if isinstance(result, BaseModel):
+        return {field: getattr(result, field) for field in result.model_fields}
+    return result
+
+
+def dump_response(result: ProviderResult) -> Dict[str, Any]:
+    """Dump a provider result to a python dict (same output as `model_dump`)"""
+    if isinstance(result, BaseModel):
+        return result.model_dump()
+    return {
+        key: value.model_dump() if isinstance(value, BaseModel) else value
+        for key, value in result.items()
+    }
+
+
+def serialize_response(result: Dict[str, Any]) -> bytes:
+    """Serialize a response straight to json bytes, nested models included,
+    without building intermediate dicts"""
+    return to_json(result)
@@ -0,0 +1,255 @@
+"""
+Analyze long texts in concurrent chunks
+
+Providers limit the size of the text of a request, in characters or in UTF-8 bytes
+(`max_characters` or `max_bytes` constraint of the subfeature in their `info.json`),
+longer texts fail or are truncated. This module:
+
+    - splits the text at sentence boundaries (then spaces, then characters) under the
+      provider limit, each chunk keeps its offset in the text
+    - analyzes the chunks concurrently
+    - merges the chunks results: entities offsets are moved back to the whole text
+      (`anonymization`, `entity_sentiment`), the anonymized chunks are put back in the
+      text, entities and keywords found in several chunks are deduplicated (keeping the
+      best score), sentiment segments are kept (a segment per chunk if the provider
+      doesn't return any) and the general sentiment is the one of most of the text
+
+The `original_response` of a merged result is the list of the chunks original responses.
+
+Example:
+    >>> analyze_long_text("amazon", "text", "sentiment_analysis", args, call)
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from edenai_apis.loaders.data_loader import ProviderDataEnum
+from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.utils.types import ResponseType
+
+MAX_WORKERS = 4
+
+# end of a sentence, with its closing quotes or brackets and the following spaces
+_SENTENCE_END_REGEX = re.compile(r"[.!?…]+[\"'”’»)\]]*\s+|[。！？]+\s*|\n\s*")
+_SPACES_REGEX = re.compile(r"\s+")
+
+# text offset, text & standardized response (dict) of each chunk
+ChunkResults = List[Tuple[int, str, Dict[str, Any]]]
+Span = Tuple[int, int]
+
+
+def utf8_size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def _max_end(text: str, start: int, limit: int, size: Callable[[str], int]) -> int:
+    """Largest end of a chunk starting at `start` under `limit` (at least a character)"""
+    # a character is at least a size unit
+    high = min(start + limit, len(text))
+    if size is len or size(text[start:high]) <= limit:
+        return max(high, start + 1)
+    low = start + 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        if size(text[start:middle]) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _last_cut(text: str, start: int, end: int) -> int:
+    """Last sentence end (or else space) in the chunk, its end if there is none"""
+    for regex in (_SENTENCE_END_REGEX, _SPACES_REGEX):
+        cut = None
+        for match in regex.finditer(text, start, end):
+            if match.end() > start:
+                cut = match.end()
+        if cut is not None and cut > start:
+            return cut
+    return end
+
+
+def split_text_spans(
+    text: str, limit: int, size: Callable[[str], int] = len
+) -> List[Span]:
+    """(start, end) of chunks of `text` under `limit`, measured with `size`, cut at
+    sentence boundaries if possible. Whitespace only chunks are skipped."""
+    spans = []
+    start = 0
+    while start < len(text):
+        end = _max_end(text, start, limit, size)
+        if end < len(text):
+            end = _last_cut(text, start, end)
+        if text[start:end].strip():
+            spans.append((start, end))
+        start = end
+    return spans
+
+
+def provider_text_limit(
+    provider_name: str, feature: str, subfeature: str
+) -> Optional[Tuple[int, Callable[[str], int]]]:
+    """Size limit of the texts of a provider subfeature and the function measuring it,
+    `None` if the provider doesn't declare one"""
+    try:
+        provider_info = load_provider(
+            ProviderDataEnum.PROVIDER_INFO,
+            provider_name=provider_name,
+            feature=feature,
+            subfeature=subfeature,
+        )
+    except Exception:
+        return None
+    constraints = provider_info.get("constraints") or {}
+    if constraints.get("max_bytes"):
+        return constraints["max_bytes"], utf8_size
+    if constraints.get("max_characters"):
+        return constraints["max_characters"], len
+    return None
+
+
+def _as_dict(value: Any) -> Any:
+    return value.model_dump() if isinstance(value, BaseModel) else value
+
+
+def _best_by(items: List[Dict], key: Callable[[Dict], Any], score: str) -> List[Dict]:
+    """Items deduplicated by `key`, in order of first occurrence, with the best score"""
+    best: Dict[Any, Dict] = {}
+    for item in items:
+        item_key = key(item)
+        kept = best.get(item_key)
+        if kept is None or (item.get(score) or 0) > (kept.get(score) or 0):
+            best[item_key] = {**item} if kept is None else {**kept, score: item[score]}
+    return list(best.values())
+
+
+def merge_named_entity_recognition(text: str, chunks: ChunkResults) -> Dict:
+    items = [item for _, _, result in chunks for item in result.get("items") or []]
+    return {
+        "items": _best_by(
+            items, lambda item: (item["entity"], item.get("category")), "importance"
+        )
+    }
+
+
+def merge_keyword_extraction(text: str, chunks: ChunkResults) -> Dict:
+    items = [item for _, _, result in chunks for item in result.get("items") or []]
+    return {
+        "items": _best_by(items, lambda item: item["keyword"].casefold(), "importance")
+    }
+
+
+def merge_entity_sentiment(text: str, chunks: ChunkResults) -> Dict:
+    items = []
+    for offset, _, result in chunks:
+        for item in result.get("items") or []:
+            item = {**item}
+            for key in ("begin_offset", "end_offset"):
+                if item.get(key) is not None:
+                    item[key] += offset
+            items.append(item)
+    return {"items": items}
+
+
+def merge_anonymization(text: str, chunks: ChunkResults) -> Dict:
+    parts = []
+    entities = []
+    position = 0
+    for offset, chunk, result in chunks:
+        parts.append(text[position:offset])
+        parts.append(result["result"])
+        position = offset + len(chunk)
+        entities += [
+            {**entity, "offset": entity["offset"] + offset}
+            for entity in result.get("entities") or []
+        ]
+    parts.append(text[position:])
+    return {"result": "".join(parts), "entities": entities}
+
+
+def merge_sentiment_analysis(text: str, chunks: ChunkResults) -> Dict:
+    items = []
+    # chunks size by sentiment, and their rates weighted by size
+    sizes: Dict[str, int] = {}
+    rates: Dict[str, List[Tuple[float, int]]] = {}
+    for _, chunk, result in chunks:
+        sentiment = result["general_sentiment"].title()
+        rate = result.get("general_sentiment_rate")
+        sizes[sentiment] = sizes.get(sentiment, 0) + len(chunk)
+        if rate is not None:
+            rates.setdefault(sentiment, []).append((rate, len(chunk)))
+        items += result.get("items") or [
+            {"segment": chunk.strip(), "sentiment": sentiment, "sentiment_rate": rate}
+        ]
+    general_sentiment = max(sizes, key=sizes.get)
+    general_rates = rates.get(general_sentiment)
+    general_sentiment_rate = (
+        sum(rate * size for rate, size in general_rates)
+        / sum(size for _, size in general_rates)
+        if general_rates
+        else None
+    )
+    return {
+        "general_sentiment": general_sentiment,
+        "general_sentiment_rate": general_sentiment_rate,
+        "items": items,
+    }
+
+
+MERGERS: Dict[Tuple[str, str], Callable[[str, ChunkResults], Dict]] = {
+    ("text", "anonymization"): merge_anonymization,
+    ("text", "entity_sentiment"): merge_entity_sentiment,
+    ("text", "keyword_extraction"): merge_keyword_extraction,
+    ("text", "named_entity_recognition"): merge_named_entity_recognition,
+    ("text", "sentiment_analysis"): merge_sentiment_analysis,
+}
+
+
+def analyze_long_text(
+    provider_name: str,
+    feature: str,
+    subfeature: str,
+    args: Dict,
+    call: Callable[[Dict], ResponseType],
+    max_workers: int = MAX_WORKERS,
+) -> ResponseType:
+    """Call a text subfeature on chunks of `args["text"]` under the provider limit and
+    merge their results, a single call if the text is under the limit
+
+    Args:
+        provider_name (str): provider name
+        feature (str): feature name, with `subfeature` a key of `MERGERS`
+        subfeature (str): subfeature name
+        args (dict): validated arguments of the subfeature
+        call (Callable): calls the provider subfeature with the given arguments
+        max_workers (int, optional): number of chunks analyzed at the same time
+    """
+    text = args["text"]
+    limit = provider_text_limit(provider_name, feature, subfeature)
+    if limit is None or limit[1](text) <= limit[0]:
+        return call(args)
+    spans = split_text_spans(text, *limit)
+    if not spans:
+        # only whitespace, nothing to split: the provider handles it as usual
+        return call(args)
+
+    def analyze(span: Span) -> ResponseType:
+        return call({**args, "text": text[span[0] : span[1]]})
+
+    # chunks calls keep the context of the caller (tracing, deferred uploads...)
+    context = copy_context()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(spans))) as executor:
+        futures = [executor.submit(context.copy().run, analyze, span) for span in spans]
+        results = [future.result() for future in futures]
+    chunks = [
+        (start, text[start:end], _as_dict(result.standardized_response))
+        for (start, end), result in zip(spans, results)
+    ]
+    return ResponseType(
+        original_response=[result.original_response for result in results],
+        standardized_response=MERGERS[(feature, subfeature)](text, chunks),
+    )
@@ -0,0 +1,307 @@
+"""
+Synthesize long texts in concurrent chunks
+
+Providers limit the number of characters of a text to speech request (`max_characters`
+constraint of their `info.json`), and long texts sent in one call either fail or take
+long before any audio is returned. This module:
+
+    - splits the text at sentence boundaries (then words) under the provider limit. For
+      SSML texts, each chunk keeps the `<speak>` tag and the tags open at the cut are
+      closed at the end of the chunk and re-opened at the start of the next one
+    - synthesizes the chunks concurrently with the provider `_text_to_speech_chunks`
+    - yields the audio of each chunk in order, as soon as it's ready, so the playback
+      can start with the first one (`iter_text_to_speech_segments`)
+    - concatenates the chunks audio into one file (`long_text_to_speech`)
+
+Example:
+    >>> for extension, audio in iter_text_to_speech_segments("google", args):
+    ...     player.play(audio)  # each segment is a complete audio file
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from edenai_apis.features.audio.text_to_speech.text_to_speech_dataclass import (
+    TextToSpeechDataClass,
+)
+from edenai_apis.loaders.data_loader import ProviderDataEnum
+from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.utils.audio import concatenate_audios
+from edenai_apis.utils.audio_conversion import FFMPEG_FORMATS
+from edenai_apis.utils.constraints import validate_all_provider_constraints
+from edenai_apis.utils.exception import ProviderException
+from edenai_apis.utils.ssml import (
+    get_index_after_first_speak_tag,
+    get_index_before_last_speak_tag,
+)
+from edenai_apis.utils.tts_streaming import (
+    provider_text_to_speech_chunks,
+    text_to_speech_response,
+)
+from edenai_apis.utils.types import ResponseType
+
+# limit of providers without `max_characters` constraint
+DEFAULT_MAX_CHARACTERS = 3000
+MAX_WORKERS = 4
+
+SENTENCE_END = ".!?…。！？"
+# words with their trailing spaces, CJK sentences end without space
+_WORDS_REGEX = re.compile(r"[^\s。！？]+[。！？]*\s*|[。！？]+\s*|\s+")
+_TAG_REGEX = re.compile(r"<[^>]*>")
+_TAG_NAME_REGEX = re.compile(r"<\s*(/)?\s*([\w:.-]+)[^>]*?(/)?\s*>$")
+
+# cut priorities, after a piece of text
+_NO_CUT = 0
+_WORD_CUT = 1
+_SENTENCE_CUT = 2
+
+
+class _Piece(NamedTuple):
+    text: str
+    cut: int
+    tag: bool = False
+    opened: Optional[str] = None
+    closed: Optional[str] = None
+
+
+def _tag_piece(tag: str) -> _Piece:
+    match = _TAG_NAME_REGEX.match(tag)
+    if match is None or match.group(3):
+        # self closing tag (eg: <break/>) or comment
+        return _Piece(tag, _WORD_CUT, tag=True)
+    if match.group(1):
+        # closing tags of paragraphs & sentences end a sentence
+        cut = _SENTENCE_CUT if match.group(2) in ("p", "s") else _WORD_CUT
+        return _Piece(tag, cut, tag=True, closed=match.group(2))
+    return _Piece(tag, _NO_CUT, tag=True, opened=match.group(2))
+
+
+def _text_pieces(text: str) -> List[_Piece]:
+    pieces = []
+    for word in _WORDS_REGEX.findall(text):
+        stripped = word.rstrip()
+        if (
+            stripped
+            and stripped[-1] in SENTENCE_END
+            and (word[-1].isspace() or word[-1] in "。！？")
+        ):
+            cut = _SENTENCE_CUT
+        elif word[-1].isspace():
+            cut = _WORD_CUT
+        else:
+            cut = _NO_CUT
+        pieces.append(_Piece(word, cut))
+    if pieces and pieces[-1].cut == _NO_CUT and text[-1] in SENTENCE_END:
+        pieces[-1] = pieces[-1]._replace(cut=_SENTENCE_CUT)
+    return pieces
+
+
+def _pieces(body: str, ssml: bool) -> List[_Piece]:
+    if not ssml:
+        return _text_pieces(body)
+    pieces = []
+    position = 0
+    for tag in _TAG_REGEX.finditer(body):
+        pieces += _text_pieces(body[position : tag.start()])
+        pieces.append(_tag_piece(tag.group(0)))
+        position = tag.end()
+    return pieces + _text_pieces(body[position:])
+
+
+def _update_stack(stack: Tuple, piece: _Piece) -> Tuple:
+    if piece.opened:
+        return stack + ((piece.opened, piece.text),)
+    if piece.closed:
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index][0] == piece.closed:
+                return stack[:index]
+    return stack
+
+
+def split_text(text: str, max_characters: int) -> List[str]:
+    """Split a text (or SSML) under `max_characters`, at sentence boundaries if possible
+
+    Sentences longer than the limit are split between words, then words between
+    characters. SSML chunks are complete documents: the `<speak>` tag is repeated and
+    the tags open at a cut are re-opened in the next chunk.
+
+    Raises:
+        ProviderException: if the SSML tags alone exceed `max_characters`
+    """
+    if len(text) <= max_characters:
+        return [text]
+
+    start_index = get_index_after_first_speak_tag(text)
+    end_index = get_index_before_last_speak_tag(text)
+    ssml = start_index != -1 and end_index != -1
+    if ssml:
+        opening, body, closing = (
+            text[:start_index],
+            text[start_index:end_index],
+            text[end_index:],
+        )
+    else:
+        opening, body, closing = "", text, ""
+    pieces = _pieces(body, ssml)
+
+    def overhead(start_stack: Tuple, end_stack: Tuple) -> int:
+        return (
+            len(opening)
+            + len(closing)
+            + sum(len(tag) for _, tag in start_stack)
+            + sum(len(name) + 3 for name, _ in end_stack)
+        )
+
+    def render(
+        start_stack: Tuple, chunk_pieces: List[_Piece], end_stack: Tuple
+    ) -> None:
+        if not any(piece.text.strip() for piece in chunk_pieces if not piece.tag):
+            return
+        chunks.append(
+            opening
+            + "".join(tag for _, tag in start_stack)
+            + "".join(piece.text for piece in chunk_pieces)
+            + "".join(f"</{name}>" for name, _ in reversed(end_stack))
+            + closing
+        )
+
+    chunks: List[str] = []
+    index = start = length = 0
+    start_stack: Tuple = ()
+    stack: Tuple = ()
+    # last cut of each priority in the current chunk: (pieces index, open tags)
+    cuts: Dict[int, Tuple[int, Tuple]] = {}
+    while index < len(pieces):
+        piece = pieces[index]
+        next_stack = _update_stack(stack, piece)
+        size = overhead(start_stack, next_stack) + length + len(piece.text)
+        if size > max_characters and index > start:
+            cut, cut_stack = (
+                cuts.get(_SENTENCE_CUT) or cuts.get(_WORD_CUT) or (index, stack)
+            )
+            render(start_stack, pieces[start:cut], cut_stack)
+            index = start = cut
+            start_stack = stack = cut_stack
+            length = 0
+            cuts = {}
+            continue
+        if size > max_characters:
+            available = max_characters - overhead(start_stack, next_stack)
+            if piece.opened or piece.closed or available <= 0:
+                raise ProviderException(
+                    f"Text can't be split in chunks of {max_characters} characters"
+                )
+            pieces[index : index + 1] = [
+                _Piece(piece.text[:available], _WORD_CUT),
+                _Piece(piece.text[available:], piece.cut),
+            ]
+            continue
+        length += len(piece.text)
+        stack = next_stack
+        index += 1
+        if piece.closed:
+            # cut after the closing tags rather than before, not to re-open them
+            for cut, (cut_index, _) in list(cuts.items()):
+                if cut_index == index - 1:
+                    cuts[cut] = (index, stack)
+        if piece.cut:
+            cuts[piece.cut] = (index, stack)
+    render(start_stack, pieces[start:], stack)
+    return chunks
+
+
+def provider_max_characters(provider_name: str) -> int:
+    """Maximum number of characters of a text to speech request of the provider"""
+    try:
+        provider_info = load_provider(
+            ProviderDataEnum.PROVIDER_INFO,
+            provider_name=provider_name,
+            feature="audio",
+            subfeature="text_to_speech",
+        )
+    except Exception:
+        return DEFAULT_MAX_CHARACTERS
+    constraints = provider_info.get("constraints") or {}
+    return constraints.get("max_characters") or DEFAULT_MAX_CHARACTERS
+
+
+def iter_text_to_speech_segments(
+    provider_name: str,
+    args: Dict,
+    api_keys: Dict = {},
+    max_characters: Optional[int] = None,
+    max_workers: int = MAX_WORKERS,
+    call: Optional[Callable[[Callable[[], Any]], Any]] = None,
+) -> Iterator[Tuple[str, bytes]]:
+    """Synthesize a long text in concurrent chunks, yielded in order as they're ready
+
+    Args:
+        provider_name (str): provider implementing `_text_to_speech_chunks`
+        args (dict): `text_to_speech` arguments, same as `compute_output`
+        api_keys (dict, optional): user's api keys for the provider
+        max_characters (int, optional): chunks size, the provider limit if `None`
+        max_workers (int, optional): number of chunks synthesized at the same time
+        call (Callable, optional): makes each chunk provider call, given the function
+            calling the provider (eg: to wait for rate limits or retry errors)
+
+    Yields:
+        Tuple[str, bytes]: extension and audio file of each chunk
+
+    Raises:
+        ProviderException: if the provider doesn't support streaming or a chunk fails
+    """
+    validated_args = validate_all_provider_constraints(
+        provider_name, "audio", "text_to_speech", "", args
+    )
+    text_to_speech_chunks = provider_text_to_speech_chunks(provider_name, api_keys)
+    texts = split_text(
+        validated_args["text"], max_characters or provider_max_characters(provider_name)
+    )
+
+    def synthesize_chunk(text: str) -> Tuple[str, bytes]:
+        extension, audio = text_to_speech_chunks(**{**validated_args, "text": text})
+        return extension, audio if isinstance(audio, bytes) else b"".join(audio)
+
+    def synthesize(text: str) -> Tuple[str, bytes]:
+        if call is None:
+            return synthesize_chunk(text)
+        return call(lambda: synthesize_chunk(text))
+
+    # chunks calls keep the context of the caller (tracing, deferred uploads...)
+    context = copy_context()
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(texts)))
+    segments = []
+    try:
+        segments = [
+            executor.submit(context.copy().run, synthesize, text) for text in texts
+        ]
+        for segment in segments:
+            yield segment.result()
+    finally:
+        # stopped early or failed: don't synthesize the remaining chunks
+        for segment in segments:
+            segment.cancel()
+        executor.shutdown(wait=False)
+
+
+def long_text_to_speech(
+    provider_name: str,
+    args: Dict,
+    api_keys: Dict = {},
+    max_characters: Optional[int] = None,
+    max_workers: int = MAX_WORKERS,
+    call: Optional[Callable[[Callable[[], Any]], Any]] = None,
+) -> ResponseType[TextToSpeechDataClass]:
+    """`audio__text_to_speech` of a long text, synthesized in concurrent chunks
+
+    See `iter_text_to_speech_segments`, the chunks audio are concatenated into one file.
+    """
+    extensions, audios = zip(
+        *iter_text_to_speech_segments(
+            provider_name, args, api_keys, max_characters, max_workers, call
+        )
+    )
+    extension = extensions[0]
+    audio = concatenate_audios(list(audios), FFMPEG_FORMATS.get(extension, extension))
+    return text_to_speech_response(audio, extension)
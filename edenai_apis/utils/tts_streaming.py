@@ -0,0 +1,242 @@
+"""
+Stream text to speech audio instead of buffering and base64 encoding it
+
+`audio__text_to_speech` returns the whole audio base64 encoded, after uploading it to
+s3: the caller waits for the synthesis and the upload, and the audio is held several
+times in memory (raw bytes, copies, base64). Providers implement `_text_to_speech_chunks`,
+returning the audio file extension and an iterator of audio chunks (or the whole audio
+as bytes for SDKs without streaming), and `text_to_speech_stream` wraps them in a
+`TextToSpeechStream`:
+
+    - chunks are yielded as the provider sends them
+    - chunks are spooled (in memory, then on disk) and uploaded to s3 in the background
+      once the audio is complete, the base64 audio is only built on demand
+
+Example:
+    >>> with text_to_speech_stream("amazon", args) as stream:
+    ...     for chunk in stream:
+    ...         player.write(chunk)
+    ...     url = stream.wait_upload()
+"""
+import base64
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from edenai_apis.features.audio.text_to_speech.text_to_speech_dataclass import (
+    TextToSpeechDataClass,
+)
+from edenai_apis.loaders.data_loader import ProviderDataEnum
+from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.utils.constraints import validate_all_provider_constraints
+from edenai_apis.utils.exception import ProviderException, get_appropriate_error
+from edenai_apis.utils.types import ResponseType
+from edenai_apis.utils.upload_s3 import (
+    USER_PROCESS,
+    upload_file_bytes_to_s3_in_background,
+    uploads_deferred,
+)
+
+AUDIO_CHUNK_SIZE = 64 * 1024
+# audio kept in memory up to this size, then written to a temporary file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def iter_audio_chunks(
+    audio: bytes, chunk_size: int = AUDIO_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Chunks of audio received at once (SDKs without streaming), without copies"""
+    view = memoryview(audio)
+    for start in range(0, len(view), chunk_size):
+        yield view[start : start + chunk_size]
+
+
+def text_to_speech_response(
+    audio: Union[bytes, Iterable[bytes]],
+    extension: str,
+    original_response: Any = {},
+    voice_type: int = 1,
+) -> ResponseType[TextToSpeechDataClass]:
+    """Standard `audio__text_to_speech` response, the audio is uploaded to s3 while it's
+    base64 encoded (unless uploads are deferred, see `upload_s3.deferred_uploads`), the
+    response is returned once the upload is done"""
+    if not isinstance(audio, bytes):
+        audio = b"".join(audio)
+    if uploads_deferred():
+        return ResponseType[TextToSpeechDataClass](
+            original_response=original_response,
+            standardized_response=TextToSpeechDataClass(
+                audio=base64.b64encode(audio).decode("utf-8"),
+                voice_type=voice_type,
+                audio_resource_url="",
+            ),
+        )
+    # the upload runs on its own thread, it doesn't wait for the background uploads of
+    # other calls. BytesIO shares the bytes buffer until written, the audio isn't copied
+    with ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="edenai_s3_upload"
+    ) as executor:
+        resource_url, upload = upload_file_bytes_to_s3_in_background(
+            BytesIO(audio), f".{extension}", USER_PROCESS, executor
+        )
+        encoded_audio = base64.b64encode(audio).decode("utf-8")
+        upload.result()
+
+    return ResponseType[TextToSpeechDataClass](
+        original_response=original_response,
+        standardized_response=TextToSpeechDataClass(
+            audio=encoded_audio,
+            voice_type=voice_type,
+            audio_resource_url=resource_url,
+        ),
+    )
+
+
+class TextToSpeechStream:
+    """Audio of a text to speech call, iterated by chunks as the provider sends them
+
+    Once all the chunks are read, the audio is uploaded to s3 in the background:
+    `audio_resource_url` is then set, `wait_upload` waits for the upload to complete.
+
+    Args:
+        chunks (Iterable[bytes] | bytes): audio chunks, from the provider, or the whole audio
+        extension (str): audio file extension, eg: "mp3"
+        upload (bool, optional): upload the audio to s3. Defaults to True.
+        voice_type (int, optional): `TextToSpeechDataClass.voice_type`. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        chunks: Union[bytes, Iterable[bytes]],
+        extension: str,
+        upload: bool = True,
+        voice_type: int = 1,
+    ) -> None:
+        if isinstance(chunks, (bytes, bytearray)):
+            chunks = iter_audio_chunks(chunks)
+        self.extension = extension
+        self.voice_type = voice_type
+        self.audio_resource_url: Optional[str] = None
+        self._chunks = iter(chunks)
+        self._upload_audio = upload
+        self._upload: Optional[Future] = None
+        self._audio = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self._complete = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self._complete:
+            raise ValueError("The audio stream was already read")
+        for chunk in self._chunks:
+            if chunk:
+                self._audio.write(chunk)
+                yield bytes(chunk)
+        if not self._complete:
+            self._on_complete()
+
+    def _on_complete(self) -> None:
+        self._complete = True
+        if self._upload_audio:
+            self._audio.seek(0)
+            self.audio_resource_url, self._upload = (
+                upload_file_bytes_to_s3_in_background(
+                    self._audio, f".{self.extension}", USER_PROCESS
+                )
+            )
+
+    def _read_remaining(self) -> None:
+        if not self._complete:
+            for _ in self:
+                pass
+
+    def wait_upload(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Read the remaining chunks, wait for the upload and return the audio url"""
+        self._read_remaining()
+        if self._upload is not None:
+            self._upload.result(timeout)
+        return self.audio_resource_url
+
+    def read(self) -> bytes:
+        """Whole audio, the remaining chunks are read first"""
+        self.wait_upload()
+        self._audio.seek(0)
+        return self._audio.read()
+
+    def response(
+        self, include_audio: bool = False
+    ) -> ResponseType[TextToSpeechDataClass]:
+        """`audio__text_to_speech` response, without the base64 audio by default
+
+        The remaining chunks are read and the upload awaited, so the url is valid.
+        """
+        self.wait_upload()
+        audio = base64.b64encode(self.read()).decode("utf-8") if include_audio else None
+        return ResponseType[TextToSpeechDataClass](
+            original_response={},
+            standardized_response=TextToSpeechDataClass(
+                audio=audio,
+                voice_type=self.voice_type,
+                audio_resource_url=self.audio_resource_url or "",
+            ),
+        )
+
+    def close(self) -> None:
+        """Release the spooled audio, once uploaded if an upload is running"""
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+        if self._upload is not None and not self._upload.done():
+            self._upload.add_done_callback(lambda _: self._audio.close())
+        else:
+            self._audio.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def provider_text_to_speech_chunks(
+    provider_name: str, api_keys: Dict = {}
+) -> Callable[..., Tuple[str, Union[bytes, Iterable[bytes]]]]:
+    """`_text_to_speech_chunks` method of the provider
+
+    Raises:
+        ProviderException: if the provider doesn't support streaming
+    """
+    provider = load_provider(ProviderDataEnum.CLASS, provider_name=provider_name)(
+        api_keys
+    )
+    text_to_speech_chunks = getattr(provider, "_text_to_speech_chunks", None)
+    if text_to_speech_chunks is None:
+        raise ProviderException(
+            f"Streaming text to speech is not available for {provider_name}"
+        )
+    return text_to_speech_chunks
+
+
+def text_to_speech_stream(
+    provider_name: str, args: Dict, api_keys: Dict = {}, upload: bool = True
+) -> TextToSpeechStream:
+    """Stream the audio of `audio__text_to_speech`
+
+    Args:
+        provider_name (str): provider implementing `_text_to_speech_chunks`
+        args (dict): `text_to_speech` arguments, same as `compute_output`
+        api_keys (dict, optional): user's api keys for the provider
+        upload (bool, optional): upload the audio to s3 once complete. Defaults to True.
+
+    Raises:
+        ProviderException: if the provider doesn't support streaming
+    """
+    validated_args = validate_all_provider_constraints(
+        provider_name, "audio", "text_to_speech", "", args
+    )
+    text_to_speech_chunks = provider_text_to_speech_chunks(provider_name, api_keys)
+
+    try:
+        extension, chunks = text_to_speech_chunks(**validated_args)
+    except ProviderException as exc:
+        raise get_appropriate_error(provider_name, exc)
+    return TextToSpeechStream(chunks, extension, upload=upload)
@@ -1,9 +1,14 @@
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
 from io import BufferedReader, BytesIO
 import json
+import threading
 from uuid import uuid4
 import os
 import datetime
-from typing import Callable, Tuple
+from typing import BinaryIO, Callable, Iterator, List, Optional, Sequence, Tuple
 import boto3
 from botocore.signers import CloudFrontSigner
 from cryptography.hazmat.backends import default_backend
@@ -12,6 +17,7 @@ from cryptography.hazmat.primitives.asymmetric import padding
 
 from edenai_apis.loaders.data_loader import ProviderDataEnum
 from edenai_apis.loaders.loaders import load_provider
+from edenai_apis.utils.instrumentation import traced
 from settings import base_path, keys_path
 
 BUCKET = ""
@@ -26,6 +32,21 @@ USER_PROCESS = "users_process"
 URL_SHORT_PERIOD = 3600
 URL_LONG_PERIOD = 3600 * 24 * 7
 
+# uploads running after the call returned (eg: streamed text to speech audio), shared
+# by the process
+BACKGROUND_UPLOADS_WORKERS = int(os.environ.get("S3_UPLOAD_WORKERS", 16))
+# concurrent uploads of the files of one result
+FILES_UPLOADS_WORKERS = 8
+
+_uploads_executor: Optional[ThreadPoolExecutor] = None
+_uploads_executor_lock = threading.Lock()
+
+# boto3 clients are thread safe, one is shared by all uploads
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+_deferred_uploads: ContextVar[bool] = ContextVar("deferred_uploads", default=False)
+
 
 def set_time_and_presigned_url_process(process_type: str) -> Tuple[Callable, int, str]:
     """Returns A tuple with the adequat function to call, the url expiration time and the bucket to which
@@ -44,30 +65,48 @@ def set_time_and_presigned_url_process(process_type: str) -> Tuple[Callable, int
         return get_cloud_front_file_url, URL_LONG_PERIOD, BUCKET_RESSOURCE
 
 
-def rsa_signer(message):
+@lru_cache(maxsize=1)
+def _cloudfront_private_key():
     with open(os.path.join(keys_path, "cloudfront_private_key.pem"), "rb") as key:
-        private_key = serialization.load_pem_private_key(
+        return serialization.load_pem_private_key(
             key.read(), password=None, backend=default_backend()
         )
+
+
+def rsa_signer(message):
+    # the key is read and parsed once
+    private_key = _cloudfront_private_key()
     return private_key.sign(message, padding.PKCS1v15(), hashes.SHA1())
 
 
+@lru_cache(maxsize=4)
+def _cloudfront_signer(key_id: str) -> CloudFrontSigner:
+    return CloudFrontSigner(key_id, rsa_signer)
+
+
 def s3_client_load():
-    api_settings = load_provider(ProviderDataEnum.KEY, "amazon")
-    aws_access_key_id = api_settings["aws_access_key_id"]
-    aws_secret_access_key = api_settings["aws_secret_access_key"]
-
-    global BUCKET, BUCKET_RESSOURCE, CLOUDFRONT_KEY_ID, REGION
-    BUCKET = api_settings["providers_resource_bucket"]
-    BUCKET_RESSOURCE = api_settings["users_resource_bucket"]
-    CLOUDFRONT_KEY_ID = api_settings["cloudfront_key_id"]
-    REGION = api_settings["ressource_region"]
-    return boto3.client(
-        "s3",
-        region_name=REGION,
-        aws_access_key_id=aws_access_key_id,
-        aws_secret_access_key=aws_secret_access_key,
-    )
+    """s3 client, created once and reused by all calls"""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is not None:
+            return _s3_client
+
+        api_settings = load_provider(ProviderDataEnum.KEY, "amazon")
+        aws_access_key_id = api_settings["aws_access_key_id"]
+        aws_secret_access_key = api_settings["aws_secret_access_key"]
+
+        global BUCKET, BUCKET_RESSOURCE, CLOUDFRONT_KEY_ID, REGION
+        BUCKET = api_settings["providers_resource_bucket"]
+        BUCKET_RESSOURCE = api_settings["users_resource_bucket"]
+        CLOUDFRONT_KEY_ID = api_settings["cloudfront_key_id"]
+        REGION = api_settings["ressource_region"]
+        _s3_client = boto3.client(
+            "s3",
+            region_name=REGION,
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+        )
+        return _s3_client
 
 
 def upload_file_to_s3(file_path: str, file_name: str, process_type=PROVIDER_PROCESS):
@@ -75,7 +114,8 @@ def upload_file_to_s3(file_path: str, file_name: str, process_type=PROVIDER_PROC
     filename = str(uuid4()) + "_" + str(file_name)
     s3_client = s3_client_load()
     func_call, process_time, bucket = set_time_and_presigned_url_process(process_type)
-    s3_client.upload_file(file_path, bucket, filename)
+    with traced("upload"):
+        s3_client.upload_file(file_path, bucket, filename)
     return func_call(filename, process_time)
 
 
@@ -86,12 +126,101 @@ def upload_file_bytes_to_s3(
     filename = str(uuid4()) + "_" + str(file_name)
     s3_client = s3_client_load()
     func_call, process_time, bucket = set_time_and_presigned_url_process(process_type)
-    s3_client.upload_fileobj(file, bucket, filename)
+    with traced("upload"):
+        s3_client.upload_fileobj(file, bucket, filename)
     return func_call(filename, process_time)
 
 
+def _background_uploads_executor() -> ThreadPoolExecutor:
+    global _uploads_executor
+    with _uploads_executor_lock:
+        if _uploads_executor is None:
+            _uploads_executor = ThreadPoolExecutor(
+                max_workers=BACKGROUND_UPLOADS_WORKERS,
+                thread_name_prefix="edenai_s3_upload",
+            )
+        return _uploads_executor
+
+
+def upload_file_bytes_to_s3_in_background(
+    file: BinaryIO,
+    file_name: str,
+    process_type=PROVIDER_PROCESS,
+    executor: Optional[Executor] = None,
+) -> Tuple[str, Future]:
+    """Start uploading a file object to s3, returns its url and the upload future
+
+    The url is signed while the file uploads, it's only valid once the returned future
+    completes (it raises if the upload failed). `file` must stay open until then.
+
+    Args:
+        executor (Executor, optional): runs the upload, defaults to the background
+            uploads executor shared by the process (`S3_UPLOAD_WORKERS` threads)
+    """
+    filename = str(uuid4()) + "_" + str(file_name)
+    s3_client = s3_client_load()
+    func_call, process_time, bucket = set_time_and_presigned_url_process(process_type)
+    upload = (executor or _background_uploads_executor()).submit(
+        s3_client.upload_fileobj, file, bucket, filename
+    )
+    return func_call(filename, process_time), upload
+
+
+@contextmanager
+def deferred_uploads(defer: bool = True) -> Iterator[None]:
+    """Skip the uploads of `upload_files_bytes_to_s3` (results assets) in this context
+
+    Results then keep their raw content only, with empty urls, the caller can upload
+    them later.
+    """
+    token = _deferred_uploads.set(defer)
+    try:
+        yield
+    finally:
+        _deferred_uploads.reset(token)
+
+
+def uploads_deferred() -> bool:
+    """Whether results uploads are deferred in the current context"""
+    return _deferred_uploads.get()
+
+
+def upload_files_bytes_to_s3(
+    files: Sequence[Tuple[bytes, str]], process_type=PROVIDER_PROCESS
+) -> List[str]:
+    """Upload several files concurrently, eg: the images generated by one call
+
+    Urls are signed while the files are uploading, they're returned once all the
+    uploads are done. The uploads run on their own threads, they don't wait for the
+    background uploads of other calls. Urls are empty if uploads are deferred (see
+    `deferred_uploads`).
+
+    Args:
+        files (Sequence[Tuple[bytes, str]]): content and name (or extension) of each file
+        process_type (str): `PROVIDER_PROCESS` or `USER_PROCESS`
+
+    Returns:
+        List[str]: url of each file, in the same order
+    """
+    if uploads_deferred() or not files:
+        return ["" for _ in files]
+    with traced("upload"), ThreadPoolExecutor(
+        max_workers=min(FILES_UPLOADS_WORKERS, len(files)),
+        thread_name_prefix="edenai_s3_upload",
+    ) as executor:
+        uploads = [
+            upload_file_bytes_to_s3_in_background(
+                BytesIO(content), file_name, process_type, executor
+            )
+            for content, file_name in files
+        ]
+        for _, upload in uploads:
+            upload.result()
+    return [url for url, _ in uploads]
+
+
 def get_cloud_front_file_url(filename: str, process_time: int):
-    cloudfront_signer = CloudFrontSigner(CLOUDFRONT_KEY_ID, rsa_signer)
+    cloudfront_signer = _cloudfront_signer(CLOUDFRONT_KEY_ID)
 
     signed_url = cloudfront_signer.generate_presigned_url(
         f"{CLOUDFRONT_URL}{filename}",
@@ -0,0 +1,293 @@
+"""
+Local vector indexes used to run similarity search on embeddings without calling a provider.
+
+Two backends are available:
+    - `VectorIndex`: flat index, exact brute force top-k with numpy
+    - `IVFVectorIndex`: approximate inverted file index, vectors are clustered with k-means
+      and only the `n_probe` closest clusters are searched
+
+Indexes are persisted to a directory (`vectors.npy` & `index.json`) and vectors are
+memory-mapped when loaded, so big indexes are not read in memory until searched.
+"""
+import json
+import os
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+IndexId = Union[int, str]
+Metric = Literal["cosine", "dot"]
+
+VECTORS_FILE = "vectors.npy"
+INDEX_FILE = "index.json"
+
+
+class VectorIndex:
+    """Flat (brute force) vector index
+
+    Args:
+        dimensions (int): size of the indexed vectors
+        metric (str, optional): `cosine` (vectors are normalized when added) or `dot`.
+            Defaults to "cosine".
+    """
+
+    kind = "flat"
+
+    def __init__(self, dimensions: int, metric: Metric = "cosine") -> None:
+        self.dimensions = dimensions
+        self.metric = metric
+        self.vectors = np.empty((0, dimensions), dtype=np.float32)
+        self.ids: List[IndexId] = []
+        self.metadata: Dict[IndexId, Dict[str, Any]] = {}
+        self._positions: Dict[IndexId, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, vector_id: IndexId) -> bool:
+        return vector_id in self._positions
+
+    def _prepare(
+        self, vectors: Union[np.ndarray, Sequence[Sequence[float]]]
+    ) -> np.ndarray:
+        array = np.asarray(vectors, dtype=np.float32)
+        if array.ndim == 1:
+            array = array.reshape(1, -1)
+        if array.shape[1] != self.dimensions:
+            raise ValueError(
+                f"Expected vectors of dimension {self.dimensions}, got {array.shape[1]}"
+            )
+        if self.metric == "cosine":
+            norms = np.linalg.norm(array, axis=1, keepdims=True)
+            array = array / np.where(norms == 0, 1, norms)
+        return array
+
+    def add(
+        self,
+        ids: Sequence[IndexId],
+        vectors: Union[np.ndarray, Sequence[Sequence[float]]],
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """Add vectors to the index, vectors of already indexed ids are replaced"""
+        array = self._prepare(vectors)
+        if len(ids) != len(array):
+            raise ValueError("ids and vectors must have the same length")
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids must be unique")
+
+        self.delete([vector_id for vector_id in ids if vector_id in self._positions])
+        start = len(self.ids)
+        self.vectors = np.concatenate([self.vectors, array])
+        self.ids.extend(ids)
+        for position, vector_id in enumerate(ids, start):
+            self._positions[vector_id] = position
+        if metadata is not None:
+            self.metadata.update(zip(ids, metadata))
+        self._on_add(array)
+
+    def delete(self, ids: Sequence[IndexId]) -> None:
+        """Delete vectors from the index, unknown ids are ignored"""
+        positions = [
+            self._positions[vector_id] for vector_id in ids if vector_id in self
+        ]
+        if not positions:
+            return
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[positions] = False
+        self.vectors = self.vectors[keep]
+        self.ids = [vector_id for vector_id, kept in zip(self.ids, keep) if kept]
+        self._positions = {
+            vector_id: position for position, vector_id in enumerate(self.ids)
+        }
+        for vector_id in ids:
+            self.metadata.pop(vector_id, None)
+        self._on_delete(keep)
+
+    def _candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Positions of the vectors to score for a query, `None` means all vectors"""
+        return None
+
+    def search(
+        self, query: Union[np.ndarray, Sequence[float]], top_k: Optional[int] = None
+    ) -> List[Tuple[IndexId, float]]:
+        """Return the `top_k` closest (id, score) pairs, best score first
+
+        Args:
+            query (array): query vector
+            top_k (int, optional): number of results, all vectors if `None`. Defaults to None.
+        """
+        if not self.ids:
+            return []
+        query_vector = self._prepare(query)[0]
+        candidates = self._candidates(query_vector)
+        vectors = self.vectors if candidates is None else self.vectors[candidates]
+        scores = vectors @ query_vector
+
+        top_k = len(scores) if top_k is None else min(top_k, len(scores))
+        if top_k < len(scores):
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        positions = best if candidates is None else candidates[best]
+        return [
+            (self.ids[position], float(score))
+            for position, score in zip(positions, scores[best])
+        ]
+
+    def _on_add(self, vectors: np.ndarray) -> None:
+        pass
+
+    def _on_delete(self, keep: np.ndarray) -> None:
+        pass
+
+    def _state(self) -> Dict[str, Any]:
+        return {}
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        pass
+
+    def save(self, path: str) -> None:
+        """Persist the index to the `path` directory"""
+        os.makedirs(path, exist_ok=True)
+        # write to temporary files then replace, the previous files can still be
+        # memory-mapped by a loaded index
+        vectors_path = os.path.join(path, VECTORS_FILE)
+        with open(f"{vectors_path}.tmp", "wb") as file:
+            np.save(file, np.ascontiguousarray(self.vectors))
+        os.replace(f"{vectors_path}.tmp", vectors_path)
+
+        index_path = os.path.join(path, INDEX_FILE)
+        with open(f"{index_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "kind": self.kind,
+                    "dimensions": self.dimensions,
+                    "metric": self.metric,
+                    "ids": self.ids,
+                    "metadata": [
+                        self.metadata.get(vector_id) for vector_id in self.ids
+                    ],
+                    **self._state(),
+                },
+                file,
+            )
+        os.replace(f"{index_path}.tmp", index_path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "VectorIndex":
+        """Load an index saved with `save`, memory-mapping its vectors if `mmap` is True"""
+        with open(os.path.join(path, INDEX_FILE), "r", encoding="utf-8") as file:
+            data = json.load(file)
+        index_class = INDEX_KINDS[data["kind"]]
+        index = index_class.__new__(index_class)
+        VectorIndex.__init__(index, data["dimensions"], data["metric"])
+        index.vectors = np.load(
+            os.path.join(path, VECTORS_FILE), mmap_mode="r" if mmap else None
+        )
+        index.ids = data["ids"]
+        index._positions = {
+            vector_id: position for position, vector_id in enumerate(index.ids)
+        }
+        index.metadata = {
+            vector_id: metadata
+            for vector_id, metadata in zip(index.ids, data["metadata"])
+            if metadata is not None
+        }
+        index._load_state(data)
+        return index
+
+
+class IVFVectorIndex(VectorIndex):
+    """Approximate inverted file index
+
+    Vectors are clustered in `n_lists` clusters with k-means once `train` is called
+    (or automatically when the index reaches `train_size` vectors), then only the
+    vectors of the `n_probe` clusters closest to the query are scored.
+
+    Args:
+        dimensions (int): size of the indexed vectors
+        metric (str, optional): `cosine` or `dot`. Defaults to "cosine".
+        n_lists (int, optional): number of clusters. Defaults to 64.
+        n_probe (int, optional): number of clusters searched per query. Defaults to 8.
+        train_size (int, optional): train automatically when reaching this size. Defaults to 4096.
+    """
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        dimensions: int,
+        metric: Metric = "cosine",
+        n_lists: int = 64,
+        n_probe: int = 8,
+        train_size: int = 4096,
+    ) -> None:
+        super().__init__(dimensions, metric)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_size = train_size
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.empty(0, dtype=np.int32)
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def train(self, iterations: int = 10, seed: int = 0) -> None:
+        """Cluster the indexed vectors with spherical k-means"""
+        n_lists = min(self.n_lists, len(self.ids))
+        if n_lists == 0:
+            return
+        vectors = np.asarray(self.vectors)
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            for cluster in range(n_lists):
+                members = vectors[assignments == cluster]
+                if len(members):
+                    centroids[cluster] = members.mean(axis=0)
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids /= np.where(norms == 0, 1, norms)
+        self.centroids = centroids
+        self.assignments = self._assign(vectors)
+
+    def _on_add(self, vectors: np.ndarray) -> None:
+        if self.centroids is not None:
+            self.assignments = np.concatenate([self.assignments, self._assign(vectors)])
+        elif len(self.ids) >= self.train_size:
+            self.train()
+
+    def _on_delete(self, keep: np.ndarray) -> None:
+        if self.centroids is not None:
+            self.assignments = self.assignments[keep]
+
+    def _candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        if self.centroids is None:
+            return None
+        n_probe = min(self.n_probe, len(self.centroids))
+        probed = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        return np.flatnonzero(np.isin(self.assignments, probed))
+
+    def _state(self) -> Dict[str, Any]:
+        return {
+            "n_lists": self.n_lists,
+            "n_probe": self.n_probe,
+            "train_size": self.train_size,
+            "centroids": None if self.centroids is None else self.centroids.tolist(),
+            "assignments": self.assignments.tolist(),
+        }
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.n_lists = state["n_lists"]
+        self.n_probe = state["n_probe"]
+        self.train_size = state["train_size"]
+        self.centroids = (
+            None
+            if state["centroids"] is None
+            else np.asarray(state["centroids"], dtype=np.float32)
+        )
+        self.assignments = np.asarray(state["assignments"], dtype=np.int32)
+
+
+INDEX_KINDS = {index.kind: index for index in (VectorIndex, IVFVectorIndex)}